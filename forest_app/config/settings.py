@@ -31,6 +31,16 @@ class AppSettings(BaseSettings):
     GEMINI_ADVANCED_MODEL_NAME: str = "gemini-1.5-pro-latest"
     LLM_TEMPERATURE: float = 0.7
 
+    # --- Optional Database Pool Configuration (async engine) ---
+    # Async URL; derived from DB_CONNECTION_STRING (asyncpg/aiosqlite) if unset
+    DB_ASYNC_CONNECTION_STRING: Optional[str] = None
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under load
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    # Semantic memory vectors (kept out of snapshots); DB_CONNECTION_STRING if unset
+    EMBEDDING_STORE_URL: Optional[str] = None
+
     # --- Optional Engine Configurations ---
     # (These configure engines IF they are enabled by flags below)
     METRICS_ENGINE_ALPHA: float = 0.3
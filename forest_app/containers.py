@@ -225,6 +225,7 @@ try:
         ComponentStateManager,
         SemanticMemoryManager
     )
+    from forest_app.core.services.embedding_store import SQLEmbeddingStore
     # --- Import Discovery Journey Service ---
     try:
         from forest_app.core.discovery_journey import DiscoveryJourneyService
@@ -243,6 +244,7 @@ try:
                                             ReflectionProcessor)
     from forest_app.core.services import (ComponentStateManager, HTAService,
                                           SemanticMemoryManager)
+    from forest_app.core.services.embedding_store import SQLEmbeddingStore
     from forest_app.modules.desire_engine import DesireEngine
     from forest_app.modules.emotional_integrity import EmotionalIntegrityIndex
     from forest_app.modules.financial_readiness import FinancialReadinessEngine
@@ -698,9 +700,21 @@ class Container(containers.DeclarativeContainer):
 
     # Snapshot Flow Controller
     # >>> CORRECTED TO SINGLETON <<< (Holds counter, snapshots deque)
+    # Memory vectors live in their own table (default: the app database),
+    # so snapshots only carry memory ids and metadata
+    embedding_store = providers.Singleton(
+        SQLEmbeddingStore,
+        url=providers.Callable(
+            lambda url, db_url: url or db_url,
+            config.EMBEDDING_STORE_URL,
+            config.DB_CONNECTION_STRING,
+        ),
+    ) if modules_core_import_ok else providers.Object(None)
+
     semantic_memory_manager: providers.Provider[SemanticMemoryProtocol] = providers.Singleton(
         SemanticMemoryManager,
-        llm_client=llm_client
+        llm_client=llm_client,
+        embedding_store=embedding_store
     ) if modules_core_import_ok else providers.Singleton(DummySemanticMemoryManager)
 
     snapshot_flow_controller = providers.Singleton(
@@ -823,8 +837,27 @@ class Container(containers.DeclarativeContainer):
 
     # Snapshot Flow Controller
     # >>> CORRECTED TO SINGLETON <<< (Holds counter, snapshots deque)
+    # Memory vectors live in their own table (default: the app database),
+    # so snapshots only carry memory ids and metadata
+    embedding_store = (
+        providers.Singleton(
+            SQLEmbeddingStore,
+            url=providers.Callable(
+                lambda url, db_url: url or db_url,
+                config.EMBEDDING_STORE_URL,
+                config.DB_CONNECTION_STRING,
+            ),
+        )
+        if modules_core_import_ok
+        else providers.Object(None)
+    )
+
     semantic_memory_manager: providers.Provider[SemanticMemoryProtocol] = (
-        providers.Singleton(SemanticMemoryManager, llm_client=llm_client)
+        providers.Singleton(
+            SemanticMemoryManager,
+            llm_client=llm_client,
+            embedding_store=embedding_store,
+        )
         if modules_core_import_ok
         else providers.Singleton(DummySemanticMemoryManager)
     )
@@ -0,0 +1,335 @@
+"""
+Cache Serializers for Forest App
+
+This module provides the serializer profiles used by the cache service to
+encode values for Redis (and the pickling in-memory backends). Every encoded
+value carries a small envelope header recording the format and compression
+codec, so entries written by one profile can always be decoded by another,
+and entries written before envelopes existed still decode as plain pickle.
+
+Envelope layout: MAGIC (3 bytes) | format id (1 byte) | codec id (1 byte) | payload
+"""
+
+import json
+import logging
+import pickle
+import zlib
+from enum import Enum
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional fast codecs; each falls back gracefully when not installed
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - exercised only without lz4
+    lz4_frame = None
+
+# Pickle protocol 0 never starts with a NUL byte and protocols 2+ start with
+# 0x80, so this prefix cannot collide with legacy (un-enveloped) entries.
+MAGIC = b"\x00FC"
+_HEADER_SIZE = len(MAGIC) + 2
+
+
+class SerializerProfile(Enum):
+    """Built-in serializer profiles for cached values."""
+
+    PICKLE = "pickle"  # Any picklable object
+    # JSON-native dict/list payloads via orjson (stdlib json fallback). Not
+    # lossless: tuples decode as lists, UUIDs/datetimes as strings.
+    JSON = "json"
+    MSGPACK = "msgpack"  # Like JSON, but bytes values survive the round-trip
+    # JSON/msgpack only when provably lossless, else pickle. Smallest safe
+    # choice, but the type check makes encoding slower than plain PICKLE.
+    AUTO = "auto"
+
+
+class CompressionCodec(Enum):
+    """Compression codecs for large cached values."""
+
+    NONE = "none"
+    ZLIB = "zlib"
+    ZSTD = "zstd"
+    LZ4 = "lz4"
+
+
+class _Format:
+    """Format ids stored in the envelope header."""
+
+    RAW = 0  # bytes stored as-is
+    PICKLE = 1
+    JSON = 2
+    MSGPACK = 3
+
+
+_CODEC_IDS = {
+    CompressionCodec.NONE: 0,
+    CompressionCodec.ZLIB: 1,
+    CompressionCodec.ZSTD: 2,
+    CompressionCodec.LZ4: 3,
+}
+_CODECS_BY_ID = {codec_id: codec for codec, codec_id in _CODEC_IDS.items()}
+
+
+def default_compression() -> CompressionCodec:
+    """Best compression codec available in this environment."""
+    if zstandard is not None:
+        return CompressionCodec.ZSTD
+    if lz4_frame is not None:
+        return CompressionCodec.LZ4
+    return CompressionCodec.ZLIB
+
+
+_JSON_SCALARS = frozenset((str, int, bool, type(None)))
+_NON_FINITE = (float("inf"), float("-inf"))
+_KIND_JSON = _Format.JSON
+_KIND_MSGPACK = _Format.MSGPACK
+
+
+def _walk_native(value: Any) -> int:
+    """Recursive worker for _native_kind; returns 0 for not-native."""
+    value_type = type(value)
+    if value_type is dict:
+        kind = _KIND_JSON
+        for key, item in value.items():
+            if type(key) is not str:
+                return 0
+            if type(item) in _JSON_SCALARS:
+                continue
+            item_kind = _walk_native(item)
+            if not item_kind:
+                return 0
+            if item_kind > kind:
+                kind = item_kind
+        return kind
+    if value_type is list:
+        kind = _KIND_JSON
+        for item in value:
+            if type(item) in _JSON_SCALARS:
+                continue
+            item_kind = _walk_native(item)
+            if not item_kind:
+                return 0
+            if item_kind > kind:
+                kind = item_kind
+        return kind
+    if value_type in _JSON_SCALARS:
+        return _KIND_JSON
+    if value_type is float:
+        # JSON encoders turn NaN/inf into null
+        return 0 if value != value or value in _NON_FINITE else _KIND_JSON
+    if value_type is bytes:
+        return _KIND_MSGPACK
+    return 0
+
+
+def _native_kind(value: Any) -> Optional[int]:
+    """
+    Classify a value for lossless encoding.
+
+    Returns:
+        _Format.JSON if the value round-trips exactly through JSON,
+        _Format.MSGPACK if it only additionally contains bytes, or None if it
+        needs pickle (tuples, datetimes, UUIDs, models, non-str keys...)
+    """
+    try:
+        return _walk_native(value) or None
+    except RecursionError:
+        return None
+
+
+class CacheSerializer:
+    """
+    Encodes and decodes cached values for one serializer profile.
+
+    Instances are callable through ``dumps``/``loads``, which is what
+    CacheConfig's serializer/deserializer hooks expect.
+    """
+
+    def __init__(
+        self,
+        profile: SerializerProfile = SerializerProfile.AUTO,
+        compression: Optional[CompressionCodec] = None,
+        compression_threshold: int = 1024,
+    ):
+        """
+        Initialize the serializer.
+
+        Args:
+            profile: Serializer profile to encode with
+            compression: Codec for values above the threshold (default: best
+                available of zstd, lz4, zlib)
+            compression_threshold: Minimum encoded size in bytes before
+                compression is attempted
+        """
+        self.profile = profile
+        self.compression = compression or default_compression()
+        self.compression_threshold = compression_threshold
+
+        if self.compression == CompressionCodec.ZSTD and zstandard is None:
+            logger.warning(
+                "zstandard not installed, falling back to zlib compression"
+            )
+            self.compression = CompressionCodec.ZLIB
+        elif self.compression == CompressionCodec.LZ4 and lz4_frame is None:
+            logger.warning("lz4 not installed, falling back to zlib compression")
+            self.compression = CompressionCodec.ZLIB
+
+        if profile == SerializerProfile.MSGPACK and msgpack is None:
+            logger.warning("msgpack not installed, MSGPACK profile will use pickle")
+
+        self._zstd_compressor = zstandard.ZstdCompressor() if zstandard else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    # --- Encoding ---
+
+    def _encode_payload(self, value: Any) -> Tuple[int, bytes]:
+        profile = self.profile
+
+        # Named tuples (e.g. the @cacheable refresh envelope) would come back
+        # from JSON/msgpack as plain lists, losing the type callers check for
+        if profile == SerializerProfile.PICKLE or (
+            isinstance(value, tuple) and type(value) is not tuple
+        ):
+            return _Format.PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        try:
+            if profile == SerializerProfile.JSON:
+                return _Format.JSON, self._json_dumps(value)
+            if profile == SerializerProfile.MSGPACK and msgpack is not None:
+                return _Format.MSGPACK, msgpack.packb(value, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError):
+            # Not representable in the profile's format; pickle instead
+            pass
+
+        if profile != SerializerProfile.AUTO:
+            return _Format.PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        # AUTO: raw bytes, then JSON/msgpack when lossless, then pickle
+        if type(value) is bytes:
+            return _Format.RAW, value
+        kind = _native_kind(value)
+        try:
+            if kind == _Format.JSON and orjson is not None:
+                return _Format.JSON, orjson.dumps(value)
+            if kind is not None and msgpack is not None:
+                return _Format.MSGPACK, msgpack.packb(value, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        return _Format.PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _json_dumps(value: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def _compress(self, payload: bytes) -> Tuple[CompressionCodec, bytes]:
+        if len(payload) < self.compression_threshold:
+            return CompressionCodec.NONE, payload
+
+        codec = self.compression
+        if codec == CompressionCodec.ZSTD:
+            compressed = self._zstd_compressor.compress(payload)
+        elif codec == CompressionCodec.LZ4:
+            compressed = lz4_frame.compress(payload)
+        elif codec == CompressionCodec.ZLIB:
+            compressed = zlib.compress(payload, 6)
+        else:
+            return CompressionCodec.NONE, payload
+
+        # Incompressible payloads are stored as-is
+        if len(compressed) >= len(payload):
+            return CompressionCodec.NONE, payload
+        return codec, compressed
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value into an enveloped byte string."""
+        format_id, payload = self._encode_payload(value)
+        codec, payload = self._compress(payload)
+        return MAGIC + bytes((format_id, _CODEC_IDS[codec])) + payload
+
+    # --- Decoding ---
+
+    def _decompress(self, codec: CompressionCodec, payload: bytes) -> bytes:
+        if codec == CompressionCodec.NONE:
+            return payload
+        if codec == CompressionCodec.ZSTD:
+            if zstandard is None:
+                raise ValueError(
+                    "Cached value is zstd-compressed but zstandard is not installed"
+                )
+            return self._zstd_decompressor.decompress(payload)
+        if codec == CompressionCodec.LZ4:
+            if lz4_frame is None:
+                raise ValueError(
+                    "Cached value is lz4-compressed but lz4 is not installed"
+                )
+            return lz4_frame.decompress(payload)
+        return zlib.decompress(payload)
+
+    def loads(self, data: Any) -> Any:
+        """Decode an enveloped value, or a legacy pickled value."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if not isinstance(data, (bytes, bytearray)) or data[: len(MAGIC)] != MAGIC:
+            # Entries written before envelopes were introduced
+            return pickle.loads(data)
+
+        format_id = data[len(MAGIC)]
+        codec = _CODECS_BY_ID.get(data[len(MAGIC) + 1])
+        if codec is None:
+            raise ValueError(
+                f"Unknown cache compression codec id {data[len(MAGIC) + 1]}"
+            )
+
+        payload = self._decompress(codec, bytes(data[_HEADER_SIZE:]))
+
+        if format_id == _Format.RAW:
+            return payload
+        if format_id == _Format.PICKLE:
+            return pickle.loads(payload)
+        if format_id == _Format.JSON:
+            return orjson.loads(payload) if orjson is not None else json.loads(payload)
+        if format_id == _Format.MSGPACK:
+            if msgpack is None:
+                raise ValueError(
+                    "Cached value is msgpack-encoded but msgpack is not installed"
+                )
+            return msgpack.unpackb(payload, raw=False)
+        raise ValueError(f"Unknown cache serializer format id {format_id}")
+
+
+def build_serializer(
+    profile: SerializerProfile,
+    compression: Optional[CompressionCodec] = None,
+    compression_threshold: int = 1024,
+) -> Tuple[Callable[[Any], bytes], Callable[[Any], Any]]:
+    """
+    Create the serializer/deserializer pair for a profile.
+
+    Args:
+        profile: Serializer profile to encode with
+        compression: Codec for large values (default: best available)
+        compression_threshold: Minimum encoded size before compressing
+
+    Returns:
+        (serializer, deserializer) callables for CacheConfig
+    """
+    serializer = CacheSerializer(profile, compression, compression_threshold)
+    return serializer.dumps, serializer.loads
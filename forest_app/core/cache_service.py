@@ -7,57 +7,68 @@ both local memory caching and Redis-based distributed caching.
 """
 
 import asyncio
-<<<<<<< HEAD
-import logging
-import json
-import hashlib
-import time
-import pickle
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, TypeVar, Generic, Callable
-from datetime import datetime, timedelta
-from functools import wraps
-from enum import Enum
-=======
+import copy
 import hashlib
+import heapq
+import inspect
+import json
 import logging
+import math
 import pickle
+import random
+import sys
 import time
+import uuid
+from collections import OrderedDict
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+from types import MappingProxyType
+from typing import (Any, Awaitable, Callable, Dict, List, NamedTuple, Optional,
+                    Set, Tuple, TypeVar)
+
+from forest_app.core.cache_serializers import (CompressionCodec,
+                                               SerializerProfile,
+                                               build_serializer)
 
 logger = logging.getLogger(__name__)
 
 # Type variable for generic cache methods
-<<<<<<< HEAD
-T = TypeVar('T')
-
-class CacheBackend(Enum):
-    """Supported cache backend types."""
-    MEMORY = "memory"  # Local in-memory cache
-    REDIS = "redis"    # Redis distributed cache
-    NONE = "none"      # No caching (for testing/debugging)
-
-class CacheConfig:
-    """Configuration for the cache service."""
-    
-=======
 T = TypeVar("T")
 
+# Values that are safe to hand out by reference without copying
+_IMMUTABLE_SCALARS = (str, bytes, int, float, complex, bool, type(None))
+
 
 class CacheBackend(Enum):
     """Supported cache backend types."""
 
     MEMORY = "memory"  # Local in-memory cache
+    BOUNDED_MEMORY = "bounded_memory"  # Size-bounded local cache with eviction
+    LOCAL = "local"  # Lock-striped local cache storing values by reference
     REDIS = "redis"  # Redis distributed cache
+    TIERED = "tiered"  # Per-process L1 in front of Redis with pub/sub invalidation
     NONE = "none"  # No caching (for testing/debugging)
 
 
+class EvictionPolicy(Enum):
+    """Eviction policies for the bounded memory backend."""
+
+    LRU = "lru"  # Evict the least recently used entry
+    LFU = "lfu"  # Evict the least frequently used entry
+    TINYLFU = "tinylfu"  # LRU eviction guarded by a frequency-sketch admission filter
+
+
+class LocalValueMode(Enum):
+    """How the local backend protects shared cached objects from mutation."""
+
+    REFERENCE = "reference"  # Return the stored object itself
+    FREEZE = "freeze"  # Store read-only copies (mappingproxy/tuple/frozenset)
+    COPY_ON_READ = "copy_on_read"  # Deep-copy mutable values on each read
+
+
 class CacheConfig:
     """Configuration for the cache service."""
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     def __init__(
         self,
         backend: CacheBackend = CacheBackend.MEMORY,
@@ -65,43 +76,133 @@ class CacheConfig:
         default_ttl: int = 3600,  # 1 hour
         namespace: str = "forest:",
         serializer: Optional[Callable] = None,
-<<<<<<< HEAD
-        deserializer: Optional[Callable] = None
-    ):
-        """
-        Initialize cache configuration.
-        
-=======
         deserializer: Optional[Callable] = None,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,  # 64 MB
+        eviction_policy: EvictionPolicy = EvictionPolicy.LRU,
+        lock_stripes: int = 16,
+        local_value_mode: LocalValueMode = LocalValueMode.REFERENCE,
+        l1_max_entries: int = 1000,
+        l1_max_bytes: Optional[int] = 16 * 1024 * 1024,  # 16 MB
+        l1_ttl: int = 60,
+        redis_client: Optional[Any] = None,
+        serializer_profile: Optional[SerializerProfile] = None,
+        compression: Optional[CompressionCodec] = None,
+        compression_threshold: int = 1024,
     ):
         """
         Initialize cache configuration.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             backend: The cache backend to use
-            redis_url: Redis connection URL (required for REDIS backend)
+            redis_url: Redis connection URL (required for REDIS backend).
+                Tagged writes extend tag TTLs with EXPIRE NX/GT on Redis 7+
+                and fall back to a Lua script on older servers
             default_ttl: Default time-to-live for cache entries in seconds
             namespace: Prefix for all cache keys
             serializer: Custom serializer function (default: pickle)
             deserializer: Custom deserializer function (default: pickle)
+            max_entries: Maximum number of entries (BOUNDED_MEMORY and LOCAL
+                backends; LOCAL splits it evenly across its lock stripes)
+            max_bytes: Maximum total serialized size in bytes, None for no limit
+                (BOUNDED_MEMORY backend)
+            eviction_policy: Eviction policy (BOUNDED_MEMORY backend)
+            lock_stripes: Number of independently locked shards (LOCAL backend)
+            local_value_mode: Mutation protection for stored objects (LOCAL backend)
+            l1_max_entries: Maximum entries in the per-process L1 (TIERED backend)
+            l1_max_bytes: Maximum serialized bytes in the L1 (TIERED backend)
+            l1_ttl: Upper bound on L1 entry lifetime in seconds (TIERED backend)
+            redis_client: Pre-built async Redis client, used instead of
+                redis_url (e.g. fakeredis in tests)
+            serializer_profile: Built-in serializer profile with compression,
+                used when no custom serializer/deserializer is given. None keeps
+                plain pickle, which workers on older releases can still read.
+            compression: Codec for values above compression_threshold when a
+                serializer_profile is set (default: best available)
+            compression_threshold: Minimum encoded size in bytes before
+                compression is attempted
         """
         self.backend = backend
         self.redis_url = redis_url
         self.default_ttl = default_ttl
         self.namespace = namespace
+        self.serializer_profile = serializer_profile
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        use_profile = serializer is None and deserializer is None
+        if serializer_profile is not None and use_profile:
+            serializer, deserializer = build_serializer(
+                serializer_profile, compression, compression_threshold
+            )
         self.serializer = serializer or pickle.dumps
         self.deserializer = deserializer or pickle.loads
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction_policy = eviction_policy
+        self.lock_stripes = lock_stripes
+        self.local_value_mode = local_value_mode
+        self.l1_max_entries = l1_max_entries
+        self.l1_max_bytes = l1_max_bytes
+        self.l1_ttl = l1_ttl
+        self.redis_client = redis_client
+
+
+def _seconds_left(remaining_ms: int) -> Optional[float]:
+    """Convert a PTTL reply to seconds; None for keys without an expiry."""
+    return remaining_ms / 1000 if remaining_ms >= 0 else None
+
+
+def _deserialize_found(deserializer: Callable, found: Dict[str, Any]) -> Dict[str, Any]:
+    """Deserialize bulk-read values, dropping any that fail to decode."""
+    values = {}
+    for key, value in found.items():
+        try:
+            values[key] = deserializer(value)
+        except Exception as e:
+            logger.error(f"Error deserializing cached value for key {key}: {e}")
+    return values
+
+
+class _TagIndex:
+    """Bidirectional tag <-> key index for the in-process backends."""
+
+    def __init__(self):
+        self.keys_by_tag: Dict[str, Set[str]] = {}
+        self.tags_by_key: Dict[str, Set[str]] = {}
+
+    def add(self, full_key: str, tags: Optional[List[str]]) -> None:
+        """Associate a key with tags, replacing any previous association."""
+        self.discard(full_key)
+        if not tags:
+            return
+        tag_set = set(tags)
+        self.tags_by_key[full_key] = tag_set
+        for tag in tag_set:
+            self.keys_by_tag.setdefault(tag, set()).add(full_key)
+
+    def discard(self, full_key: str) -> None:
+        """Forget a key that was deleted, evicted or expired."""
+        tags = self.tags_by_key.pop(full_key, None)
+        if not tags:
+            return
+        for tag in tags:
+            keys = self.keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(full_key)
+                if not keys:
+                    del self.keys_by_tag[tag]
+
+    def pop_tag(self, tag: str) -> Set[str]:
+        """Remove a tag and return the keys that carried it."""
+        keys = self.keys_by_tag.pop(tag, set())
+        for full_key in keys:
+            self.discard(full_key)
+        return keys
+
+    def clear(self) -> None:
+        self.keys_by_tag.clear()
+        self.tags_by_key.clear()
 
-<<<<<<< HEAD
-class MemoryCache:
-    """Simple in-memory cache implementation."""
-    
-    def __init__(self, config: CacheConfig):
-        """
-        Initialize memory cache.
-        
-=======
 
 class MemoryCache:
     """Simple in-memory cache implementation."""
@@ -110,7 +211,6 @@ class MemoryCache:
         """
         Initialize memory cache.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             config: Cache configuration
         """
@@ -118,21 +218,13 @@ class MemoryCache:
         self.cache: Dict[str, Tuple[Any, float]] = {}  # (value, expiry)
         self.namespace = config.namespace
         self.lock = asyncio.Lock()
-<<<<<<< HEAD
-        
-        # Start cleanup task
-        asyncio.create_task(self._cleanup_task())
-        
-        logger.info("Memory cache initialized")
-    
-=======
+        self.tags = _TagIndex()
 
         # Start cleanup task
         asyncio.create_task(self._cleanup_task())
 
         logger.info("Memory cache initialized")
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def _cleanup_task(self):
         """Background task to clean up expired cache entries."""
         while True:
@@ -141,46 +233,22 @@ class MemoryCache:
                 await self.cleanup()
             except Exception as e:
                 logger.error(f"Error in cache cleanup: {e}")
-<<<<<<< HEAD
-    
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def cleanup(self):
         """Remove expired entries from cache."""
         now = time.time()
         expired_keys = []
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         async with self.lock:
             # Find expired keys
             for key, (_, expiry) in self.cache.items():
                 if expiry < now:
                     expired_keys.append(key)
-<<<<<<< HEAD
-            
-            # Remove expired keys
-            for key in expired_keys:
-                del self.cache[key]
-        
-        if expired_keys:
-            logger.debug(f"Removed {len(expired_keys)} expired cache entries")
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """
-        Get a value from the cache.
-        
-        Args:
-            key: Cache key
-            
-=======
 
             # Remove expired keys
             for key in expired_keys:
                 del self.cache[key]
+                self.tags.discard(key)
 
         if expired_keys:
             logger.debug(f"Removed {len(expired_keys)} expired cache entries")
@@ -192,83 +260,53 @@ class MemoryCache:
         Args:
             key: Cache key
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Cached value or None if not found or expired
         """
         full_key = f"{self.namespace}{key}"
         now = time.time()
-<<<<<<< HEAD
-        
-        async with self.lock:
-            if full_key in self.cache:
-                value, expiry = self.cache[full_key]
-                
-=======
 
         async with self.lock:
             if full_key in self.cache:
                 value, expiry = self.cache[full_key]
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 # Check if expired
                 if expiry < now:
                     del self.cache[full_key]
+                    self.tags.discard(full_key)
                     return None
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 # Return cached value
                 try:
                     return self.config.deserializer(value)
                 except Exception as e:
                     logger.error(f"Error deserializing cached value: {e}")
                     return None
-<<<<<<< HEAD
-        
-        return None
-    
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """
-        Set a value in the cache.
-        
-=======
 
         return None
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
         """
         Set a value in the cache.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (uses default if None)
-<<<<<<< HEAD
-            
-=======
+            tags: Tags for group invalidation via invalidate_tag()
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if successful, False otherwise
         """
         full_key = f"{self.namespace}{key}"
         ttl = ttl if ttl is not None else self.config.default_ttl
         expiry = time.time() + ttl
-<<<<<<< HEAD
-        
-        try:
-            # Serialize value
-            serialized_value = self.config.serializer(value)
-            
-            # Store in cache
-            async with self.lock:
-                self.cache[full_key] = (serialized_value, expiry)
-            
-=======
 
         try:
             # Serialize value
@@ -277,22 +315,12 @@ class MemoryCache:
             # Store in cache
             async with self.lock:
                 self.cache[full_key] = (serialized_value, expiry)
+                self.tags.add(full_key, tags)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             return True
         except Exception as e:
             logger.error(f"Error setting cache value: {e}")
             return False
-<<<<<<< HEAD
-    
-    async def delete(self, key: str) -> bool:
-        """
-        Delete a value from the cache.
-        
-        Args:
-            key: Cache key
-            
-=======
 
     async def delete(self, key: str) -> bool:
         """
@@ -301,109 +329,387 @@ class MemoryCache:
         Args:
             key: Cache key
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if deleted, False if not found
         """
         full_key = f"{self.namespace}{key}"
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         async with self.lock:
             if full_key in self.cache:
                 del self.cache[full_key]
+                self.tags.discard(full_key)
                 return True
-<<<<<<< HEAD
-        
+
         return False
-    
-    async def flush(self) -> bool:
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """
-        Clear the entire cache.
-        
-=======
+        Get several values under a single lock acquisition.
 
-        return False
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        now = time.time()
+        found = {}
+
+        async with self.lock:
+            for key in keys:
+                full_key = f"{self.namespace}{key}"
+                entry = self.cache.get(full_key)
+                if entry is None:
+                    continue
+                if entry[1] < now:
+                    del self.cache[full_key]
+                    self.tags.discard(full_key)
+                    continue
+                found[key] = entry[0]
+
+        return _deserialize_found(self.config.deserializer, found)
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set several values under a single lock acquisition.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags applied to every entry
+
+        Returns:
+            True if successful, False otherwise
+        """
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        expiry = time.time() + ttl
+
+        try:
+            serialized = {
+                f"{self.namespace}{key}": self.config.serializer(value)
+                for key, value in items.items()
+            }
+        except Exception as e:
+            logger.error(f"Error setting cache values: {e}")
+            return False
+
+        async with self.lock:
+            for full_key, serialized_value in serialized.items():
+                self.cache[full_key] = (serialized_value, expiry)
+                self.tags.add(full_key, tags)
+
+        return True
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values under a single lock acquisition.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of entries deleted
+        """
+        removed = 0
+        async with self.lock:
+            for key in keys:
+                full_key = f"{self.namespace}{key}"
+                if self.cache.pop(full_key, None) is not None:
+                    self.tags.discard(full_key)
+                    removed += 1
+
+        return removed
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry stored with a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries deleted
+        """
+        async with self.lock:
+            full_keys = self.tags.pop_tag(tag)
+            removed = 0
+            for full_key in full_keys:
+                if self.cache.pop(full_key, None) is not None:
+                    removed += 1
+
+        return removed
 
     async def flush(self) -> bool:
         """
         Clear the entire cache.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if successful
         """
         async with self.lock:
             self.cache.clear()
-<<<<<<< HEAD
-        
+            self.tags.clear()
+
         logger.info("Memory cache flushed")
         return True
 
-class RedisCache:
-    """Redis-based distributed cache implementation."""
-    
-    def __init__(self, config: CacheConfig):
-        """
-        Initialize Redis cache.
-        
-=======
 
-        logger.info("Memory cache flushed")
+class _LRUPolicy:
+    """Recency ordering used to pick eviction victims."""
+
+    def __init__(self):
+        self.order: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, key: str) -> None:
+        self.order[key] = None
+
+    def touch(self, key: str) -> None:
+        self.order.move_to_end(key)
+
+    def discard(self, key: str) -> None:
+        self.order.pop(key, None)
+
+    def record_miss(self, key: str) -> None:
+        pass
+
+    def victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        for key in self.order:
+            if key != exclude:
+                return key
+        return None
+
+    def admit(self, key: str, victim: str) -> bool:
+        return True
+
+    def clear(self) -> None:
+        self.order.clear()
+
+
+class _LFUPolicy:
+    """Constant-time LFU ordering using per-frequency buckets."""
+
+    def __init__(self):
+        self.freq: Dict[str, int] = {}
+        self.buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self.min_freq = 0
+
+    def _bucket(self, freq: int) -> "OrderedDict[str, None]":
+        bucket = self.buckets.get(freq)
+        if bucket is None:
+            bucket = self.buckets[freq] = OrderedDict()
+        return bucket
+
+    def _unlink(self, key: str, freq: int) -> None:
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+
+    def add(self, key: str) -> None:
+        self.freq[key] = 1
+        self._bucket(1)[key] = None
+        self.min_freq = 1
+
+    def touch(self, key: str) -> None:
+        freq = self.freq[key]
+        self._unlink(key, freq)
+        if self.min_freq == freq and freq not in self.buckets:
+            self.min_freq = freq + 1
+        self.freq[key] = freq + 1
+        self._bucket(freq + 1)[key] = None
+
+    def discard(self, key: str) -> None:
+        freq = self.freq.pop(key, None)
+        if freq is not None:
+            self._unlink(key, freq)
+
+    def record_miss(self, key: str) -> None:
+        pass
+
+    def victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        if not self.freq:
+            return None
+        if self.min_freq not in self.buckets:
+            # Only happens after a discard emptied the lowest bucket
+            self.min_freq = min(self.buckets)
+        for key in self.buckets[self.min_freq]:
+            if key != exclude:
+                return key
+        # The excluded key is alone at the lowest frequency
+        for freq in sorted(self.buckets):
+            for key in self.buckets[freq]:
+                if key != exclude:
+                    return key
+        return None
+
+    def admit(self, key: str, victim: str) -> bool:
         return True
 
+    def clear(self) -> None:
+        self.freq.clear()
+        self.buckets.clear()
+        self.min_freq = 0
 
-class RedisCache:
-    """Redis-based distributed cache implementation."""
+
+class _FrequencySketch:
+    """
+    Count-min sketch with 4-bit saturating counters and periodic aging.
+
+    Used by the TinyLFU policy to estimate how often a key has been requested
+    recently, including keys that are not (or no longer) in the cache.
+    """
+
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+    _MAX_COUNT = 15
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in self._SEEDS]
+        self.sample_size = 10 * width
+        self.additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        for seed in self._SEEDS:
+            mixed = (h * seed) & 0xFFFFFFFFFFFFFFFF
+            yield (mixed ^ (mixed >> 29)) & self.mask
+
+    def increment(self, key: str) -> None:
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        """Halve every counter so the sketch tracks recent popularity."""
+        self.rows = [bytearray(count >> 1 for count in row) for row in self.rows]
+        self.additions //= 2
+
+
+class _TinyLFUPolicy(_LRUPolicy):
+    """
+    LRU eviction with TinyLFU admission.
+
+    A new key only displaces the LRU victim if it has been requested at least
+    as often, which keeps one-off keys from flushing out hot entries.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.sketch = _FrequencySketch(capacity)
+
+    def touch(self, key: str) -> None:
+        super().touch(key)
+        self.sketch.increment(key)
+
+    def record_miss(self, key: str) -> None:
+        self.sketch.increment(key)
+
+    def admit(self, key: str, victim: str) -> bool:
+        return self.sketch.estimate(key) >= self.sketch.estimate(victim)
+
+
+def _build_eviction_policy(policy: EvictionPolicy, capacity: int):
+    """Create the ordering structure for an eviction policy."""
+    if policy == EvictionPolicy.LRU:
+        return _LRUPolicy()
+    if policy == EvictionPolicy.LFU:
+        return _LFUPolicy()
+    if policy == EvictionPolicy.TINYLFU:
+        return _TinyLFUPolicy(capacity)
+    raise ValueError(f"Unsupported eviction policy: {policy}")
+
+
+class BoundedMemoryCache:
+    """
+    Size-bounded in-memory cache implementation.
+
+    Entries are capped both by count and by total serialized size, and are
+    evicted according to the configured EvictionPolicy. Expiry times are kept
+    in a min-heap so expired entries are reclaimed in O(log n) each instead of
+    scanning every key.
+    """
 
     def __init__(self, config: CacheConfig):
         """
-        Initialize Redis cache.
+        Initialize bounded memory cache.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             config: Cache configuration
         """
+        if config.max_entries <= 0:
+            raise ValueError("max_entries must be positive for bounded memory cache")
+
         self.config = config
         self.namespace = config.namespace
-        self.redis = None
+        self.max_entries = config.max_entries
+        self.max_bytes = config.max_bytes
+        self.cache: Dict[str, Tuple[Any, float, int]] = {}  # (value, expiry, size)
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.total_bytes = 0
+        self.policy = _build_eviction_policy(config.eviction_policy, config.max_entries)
         self.lock = asyncio.Lock()
-<<<<<<< HEAD
-        
-        # Import Redis here to avoid dependency if not used
-        try:
-            import redis.asyncio as aioredis
-            self.redis = aioredis.from_url(config.redis_url)
-            logger.info("Redis cache initialized with URL: " + config.redis_url.split("@")[-1])  # Hide credentials
-=======
-
-        # Import Redis here to avoid dependency if not used
-        try:
-            import redis.asyncio as aioredis
+        self.tags = _TagIndex()
+        self.stats = {"evictions": 0, "expirations": 0, "rejections": 0}
+
+        logger.info(
+            f"Bounded memory cache initialized (max_entries={self.max_entries}, "
+            f"max_bytes={self.max_bytes}, policy={config.eviction_policy.value})"
+        )
+
+    def _remove(self, full_key: str) -> None:
+        """Drop an entry and its bookkeeping. Caller must hold the lock."""
+        _, _, size = self.cache.pop(full_key)
+        self.total_bytes -= size
+        self.policy.discard(full_key)
+        self.tags.discard(full_key)
+
+    def _discard(self, full_key: str) -> None:
+        """Drop an entry if present. Caller must hold the lock."""
+        if full_key in self.cache:
+            self._remove(full_key)
+
+    def _purge_expired(self, now: float) -> None:
+        """Pop expired entries off the heap. Caller must hold the lock."""
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, full_key = heapq.heappop(heap)
+            entry = self.cache.get(full_key)
+            # Skip heap records left behind by overwrites or deletes
+            if entry is not None and entry[1] == expiry:
+                self._remove(full_key)
+                self.stats["expirations"] += 1
+
+        # Stale records accumulate when keys are rewritten; rebuild occasionally
+        if len(heap) > 2 * len(self.cache) + 64:
+            self.expiry_heap = [(entry[1], k) for k, entry in self.cache.items()]
+            heapq.heapify(self.expiry_heap)
+
+    def _over_capacity(self, extra_entries: int, extra_bytes: int) -> bool:
+        if len(self.cache) + extra_entries > self.max_entries:
+            return True
+        return (
+            self.max_bytes is not None
+            and self.total_bytes + extra_bytes > self.max_bytes
+        )
 
-            self.redis = aioredis.from_url(config.redis_url)
-            logger.info(
-                "Redis cache initialized with URL: " + config.redis_url.split("@")[-1]
-            )  # Hide credentials
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        except ImportError:
-            logger.error("Redis package not installed. Please install 'redis' package.")
-            raise
-        except Exception as e:
-            logger.error(f"Error initializing Redis connection: {e}")
-            raise
-<<<<<<< HEAD
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """
-        Get a value from the cache.
-        
-        Args:
-            key: Cache key
-            
-=======
+    async def cleanup(self):
+        """Remove expired entries from cache."""
+        async with self.lock:
+            self._purge_expired(time.time())
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -412,106 +718,159 @@ class RedisCache:
         Args:
             key: Cache key
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Cached value or None if not found or expired
         """
-        if not self.redis:
-            return None
-<<<<<<< HEAD
-        
-        full_key = f"{self.namespace}{key}"
-        
-        try:
-            # Get value from Redis
-            value = await self.redis.get(full_key)
-            
-            if value is None:
-                return None
-            
-=======
-
         full_key = f"{self.namespace}{key}"
 
-        try:
-            # Get value from Redis
-            value = await self.redis.get(full_key)
-
-            if value is None:
+        async with self.lock:
+            self._purge_expired(time.time())
+            entry = self.cache.get(full_key)
+            if entry is None:
+                self.policy.record_miss(full_key)
                 return None
+            self.policy.touch(full_key)
+            value = entry[0]
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Deserialize value
+        try:
             return self.config.deserializer(value)
         except Exception as e:
-            logger.error(f"Error getting value from Redis: {e}")
+            logger.error(f"Error deserializing cached value: {e}")
             return None
-<<<<<<< HEAD
-    
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """
-        Set a value in the cache.
-        
-=======
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
         """
-        Set a value in the cache.
+        Set a value in the cache, evicting other entries if needed.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (uses default if None)
-<<<<<<< HEAD
-            
-=======
+            tags: Tags for group invalidation via invalidate_tag()
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
-            True if successful, False otherwise
+            True if stored, False if serialization failed or the entry was
+            rejected by the size limit or admission policy (any previous
+            value of the key is then removed)
         """
-        if not self.redis:
-            return False
-<<<<<<< HEAD
-        
         full_key = f"{self.namespace}{key}"
         ttl = ttl if ttl is not None else self.config.default_ttl
-        
-        try:
-            # Serialize value
-            serialized_value = self.config.serializer(value)
-            
-            # Store in Redis
-            await self.redis.set(full_key, serialized_value, ex=ttl)
-            
-=======
 
-        full_key = f"{self.namespace}{key}"
+        serialized = self._serialize(key, value)
+
+        now = time.time()
+        async with self.lock:
+            self._purge_expired(now)
+            if serialized is None:
+                # Don't keep serving the value this set was meant to replace
+                self._discard(full_key)
+                return False
+            return self._insert(full_key, *serialized, now + ttl, tags)
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set several values under a single lock acquisition.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags applied to every entry
+
+        Returns:
+            True if every value was stored, False otherwise
+        """
         ttl = ttl if ttl is not None else self.config.default_ttl
+        prepared = []
+        rejected = []
+        for key, value in items.items():
+            serialized = self._serialize(key, value)
+            if serialized is None:
+                rejected.append(f"{self.namespace}{key}")
+            else:
+                prepared.append((f"{self.namespace}{key}", serialized))
+        all_stored = not rejected
+
+        now = time.time()
+        async with self.lock:
+            self._purge_expired(now)
+            for full_key in rejected:
+                self._discard(full_key)
+            for full_key, serialized in prepared:
+                if not self._insert(full_key, *serialized, now + ttl, tags):
+                    all_stored = False
 
+        return all_stored
+
+    def _serialize(self, key: str, value: Any) -> Optional[Tuple[Any, int]]:
+        """Serialize a value and measure it, or return None if it can't be stored."""
         try:
-            # Serialize value
             serialized_value = self.config.serializer(value)
+        except Exception as e:
+            logger.error(f"Error setting cache value: {e}")
+            return None
+
+        if isinstance(serialized_value, (bytes, bytearray, str)):
+            size = len(serialized_value)
+        else:
+            size = sys.getsizeof(serialized_value)
 
-            # Store in Redis
-            await self.redis.set(full_key, serialized_value, ex=ttl)
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.stats["rejections"] += 1
+            logger.debug(f"Value for key {key} ({size} bytes) exceeds cache max_bytes")
+            return None
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            return True
-        except Exception as e:
-            logger.error(f"Error setting value in Redis: {e}")
-            return False
-<<<<<<< HEAD
-    
-    async def delete(self, key: str) -> bool:
-        """
-        Delete a value from the cache.
-        
-        Args:
-            key: Cache key
-            
-=======
+        return serialized_value, size
+
+    def _insert(
+        self,
+        full_key: str,
+        serialized_value: Any,
+        size: int,
+        expiry: float,
+        tags: Optional[List[str]],
+    ) -> bool:
+        """Store an entry, evicting as needed. Caller must hold the lock."""
+        existing = self.cache.get(full_key)
+        if existing is not None:
+            # Overwrite in place, keeping the key's recency/frequency history
+            self.total_bytes -= existing[2]
+            self.policy.touch(full_key)
+            extra_entries = 0
+        else:
+            extra_entries = 1
+
+        if extra_entries and self._over_capacity(extra_entries, size):
+            victim = self.policy.victim()
+            if victim is not None and not self.policy.admit(full_key, victim):
+                self.stats["rejections"] += 1
+                return False
+
+        while self._over_capacity(extra_entries, size):
+            # An overwritten key is never its own victim
+            victim = self.policy.victim(exclude=full_key)
+            if victim is None:
+                break
+            self._remove(victim)
+            self.stats["evictions"] += 1
+
+        self.cache[full_key] = (serialized_value, expiry, size)
+        self.total_bytes += size
+        if extra_entries:
+            self.policy.add(full_key)
+        self.tags.add(full_key, tags)
+        heapq.heappush(self.expiry_heap, (expiry, full_key))
+        return True
 
     async def delete(self, key: str) -> bool:
         """
@@ -520,171 +879,1277 @@ class RedisCache:
         Args:
             key: Cache key
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if deleted, False if not found
         """
-        if not self.redis:
+        full_key = f"{self.namespace}{key}"
+
+        async with self.lock:
+            if full_key in self.cache:
+                self._remove(full_key)
+                return True
+
+        return False
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values under a single lock acquisition.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        found = {}
+
+        async with self.lock:
+            self._purge_expired(time.time())
+            for key in keys:
+                full_key = f"{self.namespace}{key}"
+                entry = self.cache.get(full_key)
+                if entry is None:
+                    self.policy.record_miss(full_key)
+                    continue
+                self.policy.touch(full_key)
+                found[key] = entry[0]
+
+        return _deserialize_found(self.config.deserializer, found)
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values under a single lock acquisition.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of entries deleted
+        """
+        removed = 0
+        async with self.lock:
+            for key in keys:
+                full_key = f"{self.namespace}{key}"
+                if full_key in self.cache:
+                    self._remove(full_key)
+                    removed += 1
+
+        return removed
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry stored with a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries deleted
+        """
+        async with self.lock:
+            removed = 0
+            for full_key in self.tags.pop_tag(tag):
+                if full_key in self.cache:
+                    self._remove(full_key)
+                    removed += 1
+
+        return removed
+
+    async def flush(self) -> bool:
+        """
+        Clear the entire cache.
+
+        Returns:
+            True if successful
+        """
+        async with self.lock:
+            self.cache.clear()
+            self.expiry_heap.clear()
+            self.total_bytes = 0
+            self.policy.clear()
+            self.tags.clear()
+
+        logger.info("Bounded memory cache flushed")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return eviction counters and current occupancy."""
+        return {
+            **self.stats,
+            "entries": len(self.cache),
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "eviction_policy": self.config.eviction_policy.value,
+        }
+
+
+def _is_immutable(value: Any) -> bool:
+    """Whether a value can be shared between callers without copying."""
+    if isinstance(value, _IMMUTABLE_SCALARS):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(item) for item in value)
+    return False
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert containers into read-only equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*(_freeze(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+class _LocalStripe:
+    """One shard of the local cache, guarded by its own lock."""
+
+    __slots__ = ("entries", "expiry_heap", "lock")
+
+    def __init__(self):
+        # (value, expiry), least recently used first
+        self.entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.lock = asyncio.Lock()
+
+    def purge_expired(self, now: float, tags: _TagIndex) -> int:
+        """Pop expired entries off the heap. Caller must hold the lock."""
+        removed = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, full_key = heapq.heappop(heap)
+            entry = self.entries.get(full_key)
+            if entry is not None and entry[1] == expiry:
+                del self.entries[full_key]
+                tags.discard(full_key)
+                removed += 1
+        if len(heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [(exp, k) for k, (_, exp) in self.entries.items()]
+            heapq.heapify(self.expiry_heap)
+        return removed
+
+    def evict_over(self, capacity: int, tags: _TagIndex) -> int:
+        """Drop least recently used entries above capacity. Caller holds the lock."""
+        evicted = 0
+        while len(self.entries) > capacity:
+            full_key, _ = self.entries.popitem(last=False)
+            tags.discard(full_key)
+            evicted += 1
+        return evicted
+
+
+class LocalMemoryCache:
+    """
+    Lock-striped in-process cache that stores values by reference.
+
+    Keys are sharded across ``config.lock_stripes`` stripes, each with its own
+    lock, so concurrent requests touching different keys do not serialize on a
+    single lock. Values never leave the process, so nothing is pickled.
+
+    In the default REFERENCE mode every caller receives the same object, so
+    cached values must be treated as read-only; use FREEZE or COPY_ON_READ
+    (``config.local_value_mode``) when callers may mutate what they get back.
+
+    Each stripe holds at most its share of ``config.max_entries`` and evicts
+    its least recently used entries beyond that; a background sweep removes
+    expired entries from stripes that are no longer being accessed.
+    """
+
+    SWEEP_INTERVAL = 60  # Seconds between expired-entry sweeps
+
+    def __init__(self, config: CacheConfig):
+        """
+        Initialize local memory cache.
+
+        Args:
+            config: Cache configuration
+        """
+        if config.lock_stripes <= 0:
+            raise ValueError("lock_stripes must be positive for local memory cache")
+
+        self.config = config
+        self.namespace = config.namespace
+        self.value_mode = config.local_value_mode
+        self.stripes = [_LocalStripe() for _ in range(config.lock_stripes)]
+        self.stripe_capacity = max(1, math.ceil(config.max_entries / len(self.stripes)))
+        # Shared across stripes; only mutated synchronously, never across an await
+        self.tags = _TagIndex()
+        self.sweep_task: Optional[asyncio.Task] = None
+        self.evictions = 0
+
+        logger.info(
+            f"Local memory cache initialized with {len(self.stripes)} lock stripes "
+            f"of {self.stripe_capacity} entries ({self.value_mode.value} values)"
+        )
+
+    def _ensure_sweeper(self) -> None:
+        """Start the expired-entry sweep on first write inside an event loop."""
+        if self.sweep_task is None or self.sweep_task.done():
+            self.sweep_task = asyncio.create_task(self._sweep_task())
+
+    async def _sweep_task(self):
+        """Background task to clean up expired cache entries."""
+        while True:
+            try:
+                await asyncio.sleep(self.SWEEP_INTERVAL)
+                await self.cleanup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in cache cleanup: {e}")
+
+    def _stripe(self, full_key: str) -> _LocalStripe:
+        return self.stripes[hash(full_key) % len(self.stripes)]
+
+    def _group_by_stripe(self, keys) -> Dict[int, List[Tuple[str, str]]]:
+        """Group (key, full_key) pairs by stripe index so each lock is taken once."""
+        groups: Dict[int, List[Tuple[str, str]]] = {}
+        for key in keys:
+            full_key = f"{self.namespace}{key}"
+            index = hash(full_key) % len(self.stripes)
+            groups.setdefault(index, []).append((key, full_key))
+        return groups
+
+    def _prepare_for_store(self, value: Any) -> Any:
+        if self.value_mode == LocalValueMode.FREEZE:
+            return _freeze(value)
+        return value
+
+    def _prepare_for_read(self, value: Any) -> Any:
+        if self.value_mode == LocalValueMode.COPY_ON_READ and not _is_immutable(value):
+            try:
+                # A pickle round-trip is considerably faster than copy.deepcopy
+                return pickle.loads(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                return copy.deepcopy(value)
+        return value
+
+    async def cleanup(self):
+        """Remove expired entries from cache, one stripe at a time."""
+        now = time.time()
+        removed = 0
+        for stripe in self.stripes:
+            async with stripe.lock:
+                removed += stripe.purge_expired(now, self.tags)
+
+        if removed:
+            logger.debug(f"Removed {removed} expired cache entries")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found or expired
+        """
+        full_key = f"{self.namespace}{key}"
+        stripe = self._stripe(full_key)
+        now = time.time()
+
+        async with stripe.lock:
+            entry = stripe.entries.get(full_key)
+            if entry is None:
+                return None
+            value, expiry = entry
+            if expiry <= now:
+                stripe.purge_expired(now, self.tags)
+                return None
+            stripe.entries.move_to_end(full_key)
+
+        return self._prepare_for_read(value)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set a value in the cache.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags for group invalidation via invalidate_tag()
+
+        Returns:
+            True if successful, False otherwise
+        """
+        full_key = f"{self.namespace}{key}"
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        now = time.time()
+        expiry = now + ttl
+
+        try:
+            stored_value = self._prepare_for_store(value)
+        except Exception as e:
+            logger.error(f"Error setting cache value: {e}")
+            return False
+
+        self._ensure_sweeper()
+        stripe = self._stripe(full_key)
+        async with stripe.lock:
+            stripe.purge_expired(now, self.tags)
+            stripe.entries[full_key] = (stored_value, expiry)
+            stripe.entries.move_to_end(full_key)
+            self.tags.add(full_key, tags)
+            heapq.heappush(stripe.expiry_heap, (expiry, full_key))
+            self.evictions += stripe.evict_over(self.stripe_capacity, self.tags)
+
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """
+        Delete a value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if deleted, False if not found
+        """
+        full_key = f"{self.namespace}{key}"
+        stripe = self._stripe(full_key)
+
+        async with stripe.lock:
+            self.tags.discard(full_key)
+            return stripe.entries.pop(full_key, None) is not None
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values, taking each stripe lock once.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        now = time.time()
+        found = {}
+
+        for index, pairs in self._group_by_stripe(keys).items():
+            stripe = self.stripes[index]
+            async with stripe.lock:
+                for key, full_key in pairs:
+                    entry = stripe.entries.get(full_key)
+                    if entry is not None and entry[1] > now:
+                        found[key] = entry[0]
+                        stripe.entries.move_to_end(full_key)
+
+        return {key: self._prepare_for_read(value) for key, value in found.items()}
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set several values, taking each stripe lock once.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags applied to every entry
+
+        Returns:
+            True if successful, False otherwise
+        """
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        now = time.time()
+        expiry = now + ttl
+
+        try:
+            stored = {key: self._prepare_for_store(value) for key, value in items.items()}
+        except Exception as e:
+            logger.error(f"Error setting cache values: {e}")
+            return False
+
+        self._ensure_sweeper()
+        for index, pairs in self._group_by_stripe(stored).items():
+            stripe = self.stripes[index]
+            async with stripe.lock:
+                stripe.purge_expired(now, self.tags)
+                for key, full_key in pairs:
+                    stripe.entries[full_key] = (stored[key], expiry)
+                    stripe.entries.move_to_end(full_key)
+                    self.tags.add(full_key, tags)
+                    heapq.heappush(stripe.expiry_heap, (expiry, full_key))
+                self.evictions += stripe.evict_over(self.stripe_capacity, self.tags)
+
+        return True
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values, taking each stripe lock once.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of entries deleted
+        """
+        removed = 0
+        for index, pairs in self._group_by_stripe(keys).items():
+            stripe = self.stripes[index]
+            async with stripe.lock:
+                for _, full_key in pairs:
+                    self.tags.discard(full_key)
+                    if stripe.entries.pop(full_key, None) is not None:
+                        removed += 1
+
+        return removed
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry stored with a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries deleted
+        """
+        removed = 0
+        for full_key in self.tags.pop_tag(tag):
+            stripe = self._stripe(full_key)
+            async with stripe.lock:
+                if stripe.entries.pop(full_key, None) is not None:
+                    removed += 1
+
+        return removed
+
+    async def flush(self) -> bool:
+        """
+        Clear the entire cache.
+
+        Returns:
+            True if successful
+        """
+        for stripe in self.stripes:
+            async with stripe.lock:
+                stripe.entries.clear()
+                stripe.expiry_heap.clear()
+        self.tags.clear()
+
+        logger.info("Local memory cache flushed")
+        return True
+
+    async def close(self) -> None:
+        """Stop the expired-entry sweep."""
+        if self.sweep_task is not None:
+            self.sweep_task.cancel()
+            try:
+                await self.sweep_task
+            except asyncio.CancelledError:
+                pass
+            self.sweep_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return occupancy and evictions across stripes."""
+        return {
+            "entries": sum(len(stripe.entries) for stripe in self.stripes),
+            "max_entries": self.stripe_capacity * len(self.stripes),
+            "evictions": self.evictions,
+            "lock_stripes": len(self.stripes),
+            "value_mode": self.value_mode.value,
+        }
+
+
+# Adds members to a tag set and only ever extends its TTL, for servers
+# without EXPIRE NX/GT (Redis < 7). ARGV: ttl, member...
+_ADD_TO_TAG_SCRIPT = """
+redis.call('SADD', KEYS[1], unpack(ARGV, 2))
+if redis.call('TTL', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+
+class RedisCache:
+    """Redis-based distributed cache implementation."""
+
+    # Members per script call, well below Lua's unpack() stack limit
+    TAG_SCRIPT_BATCH = 1000
+
+    def __init__(self, config: CacheConfig):
+        """
+        Initialize Redis cache.
+
+        Args:
+            config: Cache configuration
+        """
+        self.config = config
+        self.namespace = config.namespace
+        self.redis = None
+        self.lock = asyncio.Lock()
+        # Whether the server accepts EXPIRE NX/GT; None until a tagged write
+        self.expire_options: Optional[bool] = None
+        self.add_to_tag_script = None
+
+        if config.redis_client is not None:
+            self.redis = config.redis_client
+            logger.info("Redis cache initialized with provided client")
+            return
+
+        # Import Redis here to avoid dependency if not used
+        try:
+            import redis.asyncio as aioredis
+
+            self.redis = aioredis.from_url(config.redis_url)
+            logger.info(
+                "Redis cache initialized with URL: " + config.redis_url.split("@")[-1]
+            )  # Hide credentials
+        except ImportError:
+            logger.error("Redis package not installed. Please install 'redis' package.")
+            raise
+        except Exception as e:
+            logger.error(f"Error initializing Redis connection: {e}")
+            raise
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found or expired
+        """
+        if not self.redis:
+            return None
+
+        full_key = f"{self.namespace}{key}"
+
+        try:
+            # Get value from Redis
+            value = await self.redis.get(full_key)
+
+            if value is None:
+                return None
+
+            # Deserialize value
+            return self.config.deserializer(value)
+        except Exception as e:
+            logger.error(f"Error getting value from Redis: {e}")
+            return None
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get a value and its remaining time-to-live in one round-trip.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, seconds left); value is None if not found, seconds left
+            is None if the key does not expire
+        """
+        if not self.redis:
+            return None, None
+
+        full_key = f"{self.namespace}{key}"
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                value, remaining_ms = await pipe.execute()
+
+            if value is None:
+                return None, None
+
+            return self.config.deserializer(value), _seconds_left(remaining_ms)
+        except Exception as e:
+            logger.error(f"Error getting value from Redis: {e}")
+            return None, None
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}tag:{tag}"
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set a value in the cache.
+
+        Tag membership is kept in one Redis set per tag. Each tag set's TTL is
+        only ever extended so it outlives its members.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags for group invalidation via invalidate_tag()
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.redis:
+            return False
+
+        full_key = f"{self.namespace}{key}"
+        ttl = ttl if ttl is not None else self.config.default_ttl
+
+        try:
+            # Serialize value
+            serialized_value = self.config.serializer(value)
+
+            if not tags:
+                # Store in Redis
+                await self.redis.set(full_key, serialized_value, ex=ttl)
+                return True
+
+            # Store value and tag memberships in one round-trip
+            await self._set_tagged({full_key: serialized_value}, ttl, tags)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting value in Redis: {e}")
+            return False
+
+    async def _set_tagged(
+        self, serialized: Dict[str, Any], ttl: int, tags: List[str]
+    ) -> None:
+        """Store values and add them to their tag sets in one transaction."""
+        if self.expire_options is not False:
+            from redis.exceptions import ResponseError
+
+            try:
+                await self._execute_tagged(serialized, ttl, tags)
+                self.expire_options = True
+                return
+            except ResponseError as e:
+                if self.expire_options:
+                    raise
+                # Redis < 7 rejects the options, which aborts the transaction
+                logger.warning(
+                    f"Redis does not accept EXPIRE NX/GT ({e}); "
+                    "extending tag TTLs with a script instead"
+                )
+                self.expire_options = False
+        await self._execute_tagged(serialized, ttl, tags)
+
+    async def _execute_tagged(
+        self, serialized: Dict[str, Any], ttl: int, tags: List[str]
+    ) -> None:
+        if self.add_to_tag_script is None and self.expire_options is False:
+            self.add_to_tag_script = self.redis.register_script(_ADD_TO_TAG_SCRIPT)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for full_key, serialized_value in serialized.items():
+                pipe.set(full_key, serialized_value, ex=ttl)
+            members = list(serialized)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                if self.expire_options is False:
+                    for start in range(0, len(members), self.TAG_SCRIPT_BATCH):
+                        batch = members[start : start + self.TAG_SCRIPT_BATCH]
+                        await self.add_to_tag_script(
+                            keys=[tag_key], args=[ttl, *batch], client=pipe
+                        )
+                else:
+                    pipe.sadd(tag_key, *members)
+                    pipe.expire(tag_key, ttl, nx=True)
+                    pipe.expire(tag_key, ttl, gt=True)
+            await pipe.execute()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values with a single MGET round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        if not self.redis or not keys:
+            return {}
+
+        try:
+            values = await self.redis.mget([f"{self.namespace}{key}" for key in keys])
+        except Exception as e:
+            logger.error(f"Error getting values from Redis: {e}")
+            return {}
+
+        found = {key: value for key, value in zip(keys, values) if value is not None}
+        return _deserialize_found(self.config.deserializer, found)
+
+    async def get_many_with_ttl(
+        self, keys: List[str]
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """
+        Get several values and their remaining time-to-live in one round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to (value, seconds left) for the keys that were
+            found; seconds left is None for keys that do not expire
+        """
+        if not self.redis or not keys:
+            return {}
+
+        full_keys = [f"{self.namespace}{key}" for key in keys]
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.mget(full_keys)
+                for full_key in full_keys:
+                    pipe.pttl(full_key)
+                values, *remaining_ms = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error getting values from Redis: {e}")
+            return {}
+
+        found = {key: value for key, value in zip(keys, values) if value is not None}
+        found = _deserialize_found(self.config.deserializer, found)
+        seconds_left = dict(zip(keys, remaining_ms))
+        return {
+            key: (value, _seconds_left(seconds_left[key]))
+            for key, value in found.items()
+        }
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set several values with pipelined SET ... EX commands in one round-trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags applied to every entry
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.redis:
+            return False
+        if not items:
+            return True
+
+        ttl = ttl if ttl is not None else self.config.default_ttl
+
+        try:
+            serialized = {
+                f"{self.namespace}{key}": self.config.serializer(value)
+                for key, value in items.items()
+            }
+
+            if tags:
+                await self._set_tagged(serialized, ttl, tags)
+                return True
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for full_key, serialized_value in serialized.items():
+                    pipe.set(full_key, serialized_value, ex=ttl)
+                await pipe.execute()
+
+            return True
+        except Exception as e:
+            logger.error(f"Error setting values in Redis: {e}")
+            return False
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values with a single DEL.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of entries deleted
+        """
+        if not self.redis or not keys:
+            return 0
+
+        try:
+            return await self.redis.delete(*(f"{self.namespace}{key}" for key in keys))
+        except Exception as e:
+            logger.error(f"Error deleting values from Redis: {e}")
+            return 0
+
+    async def pop_tag_keys(self, tag: str) -> Tuple[List[str], int]:
+        """
+        Delete every entry stored with a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            The (un-namespaced) keys that carried the tag, and how many of
+            them still existed and were deleted
+        """
+        if not self.redis:
+            return [], 0
+
+        tag_key = self._tag_key(tag)
+
+        try:
+            members = await self.redis.smembers(tag_key)
+            full_keys = [m.decode() if isinstance(m, bytes) else m for m in members]
+            async with self.redis.pipeline(transaction=True) as pipe:
+                if full_keys:
+                    pipe.delete(*full_keys)
+                pipe.delete(tag_key)
+                results = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error invalidating tag {tag} in Redis: {e}")
+            return [], 0
+
+        removed = results[0] if full_keys else 0
+        prefix_length = len(self.namespace)
+        return [full_key[prefix_length:] for full_key in full_keys], removed
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry stored with a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries deleted
+        """
+        _, removed = await self.pop_tag_keys(tag)
+        return removed
+
+    async def delete(self, key: str) -> bool:
+        """
+        Delete a value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if deleted, False if not found
+        """
+        if not self.redis:
+            return False
+
+        full_key = f"{self.namespace}{key}"
+
+        try:
+            # Delete from Redis
+            result = await self.redis.delete(full_key)
+            return result > 0
+        except Exception as e:
+            logger.error(f"Error deleting value from Redis: {e}")
+            return False
+
+    async def flush(self) -> bool:
+        """
+        Clear all cache entries with this namespace.
+
+        Returns:
+            True if successful
+        """
+        if not self.redis:
+            return False
+
+        try:
+            # Find all keys with this namespace
+            pattern = f"{self.namespace}*"
+            keys = []
+
+            # Scan for keys in batches to avoid blocking Redis
+            cursor = 0
+            while True:
+                cursor, batch = await self.redis.scan(cursor, match=pattern, count=100)
+                keys.extend(batch)
+
+                if cursor == 0:
+                    break
+
+            # Delete keys if found
+            if keys:
+                await self.redis.delete(*keys)
+                logger.info(f"Flushed {len(keys)} keys from Redis cache")
+
+            return True
+        except Exception as e:
+            logger.error(f"Error flushing Redis cache: {e}")
+            return False
+
+
+class TieredCache:
+    """
+    Two-tier cache: a small per-process L1 in front of Redis as L2.
+
+    Reads are served from L1 when possible and fall through to Redis on a
+    miss, repopulating L1. Writes and deletes go to Redis first, then a
+    message on the invalidation channel tells every other process to drop
+    its L1 copy. L1 entries additionally expire after ``config.l1_ttl`` so a
+    missed invalidation can only serve stale data for a bounded time.
+    """
+
+    def __init__(self, config: CacheConfig):
+        """
+        Initialize tiered cache.
+
+        Args:
+            config: Cache configuration
+        """
+        self.config = config
+        self.namespace = config.namespace
+        self.l1_ttl = config.l1_ttl
+        self.l1 = BoundedMemoryCache(
+            CacheConfig(
+                backend=CacheBackend.BOUNDED_MEMORY,
+                default_ttl=config.l1_ttl,
+                namespace=config.namespace,
+                serializer=config.serializer,
+                deserializer=config.deserializer,
+                max_entries=config.l1_max_entries,
+                max_bytes=config.l1_max_bytes,
+                eviction_policy=config.eviction_policy,
+            )
+        )
+        self.l2 = RedisCache(config)
+        self.channel = f"{config.namespace}invalidate"
+        self.instance_id = uuid.uuid4().hex
+        self.listener_task: Optional[asyncio.Task] = None
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "invalidations_received": 0}
+
+        logger.info(
+            f"Tiered cache initialized (L1 max_entries={config.l1_max_entries}, "
+            f"L1 ttl={config.l1_ttl}s, channel={self.channel})"
+        )
+
+    def _ensure_listener(self) -> None:
+        """Start the invalidation listener on first use inside an event loop."""
+        if self.listener_task is None or self.listener_task.done():
+            self.listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def _listen_for_invalidations(self):
+        """Background task evicting L1 entries invalidated by other processes."""
+        backoff = 1.0
+        while True:
+            pubsub = self.l2.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                backoff = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    await self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in cache invalidation listener: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    close = getattr(pubsub, "aclose", None) or pubsub.close
+                    await close()
+                except Exception:
+                    pass
+
+    async def _apply_invalidation(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation message: {data!r}")
+            return
+
+        if message.get("origin") == self.instance_id:
+            return
+
+        self.stats["invalidations_received"] += 1
+        if message.get("flush"):
+            await self.l1.flush()
+            return
+        for key in message.get("keys", []):
+            await self.l1.delete(key)
+
+    async def _publish_invalidation(self, keys=None, flush: bool = False) -> None:
+        message = {"origin": self.instance_id}
+        if flush:
+            message["flush"] = True
+        else:
+            message["keys"] = list(keys)
+        try:
+            await self.l2.redis.publish(self.channel, json.dumps(message))
+        except Exception as e:
+            logger.error(f"Error publishing cache invalidation: {e}")
+
+    def _l1_ttl(self, ttl: Optional[float]) -> float:
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        return min(ttl, self.l1_ttl)
+
+    def _l1_ttl_left(self, seconds_left: Optional[float]) -> float:
+        """L1 ttl of a value read from Redis, never outliving the Redis entry."""
+        return self.l1_ttl if seconds_left is None else min(seconds_left, self.l1_ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from L1, falling back to Redis.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found or expired
+        """
+        self._ensure_listener()
+
+        value = await self.l1.get(key)
+        if value is not None:
+            self.stats["l1_hits"] += 1
+            return value
+
+        value, seconds_left = await self.l2.get_with_ttl(key)
+        if value is not None:
+            self.stats["l2_hits"] += 1
+            await self.l1.set(key, value, self._l1_ttl_left(seconds_left))
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set a value in Redis and the local L1, invalidating other L1s.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags for group invalidation via invalidate_tag()
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self._ensure_listener()
+
+        if not await self.l2.set(key, value, ttl, tags):
+            # Never leave L1 holding a value Redis does not have
+            await self.l1.delete(key)
             return False
-<<<<<<< HEAD
-        
-        full_key = f"{self.namespace}{key}"
-        
-=======
 
-        full_key = f"{self.namespace}{key}"
+        await self.l1.set(key, value, self._l1_ttl(ttl))
+        await self._publish_invalidation([key])
+        return True
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        try:
-            # Delete from Redis
-            result = await self.redis.delete(full_key)
-            return result > 0
-        except Exception as e:
-            logger.error(f"Error deleting value from Redis: {e}")
-            return False
-<<<<<<< HEAD
-    
-    async def flush(self) -> bool:
+    async def delete(self, key: str) -> bool:
         """
-        Clear all cache entries with this namespace.
-        
-=======
+        Delete a value from both tiers and invalidate other L1s.
 
-    async def flush(self) -> bool:
+        Args:
+            key: Cache key
+
+        Returns:
+            True if deleted, False if not found
         """
-        Clear all cache entries with this namespace.
+        self._ensure_listener()
+
+        local_deleted = await self.l1.delete(key)
+        remote_deleted = await self.l2.delete(key)
+        await self._publish_invalidation([key])
+        return local_deleted or remote_deleted
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values from L1, fetching the rest from Redis in one MGET.
+
+        Args:
+            keys: Cache keys
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
-            True if successful
+            Mapping of key to value for the keys that were found
         """
-        if not self.redis:
-            return False
-<<<<<<< HEAD
-        
-=======
+        self._ensure_listener()
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        try:
-            # Find all keys with this namespace
-            pattern = f"{self.namespace}*"
-            keys = []
-<<<<<<< HEAD
-            
-=======
+        found = await self.l1.get_many(keys)
+        self.stats["l1_hits"] += len(found)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Scan for keys in batches to avoid blocking Redis
-            cursor = 0
-            while True:
-                cursor, batch = await self.redis.scan(cursor, match=pattern, count=100)
-                keys.extend(batch)
-<<<<<<< HEAD
-                
-                if cursor == 0:
-                    break
-            
-=======
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_l2 = await self.l2.get_many_with_ttl(missing)
+            if from_l2:
+                self.stats["l2_hits"] += len(from_l2)
+                for key, (value, seconds_left) in from_l2.items():
+                    await self.l1.set(key, value, self._l1_ttl_left(seconds_left))
+                    found[key] = value
 
-                if cursor == 0:
-                    break
+        return found
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Delete keys if found
-            if keys:
-                await self.redis.delete(*keys)
-                logger.info(f"Flushed {len(keys)} keys from Redis cache")
-<<<<<<< HEAD
-            
-=======
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set several values in Redis and L1, invalidating other L1s once.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            return True
-        except Exception as e:
-            logger.error(f"Error flushing Redis cache: {e}")
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags applied to every entry
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self._ensure_listener()
+
+        if not await self.l2.set_many(items, ttl, tags):
+            await self.l1.delete_many(list(items))
             return False
 
-<<<<<<< HEAD
-class CacheService:
-    """
-    Distributed caching service for improving performance and scalability.
-    
-=======
+        await self.l1.set_many(items, self._l1_ttl(ttl))
+        await self._publish_invalidation(list(items))
+        return True
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values from both tiers and invalidate other L1s once.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of entries deleted from Redis
+        """
+        self._ensure_listener()
+
+        await self.l1.delete_many(keys)
+        removed = await self.l2.delete_many(keys)
+        await self._publish_invalidation(keys)
+        return removed
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry stored with a tag from both tiers and other L1s.
+
+        Tags are tracked in Redis only, since L1 entries filled from Redis on
+        a read do not know their tags; the affected keys are broadcast instead.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries deleted from Redis
+        """
+        self._ensure_listener()
+
+        keys, removed = await self.l2.pop_tag_keys(tag)
+        for key in keys:
+            await self.l1.delete(key)
+        if keys:
+            await self._publish_invalidation(keys)
+        return removed
+
+    async def flush(self) -> bool:
+        """
+        Clear both tiers and every other process's L1.
+
+        Returns:
+            True if successful
+        """
+        self._ensure_listener()
+
+        await self.l1.flush()
+        success = await self.l2.flush()
+        await self._publish_invalidation(flush=True)
+        return success
+
+    async def close(self) -> None:
+        """Stop the invalidation listener."""
+        if self.listener_task is not None:
+            self.listener_task.cancel()
+            try:
+                await self.listener_task
+            except asyncio.CancelledError:
+                pass
+            self.listener_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-tier hit counters and L1 occupancy."""
+        l1_stats = self.l1.get_stats()
+        return {
+            **self.stats,
+            "l1_entries": l1_stats["entries"],
+            "l1_bytes": l1_stats["bytes"],
+            "l1_evictions": l1_stats["evictions"],
+        }
+
 
 class CacheService:
     """
     Distributed caching service for improving performance and scalability.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     This service provides a unified interface for caching data, whether using
     local memory or Redis, making it easy to scale horizontally while maintaining
     the intimate, personal experience for each user.
     """
-<<<<<<< HEAD
-    
-    _instance = None
-    
-    @classmethod
-    def get_instance(cls, config: Optional[CacheConfig] = None) -> 'CacheService':
-=======
 
     _instance = None
 
     @classmethod
     def get_instance(cls, config: Optional[CacheConfig] = None) -> "CacheService":
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         """Get the singleton instance of the CacheService."""
         if cls._instance is None:
             cls._instance = CacheService(config or CacheConfig())
         elif config is not None:
             logger.warning("Cache already initialized, ignoring new config")
         return cls._instance
-<<<<<<< HEAD
-    
-    def __init__(self, config: CacheConfig):
-        """
-        Initialize the cache service.
-        
-=======
 
     def __init__(self, config: CacheConfig):
         """
         Initialize the cache service.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             config: Cache configuration
         """
         self.config = config
-<<<<<<< HEAD
-        
-=======
+        self.stats = {"hits": 0, "misses": 0}
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # Initialize backend
         if config.backend == CacheBackend.MEMORY:
             self.backend = MemoryCache(config)
+        elif config.backend == CacheBackend.BOUNDED_MEMORY:
+            self.backend = BoundedMemoryCache(config)
+        elif config.backend == CacheBackend.LOCAL:
+            self.backend = LocalMemoryCache(config)
         elif config.backend == CacheBackend.REDIS:
-            if not config.redis_url:
+            if not config.redis_url and config.redis_client is None:
                 raise ValueError("Redis URL is required for Redis backend")
             self.backend = RedisCache(config)
+        elif config.backend == CacheBackend.TIERED:
+            if not config.redis_url and config.redis_client is None:
+                raise ValueError("Redis URL is required for tiered backend")
+            self.backend = TieredCache(config)
         elif config.backend == CacheBackend.NONE:
             self.backend = None
             logger.warning("Cache disabled (NONE backend)")
         else:
             raise ValueError(f"Unsupported cache backend: {config.backend}")
-<<<<<<< HEAD
-        
-        logger.info(f"Cache service initialized with {config.backend.value} backend")
-    
-    async def get(self, key: str) -> Optional[T]:
-        """
-        Get a value from the cache.
-        
-        Args:
-            key: Cache key
-            
-=======
 
         logger.info(f"Cache service initialized with {config.backend.value} backend")
 
@@ -695,64 +2160,44 @@ class CacheService:
         Args:
             key: Cache key
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Cached value or None if not found
         """
         if not self.backend:
             return None
-<<<<<<< HEAD
-        
-        value = await self.backend.get(key)
-        logger.debug(f"Cache {'hit' if value is not None else 'miss'} for key: {key}")
-        return value
-    
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """
-        Set a value in the cache.
-        
-=======
 
         value = await self.backend.get(key)
+        self.stats["hits" if value is not None else "misses"] += 1
         logger.debug(f"Cache {'hit' if value is not None else 'miss'} for key: {key}")
         return value
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
         """
         Set a value in the cache.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (uses default if None)
-<<<<<<< HEAD
-            
-=======
+            tags: Tags such as "user:{id}" or "tree:{id}" that let related
+                entries be evicted together with invalidate_tag()
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if successful, False otherwise
         """
         if not self.backend:
             return False
-<<<<<<< HEAD
-        
-        success = await self.backend.set(key, value, ttl)
-        if success:
-            logger.debug(f"Cached value for key: {key} (TTL: {ttl or self.config.default_ttl}s)")
-        return success
-    
-    async def delete(self, key: str) -> bool:
-        """
-        Delete a value from the cache.
-        
-        Args:
-            key: Cache key
-            
-=======
 
-        success = await self.backend.set(key, value, ttl)
+        if tags:
+            success = await self.backend.set(key, value, ttl, tags)
+        else:
+            success = await self.backend.set(key, value, ttl)
         if success:
             logger.debug(
                 f"Cached value for key: {key} (TTL: {ttl or self.config.default_ttl}s)"
@@ -766,181 +2211,416 @@ class CacheService:
         Args:
             key: Cache key
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if deleted, False if not found
         """
         if not self.backend:
             return False
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         success = await self.backend.delete(key)
         if success:
             logger.debug(f"Deleted cached value for key: {key}")
         return success
-<<<<<<< HEAD
-    
-    async def flush(self) -> bool:
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """
-        Clear the entire cache.
-        
-=======
+        Get several values from the cache in one backend call.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        if not self.backend or not keys:
+            return {}
+
+        found = await self.backend.get_many(keys)
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(keys) - len(found)
+        logger.debug(f"Cache bulk lookup: {len(found)}/{len(keys)} hits")
+        return found
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set several values in the cache in one backend call.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time-to-live in seconds (uses default if None)
+            tags: Tags applied to every entry
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.backend:
+            return False
+        if not items:
+            return True
+
+        success = await self.backend.set_many(items, ttl, tags)
+        if success:
+            logger.debug(
+                f"Cached {len(items)} values (TTL: {ttl or self.config.default_ttl}s)"
+            )
+        return success
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values from the cache in one backend call.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of entries deleted
+        """
+        if not self.backend or not keys:
+            return 0
+
+        return await self.backend.delete_many(keys)
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every cached value that was stored with a tag.
+
+        Args:
+            tag: Tag passed to set()
+
+        Returns:
+            Number of entries invalidated
+        """
+        if not self.backend:
+            return 0
+
+        removed = await self.backend.invalidate_tag(tag)
+        logger.debug(f"Invalidated {removed} cached values for tag: {tag}")
+        return removed
 
     async def flush(self) -> bool:
         """
         Clear the entire cache.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             True if successful
         """
         if not self.backend:
             return False
-<<<<<<< HEAD
-        
+
         return await self.backend.flush()
 
-=======
+    async def close(self) -> None:
+        """Release background resources held by the backend."""
+        if self.backend is not None and hasattr(self.backend, "close"):
+            await self.backend.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Hit/miss counters, plus eviction and occupancy counters when the
+            backend reports them
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        stats = {
+            "backend": self.config.backend.value,
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+        if self.backend is not None and hasattr(self.backend, "get_stats"):
+            stats.update(self.backend.get_stats())
+        return stats
+
+
+class _CachedResult(NamedTuple):
+    """Envelope stored by @cacheable when refresh-ahead features are enabled."""
+
+    value: Any
+    fresh_until: float  # Epoch seconds after which the value is stale
+    compute_seconds: float  # How long the value took to compute
+
+
+class _SingleFlight:
+    """De-duplicates concurrent computations of the same cache key."""
+
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self.calls
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller has gone away
+            task.exception()
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run compute() for key, or wait for the call already in flight.
+
+        The computation runs in its own task, so a cancelled caller (e.g. a
+        disconnected client) only stops waiting; the other callers still
+        get the result.
+
+        Args:
+            key: Cache key identifying the computation
+            compute: Coroutine factory producing the value
+
+        Returns:
+            The result of the single shared computation
+        """
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+
+_single_flight = _SingleFlight()
+_background_refreshes: Set[asyncio.Task] = set()
+
+
+async def _call_function(func: Callable, args: tuple, kwargs: dict) -> Any:
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return func(*args, **kwargs)
+
+
+def _self_offset(func: Callable) -> int:
+    """Number of leading positional args (self/cls) to skip for methods."""
+    try:
+        params = list(inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        return 0
+    # Static methods and plain functions have no self/cls to skip
+    return 1 if params and params[0] in ("self", "cls") else 0
+
+
+def _format_pattern(pattern: str, args: tuple, kwargs: dict, offset: int) -> str:
+    """Format a @cacheable key or tag pattern with the call's arguments."""
+    # Skip self/cls for methods so {0} is the first real argument
+    return pattern.format(*args[offset:], **kwargs)
 
-        return await self.backend.flush()
+
+def _qualify_cache_key(func: Callable, cache_key: str) -> str:
+    # Hash long or complex keys
+    if len(cache_key) > 100:
+        cache_key = hashlib.md5(cache_key.encode()).hexdigest()
+
+    # Add function name prefix
+    return f"{func.__module__}.{func.__name__}:{cache_key}"
+
+
+def _build_cache_key(
+    func: Callable, key_pattern: str, args: tuple, kwargs: dict, offset: int
+) -> str:
+    """Format a @cacheable key pattern for one call."""
+    return _qualify_cache_key(func, _format_pattern(key_pattern, args, kwargs, offset))
+
+
+def _should_refresh_early(entry: _CachedResult, now: float, beta: float) -> bool:
+    """
+    Probabilistic early expiration (XFetch).
+
+    The closer an entry is to going stale, and the longer it took to compute,
+    the more likely a caller is to refresh it ahead of time, which spreads
+    recomputation out instead of having every caller miss at once.
+    """
+    if beta <= 0:
+        return False
+    jitter = -math.log(1.0 - random.random())  # Exponential(1), never log(0)
+    return now + entry.compute_seconds * beta * jitter >= entry.fresh_until
+
+
+def _schedule_refresh(cache_key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+    """Refresh a cache entry in the background, at most once per key."""
+    if _single_flight.in_flight(cache_key):
+        return
+
+    async def refresh():
+        try:
+            await _single_flight.do(cache_key, compute)
+        except Exception as e:
+            logger.warning(f"Background refresh failed for key {cache_key}: {e}")
+
+    task = asyncio.create_task(refresh())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
 
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # Decorator for cacheable functions
-def cacheable(key_pattern: str, ttl: Optional[int] = None):
+def cacheable(
+    key_pattern: str,
+    ttl: Optional[int] = None,
+    single_flight: bool = True,
+    stale_ttl: int = 0,
+    early_expiration_beta: float = 0.0,
+    tags: Optional[List[str]] = None,
+):
     """
     Decorator for caching function results.
-<<<<<<< HEAD
-    
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     Args:
         key_pattern: Pattern for cache key, using {arg_name} for arg values
                     For positional args, use {0}, {1}, etc.
         ttl: Time-to-live in seconds (uses default if None)
-<<<<<<< HEAD
-        
-    Returns:
-        Decorated function with caching
-    """
-=======
+        single_flight: Share one in-flight computation between concurrent
+                    callers that miss on the same key
+        stale_ttl: Seconds past ttl during which the stale value is still
+                    served while a single background task refreshes it
+        early_expiration_beta: Enables probabilistic early refresh when > 0;
+                    1.0 is a good default, larger values refresh earlier
+        tags: Tag patterns formatted like key_pattern, e.g. ["user:{0}"], so
+                    results can be evicted with CacheService.invalidate_tag()
 
     Returns:
         Decorated function with caching
     """
+    refresh_ahead = stale_ttl > 0 or early_expiration_beta > 0
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     def decorator(func):
+        offset = _self_offset(func)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Get cache service
             cache = CacheService.get_instance()
-<<<<<<< HEAD
-            
-            # Skip if cache is disabled
-            if not cache.backend:
-                return await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
-            
-=======
 
             # Skip if cache is disabled
             if not cache.backend:
-                return (
-                    await func(*args, **kwargs)
-                    if asyncio.iscoroutinefunction(func)
-                    else func(*args, **kwargs)
-                )
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Build cache key from pattern
-            key_context = kwargs.copy()
-            # Add positional args to context
-            for i, arg in enumerate(args):
-                # Skip self/cls for methods
-<<<<<<< HEAD
-                if i == 0 and func.__name__ == func.__qualname__.split('.')[-1]:
-                    continue
-                key_context[str(i)] = arg
-            
-            try:
-                # Format key pattern with args
-                cache_key = key_pattern.format(**key_context)
-                
-                # Hash long or complex keys
-                if len(cache_key) > 100:
-                    cache_key = hashlib.md5(cache_key.encode()).hexdigest()
-                
-                # Add function name prefix
-                cache_key = f"{func.__module__}.{func.__name__}:{cache_key}"
-                
-=======
-                if i == 0 and func.__name__ == func.__qualname__.split(".")[-1]:
-                    continue
-                key_context[str(i)] = arg
+                return await _call_function(func, args, kwargs)
 
             try:
-                # Format key pattern with args
-                cache_key = key_pattern.format(**key_context)
-
-                # Hash long or complex keys
-                if len(cache_key) > 100:
-                    cache_key = hashlib.md5(cache_key.encode()).hexdigest()
+                cache_key = _build_cache_key(func, key_pattern, args, kwargs, offset)
+                cache_tags = [
+                    _format_pattern(tag, args, kwargs, offset) for tag in tags or ()
+                ]
 
-                # Add function name prefix
-                cache_key = f"{func.__module__}.{func.__name__}:{cache_key}"
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 # Check cache first
                 cached_value = await cache.get(cache_key)
-                if cached_value is not None:
-                    return cached_value
-<<<<<<< HEAD
-                
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                # Call function if cache miss
-                if asyncio.iscoroutinefunction(func):
-                    result = await func(*args, **kwargs)
-                else:
-                    result = func(*args, **kwargs)
-<<<<<<< HEAD
-                
-                # Cache result
-                await cache.set(cache_key, result, ttl)
-                
-                return result
-                
             except Exception as e:
-                logger.warning(f"Error in cache logic: {e}, falling back to uncached function")
+                logger.warning(
+                    f"Error in cache logic: {e}, falling back to uncached function"
+                )
                 # Fall back to uncached function call
-                return await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
-        
+                return await _call_function(func, args, kwargs)
+
+            fresh_ttl = ttl if ttl is not None else cache.config.default_ttl
+
+            async def compute():
+                started = time.time()
+                result = await _call_function(func, args, kwargs)
+                if refresh_ahead:
+                    now = time.time()
+                    entry = _CachedResult(result, now + fresh_ttl, now - started)
+                    await cache.set(
+                        cache_key, entry, fresh_ttl + stale_ttl, tags=cache_tags
+                    )
+                else:
+                    await cache.set(cache_key, result, ttl, tags=cache_tags)
+                return result
+
+            if cached_value is not None:
+                if not isinstance(cached_value, _CachedResult):
+                    return cached_value
+
+                now = time.time()
+                if now < cached_value.fresh_until:
+                    if _should_refresh_early(cached_value, now, early_expiration_beta):
+                        _schedule_refresh(cache_key, compute)
+                    return cached_value.value
+                if stale_ttl > 0:
+                    # Serve stale while one background task revalidates
+                    _schedule_refresh(cache_key, compute)
+                    return cached_value.value
+
+            # Call function on cache miss
+            if single_flight:
+                return await _single_flight.do(cache_key, compute)
+            return await compute()
+
         return wrapper
-    
-=======
 
-                # Cache result
-                await cache.set(cache_key, result, ttl)
+    return decorator
+
 
-                return result
+def cacheable_batch(key_pattern: str, ttl: Optional[int] = None):
+    """
+    Decorator for caching per-item results of functions that take a list of IDs.
+
+    The decorated function must take the list of IDs as its first argument
+    (after self) and return a mapping of ID to result. Cached items are read
+    with one get_many() call, only the missing IDs are passed to the function,
+    and its results are written back with one set_many() call.
+
+    Args:
+        key_pattern: Pattern for each item's cache key, using {id} for the
+                    item ID; arguments after the ID list are available as
+                    {0}, {1}, etc. and keyword arguments as {arg_name}
+        ttl: Time-to-live in seconds (uses default if None)
+
+    Returns:
+        Decorated function with per-item caching
+    """
+
+    def decorator(func):
+        offset = _self_offset(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Get cache service
+            cache = CacheService.get_instance()
+
+            ids = list(args[offset]) if len(args) > offset else []
 
+            # Skip if cache is disabled or there is nothing to look up
+            if not cache.backend or not ids:
+                return await _call_function(func, args, kwargs)
+
+            other_args = args[offset + 1 :]
+            try:
+                keys = {
+                    item_id: _qualify_cache_key(
+                        func, key_pattern.format(*other_args, id=item_id, **kwargs)
+                    )
+                    for item_id in ids
+                }
+                cached = await cache.get_many(list(keys.values()))
             except Exception as e:
                 logger.warning(
                     f"Error in cache logic: {e}, falling back to uncached function"
                 )
-                # Fall back to uncached function call
-                return (
-                    await func(*args, **kwargs)
-                    if asyncio.iscoroutinefunction(func)
-                    else func(*args, **kwargs)
+                return await _call_function(func, args, kwargs)
+
+            results = {
+                item_id: cached[key] for item_id, key in keys.items() if key in cached
+            }
+
+            missing = [item_id for item_id in keys if item_id not in results]
+            if missing:
+                call_args = args[:offset] + (missing,) + other_args
+                fetched = await _call_function(func, call_args, kwargs) or {}
+                await cache.set_many(
+                    {
+                        keys[item_id]: value
+                        for item_id, value in fetched.items()
+                        if item_id in keys and value is not None
+                    },
+                    ttl,
                 )
+                results.update(fetched)
+
+            return {item_id: results[item_id] for item_id in keys if item_id in results}
 
         return wrapper
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     return decorator
@@ -8,71 +8,57 @@ experience for each user.
 """
 
 import asyncio
-import logging
-<<<<<<< HEAD
+import functools
 import json
-import uuid
+import logging
+import os
+import pickle
+import tempfile
 import time
-from typing import Any, Callable, Dict, List, Optional, Set, Union, Awaitable
-from datetime import datetime, timezone
-from enum import Enum
-=======
 import uuid
+from collections import deque
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Union
-import functools
+from itertools import islice
+from typing import (Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set,
+                    Tuple, Union)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 from pydantic import BaseModel, Field, validator
 
+from forest_app.core.event_log import EventLog, LogRecord
+from forest_app.core.event_transport import EventTransport, InProcessTransport
+
 logger = logging.getLogger(__name__)
 
-<<<<<<< HEAD
-class EventType(str, Enum):
-    """Core event types in the system."""
-=======
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
 
 class EventType(str, Enum):
     """Core event types in the system."""
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     # Journey events
     TASK_COMPLETED = "task.completed"
     TASK_UPDATED = "task.updated"
     TREE_EVOLVED = "tree.evolved"
     MILESTONE_REACHED = "journey.milestone"
-<<<<<<< HEAD
-    
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     # Emotional/reflection events
     REFLECTION_ADDED = "reflection.added"
     MOOD_RECORDED = "mood.recorded"
     INSIGHT_DISCOVERED = "insight.discovered"
-<<<<<<< HEAD
-    
-    # Memory events
-    MEMORY_STORED = "memory.stored"
-    MEMORY_RECALLED = "memory.recalled"
-    
-=======
 
     # Memory events
     MEMORY_STORED = "memory.stored"
     MEMORY_RECALLED = "memory.recalled"
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     # User events
     USER_ONBOARDED = "user.onboarded"
     USER_RETURNED = "user.returned"
     USER_GOAL_UPDATED = "user.goal_updated"
-<<<<<<< HEAD
-    
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     # System events
     LLM_CALL_SUCCEEDED = "system.llm_succeeded"
     LLM_CALL_FAILED = "system.llm_failed"
@@ -80,17 +66,6 @@ class EventType(str, Enum):
     SYSTEM_ERROR = "system.error"
     METRICS_RECORDED = "system.metrics"
 
-<<<<<<< HEAD
-class EventData(BaseModel):
-    """Base model for event data payload."""
-    event_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    event_type: EventType
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    user_id: Optional[str] = None
-    payload: Dict[str, Any] = Field(default_factory=dict)
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-    
-=======
 
 class EventData(BaseModel):
     """Base model for event data payload."""
@@ -104,23 +79,15 @@ class EventData(BaseModel):
     payload: Dict[str, Any] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     class Config:
         extra = "allow"
         json_encoders = {
             # Add custom encoders for non-JSON serializable types
             datetime: lambda dt: dt.isoformat(),
-<<<<<<< HEAD
-            uuid.UUID: lambda id: str(id)
-        }
-    
-    @validator('event_type', pre=True)
-=======
             uuid.UUID: lambda id: str(id),
         }
 
     @validator("event_type", pre=True, allow_reuse=True)
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     def validate_event_type(cls, v):
         """Validate and convert event_type."""
         if isinstance(v, EventType):
@@ -133,75 +100,628 @@ class EventData(BaseModel):
         # Allow custom event types
         return v
 
-<<<<<<< HEAD
-class EventBus:
+
+class DispatchMode(Enum):
+    """How published events reach subscribers."""
+
+    INLINE = "inline"  # publish awaits every subscriber before returning
+    QUEUED = "queued"  # publish enqueues; each subscriber drains its own queue
+
+
+class OverflowPolicy(Enum):
+    """What a full subscriber queue does with a new event (QUEUED mode)."""
+
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued event
+    BLOCK = "block"  # Make the publisher wait for space
+    SPILL = "spill"  # Write overflow to a temporary file, replayed in order
+
+
+class EventBusConfig:
+    """Configuration for the event bus."""
+
+    def __init__(
+        self,
+        dispatch_mode: DispatchMode = DispatchMode.INLINE,
+        max_queue_size: int = 1000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        spill_dir: Optional[str] = None,
+        max_history_size: int = 1000,
+        event_log: Optional[EventLog] = None,
+        durable_batch_size: int = 100,
+        max_delivery_attempts: int = 5,
+        retry_base_delay: float = 0.5,
+        transport: Optional[EventTransport] = None,
+        prune_interval: Optional[float] = 60.0,
+        max_log_lag: Optional[int] = 100000,
+    ):
+        """
+        Initialize event bus configuration.
+
+        Args:
+            dispatch_mode: Default dispatch mode for subscribers
+            max_queue_size: Default per-subscriber queue bound (QUEUED mode)
+            overflow_policy: Default overflow policy (QUEUED mode)
+            spill_dir: Directory for spill files (default: system temp dir)
+            max_history_size: Number of recent events kept for get_recent_events
+            event_log: Optional durable log; every published event is committed
+                to it before delivery, and subscribers given a durable_id are fed
+                from it with at-least-once delivery
+            durable_batch_size: Events read per batch by durable subscribers
+            max_delivery_attempts: Delivery attempts per event for durable
+                subscribers before it is skipped
+            retry_base_delay: Initial retry delay in seconds, doubled per attempt
+            transport: Transport delivering events to subscribers registered
+                with a durable_id, which names their group (default:
+                in-process). A distributed transport such as Redis Streams
+                reaches the group's subscribers in every worker process.
+            prune_interval: Seconds between event log prunes, None to never
+                prune automatically
+            max_log_lag: Events kept behind the log head for subscribers that
+                have fallen behind; older events are pruned even if an
+                abandoned or stuck durable_id has not handled them (None to
+                keep them until every subscriber has)
+        """
+        self.dispatch_mode = dispatch_mode
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.spill_dir = spill_dir
+        self.max_history_size = max_history_size
+        self.event_log = event_log
+        self.durable_batch_size = durable_batch_size
+        self.max_delivery_attempts = max_delivery_attempts
+        self.retry_base_delay = retry_base_delay
+        self.transport = transport or InProcessTransport()
+        self.prune_interval = prune_interval
+        self.max_log_lag = max_log_lag
+        if event_log is not None and self.transport.distributed:
+            raise ValueError(
+                "Use either an event log or a distributed transport, not both"
+            )
+
+
+class _DeliveryOptions(NamedTuple):
+    """Per-subscriber dispatch settings."""
+
+    dispatch_mode: DispatchMode
+    max_queue_size: int
+    overflow_policy: OverflowPolicy
+
+
+class _SubscriberQueue:
     """
-    Central event bus for publishing and subscribing to events.
-    
-=======
+    Bounded event queue drained by a dedicated task for one subscriber.
+
+    Queue items are (enqueued_at, event) pairs so that delivery lag can be
+    measured. Once anything has been spilled, new events are spilled too
+    until the spill file is drained, which keeps delivery in publish order.
+    """
+
+    def __init__(
+        self, callback: Callable, options: _DeliveryOptions, spill_dir: Optional[str]
+    ):
+        self.callback = callback
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.max_size = max(1, options.max_queue_size)
+        self.overflow_policy = options.overflow_policy
+        self.spill_dir = spill_dir
+
+        self.queue: Deque[Tuple[float, EventData]] = deque()
+        self.spill_file = None
+        self.spill_read_pos = 0
+        self.spilled_pending = 0
+
+        self.task: Optional[asyncio.Task] = None
+        self.has_items: Optional[asyncio.Event] = None
+        self.has_space: Optional[asyncio.Event] = None
+        self.idle: Optional[asyncio.Event] = None
+        self.in_flight = 0
+
+        self.metrics = {
+            "enqueued": 0,
+            "delivered": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "max_depth": 0,
+            "lag_seconds": 0.0,
+            "max_lag_seconds": 0.0,
+        }
+
+    @property
+    def depth(self) -> int:
+        """Events waiting for delivery, in memory and spilled."""
+        return len(self.queue) + self.spilled_pending
+
+    def ensure_worker(self, bus: "EventBus") -> None:
+        """Start (or restart, e.g. on a new event loop) the drain task."""
+        if self.task is not None and not self.task.done():
+            return
+        # Events bind to the running loop, so recreate them with the task
+        self.has_items = asyncio.Event()
+        self.has_space = asyncio.Event()
+        self.idle = asyncio.Event()
+        if self.depth:
+            self.has_items.set()
+        else:
+            self.idle.set()
+        if len(self.queue) < self.max_size:
+            self.has_space.set()
+        self.task = asyncio.create_task(self._drain(bus))
+
+    async def put(self, event: EventData) -> None:
+        """Enqueue an event, applying the overflow policy when full."""
+        item = (time.monotonic(), event)
+
+        if self.spilled_pending or len(self.queue) >= self.max_size:
+            if self.overflow_policy == OverflowPolicy.SPILL and self._spill(item):
+                self._mark_enqueued()
+                return
+            if self.overflow_policy == OverflowPolicy.BLOCK:
+                while len(self.queue) >= self.max_size:
+                    self.has_space.clear()
+                    await self.has_space.wait()
+            else:
+                # DROP_OLDEST, and SPILL when the event could not be spilled
+                while len(self.queue) >= self.max_size:
+                    self.queue.popleft()
+                    self.metrics["dropped"] += 1
+
+        self.queue.append(item)
+        self._mark_enqueued()
+
+    def _mark_enqueued(self) -> None:
+        self.metrics["enqueued"] += 1
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], self.depth)
+        self.idle.clear()
+        self.has_items.set()
+
+    def _spill(self, item: Tuple[float, EventData]) -> bool:
+        """Append an item to the spill file; returns False if it can't be."""
+        try:
+            if self.spill_file is None:
+                self.spill_file = tempfile.TemporaryFile(
+                    prefix="forest-events-", dir=self.spill_dir
+                )
+            self.spill_file.seek(0, os.SEEK_END)
+            pickle.dump(item, self.spill_file, pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not spill event for subscriber {self.name}: {e}")
+            return False
+        self.spilled_pending += 1
+        self.metrics["spilled"] += 1
+        return True
+
+    def _read_spilled(self) -> Tuple[float, EventData]:
+        """Pop the oldest spilled item, truncating the file once drained."""
+        self.spill_file.seek(self.spill_read_pos)
+        item = pickle.load(self.spill_file)
+        self.spill_read_pos = self.spill_file.tell()
+        self.spilled_pending -= 1
+        if not self.spilled_pending:
+            self.spill_file.seek(0)
+            self.spill_file.truncate()
+            self.spill_read_pos = 0
+        return item
+
+    def _next_item(self) -> Optional[Tuple[float, EventData]]:
+        if self.queue:
+            item = self.queue.popleft()
+            self.has_space.set()
+            return item
+        if self.spilled_pending:
+            return self._read_spilled()
+        return None
+
+    async def _drain(self, bus: "EventBus") -> None:
+        while True:
+            item = self._next_item()
+            if item is None:
+                self.has_items.clear()
+                if not self.in_flight:
+                    self.idle.set()
+                await self.has_items.wait()
+                continue
+
+            enqueued_at, event = item
+            lag = time.monotonic() - enqueued_at
+            self.metrics["lag_seconds"] = lag
+            self.metrics["max_lag_seconds"] = max(self.metrics["max_lag_seconds"], lag)
+
+            self.in_flight += 1
+            try:
+                delivered = await bus._deliver_event(self.callback, event)
+            finally:
+                self.in_flight -= 1
+            self.metrics["delivered" if delivered else "failed"] += 1
+
+    async def wait_idle(self) -> None:
+        """Wait until every enqueued event has been handled."""
+        if self.idle is not None:
+            await self.idle.wait()
+
+    def close(self) -> None:
+        """Stop the drain task and discard the spill file."""
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        self.task = None
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+            self.spill_read_pos = 0
+            self.spilled_pending = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "subscriber": self.name,
+            "overflow_policy": self.overflow_policy.value,
+            "max_queue_size": self.max_size,
+            "depth": self.depth,
+            "spilled_pending": self.spilled_pending,
+            **self.metrics,
+        }
+
+
+# Field order of the binary encoding; any extra fields follow as a dict
+_BINARY_FIELDS = (
+    "event_id",
+    "event_type",
+    "timestamp",
+    "user_id",
+    "payload",
+    "metadata",
+)
+_BINARY_MSGPACK = 1
+_BINARY_JSON = 2
+
+
+def _event_to_dict(event: EventData) -> Dict[str, Any]:
+    """JSON-compatible dict of an event's fields."""
+    if hasattr(event, "model_dump"):
+        return event.model_dump(mode="json")
+    return json.loads(event.json())
+
+
+def _encode_event_binary(event: EventData) -> bytes:
+    """
+    Compact encoding for transports: a positional msgpack array, with UUID
+    event ids packed as 16 raw bytes. Falls back to JSON without msgpack.
+    """
+    data = _event_to_dict(event)
+    values = [data.pop(field, None) for field in _BINARY_FIELDS]
+    values.append(data)  # Extra fields allowed by EventData.Config
+    if msgpack is None:
+        return bytes((_BINARY_JSON,)) + json.dumps(
+            values, separators=(",", ":")
+        ).encode("utf-8")
+    try:
+        values[0] = uuid.UUID(values[0]).bytes
+    except (TypeError, ValueError, AttributeError):
+        pass  # Non-UUID ids are sent as strings
+    return bytes((_BINARY_MSGPACK,)) + msgpack.packb(values, use_bin_type=True)
+
+
+def _decode_event_binary(data: bytes) -> EventData:
+    """Rebuild an event from _encode_event_binary output."""
+    if data[0] == _BINARY_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Event is msgpack-encoded but msgpack is not installed")
+        values = msgpack.unpackb(data[1:], raw=False)
+    elif data[0] == _BINARY_JSON:
+        values = json.loads(data[1:])
+    else:
+        raise ValueError(f"Unknown event encoding {data[0]}")
+
+    fields = dict(zip(_BINARY_FIELDS, values))
+    if isinstance(fields["event_id"], bytes):
+        fields["event_id"] = str(uuid.UUID(bytes=fields["event_id"]))
+    extras = values[len(_BINARY_FIELDS)] if len(values) > len(_BINARY_FIELDS) else {}
+    return EventData(**extras, **fields)
+
+
+def _serialize_event(event: EventData) -> str:
+    """Serialize an event for the durable log."""
+    if hasattr(event, "model_dump_json"):
+        return event.model_dump_json()
+    return event.json()
+
+
+def _deserialize_event(data: str) -> EventData:
+    """Rebuild an event read back from the durable log."""
+    if hasattr(EventData, "model_validate_json"):
+        return EventData.model_validate_json(data)
+    return EventData.parse_raw(data)
+
+
+class _DurableConsumer:
+    """
+    Feeds one durable subscriber from the event log.
+
+    The consumer reads events after its committed offset, delivers them in
+    order, and commits the offset once a batch has been handled. A consumer
+    of some event types commits the position it has scanned to, not just
+    its last matching event, so it does not hold back pruning. A crash
+    between delivery and commit redelivers the batch (at-least-once), so
+    durable subscribers should be idempotent. Failed deliveries are retried
+    with exponential backoff before the event is skipped.
+    """
+
+    def __init__(self, durable_id: str, callback: Callable, config: EventBusConfig):
+        self.durable_id = durable_id
+        self.callback = callback
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.event_log = config.event_log
+        self.batch_size = config.durable_batch_size
+        self.max_attempts = max(1, config.max_delivery_attempts)
+        self.retry_base_delay = config.retry_base_delay
+        # None means every event type ('*' subscription)
+        self.event_types: Optional[Set[str]] = set()
+
+        self.position = 0
+        self.task: Optional[asyncio.Task] = None
+        self.wakeup: Optional[asyncio.Event] = None
+        self.idle: Optional[asyncio.Event] = None
+
+        self.metrics = {"delivered": 0, "retries": 0, "failed": 0}
+
+    def wants(self, event_type: str) -> bool:
+        return self.event_types is None or event_type in self.event_types
+
+    def ensure_worker(self, bus: "EventBus") -> None:
+        """Start (or restart, e.g. on a new event loop) the consumer task."""
+        if self.task is not None and not self.task.done():
+            return
+        self.wakeup = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.wakeup.set()  # Catch up on anything already in the log
+        self.task = asyncio.create_task(self._consume(bus))
+
+    def notify(self) -> None:
+        """Signal that new events were committed to the log."""
+        if self.wakeup is not None:
+            self.idle.clear()
+            self.wakeup.set()
+
+    async def _consume(self, bus: "EventBus") -> None:
+        self.position = await self.event_log.get_offset(self.durable_id)
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            try:
+                # A filtered read that comes back short has scanned to the head
+                head = None
+                if self.event_types is not None:
+                    head = await self.event_log.head()
+                records = await self.event_log.read(
+                    self.position, self.event_types, self.batch_size
+                )
+            except Exception as e:
+                logger.error(f"Error reading event log for {self.durable_id}: {e}")
+                await asyncio.sleep(self.retry_base_delay)
+                self.wakeup.set()
+                continue
+            scanned = head if len(records) < self.batch_size else None
+
+            if not records:
+                if scanned is not None and scanned > self.position:
+                    self.position = scanned
+                    await self.event_log.commit_offset(self.durable_id, self.position)
+                if not self.wakeup.is_set():
+                    self.idle.set()
+                continue
+
+            events = self._decode(records)
+            if self.callback in bus.batch_subscribers:
+                if events:
+                    await self._deliver(bus, events)
+            else:
+                for event in events:
+                    await self._deliver(bus, [event])
+            self.position = max(records[-1].offset, scanned or 0)
+            await self.event_log.commit_offset(self.durable_id, self.position)
+            # There may be more than one batch waiting
+            self.wakeup.set()
+
+    def _decode(self, records: List[LogRecord]) -> List[EventData]:
+        events = []
+        for record in records:
+            try:
+                events.append(_deserialize_event(record.data))
+            except Exception as e:
+                logger.error(
+                    f"Skipping undecodable event at offset {record.offset}: {e}"
+                )
+                self.metrics["failed"] += 1
+        return events
+
+    async def _deliver(self, bus: "EventBus", events: List[EventData]) -> None:
+        """Deliver events (one call) with retries and exponential backoff."""
+        for attempt in range(self.max_attempts):
+            if await bus._deliver_events(self.callback, events):
+                self.metrics["delivered"] += len(events)
+                return
+            if attempt + 1 < self.max_attempts:
+                self.metrics["retries"] += 1
+                await asyncio.sleep(self.retry_base_delay * 2**attempt)
+
+        self.metrics["failed"] += len(events)
+        logger.error(
+            f"Giving up on {len(events)} event(s) starting at {events[0].event_id} "
+            f"for {self.durable_id} after {self.max_attempts} attempts"
+        )
+
+    async def wait_idle(self) -> None:
+        if self.idle is not None:
+            await self.idle.wait()
+
+    def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        self.task = None
+
+    def get_metrics(self, head: int) -> Dict[str, Any]:
+        return {
+            "durable_id": self.durable_id,
+            "subscriber": self.name,
+            "position": self.position,
+            "lag": max(0, head - self.position),
+            **self.metrics,
+        }
+
+
+def _event_type_key(event_type: Union[str, EventType]) -> str:
+    """Normalize an event type to its string value for lookups."""
+    # str() of a str-mixin Enum gives "EventType.X" on Python 3.11+
+    return event_type.value if isinstance(event_type, Enum) else str(event_type)
+
+
+class _EventHistory:
+    """
+    Fixed-capacity ring buffer of recent events with secondary indexes.
+
+    Events are indexed by event type, user ID and (event type, user ID), so
+    filtered lookups of the newest k events cost O(k). Each index deque is in
+    publish order, so evicting the oldest event only ever pops from the left
+    of the index deques it appears in.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.events: Deque[EventData] = deque()
+        self.by_type: Dict[str, Deque[EventData]] = {}
+        self.by_user: Dict[str, Deque[EventData]] = {}
+        self.by_type_user: Dict[Tuple[str, str], Deque[EventData]] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def append(self, event: EventData) -> None:
+        """Add an event, evicting the oldest one when at capacity."""
+        if len(self.events) >= self.capacity:
+            self._evict(self.events.popleft())
+        self.events.append(event)
+
+        event_type = _event_type_key(event.event_type)
+        self._index(self.by_type, event_type, event)
+        if event.user_id is not None:
+            self._index(self.by_user, event.user_id, event)
+            self._index(self.by_type_user, (event_type, event.user_id), event)
+
+    @staticmethod
+    def _index(index: Dict[Any, Deque[EventData]], key: Any, event: EventData) -> None:
+        entries = index.get(key)
+        if entries is None:
+            index[key] = entries = deque()
+        entries.append(event)
+
+    def _evict(self, event: EventData) -> None:
+        event_type = _event_type_key(event.event_type)
+        self._pop_oldest(self.by_type, event_type)
+        if event.user_id is not None:
+            self._pop_oldest(self.by_user, event.user_id)
+            self._pop_oldest(self.by_type_user, (event_type, event.user_id))
+
+    @staticmethod
+    def _pop_oldest(index: Dict[Any, Deque[EventData]], key: Any) -> None:
+        entries = index[key]
+        entries.popleft()
+        if not entries:
+            # Drop empty buckets so one-off users/types don't accumulate
+            del index[key]
+
+    def recent(
+        self,
+        event_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[EventData]:
+        """Return up to ``limit`` matching events, newest first."""
+        if event_type and user_id:
+            entries = self.by_type_user.get((event_type, user_id), ())
+        elif event_type:
+            entries = self.by_type.get(event_type, ())
+        elif user_id:
+            entries = self.by_user.get(user_id, ())
+        else:
+            entries = self.events
+        return list(islice(reversed(entries), max(0, limit)))
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.by_type.clear()
+        self.by_user.clear()
+        self.by_type_user.clear()
+
 
 class EventBus:
     """
     Central event bus for publishing and subscribing to events.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     The EventBus enables loose coupling between components by allowing them to
     communicate through events rather than direct method calls. This improves
     modularity, testability, and allows for features like event replay.
+
+    In INLINE dispatch mode publish awaits every subscriber. In QUEUED mode
+    publish only enqueues the event; each subscriber drains its own bounded
+    queue in a dedicated task, so a slow subscriber never adds to the
+    publisher's latency.
+
+    With an event log configured, every event is committed to the log before
+    delivery. Subscribers registered with a durable_id are then fed from the
+    log rather than by publish, keep a committed offset, and catch up on
+    missed events after a restart.
     """
-<<<<<<< HEAD
-    
-    _instance = None
-    
-    @classmethod
-    def get_instance(cls) -> 'EventBus':
-=======
 
     _instance = None
 
     @classmethod
-    def get_instance(cls) -> "EventBus":
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+    def get_instance(cls, config: Optional[EventBusConfig] = None) -> "EventBus":
         """Get the singleton instance of the EventBus."""
         if cls._instance is None:
-            cls._instance = EventBus()
+            cls._instance = EventBus(config)
+        elif config is not None:
+            logger.warning("EventBus already initialized, ignoring new config")
         return cls._instance
-<<<<<<< HEAD
-    
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-    def __init__(self):
-        """Initialize the event bus."""
+    def __init__(self, config: Optional[EventBusConfig] = None):
+        """
+        Initialize the event bus.
+
+        Args:
+            config: Event bus configuration (default: inline dispatch)
+        """
+        self.config = config or EventBusConfig()
         # Maps event types to sets of subscribers
         self.subscribers: Dict[str, Set[Callable]] = {}
         # Maps subscriptions to specific event types
         self.subscriber_events: Dict[Callable, Set[str]] = {}
-        # For reliable event delivery
-        self.event_history: List[EventData] = []
-        self.max_history_size = 1000  # Limit history to avoid memory issues
+        # Dispatch settings and queues for each subscriber
+        self.subscriber_options: Dict[Callable, _DeliveryOptions] = {}
+        self.subscriber_queues: Dict[Callable, _SubscriberQueue] = {}
+        # Durable subscribers (event log configured), keyed by durable_id
+        self.durable_consumers: Dict[str, _DurableConsumer] = {}
+        self.durable_ids: Dict[Callable, str] = {}
+        # Subscribers that take a list of events per call
+        self.batch_subscribers: Set[Callable] = set()
+        # Subscribers delivered through the transport, keyed to their group
+        self.transport = self.config.transport
+        self.group_ids: Dict[Callable, str] = {}
+        self.transport_started = False
+        self.log_head = 0
+        self.prune_task: Optional[asyncio.Task] = None
+        # Recent events, bounded to avoid memory issues
+        self.event_history = _EventHistory(self.config.max_history_size)
         self.lock = asyncio.Lock()
-<<<<<<< HEAD
-        
+
         # Metrics
         self.metrics = {
             "events_published": 0,
-            "events_delivered": 0
+            "events_delivered": 0,
+            "batches_published": 0,
+            "events_pruned": 0,
         }
-        
-        logger.info("EventBus initialized")
-    
-    async def publish(self, event: Union[EventData, Dict[str, Any]]) -> str:
-        """
-        Publish an event to all subscribers.
-        
-        Args:
-            event: The event to publish (EventData or dict that can be converted)
-            
-=======
-
-        # Metrics
-        self.metrics = {"events_published": 0, "events_delivered": 0}
 
         logger.info("EventBus initialized")
 
@@ -212,125 +732,375 @@ class EventBus:
         Args:
             event: The event to publish (EventData or dict that can be converted)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             The event ID
         """
         # Convert dict to EventData if needed
         if isinstance(event, dict):
             event = EventData(**event)
-<<<<<<< HEAD
-        
-        # Ensure event_id is set
-        if not event.event_id:
-            event.event_id = str(uuid.uuid4())
-            
-        # Get event type as string for subscriber lookup
-        event_type = str(event.event_type)
-        
-=======
 
         # Ensure event_id is set
         if not event.event_id:
             event.event_id = str(uuid.uuid4())
 
         # Get event type as string for subscriber lookup
-        event_type = str(event.event_type)
+        event_type = _event_type_key(event.event_type)
+
+        # Commit to the durable log before anything is delivered
+        if self.config.event_log is not None:
+            await self._append_to_log(event, event_type)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # Store event in history
         async with self.lock:
             self.event_history.append(event)
-            # Trim history if needed
-            if len(self.event_history) > self.max_history_size:
-<<<<<<< HEAD
-                self.event_history = self.event_history[-self.max_history_size:]
-            self.metrics["events_published"] += 1
-        
-=======
-                self.event_history = self.event_history[-self.max_history_size :]
             self.metrics["events_published"] += 1
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # Get subscribers for this event type
-        specific_subscribers = self.subscribers.get(event_type, set())
-        wildcard_subscribers = self.subscribers.get("*", set())
-        all_subscribers = specific_subscribers.union(wildcard_subscribers)
-<<<<<<< HEAD
-        
+        all_subscribers = self._subscribers_for(event_type)
+
         # Notify subscribers
         delivery_tasks = []
-        
+
         for subscriber in all_subscribers:
-            # Create task for each subscriber to avoid one blocking others
-            delivery_tasks.append(self._deliver_event(subscriber, event))
-        
+            if subscriber in self.durable_ids or subscriber in self.group_ids:
+                # Fed from the event log or the transport instead
+                continue
+            options = self.subscriber_options.get(subscriber)
+            if options is not None and options.dispatch_mode == DispatchMode.QUEUED:
+                # Hand off to the subscriber's own queue and drain task
+                await self._get_subscriber_queue(subscriber, options).put(event)
+            else:
+                # Create task for each subscriber to avoid one blocking others
+                delivery_tasks.append(self._deliver_event(subscriber, event))
+
+        if self._uses_transport():
+            delivery_tasks.append(self._send_to_transport([(event_type, event)]))
+
         # Wait for all deliveries to complete
         if delivery_tasks:
             await asyncio.gather(*delivery_tasks, return_exceptions=True)
-        
-        logger.debug(f"Published event {event.event_id} of type {event_type} to {len(all_subscribers)} subscribers")
-        
+
+        logger.debug(
+            f"Published event {event.event_id} of type {event_type} to {len(all_subscribers)} subscribers"
+        )
+
         return event.event_id
-    
-    async def _deliver_event(self, subscriber: Callable, event: EventData) -> None:
+
+    async def publish_batch(
+        self, events: List[Union[EventData, Dict[str, Any]]]
+    ) -> List[str]:
         """
-        Deliver an event to a subscriber with error handling.
-        
-=======
+        Publish several events through one pass of the pipeline.
 
-        # Notify subscribers
-        delivery_tasks = []
+        Events are validated up front, committed to the event log together,
+        added to the history under a single lock acquisition, and grouped per
+        subscriber. Batch subscribers receive one list-of-events call; other
+        subscribers receive the events one at a time, in order.
 
-        for subscriber in all_subscribers:
-            # Create task for each subscriber to avoid one blocking others
-            delivery_tasks.append(self._deliver_event(subscriber, event))
+        Args:
+            events: Events to publish (EventData or dicts that can be converted)
+
+        Returns:
+            The event IDs, in publish order
+
+        Raises:
+            ValidationError: If any event dict is invalid (nothing is published)
+        """
+        batch = [
+            event if isinstance(event, EventData) else EventData(**event)
+            for event in events
+        ]
+        if not batch:
+            return []
+
+        typed = []
+        for event in batch:
+            if not event.event_id:
+                event.event_id = str(uuid.uuid4())
+            typed.append((_event_type_key(event.event_type), event))
+
+        # Concurrent appends share group commits in the event log
+        if self.config.event_log is not None:
+            await asyncio.gather(
+                *(self._append_to_log(event, event_type) for event_type, event in typed)
+            )
+
+        async with self.lock:
+            for _, event in typed:
+                self.event_history.append(event)
+            self.metrics["events_published"] += len(batch)
+            self.metrics["batches_published"] += 1
+
+        # Look up subscribers once per event type, then group per subscriber
+        subscribers_by_type: Dict[str, Set[Callable]] = {}
+        events_by_subscriber: Dict[Callable, List[EventData]] = {}
+        for event_type, event in typed:
+            subscribers = subscribers_by_type.get(event_type)
+            if subscribers is None:
+                subscribers = self._subscribers_for(event_type)
+                subscribers_by_type[event_type] = subscribers
+            for subscriber in subscribers:
+                events_by_subscriber.setdefault(subscriber, []).append(event)
+
+        delivery_tasks = []
+        if self._uses_transport():
+            delivery_tasks.append(self._send_to_transport(typed))
+        for subscriber, subscriber_events in events_by_subscriber.items():
+            if subscriber in self.durable_ids or subscriber in self.group_ids:
+                continue
+            options = self.subscriber_options.get(subscriber)
+            if options is not None and options.dispatch_mode == DispatchMode.QUEUED:
+                queue = self._get_subscriber_queue(subscriber, options)
+                for event in subscriber_events:
+                    await queue.put(event)
+            else:
+                delivery_tasks.append(
+                    self._deliver_events(subscriber, subscriber_events)
+                )
 
-        # Wait for all deliveries to complete
         if delivery_tasks:
             await asyncio.gather(*delivery_tasks, return_exceptions=True)
 
         logger.debug(
-            f"Published event {event.event_id} of type {event_type} to {len(all_subscribers)} subscribers"
+            f"Published batch of {len(batch)} events to "
+            f"{len(events_by_subscriber)} subscribers"
         )
 
-        return event.event_id
+        return [event.event_id for event in batch]
 
-    async def _deliver_event(self, subscriber: Callable, event: EventData) -> None:
+    def _uses_transport(self) -> bool:
+        """Whether published events need to go through the transport."""
+        return self.transport.distributed or bool(self.group_ids)
+
+    async def _send_to_transport(
+        self, typed_events: List[Tuple[str, EventData]]
+    ) -> None:
+        """Send events to the transport, encoding them if it is distributed."""
+        await self._ensure_transport_started()
+        try:
+            if self.transport.distributed:
+                await self.transport.send_many(
+                    [
+                        (event_type, _encode_event_binary(event))
+                        for event_type, event in typed_events
+                    ]
+                )
+            else:
+                await self.transport.send_many(typed_events)
+        except Exception as e:
+            logger.error(
+                f"Error sending {len(typed_events)} event(s) to transport: {e}"
+            )
+
+    async def _ensure_transport_started(self) -> None:
+        if not self.transport_started:
+            self.transport_started = True
+            await self.transport.start()
+
+    def _subscribers_for(self, event_type: str) -> Set[Callable]:
+        """Get the subscribers for an event type, including wildcard ones."""
+        specific_subscribers = self.subscribers.get(event_type, set())
+        wildcard_subscribers = self.subscribers.get("*", set())
+        return specific_subscribers.union(wildcard_subscribers)
+
+    async def _deliver_event(self, subscriber: Callable, event: EventData) -> bool:
         """
         Deliver an event to a subscriber with error handling.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             subscriber: The subscriber callback
             event: The event to deliver
+
+        Returns:
+            True if the subscriber handled the event without raising
         """
+        if subscriber in self.batch_subscribers:
+            return await self._deliver_events(subscriber, [event])
         try:
             if asyncio.iscoroutinefunction(subscriber):
                 await subscriber(event)
             else:
                 subscriber(event)
-            async with self.lock:
-                self.metrics["events_delivered"] += 1
+            # No await between read and write, so no lock is needed
+            self.metrics["events_delivered"] += 1
+            return True
         except Exception as e:
             logger.error(f"Error delivering event {event.event_id} to subscriber: {e}")
-<<<<<<< HEAD
-    
-    def subscribe(self, event_type: Union[str, EventType, List[Union[str, EventType]]], 
-                 callback: Callable[[EventData], Any]) -> Callable:
+            return False
+
+    async def _deliver_events(
+        self, subscriber: Callable, events: List[EventData]
+    ) -> bool:
         """
-        Subscribe to events of a specific type.
-        
+        Deliver several events to a subscriber.
+
+        Batch subscribers get a single call with the whole list; others get
+        one call per event.
+
         Args:
-            event_type: Event type(s) to subscribe to ('*' for all events)
-            callback: Function to call when event occurs
-            
-=======
+            subscriber: The subscriber callback
+            events: The events to deliver, in publish order
+
+        Returns:
+            True if every event was handled without raising
+        """
+        if subscriber not in self.batch_subscribers:
+            results = [await self._deliver_event(subscriber, event) for event in events]
+            return all(results)
+        try:
+            if asyncio.iscoroutinefunction(subscriber):
+                await subscriber(events)
+            else:
+                subscriber(events)
+            self.metrics["events_delivered"] += len(events)
+            return True
+        except Exception as e:
+            logger.error(
+                f"Error delivering batch of {len(events)} events to subscriber: {e}"
+            )
+            return False
+
+    async def _append_to_log(self, event: EventData, event_type: str) -> None:
+        """Commit an event to the durable log and wake matching consumers."""
+        try:
+            offset = await self.config.event_log.append(
+                event.event_id, event_type, event.user_id, _serialize_event(event)
+            )
+        except Exception as e:
+            # Publishing still succeeds; durable subscribers miss this event
+            logger.error(f"Error appending event {event.event_id} to event log: {e}")
+            return
+
+        self.log_head = max(self.log_head, offset)
+        self._ensure_pruning()
+        for consumer in self.durable_consumers.values():
+            if consumer.wants(event_type):
+                consumer.ensure_worker(self)
+                consumer.notify()
+
+    def _ensure_pruning(self) -> None:
+        """Start the periodic event log prune on first use inside an event loop."""
+        if self.config.prune_interval is None:
+            return
+        if self.prune_task is None or self.prune_task.done():
+            self.prune_task = asyncio.create_task(self._prune_periodically())
+
+    async def _prune_periodically(self) -> None:
+        """Background task deleting handled (or abandoned) events from the log."""
+        while True:
+            await asyncio.sleep(self.config.prune_interval)
+            try:
+                await self.prune_log()
+            except Exception as e:
+                logger.error(f"Error pruning event log: {e}")
+
+    async def prune_log(self, timeout: Optional[float] = 10.0) -> int:
+        """
+        Delete events from the event log that are no longer needed.
+
+        Consumers filtering by event type are first woken so they commit how
+        far they have scanned. Events behind every committed offset are then
+        deleted, along with events more than max_log_lag behind the head.
+
+        Args:
+            timeout: Maximum seconds to wait for woken consumers to catch up
+
+        Returns:
+            Number of events deleted
+        """
+        if self.config.event_log is None:
+            return 0
+        self.log_head = max(self.log_head, await self.config.event_log.head())
+        for consumer in self.durable_consumers.values():
+            if consumer.position < self.log_head:
+                consumer.ensure_worker(self)
+                consumer.notify()
+        await self.drain(timeout=timeout)
+
+        deleted = await self.config.event_log.prune(self.config.max_log_lag)
+        self.metrics["events_pruned"] += deleted
+        if deleted:
+            logger.debug(f"Pruned {deleted} events from the event log")
+        return deleted
+
+    async def start(self) -> None:
+        """
+        Start durable subscribers and the transport's consumers.
+
+        Durable subscribers replay events missed while down. Both also start
+        on the first publish; call this at startup so a worker receives
+        events (and catches up) without publishing first.
+        """
+        if self.config.event_log is not None:
+            self.log_head = await self.config.event_log.head()
+            self._ensure_pruning()
+        for consumer in self.durable_consumers.values():
+            consumer.ensure_worker(self)
+        await self._ensure_transport_started()
+
+    def _get_subscriber_queue(
+        self, subscriber: Callable, options: _DeliveryOptions
+    ) -> _SubscriberQueue:
+        """Get the subscriber's queue, starting its drain task if needed."""
+        queue = self.subscriber_queues.get(subscriber)
+        if queue is None:
+            queue = _SubscriberQueue(subscriber, options, self.config.spill_dir)
+            self.subscriber_queues[subscriber] = queue
+        queue.ensure_worker(self)
+        return queue
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued or logged event has been delivered.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            True if all subscriber queues drained within the timeout
+        """
+        waits = [queue.wait_idle() for queue in self.subscriber_queues.values()]
+        waits.extend(
+            consumer.wait_idle() for consumer in self.durable_consumers.values()
+        )
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        """
+        Stop all subscriber drain tasks, discarding undelivered queued events.
+
+        Events not yet handled by durable subscribers stay in the event log
+        and are redelivered on the next start. The event log itself is left
+        open for its owner to close.
+        """
+        queues = list(self.subscriber_queues.values())
+        self.subscriber_queues.clear()
+        for queue in queues:
+            queue.close()
+        for consumer in self.durable_consumers.values():
+            consumer.close()
+        if self.prune_task is not None:
+            self.prune_task.cancel()
+            self.prune_task = None
+        if self.transport_started:
+            self.transport_started = False
+            await self.transport.close()
 
     def subscribe(
         self,
         event_type: Union[str, EventType, List[Union[str, EventType]]],
         callback: Callable[[EventData], Any],
+        dispatch_mode: Optional[DispatchMode] = None,
+        max_queue_size: Optional[int] = None,
+        overflow_policy: Optional[OverflowPolicy] = None,
+        durable_id: Optional[str] = None,
+        batch: bool = False,
     ) -> Callable:
         """
         Subscribe to events of a specific type.
@@ -338,8 +1108,17 @@ class EventBus:
         Args:
             event_type: Event type(s) to subscribe to ('*' for all events)
             callback: Function to call when event occurs
+            dispatch_mode: Override the bus's default dispatch mode
+            max_queue_size: Override the default queue bound (QUEUED mode)
+            overflow_policy: Override the default overflow policy (QUEUED mode)
+            durable_id: Stable subscriber name, the same in every process. With
+                an event log it keys the subscriber's offset and events come
+                from the log (at-least-once); otherwise it names the
+                subscriber's transport group, which gets each event in one
+                process (at-least-once, redeliveries of handled events skipped)
+            batch: Call the callback with a list of events; publish_batch
+                delivers all matching events in one call, publish a list of one
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Unsubscribe function
         """
@@ -348,46 +1127,35 @@ class EventBus:
             event_types = [event_type]
         else:
             event_types = event_type
-<<<<<<< HEAD
-        
-        # Convert EventType enums to strings
-        event_types = [str(et) for et in event_types]
-        
-=======
 
         # Convert EventType enums to strings
-        event_types = [str(et) for et in event_types]
+        event_types = [_event_type_key(et) for et in event_types]
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # Add subscriber to each event type
         for et in event_types:
             if et not in self.subscribers:
                 self.subscribers[et] = set()
             self.subscribers[et].add(callback)
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             # Track events for this subscriber
             if callback not in self.subscriber_events:
                 self.subscriber_events[callback] = set()
             self.subscriber_events[callback].add(et)
-<<<<<<< HEAD
-        
-        # Create unsubscribe function
-        def unsubscribe():
-            self.unsubscribe(callback)
-        
-        logger.debug(f"Subscribed to event types: {event_types}")
-        
-        return unsubscribe
-    
-    def unsubscribe(self, callback: Callable) -> None:
-        """
-        Unsubscribe a callback from all events.
-        
-=======
+
+        # Later subscriptions of the same callback replace its settings
+        self.subscriber_options[callback] = _DeliveryOptions(
+            dispatch_mode=dispatch_mode or self.config.dispatch_mode,
+            max_queue_size=max_queue_size or self.config.max_queue_size,
+            overflow_policy=overflow_policy or self.config.overflow_policy,
+        )
+
+        if batch:
+            self.batch_subscribers.add(callback)
+        if durable_id is not None:
+            if self.config.event_log is not None:
+                self._register_durable(durable_id, callback)
+            else:
+                self._register_group(durable_id, callback)
 
         # Create unsubscribe function
         def unsubscribe():
@@ -397,21 +1165,57 @@ class EventBus:
 
         return unsubscribe
 
+    def _register_durable(self, durable_id: str, callback: Callable) -> None:
+        """Feed a subscriber from the event log under a durable ID."""
+        consumer = self.durable_consumers.get(durable_id)
+        if consumer is None or consumer.callback is not callback:
+            if consumer is not None:
+                consumer.close()
+                self.durable_ids.pop(consumer.callback, None)
+            consumer = _DurableConsumer(durable_id, callback, self.config)
+            self.durable_consumers[durable_id] = consumer
+        self.durable_ids[callback] = durable_id
+
+        event_types = self.subscriber_events[callback]
+        consumer.event_types = None if "*" in event_types else set(event_types)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Started by start() or the first publish instead
+        consumer.ensure_worker(self)
+
+    def _register_group(self, group: str, callback: Callable) -> None:
+        """Deliver a subscriber's events through the transport as a group."""
+        for other, other_group in list(self.group_ids.items()):
+            if other_group == group and other is not callback:
+                del self.group_ids[other]
+        self.group_ids[callback] = group
+
+        async def handle(message: Any) -> bool:
+            if isinstance(message, (bytes, bytearray)):
+                try:
+                    message = _decode_event_binary(message)
+                except Exception as e:
+                    logger.error(f"Dropping undecodable event for group {group}: {e}")
+                    return True
+            return await self._deliver_event(callback, message)
+
+        event_types = self.subscriber_events[callback]
+        self.transport.register(
+            group, None if "*" in event_types else set(event_types), handle
+        )
+
     def unsubscribe(self, callback: Callable) -> None:
         """
         Unsubscribe a callback from all events.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             callback: The callback to unsubscribe
         """
         # Get list of event types this callback is subscribed to
         event_types = self.subscriber_events.get(callback, set())
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # Remove callback from each event type
         for event_type in event_types:
             if event_type in self.subscribers:
@@ -419,23 +1223,21 @@ class EventBus:
                 # Remove event type entry if no subscribers left
                 if not self.subscribers[event_type]:
                     del self.subscribers[event_type]
-<<<<<<< HEAD
-        
-        # Remove callback from tracking
-        if callback in self.subscriber_events:
-            del self.subscriber_events[callback]
-        
-        logger.debug(f"Unsubscribed from event types: {event_types}")
-    
-    def get_metrics(self) -> Dict[str, Any]:
-        """
-        Get metrics about the event bus.
-        
-=======
 
         # Remove callback from tracking
         if callback in self.subscriber_events:
             del self.subscriber_events[callback]
+        self.subscriber_options.pop(callback, None)
+        self.batch_subscribers.discard(callback)
+        queue = self.subscriber_queues.pop(callback, None)
+        if queue is not None:
+            queue.close()
+        durable_id = self.durable_ids.pop(callback, None)
+        if durable_id is not None:
+            self.durable_consumers.pop(durable_id).close()
+        group = self.group_ids.pop(callback, None)
+        if group is not None:
+            self.transport.unregister(group)
 
         logger.debug(f"Unsubscribed from event types: {event_types}")
 
@@ -443,7 +1245,6 @@ class EventBus:
         """
         Get metrics about the event bus.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Dictionary with metrics
         """
@@ -451,21 +1252,28 @@ class EventBus:
             "subscribers_count": sum(len(subs) for subs in self.subscribers.values()),
             "event_types_count": len(self.subscribers),
             "history_size": len(self.event_history),
-<<<<<<< HEAD
-            **self.metrics
-        }
-    
-    def get_recent_events(self, 
-                         event_type: Optional[Union[str, EventType]] = None,
-                         user_id: Optional[str] = None,
-                         limit: int = 50) -> List[EventData]:
-        """
-        Get recent events, optionally filtered.
-        
-=======
             **self.metrics,
+            "subscriber_queues": self.get_subscriber_metrics(),
+            "durable_consumers": [
+                consumer.get_metrics(self.log_head)
+                for consumer in self.durable_consumers.values()
+            ],
+            "transport_groups": (
+                self.transport.get_stats()
+                if hasattr(self.transport, "get_stats")
+                else {}
+            ),
         }
 
+    def get_subscriber_metrics(self) -> List[Dict[str, Any]]:
+        """
+        Get per-subscriber queue metrics (QUEUED mode).
+
+        Returns:
+            List of dicts with queue depth, drop/spill counts and delivery lag
+        """
+        return [queue.get_metrics() for queue in self.subscriber_queues.values()]
+
     def get_recent_events(
         self,
         event_type: Optional[Union[str, EventType]] = None,
@@ -475,64 +1283,26 @@ class EventBus:
         """
         Get recent events, optionally filtered.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             event_type: Optional filter by event type
             user_id: Optional filter by user ID
             limit: Maximum number of events to return
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             List of events, newest first
         """
         # Convert event_type to string if it's an EventType
-        if isinstance(event_type, EventType):
-            event_type = str(event_type)
-<<<<<<< HEAD
-        
-        # Start with full history, newest first
-        events = list(reversed(self.event_history))
-        
-=======
-
-        # Start with full history, newest first
-        events = list(reversed(self.event_history))
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        # Apply filters
         if event_type:
-            events = [e for e in events if str(e.event_type) == event_type]
-        if user_id:
-            events = [e for e in events if e.user_id == user_id]
-<<<<<<< HEAD
-        
-=======
+            event_type = _event_type_key(event_type)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        # Apply limit
-        return events[:limit]
+        # Indexed lookup, cost proportional to the number of results
+        return self.event_history.recent(event_type, user_id, limit)
 
 
 # Create a decorator for event publishing
 def publish_event(event_type: Union[str, EventType], include_result: bool = False):
     """
     Decorator for publishing events before or after function execution.
-<<<<<<< HEAD
-    
-    Args:
-        event_type: Type of event to publish
-        include_result: Whether to include function result in event payload
-        
-    Returns:
-        Decorated function
-    """
-    def decorator(func):
-        if asyncio.iscoroutinefunction(func):
-            @asyncio.wraps(func)
-=======
 
     Args:
         event_type: Type of event to publish
@@ -546,48 +1316,22 @@ def publish_event(event_type: Union[str, EventType], include_result: bool = Fals
         if asyncio.iscoroutinefunction(func):
 
             @functools.wraps(func)
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             async def async_wrapper(*args, **kwargs):
                 # Extract user_id from args or kwargs if possible
                 user_id = None
                 for arg in args:
-<<<<<<< HEAD
-                    if hasattr(arg, 'user_id'):
-                        user_id = arg.user_id
-                        break
-                if not user_id and 'user_id' in kwargs:
-                    user_id = kwargs['user_id']
-                
-=======
                     if hasattr(arg, "user_id"):
                         user_id = arg.user_id
                         break
                 if not user_id and "user_id" in kwargs:
                     user_id = kwargs["user_id"]
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 # Create event bus event
                 event_data = {
                     "event_type": event_type,
                     "user_id": user_id,
                     "payload": {
                         "function": func.__name__,
-<<<<<<< HEAD
-                        "args_summary": f"{len(args)} positional, {len(kwargs)} keyword args"
-                    },
-                    "metadata": {
-                        "source": f"{func.__module__}.{func.__name__}"
-                    }
-                }
-                
-                # Get event bus
-                event_bus = EventBus.get_instance()
-                
-                try:
-                    # Execute function
-                    result = await func(*args, **kwargs)
-                    
-=======
                         "args_summary": f"{len(args)} positional, {len(kwargs)} keyword args",
                     },
                     "metadata": {"source": f"{func.__module__}.{func.__name__}"},
@@ -600,22 +1344,14 @@ def publish_event(event_type: Union[str, EventType], include_result: bool = Fals
                     # Execute function
                     result = await func(*args, **kwargs)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                     # Include result in payload if requested
                     if include_result:
                         # Try to convert result to JSON-serializable form
                         try:
-<<<<<<< HEAD
-                            if hasattr(result, 'dict'):
-                                # Pydantic model or similar
-                                result_dict = result.dict()
-                            elif hasattr(result, 'to_dict'):
-=======
                             if hasattr(result, "dict"):
                                 # Pydantic model or similar
                                 result_dict = result.dict()
                             elif hasattr(result, "to_dict"):
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                                 # Object with to_dict method
                                 result_dict = result.to_dict()
                             elif isinstance(result, dict):
@@ -624,26 +1360,11 @@ def publish_event(event_type: Union[str, EventType], include_result: bool = Fals
                             else:
                                 # Try to convert to string
                                 result_dict = {"value": str(result)}
-<<<<<<< HEAD
-                                
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                             event_data["payload"]["result"] = result_dict
                         except Exception as e:
                             logger.debug(f"Could not include result in event: {e}")
                             event_data["payload"]["result_included"] = False
-<<<<<<< HEAD
-                    
-                    # Add success status
-                    event_data["payload"]["success"] = True
-                    
-                    # Publish event
-                    await event_bus.publish(event_data)
-                    
-                    return result
-                    
-=======
 
                     # Add success status
                     event_data["payload"]["success"] = True
@@ -653,20 +1374,11 @@ def publish_event(event_type: Union[str, EventType], include_result: bool = Fals
 
                     return result
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 except Exception as e:
                     # Add error information to event
                     event_data["payload"]["success"] = False
                     event_data["payload"]["error"] = str(e)
                     event_data["payload"]["error_type"] = type(e).__name__
-<<<<<<< HEAD
-                    
-                    # Publish event
-                    await event_bus.publish(event_data)
-                    
-                    # Re-raise the exception
-                    raise
-=======
 
                     # Publish event
                     await event_bus.publish(event_data)
@@ -674,20 +1386,11 @@ def publish_event(event_type: Union[str, EventType], include_result: bool = Fals
                     # Re-raise the exception
                     raise
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         else:
             # Synchronous function
             def wrapper(*args, **kwargs):
                 # We can't do async operations in a sync function,
                 # so we'll just log that events would be generated
-<<<<<<< HEAD
-                logger.info(f"Would publish {event_type} event for {func.__name__} "
-                           f"(sync functions can't publish events via event bus)")
-                return func(*args, **kwargs)
-        
-        return async_wrapper if asyncio.iscoroutinefunction(func) else wrapper
-    
-=======
                 logger.info(
                     f"Would publish {event_type} event for {func.__name__} "
                     f"(sync functions can't publish events via event bus)"
@@ -696,5 +1399,4 @@ def publish_event(event_type: Union[str, EventType], include_result: bool = Fals
 
         return async_wrapper if asyncio.iscoroutinefunction(func) else wrapper
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     return decorator
@@ -0,0 +1,307 @@
+"""
+Durable Event Log for Forest App
+
+This module provides the append-only, replayable log that can sit behind the
+EventBus. Published events are committed to the log before delivery, and each
+durable subscriber tracks its own offset, so a subscriber that was down (or a
+process that crashed mid-delivery) catches up from where it left off instead
+of silently missing events. Delivery is at-least-once: offsets are committed
+after the subscriber has handled the events.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LogRecord(NamedTuple):
+    """An event as stored in the log."""
+
+    offset: int
+    event_type: str
+    data: str  # Serialized event
+
+
+class EventLog(ABC):
+    """Interface for durable event log backends."""
+
+    @abstractmethod
+    async def append(
+        self, event_id: str, event_type: str, user_id: Optional[str], data: str
+    ) -> int:
+        """
+        Durably append an event.
+
+        Args:
+            event_id: Event identifier
+            event_type: Event type value
+            user_id: Optional user the event belongs to
+            data: Serialized event
+
+        Returns:
+            The offset assigned to the event (increasing, starting at 1)
+        """
+
+    @abstractmethod
+    async def read(
+        self,
+        after_offset: int,
+        event_types: Optional[Iterable[str]] = None,
+        limit: int = 100,
+    ) -> List[LogRecord]:
+        """
+        Read committed events after an offset, oldest first.
+
+        Args:
+            after_offset: Return events with an offset greater than this
+            event_types: Optional event types to restrict to
+            limit: Maximum number of events to return
+
+        Returns:
+            List of log records
+        """
+
+    @abstractmethod
+    async def get_offset(self, subscriber_id: str) -> int:
+        """Get a subscriber's committed offset (0 if it has none)."""
+
+    @abstractmethod
+    async def commit_offset(self, subscriber_id: str, offset: int) -> None:
+        """Record that a subscriber has handled every event up to offset."""
+
+    @abstractmethod
+    async def head(self) -> int:
+        """Get the offset of the newest committed event (0 if empty)."""
+
+    @abstractmethod
+    async def prune(self, max_lag: Optional[int] = None) -> int:
+        """
+        Delete events every known subscriber has already handled.
+
+        Args:
+            max_lag: Also delete events more than this many offsets behind
+                the head, even if a subscriber has not handled them yet, so
+                an abandoned or stuck subscriber cannot pin the log forever
+
+        Returns:
+            Number of events deleted
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Flush pending appends and release resources."""
+
+
+class SQLiteEventLog(EventLog):
+    """
+    Event log stored in a SQLite database (WAL mode).
+
+    Appends use group commit: concurrent appends that arrive while a write is
+    in progress are written together in the next transaction, so the fsync
+    cost is shared by the whole batch. All database access happens on one
+    dedicated thread to keep the event loop free.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch_size: int = 500,
+        commit_interval: float = 0.0,
+        synchronous: str = "FULL",
+    ):
+        """
+        Initialize the SQLite event log.
+
+        Args:
+            path: Database file path
+            max_batch_size: Maximum events written per transaction
+            commit_interval: Extra seconds to wait for more appends before
+                committing a batch (0 batches only concurrent appends)
+            synchronous: SQLite synchronous pragma; FULL fsyncs every commit,
+                NORMAL trades durability of the last commits for speed
+        """
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.commit_interval = commit_interval
+        self.synchronous = synchronous
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="event-log"
+        )
+        self.connection: Optional[sqlite3.Connection] = None
+        self.pending: List[Tuple[Tuple, asyncio.Future]] = []
+        self.writer_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.stats = {"appended": 0, "commits": 0}
+
+    # --- Executor-thread helpers ---
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS event_log (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    user_id TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_event_log_type_seq
+                    ON event_log (event_type, seq);
+                CREATE TABLE IF NOT EXISTS event_log_offsets (
+                    subscriber_id TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL
+                );
+                """
+            )
+            self.connection = connection
+        return self.connection
+
+    def _write_batch(self, rows: List[Tuple]) -> List[int]:
+        connection = self._connect()
+        offsets = []
+        with connection:  # One transaction, one fsync
+            for row in rows:
+                cursor = connection.execute(
+                    "INSERT INTO event_log (event_id, event_type, user_id, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    row,
+                )
+                offsets.append(cursor.lastrowid)
+        return offsets
+
+    def _read(
+        self, after_offset: int, event_types: Optional[List[str]], limit: int
+    ) -> List[LogRecord]:
+        query = "SELECT seq, event_type, data FROM event_log WHERE seq > ?"
+        params: list = [after_offset]
+        if event_types is not None:
+            query += f" AND event_type IN ({','.join('?' * len(event_types))})"
+            params.extend(event_types)
+        query += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+        return [LogRecord(*row) for row in self._connect().execute(query, params)]
+
+    def _scalar(self, query: str, params: Tuple = ()) -> Optional[int]:
+        row = self._connect().execute(query, params).fetchone()
+        return row[0] if row else None
+
+    def _commit_offset(self, subscriber_id: str, offset: int) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO event_log_offsets (subscriber_id, position) "
+                "VALUES (?, ?) ON CONFLICT (subscriber_id) "
+                "DO UPDATE SET position = MAX(position, excluded.position)",
+                (subscriber_id, offset),
+            )
+
+    def _prune(self, max_lag: Optional[int]) -> int:
+        with self._connect() as connection:
+            cutoff = self._scalar("SELECT MIN(position) FROM event_log_offsets")
+            head = self._scalar("SELECT MAX(seq) FROM event_log")
+            if max_lag is not None and head is not None:
+                lag_cutoff = head - max_lag
+                if lag_cutoff > (cutoff or 0):
+                    behind = connection.execute(
+                        "SELECT subscriber_id FROM event_log_offsets "
+                        "WHERE position < ?",
+                        (lag_cutoff,),
+                    ).fetchall()
+                    if behind:
+                        logger.warning(
+                            f"Pruning events not yet handled by subscribers more "
+                            f"than {max_lag} events behind: "
+                            f"{', '.join(row[0] for row in behind)}"
+                        )
+                    cutoff = lag_cutoff
+            if cutoff is None:
+                return 0
+            return connection.execute(
+                "DELETE FROM event_log WHERE seq <= ?", (cutoff,)
+            ).rowcount
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    # --- Group commit ---
+
+    async def _writer(self) -> None:
+        while self.pending:
+            if self.commit_interval and len(self.pending) < self.max_batch_size:
+                await asyncio.sleep(self.commit_interval)
+
+            batch = self.pending[: self.max_batch_size]
+            del self.pending[: len(batch)]
+            try:
+                offsets = await self._run(
+                    self._write_batch, [row for row, _ in batch]
+                )
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} events to event log: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats["appended"] += len(batch)
+            self.stats["commits"] += 1
+            for (_, future), offset in zip(batch, offsets):
+                if not future.done():
+                    future.set_result(offset)
+
+    async def append(
+        self, event_id: str, event_type: str, user_id: Optional[str], data: str
+    ) -> int:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(((event_id, event_type, user_id, data), future))
+        if self.writer_task is None or self.writer_task.done():
+            self.writer_task = asyncio.create_task(self._writer())
+        return await future
+
+    # --- Reads and offsets ---
+
+    async def read(
+        self,
+        after_offset: int,
+        event_types: Optional[Iterable[str]] = None,
+        limit: int = 100,
+    ) -> List[LogRecord]:
+        types = sorted(event_types) if event_types is not None else None
+        return await self._run(self._read, after_offset, types, limit)
+
+    async def get_offset(self, subscriber_id: str) -> int:
+        offset = await self._run(
+            self._scalar,
+            "SELECT position FROM event_log_offsets WHERE subscriber_id = ?",
+            (subscriber_id,),
+        )
+        return offset or 0
+
+    async def commit_offset(self, subscriber_id: str, offset: int) -> None:
+        await self._run(self._commit_offset, subscriber_id, offset)
+
+    async def head(self) -> int:
+        return await self._run(self._scalar, "SELECT MAX(seq) FROM event_log") or 0
+
+    async def prune(self, max_lag: Optional[int] = None) -> int:
+        return await self._run(self._prune, max_lag)
+
+    async def close(self) -> None:
+        if self.writer_task is not None:
+            await self.writer_task
+            self.writer_task = None
+        if self.connection is not None:
+            await self._run(self.connection.close)
+            self.connection = None
+        self.executor.shutdown(wait=True)
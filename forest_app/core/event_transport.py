@@ -0,0 +1,422 @@
+"""
+Event Transports for Forest App
+
+This module provides the transport layer used by the EventBus to deliver
+events to named subscriber groups. The in-process transport delivers within
+the publishing process. The Redis Streams transport lets every worker process
+publish to a shared stream and uses consumer groups, so each event goes to
+one worker per group. Delivery is at-least-once: unacknowledged events are
+reclaimed from workers that died mid-delivery. Handled entries are marked in
+Redis so a redelivered entry that was already handled is skipped; a handler
+can still run twice only if its worker dies between handling an event and
+marking it.
+
+Transports move opaque messages: distributed transports are given encoded
+bytes by the EventBus, the in-process transport is given the event itself.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Receives one event message; returns True once it has been handled
+GroupHandler = Callable[[Any], Awaitable[bool]]
+
+
+class EventTransport(ABC):
+    """Interface for event transports."""
+
+    # True when events reach other processes (subscribers are then only
+    # delivered through the transport, never directly by the publisher)
+    distributed = False
+
+    @abstractmethod
+    def register(
+        self, group: str, event_types: Optional[Set[str]], handler: GroupHandler
+    ) -> None:
+        """
+        Register (or replace) the local handler for a subscriber group.
+
+        Args:
+            group: Group name, shared by the same subscriber in every process
+            event_types: Event types the group wants, None for all
+            handler: Coroutine handling one event message
+        """
+
+    @abstractmethod
+    def unregister(self, group: str) -> None:
+        """Stop delivering to a subscriber group in this process."""
+
+    @abstractmethod
+    async def send(self, event_type: str, message: Any) -> None:
+        """
+        Send an event to every registered group.
+
+        Args:
+            event_type: Event type value, used for group filtering
+            message: The event (encoded bytes for distributed transports)
+        """
+
+    async def send_many(self, messages: List[Tuple[str, Any]]) -> None:
+        """Send several (event_type, message) pairs, in order."""
+        for event_type, message in messages:
+            await self.send(event_type, message)
+
+    async def start(self) -> None:
+        """Start receiving events (no-op for transports without consumers)."""
+
+    async def close(self) -> None:
+        """Stop receiving events and release resources."""
+
+
+class InProcessTransport(EventTransport):
+    """Delivers events to the groups registered in this process."""
+
+    def __init__(self):
+        """Initialize the in-process transport."""
+        self.groups: Dict[str, tuple] = {}
+
+    def register(
+        self, group: str, event_types: Optional[Set[str]], handler: GroupHandler
+    ) -> None:
+        self.groups[group] = (event_types, handler)
+
+    def unregister(self, group: str) -> None:
+        self.groups.pop(group, None)
+
+    async def send(self, event_type: str, message: Any) -> None:
+        handlers = [
+            handler(message)
+            for event_types, handler in self.groups.values()
+            if event_types is None or event_type in event_types
+        ]
+        if handlers:
+            await asyncio.gather(*handlers, return_exceptions=True)
+
+
+class _StreamGroup:
+    """State for one consumer group read by this process."""
+
+    def __init__(self, name: str, event_types: Optional[Set[str]], handler):
+        self.name = name
+        self.event_types = event_types
+        self.handler = handler
+        self.task: Optional[asyncio.Task] = None
+        # Failed deliveries per entry id, for dead-lettering after max attempts
+        self.attempts: Dict[bytes, int] = {}
+        self.stats = {
+            "delivered": 0,
+            "skipped": 0,
+            "failed": 0,
+            "reclaimed": 0,
+            "duplicates": 0,
+        }
+
+    def wants(self, event_type: str) -> bool:
+        return self.event_types is None or event_type in self.event_types
+
+
+class RedisStreamsTransport(EventTransport):
+    """
+    Delivers events through a Redis Stream with one consumer group per
+    subscriber group.
+
+    Every process reads each group as its own consumer, so Redis hands each
+    new stream entry to one process per group. Entries are marked handled
+    and acknowledged after the handler succeeds; entries left pending by a
+    failed handler, a failed acknowledgement or a crashed worker are
+    reclaimed with XAUTOCLAIM once idle (checked every reclaim interval,
+    also under load), skipped if already marked handled, and dropped after
+    max_delivery_attempts.
+
+    Consumer groups are created before this process sends its next event,
+    so a newly registered group never misses events published after it.
+    """
+
+    distributed = True
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        redis_client: Optional[Any] = None,
+        stream: str = "forest:events",
+        max_length: int = 100000,
+        batch_size: int = 100,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 30000,
+        max_delivery_attempts: int = 5,
+        consumer_name: Optional[str] = None,
+        reclaim_interval_ms: Optional[int] = None,
+        dedupe_ttl: int = 86400,
+    ):
+        """
+        Initialize the Redis Streams transport.
+
+        Args:
+            redis_url: Redis connection URL
+            redis_client: Pre-built async Redis client, used instead of
+                redis_url (e.g. fakeredis in tests)
+            stream: Stream key shared by all workers
+            max_length: Approximate cap on stream length (older entries trimmed)
+            batch_size: Entries read per XREADGROUP call
+            block_ms: How long a read blocks waiting for new entries
+            claim_idle_ms: Idle time after which pending entries are reclaimed
+            max_delivery_attempts: Attempts per entry before it is dropped
+            consumer_name: Consumer name for this process (default:
+                host:pid:random)
+            reclaim_interval_ms: How often pending entries are checked for
+                reclaiming (default: claim_idle_ms)
+            dedupe_ttl: Seconds a handled entry stays marked, which must
+                outlast its redelivery
+        """
+        if redis_client is None:
+            if not redis_url:
+                raise ValueError("redis_url or redis_client is required")
+            import redis.asyncio as redis_asyncio
+
+            redis_client = redis_asyncio.from_url(redis_url)
+
+        self.redis = redis_client
+        self.stream = stream
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_delivery_attempts = max(1, max_delivery_attempts)
+        self.reclaim_interval = (
+            claim_idle_ms if reclaim_interval_ms is None else reclaim_interval_ms
+        ) / 1000
+        self.dedupe_ttl = dedupe_ttl
+        self.consumer_name = (
+            consumer_name
+            or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+
+        self.groups: Dict[str, _StreamGroup] = {}
+        # Groups registered but not yet created in Redis
+        self.pending_groups: Set[str] = set()
+        self.started = False
+
+    def register(
+        self, group: str, event_types: Optional[Set[str]], handler: GroupHandler
+    ) -> None:
+        existing = self.groups.get(group)
+        if existing is not None:
+            existing.event_types = event_types
+            existing.handler = handler
+            return
+        self.groups[group] = _StreamGroup(group, event_types, handler)
+        self.pending_groups.add(group)
+        if self.started:
+            self._start_group(self.groups[group])
+
+    def unregister(self, group: str) -> None:
+        self.pending_groups.discard(group)
+        stream_group = self.groups.pop(group, None)
+        if stream_group is not None and stream_group.task is not None:
+            stream_group.task.cancel()
+
+    async def _create_pending_groups(self) -> None:
+        for name in list(self.pending_groups):
+            await self._ensure_group(name)
+            self.pending_groups.discard(name)
+
+    async def send(self, event_type: str, message: bytes) -> None:
+        if self.pending_groups:
+            await self._create_pending_groups()
+        await self.redis.xadd(
+            self.stream,
+            {"t": event_type, "d": message},
+            maxlen=self.max_length,
+            approximate=True,
+        )
+
+    async def send_many(self, messages: List[Tuple[str, bytes]]) -> None:
+        if self.pending_groups:
+            await self._create_pending_groups()
+        # One round trip for the whole batch
+        pipe = self.redis.pipeline(transaction=False)
+        for event_type, message in messages:
+            pipe.xadd(
+                self.stream,
+                {"t": event_type, "d": message},
+                maxlen=self.max_length,
+                approximate=True,
+            )
+        await pipe.execute()
+
+    async def start(self) -> None:
+        self.started = True
+        try:
+            await self._create_pending_groups()
+        except Exception as e:
+            # Consumers create their groups when Redis is back
+            logger.warning(f"Could not create event stream consumer groups: {e}")
+        for stream_group in self.groups.values():
+            if stream_group.task is None or stream_group.task.done():
+                self._start_group(stream_group)
+
+    def _start_group(self, stream_group: _StreamGroup) -> None:
+        stream_group.task = asyncio.create_task(self._consume(stream_group))
+
+    async def _ensure_group(self, name: str) -> None:
+        try:
+            # New groups start at the end: history before deployment is skipped
+            await self.redis.xgroup_create(self.stream, name, id="$", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _running(self, stream_group: _StreamGroup) -> bool:
+        # Checked as well as cancellation, which a client can swallow when it
+        # races with the client's own read timeout
+        return self.started and self.groups.get(stream_group.name) is stream_group
+
+    async def _consume(self, stream_group: _StreamGroup) -> None:
+        backoff = 0.1
+        while self._running(stream_group):
+            try:
+                await self._ensure_group(stream_group.name)
+                next_reclaim = 0.0
+                while self._running(stream_group):
+                    started = time.monotonic()
+                    if started >= next_reclaim:
+                        # Retry failed entries and take over abandoned ones,
+                        # even while new entries keep arriving
+                        await self._reclaim(stream_group)
+                        next_reclaim = time.monotonic() + self.reclaim_interval
+                    response = await self.redis.xreadgroup(
+                        stream_group.name,
+                        self.consumer_name,
+                        {self.stream: ">"},
+                        count=self.batch_size,
+                        block=self.block_ms,
+                    )
+                    for _, entries in response or []:
+                        await self._handle_entries(stream_group, entries)
+                    if not response:
+                        # Some clients (and test doubles) don't honour BLOCK
+                        remaining = self.block_ms / 1000 - (time.monotonic() - started)
+                        await asyncio.sleep(max(0.0, remaining))
+                    backoff = 0.1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Event stream consumer for {stream_group.name} failed: {e}; "
+                    f"retrying in {backoff:.1f}s"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def _reclaim(self, stream_group: _StreamGroup) -> None:
+        start_id = "0-0"
+        while True:
+            result = await self.redis.xautoclaim(
+                self.stream,
+                stream_group.name,
+                self.consumer_name,
+                min_idle_time=self.claim_idle_ms,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            start_id, entries = result[0], result[1]
+            if entries:
+                stream_group.stats["reclaimed"] += len(entries)
+                await self._handle_entries(stream_group, entries, reclaimed=True)
+            if not entries or start_id in (b"0-0", "0-0"):
+                return
+
+    def _handled_key(self, group: str, entry_id) -> str:
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode()
+        return f"{self.stream}:handled:{group}:{entry_id}"
+
+    async def _already_handled(self, group: str, entry_ids: List) -> Set:
+        pipe = self.redis.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipe.exists(self._handled_key(group, entry_id))
+        found = await pipe.execute()
+        return {entry_id for entry_id, count in zip(entry_ids, found) if count}
+
+    async def _handle_entries(
+        self, stream_group: _StreamGroup, entries, reclaimed: bool = False
+    ) -> None:
+        # Only redelivered entries can have been handled before
+        handled_before: Set = set()
+        if reclaimed:
+            handled_before = await self._already_handled(
+                stream_group.name, [entry_id for entry_id, _ in entries]
+            )
+
+        ack_ids = []
+        handled_ids = []
+        for entry_id, fields in entries:
+            if not fields:
+                # Entry was trimmed from the stream while pending
+                ack_ids.append(entry_id)
+                continue
+            if entry_id in handled_before:
+                stream_group.stats["duplicates"] += 1
+                stream_group.attempts.pop(entry_id, None)
+                ack_ids.append(entry_id)
+                continue
+            event_type = fields.get(b"t", b"").decode()
+            if not stream_group.wants(event_type):
+                stream_group.stats["skipped"] += 1
+                ack_ids.append(entry_id)
+                continue
+
+            if await stream_group.handler(fields[b"d"]):
+                stream_group.stats["delivered"] += 1
+                stream_group.attempts.pop(entry_id, None)
+                handled_ids.append(entry_id)
+                ack_ids.append(entry_id)
+                continue
+
+            attempts = stream_group.attempts.get(entry_id, 0) + 1
+            if attempts >= self.max_delivery_attempts:
+                logger.error(
+                    f"Dropping event {entry_id!r} for {stream_group.name} "
+                    f"after {attempts} attempts"
+                )
+                stream_group.stats["failed"] += 1
+                stream_group.attempts.pop(entry_id, None)
+                ack_ids.append(entry_id)
+            else:
+                # Left pending; reclaimed after claim_idle_ms
+                stream_group.attempts[entry_id] = attempts
+
+        if handled_ids:
+            # Marked before acknowledging: if the ack is lost, the redelivered
+            # entry is recognised and skipped
+            pipe = self.redis.pipeline(transaction=False)
+            for entry_id in handled_ids:
+                pipe.set(
+                    self._handled_key(stream_group.name, entry_id),
+                    1,
+                    ex=self.dedupe_ttl,
+                )
+            await pipe.execute()
+        if ack_ids:
+            await self.redis.xack(self.stream, stream_group.name, *ack_ids)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get per-group delivery counts for this process."""
+        return {name: dict(group.stats) for name, group in self.groups.items()}
+
+    async def close(self) -> None:
+        self.started = False
+        tasks = [g.task for g in self.groups.values() if g.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for stream_group in self.groups.values():
+            stream_group.task = None
@@ -1,43 +1,23 @@
 # forest_app/core/security.py (Refactored - Updated Type Hint)
 
-<<<<<<< HEAD
-import os
-import logging
-from datetime import datetime, timedelta, timezone
-# --- MODIFICATION: Added Callable back for specific type hint ---
-from typing import Optional, Any, Callable
-
-# --- Security Libraries ---
-from passlib.context import CryptContext
-from jose import JWTError, jwt
-=======
 import logging
 import os
 from datetime import datetime, timedelta, timezone
 # --- MODIFICATION: Added Callable back for specific type hint ---
-from typing import Any, Callable, Optional
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+from typing import Any, Awaitable, Callable, Optional
 
 # --- FastAPI/Pydantic ---
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-<<<<<<< HEAD
-from pydantic import BaseModel, ValidationError
-
-# --- Database & Models ---
-from sqlalchemy.orm import Session
-from forest_app.persistence.database import get_db
-=======
 from jose import JWTError, jwt
 # --- Security Libraries ---
 from passlib.context import CryptContext
 from pydantic import BaseModel, ValidationError
 # --- Database & Models ---
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from forest_app.persistence.database import get_db
+from forest_app.persistence.database import get_async_db
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # Assuming UserModel is defined and available (e.g., imported from models)
 # from forest_app.persistence.models import UserModel # Example
 
@@ -46,24 +26,17 @@ logger = logging.getLogger(__name__)
 
 # --- Globals for dependencies (initialized via function) ---
 UserModel = None
-<<<<<<< HEAD
-get_user_by_email: Optional[Callable[[Session, str], Optional[UserModel]]] = None # Use refined hint
-
-# --- Updated function signature & type hint ---
-def initialize_security_dependencies(
-    _get_user_by_email: Callable[[Session, str], Optional[UserModel]], # Refined hint
-    _user_model: type
-=======
-get_user_by_email: Optional[Callable[[Session, str], Optional[UserModel]]] = (
-    None  # Use refined hint
-)
+get_user_by_email: Optional[
+    Callable[[AsyncSession, str], Awaitable[Optional[UserModel]]]
+] = None  # Use refined hint
 
 
 # --- Updated function signature & type hint ---
 def initialize_security_dependencies(
-    _get_user_by_email: Callable[[Session, str], Optional[UserModel]],  # Refined hint
+    _get_user_by_email: Callable[
+        [AsyncSession, str], Awaitable[Optional[UserModel]]
+    ],  # Refined hint (async lookup, e.g. get_user_by_email_async)
     _user_model: type,
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 ):
     """Initialize the security module's dependencies (get_user_by_email, UserModel)."""
     global get_user_by_email, UserModel
@@ -76,11 +49,8 @@ def initialize_security_dependencies(
     get_user_by_email = _get_user_by_email
     UserModel = _user_model
     logger.info("Security dependencies (get_user_by_email, UserModel) initialized.")
-<<<<<<< HEAD
-=======
 
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # --- END MODIFICATION ---
 
 # --- Configuration (SECRET_KEY, ALGORITHM, etc. - unchanged) ---
@@ -88,52 +58,19 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dummy_insecure_secret_key_replace_in_env")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 if SECRET_KEY == "dummy_insecure_secret_key_replace_in_env":
-<<<<<<< HEAD
-     logger.critical("FATAL SECURITY WARNING: SECRET_KEY environment variable not set.")
-=======
     logger.critical("FATAL SECURITY WARNING: SECRET_KEY environment variable not set.")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --- Password Hashing Setup (unchanged) ---
 pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated=["bcrypt"])
 
 # --- OAuth2 Scheme Setup (unchanged) ---
-<<<<<<< HEAD
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token") # Matches endpoint in main.py
-=======
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")  # Matches endpoint in main.py
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --- Pydantic model for token data (unchanged) ---
 class TokenData(BaseModel):
     email: Optional[str] = None
 
-<<<<<<< HEAD
-# --- Helper Functions (verify_password, get_password_hash, create_access_token - unchanged) ---
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    if not plain_password or not hashed_password: return False
-    try: return pwd_context.verify(plain_password, hashed_password)
-    except Exception as e: logger.error(f"Error verifying password: {e}", exc_info=True); return False
-
-def get_password_hash(password: str) -> str:
-    if not password: raise ValueError("Password cannot be empty")
-    return pwd_context.hash(password)
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    if expires_delta: expire = datetime.now(timezone.utc) + expires_delta
-    else: expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    if "sub" not in to_encode and "email" in to_encode: to_encode["sub"] = to_encode.pop("email")
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-# --- Dependency to Decode Token (decode_access_token - unchanged) ---
-async def decode_access_token(token: str = Depends(oauth2_scheme)) -> TokenData:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials",
-=======
 
 # --- Helper Functions (verify_password, get_password_hash, create_access_token - unchanged) ---
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -172,25 +109,11 @@ async def decode_access_token(token: str = Depends(oauth2_scheme)) -> TokenData:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: Optional[str] = payload.get("sub")
-<<<<<<< HEAD
-        if email is None: logger.warning("Token payload missing 'sub'."); raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError as e: logger.warning(f"JWTError decoding token: {e}"); raise credentials_exception
-    except ValidationError as e: logger.warning(f"Token Data validation error: {e}"); raise credentials_exception
-    except Exception as e: logger.exception(f"Unexpected error decoding token: {e}"); raise credentials_exception
-    return token_data
-
-# --- Dependency to Get Current User (Refactored previously - unchanged here) ---
-async def get_current_user(
-    token_data: TokenData = Depends(decode_access_token),
-    db: Session = Depends(get_db) # Uses managed session
-=======
         if email is None:
             logger.warning("Token payload missing 'sub'.")
             raise credentials_exception
@@ -210,28 +133,15 @@ async def get_current_user(
 # --- Dependency to Get Current User (Refactored previously - unchanged here) ---
 async def get_current_user(
     token_data: TokenData = Depends(decode_access_token),
-    db: Session = Depends(get_db),  # Uses managed session
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+    db: AsyncSession = Depends(get_async_db),  # Uses managed async session
 ) -> Any:
     """
     Dependency to fetch the user from DB based on token data.
-    Uses a managed DB session from get_db dependency.
+    Uses a managed async DB session from get_async_db dependency, so the
+    lookup on every authenticated request does not block the event loop.
     """
     # Check if dependencies were initialized correctly
     if not callable(get_user_by_email) or UserModel is None:
-<<<<<<< HEAD
-        logger.critical("Security dependencies (get_user_by_email/UserModel) not initialized!")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Server configuration error [Security Dep Init]"
-        )
-    if token_data.email is None:
-        logger.error("Token data email is None in get_current_user.")
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token data", headers={"WWW-Authenticate": "Bearer"})
-
-    try:
-        logger.debug("Fetching user in get_current_user for email: %s", token_data.email)
-=======
         logger.critical(
             "Security dependencies (get_user_by_email/UserModel) not initialized!"
         )
@@ -251,15 +161,10 @@ async def get_current_user(
         logger.debug(
             "Fetching user in get_current_user for email: %s", token_data.email
         )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # Use the injected, managed db session directly
-        user = get_user_by_email(db=db, email=token_data.email)
+        user = await get_user_by_email(db=db, email=token_data.email)
 
         if user is None:
-<<<<<<< HEAD
-            logger.warning("User '%s' from token not found in database.", token_data.email)
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User associated with token not found", headers={"WWW-Authenticate": "Bearer"})
-=======
             logger.warning(
                 "User '%s' from token not found in database.", token_data.email
             )
@@ -268,7 +173,6 @@ async def get_current_user(
                 detail="User associated with token not found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
         logger.debug("User '%s' found in database.", token_data.email)
         return user
@@ -278,24 +182,10 @@ async def get_current_user(
         raise
     except Exception as e:
         # Log other unexpected errors during DB lookup
-<<<<<<< HEAD
-        logger.exception(f"Error fetching user '{token_data.email}' in get_current_user: {e}")
-        # No rollback needed here, get_db handles it if error propagates
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error retrieving user information.")
-
-# --- Dependency to Get Current Active User (Unchanged) ---
-async def get_current_active_user(
-    current_user: Any = Depends(get_current_user) # Depends on refactored get_current_user
-) -> Any:
-    """Dependency to get the current *active* user."""
-    if not getattr(current_user, "is_active", False):
-        logger.warning("Authentication attempt by inactive user: %s", getattr(current_user, 'email', 'N/A'))
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
-=======
         logger.exception(
             f"Error fetching user '{token_data.email}' in get_current_user: {e}"
         )
-        # No rollback needed here, get_db handles it if error propagates
+        # No rollback needed here, get_async_db handles it if error propagates
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error retrieving user information.",
@@ -317,5 +207,4 @@ async def get_current_active_user(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     return current_user
@@ -0,0 +1,221 @@
+"""
+Embedding Cache for Forest App
+
+This module caches text embeddings by a hash of their content, so the same
+text is only sent to the embedding model once: a reflection that is stored
+and then used as a query, or memories re-embedded after a reload. The cache
+is bounded (least recently used entries are evicted), shared by default
+across SemanticMemoryManager instances that use the same embedding model,
+and can be backed by an EmbeddingStore to survive restarts.
+
+Misses are fetched in one batch when the client supports get_embeddings,
+and concurrent requests for the same text share a single call.
+"""
+
+import asyncio
+import hashlib
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from forest_app.core.services.embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Content-hash keyed LRU cache of embedding vectors."""
+
+    # Shared caches by namespace, and per client for clients that do not
+    # name their embedding model
+    _shared: Dict[str, "EmbeddingCache"] = {}
+    _per_client: "weakref.WeakKeyDictionary[Any, EmbeddingCache]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        store: Optional[EmbeddingStore] = None,
+        namespace: str = "",
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            max_entries: Maximum vectors kept in memory
+            store: Optional store the cache is persisted to
+            namespace: Prefix hashed into every key; use the embedding model
+                name so vectors of different models never mix
+        """
+        self.max_entries = max(1, max_entries)
+        self.store = store
+        self.namespace = namespace
+        self.entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls, namespace: str) -> "EmbeddingCache":
+        """
+        Get the process-wide cache of a namespace.
+
+        Args:
+            namespace: Embedding model the cached vectors come from
+        """
+        cache = cls._shared.get(namespace)
+        if cache is None:
+            cache = cls._shared[namespace] = cls(namespace=namespace)
+        return cache
+
+    @classmethod
+    def for_client(cls, client: Any) -> "EmbeddingCache":
+        """
+        Get the cache used for a client when none is configured.
+
+        Clients that name their model (an ``embedding_model`` attribute)
+        share one cache per client class and model. Vectors of other clients
+        are only reused for that same client instance, since nothing tells
+        which model they came from.
+
+        Args:
+            client: Client the embeddings are fetched with
+        """
+        model = getattr(client, "embedding_model", None)
+        if isinstance(model, str) and model:
+            client_type = type(client)
+            name = f"{client_type.__module__}.{client_type.__qualname__}"
+            return cls.shared(f"{name}:{model}")
+        try:
+            cache = cls._per_client.get(client)
+            if cache is None:
+                cache = cls._per_client[client] = cls()
+            return cache
+        except TypeError:  # Not weak-referenceable or not hashable
+            return cls()
+
+    @classmethod
+    def reset_shared(cls) -> None:
+        """Forget all shared caches (e.g. between tests)."""
+        cls._shared = {}
+        cls._per_client = weakref.WeakKeyDictionary()
+
+    def key(self, text: str) -> str:
+        """Get the cache key of a text."""
+        digest = hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        self.entries[key] = embedding
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def get_embedding(self, client: Any, text: str) -> List[float]:
+        """
+        Get the embedding of a text, calling the client on a miss.
+
+        Args:
+            client: Client with get_embedding (and optionally get_embeddings)
+            text: Text to embed
+
+        Returns:
+            The embedding vector
+        """
+        return (await self.get_embeddings(client, [text]))[0]
+
+    async def get_embeddings(self, client: Any, texts: Sequence[str]) -> List[Any]:
+        """
+        Get the embeddings of several texts, fetching all misses in one batch.
+
+        Args:
+            client: Client with get_embedding (and optionally get_embeddings)
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in the order of texts
+        """
+        keys = [self.key(text) for text in texts]
+        results: Dict[str, Any] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in results or key in waiting or key in missing:
+                continue
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                results[key] = self.entries[key]
+                self.hits += 1
+            elif key in self.inflight:
+                waiting[key] = self.inflight[key]
+                self.hits += 1
+            else:
+                missing[key] = text
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self.inflight.update(futures)
+            try:
+                fetched = await self._fetch(client, missing)
+                for key, embedding in fetched.items():
+                    self._remember(key, embedding)
+                    futures[key].set_result(embedding)
+                results.update(fetched)
+            except BaseException as e:
+                for future in futures.values():
+                    if future.done():
+                        continue
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                        future.exception()  # Mark retrieved if nobody waits
+                raise
+            finally:
+                for key in futures:
+                    self.inflight.pop(key, None)
+
+        for key, future in waiting.items():
+            results[key] = await asyncio.shield(future)
+        return [results[key] for key in keys]
+
+    async def _fetch(self, client: Any, missing: Dict[str, str]) -> Dict[str, Any]:
+        fetched: Dict[str, Any] = {}
+        if self.store is not None:
+            stored = await self.store.get_many(missing)
+            fetched.update((key, vector.tolist()) for key, vector in stored.items())
+
+        keys = [key for key in missing if key not in fetched]
+        self.misses += len(keys)
+        if keys:
+            texts = [missing[key] for key in keys]
+            if hasattr(client, "get_embeddings"):
+                embeddings = await client.get_embeddings(texts)
+            else:
+                embeddings = await asyncio.gather(
+                    *(client.get_embedding(text) for text in texts)
+                )
+            new = dict(zip(keys, embeddings))
+            if self.store is not None:
+                await self.store.put_many({k: e for k, e in new.items() if e})
+            fetched.update(new)
+        self.hits += len(missing) - len(keys)
+        return fetched
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the store, if any, is kept)."""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
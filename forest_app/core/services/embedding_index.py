@@ -0,0 +1,282 @@
+"""
+Embedding Index for Forest App
+
+This module keeps memory embeddings in one contiguous, pre-normalized float32
+matrix so a similarity query is a single matrix-vector product followed by an
+argpartition top-k, instead of a Python loop that re-normalizes every stored
+vector. Rows are appended incrementally (the matrix grows geometrically) and
+looked up by memory id.
+
+For very large memory stores the index can run in approximate mode: an
+inverted-file (IVF) layout where rows are bucketed under k-means centroids
+and a query only scores the rows in its nearest buckets.
+"""
+
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingIndex:
+    """
+    In-memory cosine-similarity index over embedding vectors.
+
+    Rows are numbered in insertion order, so callers can keep a parallel
+    list of the objects the vectors belong to and use row numbers to filter.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        initial_capacity: int = 64,
+        approximate: bool = False,
+        approximate_threshold: int = 10000,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            dimension: Embedding size (taken from the first vector if None)
+            initial_capacity: Rows to allocate before the first growth
+            approximate: Use IVF search once the index is large enough
+            approximate_threshold: Rows needed before IVF is trained; smaller
+                indexes are always searched exactly
+            n_lists: Number of IVF buckets (default sqrt of the row count)
+            n_probe: Buckets scanned per query in approximate mode
+        """
+        self.dimension = dimension
+        self.initial_capacity = max(1, initial_capacity)
+        self.approximate = approximate
+        self.approximate_threshold = approximate_threshold
+        self.n_lists = n_lists
+        self.n_probe = max(1, n_probe)
+
+        self.size = 0
+        self.vectors: Optional[np.ndarray] = None
+        self.ids: List[Hashable] = []
+        self.id_to_row: Dict[Hashable, int] = {}
+
+        # IVF state: centroids and the bucket of every row (-1 if untrained)
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self.id_to_row
+
+    def row(self, item_id: Hashable) -> Optional[int]:
+        """Get the row of an id, or None if it is not indexed."""
+        return self.id_to_row.get(item_id)
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0  # Zero vectors stay zero (similarity 0)
+        return vectors / norms
+
+    def _as_matrix(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("Embeddings must all have the same length")
+        if self.dimension is None:
+            self.dimension = matrix.shape[1]
+        elif matrix.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {matrix.shape[1]} does not match index "
+                f"dimension {self.dimension}"
+            )
+        return self._normalize(matrix)
+
+    def _reserve(self, rows: int) -> None:
+        needed = self.size + rows
+        capacity = 0 if self.vectors is None else self.vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(self.initial_capacity, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+        vectors = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        if self.vectors is not None:
+            vectors[: self.size] = self.vectors[: self.size]
+            assignments[: self.size] = self.assignments[: self.size]
+        self.vectors = vectors
+        self.assignments = assignments
+
+    def add(self, item_id: Hashable, embedding: Sequence[float]) -> int:
+        """
+        Add or replace the vector for an id.
+
+        Args:
+            item_id: Id of the item the vector belongs to
+            embedding: The embedding vector
+
+        Returns:
+            The row the vector is stored in
+        """
+        return self.add_many([item_id], [embedding])[0]
+
+    def add_many(
+        self,
+        item_ids: Sequence[Hashable],
+        embeddings: Sequence[Sequence[float]],
+    ) -> List[int]:
+        """
+        Add or replace the vectors for several ids in one batch.
+
+        Args:
+            item_ids: Ids of the items, one per embedding
+            embeddings: The embedding vectors
+
+        Returns:
+            The rows the vectors are stored in
+        """
+        if len(item_ids) != len(embeddings):
+            raise ValueError("item_ids and embeddings must have the same length")
+        if not item_ids:
+            return []
+        matrix = self._as_matrix(embeddings)
+        self._reserve(len(item_ids))
+
+        rows = []
+        for item_id, vector in zip(item_ids, matrix):
+            row = self.id_to_row.get(item_id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.ids.append(item_id)
+                self.id_to_row[item_id] = row
+            self.vectors[row] = vector
+            rows.append(row)
+
+        if self.centroids is not None:
+            row_array = np.asarray(rows)
+            self.assignments[row_array] = self._nearest_lists(matrix, 1)[:, 0]
+        self._maybe_train()
+        return rows
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self.size = 0
+        self.vectors = None
+        self.ids = []
+        self.id_to_row = {}
+        self.centroids = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.trained_size = 0
+
+    def _maybe_train(self) -> None:
+        if not self.approximate or self.size < self.approximate_threshold:
+            return
+        # Retrain whenever the index has doubled since the last training, so
+        # bucket sizes stay balanced as the store grows
+        if self.centroids is None or self.size >= 2 * self.trained_size:
+            self._train()
+
+    def _train(self, iterations: int = 10, sample_size: int = 65536) -> None:
+        data = self.vectors[: self.size]
+        n_lists = self.n_lists or max(1, int(np.sqrt(self.size)))
+        n_lists = min(n_lists, self.size)
+        rng = np.random.default_rng(0)
+        sample = data
+        if self.size > sample_size:
+            sample = data[rng.choice(self.size, sample_size, replace=False)]
+
+        # Spherical k-means: centroids are kept unit length so assignment is
+        # by cosine similarity, the same measure queries use
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            # Reseed empty buckets with random rows
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = self._normalize(sums)
+
+        self.centroids = centroids
+        self.assignments[: self.size] = self._nearest_lists(data, 1)[:, 0]
+        self.trained_size = self.size
+        logger.debug(f"Trained IVF embedding index: {n_lists} lists, {self.size} rows")
+
+    def _nearest_lists(self, vectors: np.ndarray, n: int) -> np.ndarray:
+        scores = vectors @ self.centroids.T
+        n = min(n, scores.shape[1])
+        if n == scores.shape[1]:
+            return np.argsort(-scores, axis=1)
+        top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+        return top
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 5,
+        rows: Optional[np.ndarray] = None,
+        exact: Optional[bool] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the rows most similar to a query vector.
+
+        Args:
+            query: The query embedding
+            k: Number of results to return
+            rows: Optional array of row numbers to restrict the search to
+            exact: Force exact (True) or approximate (False) search; by
+                default approximate search is used once IVF is trained
+
+        Returns:
+            List of (row, cosine similarity), most similar first
+        """
+        if self.size == 0 or k <= 0:
+            return []
+        query_vector = self._as_matrix([query])[0]
+        data = self.vectors[: self.size]
+
+        candidates = rows
+        use_ivf = self.centroids is not None and exact is not True
+        if use_ivf:
+            probe = self._nearest_lists(query_vector[np.newaxis], self.n_probe)[0]
+            in_probe = np.flatnonzero(np.isin(self.assignments[: self.size], probe))
+            if candidates is not None:
+                in_probe = np.intersect1d(in_probe, candidates, assume_unique=True)
+            # Too few rows near the query: fall back to an exact scan
+            if len(in_probe) >= k:
+                candidates = in_probe
+
+        if candidates is None:
+            scores = data @ query_vector
+            top = self._top_k(scores, k)
+            return [(int(row), float(scores[row])) for row in top]
+
+        candidates = np.asarray(candidates, dtype=np.intp)
+        if len(candidates) == 0:
+            return []
+        scores = data[candidates] @ query_vector
+        top = self._top_k(scores, k)
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size, memory use and search mode of the index."""
+        return {
+            "rows": self.size,
+            "dimension": self.dimension,
+            "capacity": 0 if self.vectors is None else self.vectors.shape[0],
+            "bytes": 0 if self.vectors is None else self.vectors.nbytes,
+            "mode": "ivf" if self.centroids is not None else "exact",
+            "lists": 0 if self.centroids is None else len(self.centroids),
+        }
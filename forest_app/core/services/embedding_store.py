@@ -0,0 +1,188 @@
+"""
+Embedding Storage for Forest App
+
+This module keeps memory embedding vectors out of snapshots. Vectors are
+stored as raw float32 (or float16) bytes keyed by memory id, so snapshots
+only carry memory ids and metadata and vectors are read back in one batch
+when a similarity query actually needs them.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore(ABC):
+    """Interface for embedding vector stores."""
+
+    @abstractmethod
+    async def put_many(self, embeddings: Mapping[str, Sequence[float]]) -> None:
+        """
+        Store (or replace) vectors.
+
+        Args:
+            embeddings: Mapping of memory id to embedding vector
+        """
+
+    @abstractmethod
+    async def get_many(self, memory_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Load vectors.
+
+        Args:
+            memory_ids: Ids of the memories to load
+
+        Returns:
+            Mapping of memory id to float32 vector; ids without a stored
+            vector are left out
+        """
+
+    @abstractmethod
+    async def delete_many(self, memory_ids: Iterable[str]) -> int:
+        """Delete vectors, returning how many were deleted."""
+
+    async def close(self) -> None:
+        """Release resources."""
+
+
+class SQLEmbeddingStore(EmbeddingStore):
+    """
+    Embedding store kept in a SQL table through SQLAlchemy Core.
+
+    Each row holds one vector as raw little-endian bytes, which is about a
+    quarter of the size of the same vector as JSON floats (an eighth with
+    float16) and is decoded without parsing. Database calls run on a
+    dedicated thread to keep the event loop free.
+    """
+
+    # Ids per SELECT/DELETE, below the bound parameter limits of SQLite
+    BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        url: str = "sqlite:///forest_embeddings.db",
+        engine: Optional[Any] = None,
+        dtype: str = "float32",
+    ):
+        """
+        Initialize the SQL embedding store.
+
+        Args:
+            url: SQLAlchemy database URL
+            engine: Pre-built SQLAlchemy engine, used instead of url
+            dtype: Storage precision, "float32" or "float16"
+        """
+        import sqlalchemy as sa
+
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.sa = sa
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.engine = engine or sa.create_engine(url, pool_pre_ping=True)
+        if self.engine.dialect.name == "sqlite":
+            sa.event.listen(self.engine, "connect", self._configure_sqlite)
+
+        metadata = sa.MetaData()
+        self.embeddings = sa.Table(
+            "memory_embeddings",
+            metadata,
+            sa.Column("memory_id", sa.String(64), primary_key=True),
+            sa.Column("dtype", sa.String(8), nullable=False),
+            sa.Column("dimension", sa.Integer, nullable=False),
+            sa.Column("vector", sa.LargeBinary, nullable=False),
+        )
+        metadata.create_all(self.engine)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding-store"
+        )
+
+    @staticmethod
+    def _configure_sqlite(connection, _record) -> None:
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    @staticmethod
+    def _batches(items: Sequence[str], size: int):
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    # --- Executor-thread helpers ---
+
+    def _put_many(self, rows: list) -> None:
+        table = self.embeddings
+        ids = [row["memory_id"] for row in rows]
+        with self.engine.begin() as connection:
+            for batch in self._batches(ids, self.BATCH_SIZE):
+                connection.execute(table.delete().where(table.c.memory_id.in_(batch)))
+            connection.execute(table.insert(), rows)
+
+    def _get_many(self, memory_ids: list) -> Dict[str, np.ndarray]:
+        table = self.embeddings
+        vectors = {}
+        with self.engine.connect() as connection:
+            for batch in self._batches(memory_ids, self.BATCH_SIZE):
+                result = connection.execute(
+                    self.sa.select(table.c.memory_id, table.c.dtype, table.c.vector)
+                    .where(table.c.memory_id.in_(batch))
+                )
+                for memory_id, dtype, data in result:
+                    stored_dtype = np.dtype(dtype).newbyteorder("<")
+                    vector = np.frombuffer(data, dtype=stored_dtype)
+                    vectors[memory_id] = vector.astype(np.float32)
+        return vectors
+
+    def _delete_many(self, memory_ids: list) -> int:
+        table = self.embeddings
+        deleted = 0
+        with self.engine.begin() as connection:
+            for batch in self._batches(memory_ids, self.BATCH_SIZE):
+                deleted += connection.execute(
+                    table.delete().where(table.c.memory_id.in_(batch))
+                ).rowcount
+        return deleted
+
+    # --- Public API ---
+
+    async def put_many(self, embeddings: Mapping[str, Sequence[float]]) -> None:
+        if not embeddings:
+            return
+        rows = []
+        for memory_id, embedding in embeddings.items():
+            vector = np.asarray(embedding, dtype=self.dtype)
+            rows.append(
+                {
+                    "memory_id": memory_id,
+                    "dtype": self.dtype.name,
+                    "dimension": len(vector),
+                    "vector": vector.tobytes(),
+                }
+            )
+        await self._run(self._put_many, rows)
+
+    async def get_many(self, memory_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+        memory_ids = list(memory_ids)
+        if not memory_ids:
+            return {}
+        return await self._run(self._get_many, memory_ids)
+
+    async def delete_many(self, memory_ids: Iterable[str]) -> int:
+        memory_ids = list(memory_ids)
+        if not memory_ids:
+            return 0
+        return await self._run(self._delete_many, memory_ids)
+
+    async def close(self) -> None:
+        await self._run(self.engine.dispose)
+        self.executor.shutdown(wait=True)
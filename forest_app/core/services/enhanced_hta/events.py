@@ -10,94 +10,68 @@ These components enable a reactive architecture that responds to user
 actions and keeps all parts of the system synchronized.
 """
 
-<<<<<<< HEAD
-import logging
-import asyncio
-from typing import Any, Dict, List, Optional, Union, Callable, Awaitable
-from uuid import UUID
-from datetime import datetime, timezone
-from enum import Enum
-
-from forest_app.core.event_bus import EventBus, EventType, EventData
-from forest_app.core.cache_service import CacheService
-from forest_app.core.circuit_breaker import circuit_protected
-=======
-import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from forest_app.core.cache_service import CacheService
 from forest_app.core.circuit_breaker import circuit_protected
 from forest_app.core.event_bus import EventBus, EventData, EventType
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 logger = logging.getLogger(__name__)
 
 
 class EventManager:
     """Manages event publishing and handling for the Enhanced HTA service.
-<<<<<<< HEAD
-    
-    This component centralizes event handling, providing a consistent way to respond
-    to system changes and maintain cache coherence across the application.
-    """
-    
-    def __init__(self, cache_service: Optional[CacheService] = None):
-        """Initialize the event manager with required services.
-        
-=======
 
     This component centralizes event handling, providing a consistent way to respond
     to system changes and maintain cache coherence across the application.
     """
 
+    # Event types whose repeats within a batch are redundant, keyed by the
+    # payload field identifying what they are about
+    COALESCED_EVENT_FIELDS = {EventType.TREE_EVOLVED: "tree_id"}
+
     def __init__(self, cache_service: Optional[CacheService] = None):
         """Initialize the event manager with required services.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             cache_service: Optional cache service for invalidation operations
         """
         self.event_bus = EventBus.get_instance()
         self.cache = cache_service or CacheService.get_instance()
-<<<<<<< HEAD
-        
-        # Register event handlers
-        self._register_event_handlers()
-    
-    def _register_event_handlers(self):
-        """Register listeners for relevant events."""
-        self.event_bus.subscribe(EventType.TASK_COMPLETED, self._handle_task_completed_event)
-        self.event_bus.subscribe(EventType.TREE_EVOLVED, self._handle_tree_evolved_event)
-        self.event_bus.subscribe(EventType.MEMORY_STORED, self._handle_memory_stored_event)
-=======
 
         # Register event handlers
         self._register_event_handlers()
 
     def _register_event_handlers(self):
-        """Register listeners for relevant events."""
+        """Register listeners for relevant events.
+
+        The handlers are idempotent cache invalidations, so they are registered
+        as durable subscribers: when the event bus has an event log they are
+        replayed after a crash instead of missing updates.
+        """
         self.event_bus.subscribe(
-            EventType.TASK_COMPLETED, self._handle_task_completed_event
+            EventType.TASK_COMPLETED,
+            self._handle_task_completed_event,
+            durable_id="enhanced_hta.task_completed",
         )
         self.event_bus.subscribe(
-            EventType.TREE_EVOLVED, self._handle_tree_evolved_event
+            EventType.TREE_EVOLVED,
+            self._handle_tree_evolved_event,
+            durable_id="enhanced_hta.tree_evolved",
         )
         self.event_bus.subscribe(
-            EventType.MEMORY_STORED, self._handle_memory_stored_event
+            EventType.MEMORY_STORED,
+            self._handle_memory_stored_event,
+            durable_id="enhanced_hta.memory_stored",
         )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         logger.debug("Registered event listeners for Enhanced HTA Service")
 
     async def _handle_task_completed_event(self, event: EventData):
         """Handle task completion events to update caches.
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             event: The event data containing user_id and payload
         """
@@ -106,13 +80,6 @@ class EventManager:
             return
         cache_key = f"user:{user_id}:journey"
         await self.cache.delete(cache_key)
-<<<<<<< HEAD
-        logger.debug(f"Invalidated journey cache for user {user_id} after task completion")
-
-    async def _handle_tree_evolved_event(self, event: EventData):
-        """Handle tree evolution events to update caches.
-        
-=======
         logger.debug(
             f"Invalidated journey cache for user {user_id} after task completion"
         )
@@ -120,7 +87,6 @@ class EventManager:
     async def _handle_tree_evolved_event(self, event: EventData):
         """Handle tree evolution events to update caches.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             event: The event data containing user_id and payload
         """
@@ -133,11 +99,7 @@ class EventManager:
 
     async def _handle_memory_stored_event(self, event: EventData):
         """Handle memory storage events to update relevant caches.
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             event: The event data containing user_id and payload
         """
@@ -146,17 +108,6 @@ class EventManager:
             return
         cache_key = f"user:{user_id}:pattern_analysis"
         await self.cache.delete(cache_key)
-<<<<<<< HEAD
-        logger.debug(f"Invalidated pattern analysis cache for user {user_id} after new memory")
-    
-    @circuit_protected(name="event_publishing", failure_threshold=5, recovery_timeout=30)
-    async def publish_event(self, event_type: EventType, user_id: UUID, payload: Dict[str, Any], priority: int = 1) -> bool:
-        """Publish an event to the event bus.
-        
-        This method enriches events with timestamp data and handles failures gracefully
-        using circuit breaking patterns to prevent cascading failures.
-        
-=======
         logger.debug(
             f"Invalidated pattern analysis cache for user {user_id} after new memory"
         )
@@ -176,17 +127,12 @@ class EventManager:
         This method enriches events with timestamp data and handles failures gracefully
         using circuit breaking patterns to prevent cascading failures.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             event_type: The type of event to publish
             user_id: The UUID of the affected user
             payload: Dictionary containing event data
             priority: Event priority (1-5, with 1 being highest)
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Boolean indicating success
         """
@@ -196,37 +142,6 @@ class EventManager:
                 **payload,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "event_id": str(UUID.uuid4()),
-<<<<<<< HEAD
-                "priority": priority
-            }
-            
-            # Add source information for debugging and auditing
-            if "source" not in enriched_payload:
-                enriched_payload["source"] = "enhanced_hta_service"
-                
-            await self.event_bus.publish({
-                "event_type": event_type,
-                "user_id": str(user_id),
-                "payload": enriched_payload
-            })
-            
-            logger.debug(f"Published {event_type} event for user {user_id} with priority {priority}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error publishing event {event_type}: {e}")
-            return False
-            
-    async def publish_batch_events(self, events: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Publish multiple events in a batch operation.
-        
-        Allows efficient publishing of multiple related events that should be
-        processed together, with optional grouping by type.
-        
-        Args:
-            events: List of event dictionaries with event_type, user_id, and payload keys
-            
-=======
                 "priority": priority,
             }
 
@@ -252,138 +167,100 @@ class EventManager:
             return False
 
     async def publish_batch_events(
-        self, events: List[Dict[str, Any]]
+        self, events: List[Dict[str, Any]], coalesce: bool = True
     ) -> Dict[str, int]:
         """Publish multiple events in a batch operation.
 
-        Allows efficient publishing of multiple related events that should be
-        processed together, with optional grouping by type.
+        Events are validated up front, redundant events are coalesced (for
+        example several TREE_EVOLVED events for the same tree in one batch
+        become the latest one), and the rest go through a single
+        EventBus.publish_batch call instead of one full publish per event.
 
         Args:
             events: List of event dictionaries with event_type, user_id, and payload keys
+            coalesce: Whether to collapse redundant events within the batch
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
-            Dictionary with success and failure counts
+            Dictionary with success, failure and coalesced counts
         """
-        results = {"success": 0, "failure": 0}
-<<<<<<< HEAD
-        
-=======
+        results = {"success": 0, "failure": 0, "coalesced": 0}
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        # Validate everything before publishing anything
+        valid_events = []
+        for event in events:
+            if not event.get("event_type"):
+                logger.warning("Skipping event with missing event_type")
+                results["failure"] += 1
+                continue
+            try:
+                valid_events.append(self._build_batch_event(event, timestamp))
+            except Exception as e:
+                logger.error(f"Skipping invalid event {event.get('event_type')}: {e}")
+                results["failure"] += 1
+
+        if coalesce:
+            valid_events, results["coalesced"] = self._coalesce_events(valid_events)
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         try:
-            # Group events by type for more efficient processing
-            event_groups = {}
-            for event in events:
-                event_type = event.get("event_type")
-                if not event_type:
-                    logger.warning("Skipping event with missing event_type")
-                    results["failure"] += 1
-                    continue
-<<<<<<< HEAD
-                    
-                if event_type not in event_groups:
-                    event_groups[event_type] = []
-                event_groups[event_type].append(event)
-            
-=======
-
-                if event_type not in event_groups:
-                    event_groups[event_type] = []
-                event_groups[event_type].append(event)
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Process each group concurrently
-            tasks = []
-            for event_type, group_events in event_groups.items():
-                tasks.append(self._publish_event_group(event_type, group_events))
-<<<<<<< HEAD
-                
-            group_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-=======
-
-            group_results = await asyncio.gather(*tasks, return_exceptions=True)
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Combine results
-            for group_result in group_results:
-                if isinstance(group_result, Exception):
-                    # Count exceptions as failures for the whole group
-                    results["failure"] += 1
-                    logger.error(f"Error in batch event publishing: {group_result}")
-                elif isinstance(group_result, dict):
-                    results["success"] += group_result.get("success", 0)
-                    results["failure"] += group_result.get("failure", 0)
-<<<<<<< HEAD
-            
-            return results
-            
-=======
-
-            return results
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+            await self.event_bus.publish_batch(valid_events)
+            results["success"] += len(valid_events)
         except Exception as e:
             logger.error(f"Error in batch event publishing: {e}")
-            results["failure"] = len(events)
-            return results
-<<<<<<< HEAD
-    
-    async def _publish_event_group(self, event_type: EventType, events: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Publish a group of events of the same type.
-        
-        Args:
-            event_type: The common event type for all events in the group
-            events: List of event dictionaries
-            
-=======
+            results["failure"] += len(valid_events)
 
-    async def _publish_event_group(
-        self, event_type: EventType, events: List[Dict[str, Any]]
-    ) -> Dict[str, int]:
-        """Publish a group of events of the same type.
-
-        Args:
-            event_type: The common event type for all events in the group
-            events: List of event dictionaries
+        return results
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        Returns:
-            Dictionary with success and failure counts for this group
-        """
-        results = {"success": 0, "failure": 0}
-<<<<<<< HEAD
-        
-=======
+    @staticmethod
+    def _build_batch_event(event: Dict[str, Any], timestamp: str) -> EventData:
+        """Validate an event dict, ensuring its payload has a timestamp."""
+        payload = event.get("payload") or {}
+        if "timestamp" not in payload:
+            payload = {**payload, "timestamp": timestamp}
+        user_id = event.get("user_id")
+        return EventData(
+            **{
+                **event,
+                "user_id": str(user_id) if user_id is not None else None,
+                "payload": payload,
+            }
+        )
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        for event in events:
-            try:
-                # Ensure events have timestamps
-                if "payload" in event and "timestamp" not in event["payload"]:
-<<<<<<< HEAD
-                    event["payload"]["timestamp"] = datetime.now(timezone.utc).isoformat()
-                    
-                await self.event_bus.publish(event)
-                results["success"] += 1
-                
-            except Exception as e:
-                logger.error(f"Error publishing grouped event {event_type}: {e}")
-                results["failure"] += 1
-                
-=======
-                    event["payload"]["timestamp"] = datetime.now(
-                        timezone.utc
-                    ).isoformat()
+    @classmethod
+    def _coalesce_events(cls, events: List[EventData]) -> Tuple[List[EventData], int]:
+        """Keep only the latest of each group of redundant events.
 
-                await self.event_bus.publish(event)
-                results["success"] += 1
+        Events are redundant when they share a type listed in
+        COALESCED_EVENT_FIELDS, a user, and the value of that type's payload
+        field. The surviving event records how many it replaced in
+        metadata["coalesced_count"].
 
-            except Exception as e:
-                logger.error(f"Error publishing grouped event {event_type}: {e}")
-                results["failure"] += 1
+        Args:
+            events: Validated events in publish order
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        return results
+        Returns:
+            Tuple of (remaining events in publish order, number coalesced)
+        """
+        latest: Dict[Tuple[Any, ...], int] = {}
+        merged: Dict[Tuple[Any, ...], int] = {}
+        keys: List[Optional[Tuple[Any, ...]]] = []
+        for index, event in enumerate(events):
+            field = cls.COALESCED_EVENT_FIELDS.get(event.event_type)
+            target = event.payload.get(field) if field else None
+            if target is None:
+                keys.append(None)
+                continue
+            key = (event.event_type, event.user_id, str(target))
+            keys.append(key)
+            merged[key] = merged.get(key, 0) + (key in latest)
+            latest[key] = index
+
+        remaining = []
+        for index, (event, key) in enumerate(zip(events, keys)):
+            if key is None:
+                remaining.append(event)
+            elif latest[key] == index:
+                if merged[key]:
+                    event.metadata["coalesced_count"] = merged[key]
+                remaining.append(event)
+        return remaining, len(events) - len(remaining)
@@ -12,18 +12,6 @@ the user's journey history and contextual preferences.
 
 import logging
 import uuid
-<<<<<<< HEAD
-from typing import Any, Dict, List, Optional, Union
-from uuid import UUID
-from datetime import datetime, timezone, timedelta
-from sqlalchemy import select, desc, func
-
-from forest_app.core.cache_service import CacheService, cacheable
-from forest_app.core.session_manager import SessionManager
-from forest_app.core.transaction_decorator import transaction_protected
-from forest_app.core.snapshot import MemorySnapshot
-from forest_app.persistence.models import MemorySnapshotModel, HTANodeModel
-=======
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 from uuid import UUID
@@ -35,23 +23,12 @@ from forest_app.core.session_manager import SessionManager
 from forest_app.core.snapshot import MemorySnapshot
 from forest_app.core.transaction_decorator import transaction_protected
 from forest_app.persistence.models import HTANodeModel, MemorySnapshotModel
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 logger = logging.getLogger(__name__)
 
 
 class HTAMemoryManager:
     """Manages semantic and episodic memory operations for the Enhanced HTA service.
-<<<<<<< HEAD
-    
-    This component handles memory storage, retrieval, and context integration,
-    providing a way to personalize HTA nodes based on the user's history and preferences.
-    """
-    
-    def __init__(self, session_manager: Optional[SessionManager] = None):
-        """Initialize the memory manager with session management.
-        
-=======
 
     This component handles memory storage, retrieval, and context integration,
     providing a way to personalize HTA nodes based on the user's history and preferences.
@@ -60,7 +37,6 @@ class HTAMemoryManager:
     def __init__(self, session_manager: Optional[SessionManager] = None):
         """Initialize the memory manager with session management.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             session_manager: Optional session manager for database operations
         """
@@ -70,17 +46,6 @@ class HTAMemoryManager:
     @transaction_protected()
     async def store_memory(self, user_id: UUID, memory_data: Dict[str, Any]) -> bool:
         """Store a new memory item for a user.
-<<<<<<< HEAD
-        
-        This method creates a persistent memory snapshot that preserves the user's
-        current context, preferences, and journey state. This enables a more
-        personalized and continuous experience across sessions.
-        
-        Args:
-            user_id: The UUID of the user
-            memory_data: Dictionary containing memory content
-            
-=======
 
         This method creates a persistent memory snapshot that preserves the user's
         current context, preferences, and journey state. This enables a more
@@ -90,24 +55,12 @@ class HTAMemoryManager:
             user_id: The UUID of the user
             memory_data: Dictionary containing memory content
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Boolean indicating success
         """
         try:
             # Create a new memory snapshot model
             memory_snapshot = MemorySnapshotModel(
-<<<<<<< HEAD
-                id=UUID(memory_data.get('snapshot_id', str(uuid.uuid4()))),
-                user_id=user_id,
-                snapshot_type=memory_data.get('snapshot_type', 'user_state'),
-                timestamp=memory_data.get('timestamp', datetime.now(timezone.utc)),
-                content=memory_data,
-                tags=memory_data.get('tags', []),
-                metadata=memory_data.get('metadata', {})
-            )
-            
-=======
                 id=UUID(memory_data.get("snapshot_id", str(uuid.uuid4()))),
                 user_id=user_id,
                 snapshot_type=memory_data.get("snapshot_type", "user_state"),
@@ -117,39 +70,13 @@ class HTAMemoryManager:
                 metadata=memory_data.get("metadata", {}),
             )
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             # Persist to database using session manager
             async with self.session_manager.session() as session:
                 session.add(memory_snapshot)
                 await session.commit()
-<<<<<<< HEAD
-            
-            # Invalidate any cached snapshots
-            cache_key = f"memory:user:{user_id}:latest"
-            await self.cache.delete(cache_key)
-            
-            logger.info(f"Stored memory snapshot {memory_snapshot.id} for user {user_id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to store memory for user {user_id}: {e}")
-            return False
-    
-    @cacheable(key_pattern="memory:user:{0}:latest", ttl=300)
-    async def get_latest_snapshot(self, user_id: UUID) -> Optional[MemorySnapshot]:
-        """Retrieve the latest memory snapshot for a user with caching.
-        
-        This method retrieves the most recent memory snapshot for a user, enabling
-        personalized context-aware operations. Results are cached for performance.
-        
-        Args:
-            user_id: The UUID of the user
-            
-=======
 
-            # Invalidate any cached snapshots
-            cache_key = f"memory:user:{user_id}:latest"
-            await self.cache.delete(cache_key)
+            # Invalidate cached snapshots and completion stats for this user
+            await self.cache.invalidate_tag(f"memory:user:{user_id}")
 
             logger.info(
                 f"Stored memory snapshot {memory_snapshot.id} for user {user_id}"
@@ -160,7 +87,9 @@ class HTAMemoryManager:
             logger.error(f"Failed to store memory for user {user_id}: {e}")
             return False
 
-    @cacheable(key_pattern="memory:user:{0}:latest", ttl=300)
+    @cacheable(
+        key_pattern="memory:user:{0}:latest", ttl=300, tags=["memory:user:{0}"]
+    )
     async def get_latest_snapshot(self, user_id: UUID) -> Optional[MemorySnapshot]:
         """Retrieve the latest memory snapshot for a user with caching.
 
@@ -170,7 +99,6 @@ class HTAMemoryManager:
         Args:
             user_id: The UUID of the user
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Optional MemorySnapshot containing user's latest memory context
         """
@@ -183,16 +111,6 @@ class HTAMemoryManager:
                     .order_by(desc(MemorySnapshotModel.timestamp))
                     .limit(1)
                 )
-<<<<<<< HEAD
-                
-                result = await session.execute(query)
-                model = result.scalars().first()
-                
-                if not model:
-                    logger.info(f"No memory snapshots found for user {user_id}")
-                    return None
-                    
-=======
 
                 result = await session.execute(query)
                 model = result.scalars().first()
@@ -201,7 +119,6 @@ class HTAMemoryManager:
                     logger.info(f"No memory snapshots found for user {user_id}")
                     return None
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 # Convert to domain model
                 snapshot = MemorySnapshot(
                     id=model.id,
@@ -210,28 +127,6 @@ class HTAMemoryManager:
                     content=model.content,
                     snapshot_type=model.snapshot_type,
                     tags=model.tags,
-<<<<<<< HEAD
-                    metadata=model.metadata
-                )
-                
-                logger.debug(f"Retrieved memory snapshot {snapshot.id} for user {user_id}")
-                return snapshot
-                
-        except Exception as e:
-            logger.error(f"Error retrieving memory snapshot for user {user_id}: {e}")
-            return None
-            
-    async def update_memory_with_completion(self, user_id: UUID, node: HTANodeModel) -> bool:
-        """Update user memory with details of a completed HTA node.
-        
-        This method captures task completion data into the user's memory context,
-        enhancing future personalization through their journey history.
-        
-        Args:
-            user_id: UUID of the user
-            node: HTANodeModel that was just completed
-            
-=======
                     metadata=model.metadata,
                 )
 
@@ -256,18 +151,13 @@ class HTAMemoryManager:
             user_id: UUID of the user
             node: HTANodeModel that was just completed
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Boolean indicating success
         """
         try:
             # Get existing memory snapshot or create a new one
             current_snapshot = await self.get_latest_snapshot(user_id)
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             # Build completion memory data
             completion_data = {
                 "snapshot_type": "task_completion",
@@ -278,51 +168,15 @@ class HTAMemoryManager:
                         "title": node.title,
                         "tree_id": str(node.tree_id),
                         "completed_at": datetime.now(timezone.utc).isoformat(),
-<<<<<<< HEAD
-                        "is_major_phase": getattr(node, 'is_major_phase', False)
-                    },
-                    "previous_state": current_snapshot.content if current_snapshot else {}
-=======
                         "is_major_phase": getattr(node, "is_major_phase", False),
                     },
                     "previous_state": (
                         current_snapshot.content if current_snapshot else {}
                     ),
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 },
                 "tags": ["task_completion", node.title.lower().replace(" ", "_")[:20]],
                 "metadata": {
                     "tree_id": str(node.tree_id),
-<<<<<<< HEAD
-                    "node_type": "major_phase" if getattr(node, 'is_major_phase', False) else "task"
-                }
-            }
-            
-            # Store the updated memory
-            success = await self.store_memory(user_id, completion_data)
-            
-            if success:
-                logger.info(f"Updated memory for user {user_id} with completion of node {node.id}")
-            else:
-                logger.warning(f"Failed to update memory for user {user_id} with node {node.id} completion")
-                
-            return success
-            
-        except Exception as e:
-            logger.error(f"Error updating memory with completion for user {user_id}: {e}")
-            return False
-            
-    @cacheable(key_pattern="memory:user:{0}:completion_count", ttl=600)
-    async def get_user_completion_stats(self, user_id: UUID) -> Dict[str, Any]:
-        """Get statistics on user's task completion history.
-        
-        Retrieves analytics about the user's journey to provide insights for
-        personalization and user experience enhancement.
-        
-        Args:
-            user_id: UUID of the user
-            
-=======
                     "node_type": (
                         "major_phase"
                         if getattr(node, "is_major_phase", False)
@@ -351,7 +205,11 @@ class HTAMemoryManager:
             )
             return False
 
-    @cacheable(key_pattern="memory:user:{0}:completion_count", ttl=600)
+    @cacheable(
+        key_pattern="memory:user:{0}:completion_count",
+        ttl=600,
+        tags=["memory:user:{0}"],
+    )
     async def get_user_completion_stats(self, user_id: UUID) -> Dict[str, Any]:
         """Get statistics on user's task completion history.
 
@@ -361,44 +219,12 @@ class HTAMemoryManager:
         Args:
             user_id: UUID of the user
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Dictionary with completion statistics
         """
         try:
             async with self.session_manager.session() as session:
                 # Get total completed nodes
-<<<<<<< HEAD
-                completed_query = (
-                    select(func.count())
-                    .where(
-                        (HTANodeModel.user_id == user_id) &
-                        (HTANodeModel.status == "completed")
-                    )
-                )
-                result = await session.execute(completed_query)
-                completed_count = result.scalar_one() or 0
-                
-                # Get major milestones completed
-                milestone_query = (
-                    select(func.count())
-                    .where(
-                        (HTANodeModel.user_id == user_id) &
-                        (HTANodeModel.status == "completed") &
-                        (HTANodeModel.hta_metadata['is_major_phase'].as_boolean() == True)
-                    )
-                )
-                result = await session.execute(milestone_query)
-                milestone_count = result.scalar_one() or 0
-                
-                # Get count of recent completions (last 7 days)
-                recent_query = (
-                    select(func.count())
-                    .where(
-                        (HTANodeModel.user_id == user_id) &
-                        (HTANodeModel.status == "completed") &
-                        (HTANodeModel.updated_at >= datetime.now(timezone.utc) - timedelta(days=7))
-=======
                 completed_query = select(func.count()).where(
                     (HTANodeModel.user_id == user_id)
                     & (HTANodeModel.status == "completed")
@@ -422,29 +248,18 @@ class HTAMemoryManager:
                     & (
                         HTANodeModel.updated_at
                         >= datetime.now(timezone.utc) - timedelta(days=7)
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                     )
                 )
                 result = await session.execute(recent_query)
                 recent_count = result.scalar_one() or 0
-<<<<<<< HEAD
-                
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 return {
                     "total_completed": completed_count,
                     "major_milestones": milestone_count,
                     "recent_completions": recent_count,
-<<<<<<< HEAD
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-                
-=======
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                 }
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         except Exception as e:
             logger.error(f"Error retrieving completion stats for user {user_id}: {e}")
             return {
@@ -452,9 +267,5 @@ class HTAMemoryManager:
                 "major_milestones": 0,
                 "recent_completions": 0,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
-<<<<<<< HEAD
-                "error": str(e)
-=======
                 "error": str(e),
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             }
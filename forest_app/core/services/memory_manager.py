@@ -1,19 +1,19 @@
-<<<<<<< HEAD
-from typing import List, Dict, Any, Optional
-from uuid import UUID
-from datetime import datetime
 import json
+import logging
 import os
-
-from ..protocols import SemanticMemoryProtocol
-=======
-import json
-import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+_EPOCH = datetime(1970, 1, 1)
+
 
 class MemoryEntry:
     def __init__(
@@ -21,21 +21,13 @@ class MemoryEntry:
         memory_type: str,
         content: str,
         timestamp: datetime,
-<<<<<<< HEAD
-        metadata: Optional[Dict[str, Any]] = None
-=======
         metadata: Optional[Dict[str, Any]] = None,
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     ):
         if not memory_type or not content:
             raise ValueError("memory_type and content must not be empty")
         if not isinstance(timestamp, datetime):
             raise TypeError("timestamp must be a datetime object")
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         self.memory_type = memory_type.strip()
         self.content = content.strip()
         self.timestamp = timestamp
@@ -44,39 +36,15 @@ class MemoryEntry:
     def to_dict(self) -> Dict[str, Any]:
         try:
             return {
-<<<<<<< HEAD
-                'memory_type': self.memory_type,
-                'content': self.content,
-                'timestamp': self.timestamp.isoformat(),
-                'metadata': self.metadata
-=======
                 "memory_type": self.memory_type,
                 "content": self.content,
                 "timestamp": self.timestamp.isoformat(),
                 "metadata": self.metadata,
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             }
         except Exception as e:
             raise ValueError(f"Error converting memory to dict: {e}")
 
     @classmethod
-<<<<<<< HEAD
-    def from_dict(cls, data: Dict[str, Any]) -> 'MemoryEntry':
-        if not isinstance(data, dict):
-            raise TypeError("data must be a dictionary")
-            
-        required_fields = {'memory_type', 'content', 'timestamp'}
-        missing_fields = required_fields - set(data.keys())
-        if missing_fields:
-            raise ValueError(f"Missing required fields: {missing_fields}")
-            
-        try:
-            return cls(
-                memory_type=str(data['memory_type']),
-                content=str(data['content']),
-                timestamp=datetime.fromisoformat(str(data['timestamp'])),
-                metadata=data.get('metadata', {})
-=======
     def from_dict(cls, data: Dict[str, Any]) -> "MemoryEntry":
         if not isinstance(data, dict):
             raise TypeError("data must be a dictionary")
@@ -92,23 +60,189 @@ class MemoryEntry:
                 content=str(data["content"]),
                 timestamp=datetime.fromisoformat(str(data["timestamp"])),
                 metadata=data.get("metadata", {}),
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             )
         except Exception as e:
             raise ValueError(f"Error creating memory from dict: {e}")
 
-<<<<<<< HEAD
-class SemanticMemoryManager:
-    def __init__(self, storage_path: Optional[str] = None):
-        self.storage_path = storage_path or 'memory_store.json'
-=======
+
+class _RelevanceIndex:
+    """
+    Incrementally maintained search structures for get_relevant_memories.
+
+    Keeps the lowercased content of every memory, an inverted index from
+    content token to rows, an index from lowercased metadata context value to
+    rows, and arrays of timestamps and impact multipliers, so a query scores
+    all memories with a few vectorized operations.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.contents: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.vocabulary: List[str] = []
+        # Postings / context value rows as arrays, rebuilt when they grow
+        self.arrays: Dict[Tuple[str, str], np.ndarray] = {}
+        # Query part -> (vocabulary entries scanned, tokens containing it)
+        self.containing: Dict[str, Tuple[int, List[str]]] = {}
+        self.context_values: Dict[str, List[int]] = {}
+        self.timestamps = np.empty(0, dtype=np.float64)
+        self.multipliers = np.empty(0, dtype=np.float64)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.timestamps)
+        if needed <= capacity:
+            return
+        capacity = max(64, capacity)
+        while capacity < needed:
+            capacity *= 2
+        timestamps = np.zeros(capacity, dtype=np.float64)
+        multipliers = np.ones(capacity, dtype=np.float64)
+        timestamps[: self.size] = self.timestamps[: self.size]
+        multipliers[: self.size] = self.multipliers[: self.size]
+        self.timestamps = timestamps
+        self.multipliers = multipliers
+
+    @staticmethod
+    def seconds(timestamp: datetime) -> float:
+        """Seconds since the epoch of a (naive UTC or aware) datetime."""
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return (timestamp - _EPOCH).total_seconds()
+
+    def add(self, memory: Any) -> None:
+        """Index the next memory (anything but a MemoryEntry never matches)."""
+        row = self.size
+        self._grow(row + 1)
+        self.size += 1
+        if not isinstance(memory, MemoryEntry):
+            self.contents.append("")
+            self.multipliers[row] = 0.0
+            return
+
+        content = memory.content.lower()
+        self.contents.append(content)
+        for token in set(_TOKEN_RE.findall(content)):
+            rows = self.postings.get(token)
+            if rows is None:
+                rows = self.postings[token] = []
+                self.vocabulary.append(token)
+            rows.append(row)
+
+        memory_context = memory.metadata.get("context", {})
+        if isinstance(memory_context, dict):
+            for value in memory_context.values():
+                self.context_values.setdefault(str(value).lower(), []).append(row)
+
+        self.timestamps[row] = self.seconds(memory.timestamp)
+        if memory.memory_type == "milestone":
+            impact = memory.metadata.get("impact", 0.0)
+            if isinstance(impact, (int, float)):
+                self.multipliers[row] = 1.0 + float(impact)
+
+    def _array(self, kind: str, key: str, rows: List[int]) -> np.ndarray:
+        array = self.arrays.get((kind, key))
+        if array is None or len(array) != len(rows):
+            array = self.arrays[kind, key] = np.array(rows, dtype=np.intp)
+        return array
+
+    def _posting_array(self, token: str) -> np.ndarray:
+        return self._array("token", token, self.postings.get(token, []))
+
+    def _tokens_containing(self, part: str) -> List[str]:
+        scanned, tokens = self.containing.get(part, (0, []))
+        if scanned < len(self.vocabulary):
+            # Only scan tokens first seen since the last lookup
+            tokens = tokens + [t for t in self.vocabulary[scanned:] if part in t]
+            if len(self.containing) >= 1024:
+                self.containing.clear()
+            self.containing[part] = (len(self.vocabulary), tokens)
+        return tokens
+
+    def _mask(self, rows: List[np.ndarray]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        if rows:
+            mask[np.concatenate(rows)] = True
+        return mask
+
+    def content_matches(self, context: str) -> np.ndarray:
+        """Mask of rows whose content contains the (lowercased) context."""
+        tokens = _TOKEN_RE.findall(context)
+        if not tokens:
+            return np.fromiter((context in c for c in self.contents), bool, self.size)
+
+        # A substring match has the context's inner tokens as whole tokens
+        # of the content, and its first and last tokens inside content
+        # tokens; intersect those postings, then check the exact substring
+        mask = None
+        for position, token in enumerate(tokens):
+            if 0 < position < len(tokens) - 1:
+                token_mask = self._mask([self._posting_array(token)])
+            else:
+                token_mask = self._mask(
+                    [self._posting_array(t) for t in self._tokens_containing(token)]
+                )
+            mask = token_mask if mask is None else mask & token_mask
+        if context == tokens[0]:
+            return mask  # A token containing the context is a match
+        candidates = np.flatnonzero(mask)
+        found = (context in self.contents[row] for row in candidates)
+        mask[candidates] = np.fromiter(found, bool, len(candidates))
+        return mask
+
+    def scores(self, context: str, now: datetime) -> np.ndarray:
+        """Relevance score of every indexed memory for a lowercased context."""
+        size = self.size
+        scores = self.content_matches(context).astype(np.float64)
+
+        matching = [
+            self._array("value", value, rows)
+            for value, rows in self.context_values.items()
+            if value in context
+        ]
+        if matching:
+            scores += 0.5 * np.bincount(np.concatenate(matching), minlength=size)
+
+        # Recency boost, decaying over days
+        age = self.seconds(now) - self.timestamps[:size]
+        scores += 1.0 / (1.0 + age / 86400.0)
+        scores *= self.multipliers[:size]
+        return scores
+
 
 class SemanticMemoryManager:
-    def __init__(self, storage_path: Optional[str] = None):
+    """
+    File-backed memory store.
+
+    Memories are kept in an append-only JSONL journal (one memory per line):
+    storing a memory appends one line instead of rewriting the file. Appends
+    are flushed to the OS immediately and fsynced in batches; compaction
+    rewrites the journal through a temporary file and an atomic rename.
+    """
+
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        fsync_batch_size: int = 16,
+        fsync_interval: float = 1.0,
+    ):
+        """
+        Initialize the memory manager and load the journal.
+
+        Args:
+            storage_path: Journal file path
+            fsync_batch_size: Appends between fsyncs
+            fsync_interval: Seconds after which the next append fsyncs even
+                if the batch is not full
+        """
         self.storage_path = storage_path or "memory_store.json"
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.fsync_interval = fsync_interval
         self.memories: List[MemoryEntry] = []
         self.current_context: Dict[str, Any] = {}
+        self._journal = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._index = _RelevanceIndex()
         self._load_memories()
 
     def store_milestone(self, node_id: UUID, description: str, impact: float) -> None:
@@ -121,19 +255,6 @@ class SemanticMemoryManager:
             raise TypeError("impact must be a number")
         if impact < 0.0 or impact > 1.0:
             raise ValueError("impact must be between 0.0 and 1.0")
-<<<<<<< HEAD
-            
-        try:
-            memory = MemoryEntry(
-                memory_type='milestone',
-                content=description,
-                timestamp=datetime.utcnow(),
-                metadata={
-                    'node_id': str(node_id),
-                    'impact': float(impact),
-                    'context': self.current_context.copy()
-                }
-=======
 
         try:
             memory = MemoryEntry(
@@ -145,41 +266,20 @@ class SemanticMemoryManager:
                     "impact": float(impact),
                     "context": self.current_context.copy(),
                 },
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             )
             self.memories.append(memory)
-            self._save_memories()
+            self._append_memory(memory)
         except Exception as e:
             raise ValueError(f"Error storing milestone: {e}")
 
     def store_reflection(
-<<<<<<< HEAD
-        self,
-        reflection_type: str,
-        content: str,
-        emotion: Optional[str] = None
-=======
         self, reflection_type: str, content: str, emotion: Optional[str] = None
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     ) -> None:
         """Store a reflection with optional emotional context."""
         if not reflection_type or not content:
             raise ValueError("reflection_type and content must not be empty")
         if emotion is not None and not isinstance(emotion, str):
             raise TypeError("emotion must be a string or None")
-<<<<<<< HEAD
-            
-        try:
-            memory = MemoryEntry(
-                memory_type='reflection',
-                content=content,
-                timestamp=datetime.utcnow(),
-                metadata={
-                    'reflection_type': reflection_type,
-                    'emotion': emotion,
-                    'context': self.current_context.copy()
-                }
-=======
 
         try:
             memory = MemoryEntry(
@@ -191,106 +291,45 @@ class SemanticMemoryManager:
                     "emotion": emotion,
                     "context": self.current_context.copy(),
                 },
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             )
             self.memories.append(memory)
-            self._save_memories()
+            self._append_memory(memory)
         except Exception as e:
             raise ValueError(f"Error storing reflection: {e}")
 
     def get_relevant_memories(
-<<<<<<< HEAD
-        self,
-        context: str,
-        limit: int = 5
-=======
         self, context: str, limit: int = 5
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     ) -> List[Dict[str, Any]]:
         """Retrieve memories relevant to the given context."""
         if not isinstance(context, str):
             raise TypeError("context must be a string")
         if not isinstance(limit, int) or limit < 1:
             raise ValueError("limit must be a positive integer")
-<<<<<<< HEAD
-            
-        try:
-            scored_memories = []
-            context_lower = context.lower()
-            
-            for memory in self.memories:
-                if not isinstance(memory, MemoryEntry):
-                    continue
-                    
-                score = 0.0
-                
-                # Check content match
-                if context_lower in memory.content.lower():
-                    score += 1.0
-                
-                # Check metadata context match
-                memory_context = memory.metadata.get('context', {})
-=======
 
         try:
-            scored_memories = []
-            context_lower = context.lower()
+            self._sync_index()
+            if not self.memories:
+                return []
+            scores = self._index.scores(context.lower(), datetime.utcnow())
 
-            for memory in self.memories:
-                if not isinstance(memory, MemoryEntry):
-                    continue
-
-                score = 0.0
-
-                # Check content match
-                if context_lower in memory.content.lower():
-                    score += 1.0
-
-                # Check metadata context match
-                memory_context = memory.metadata.get("context", {})
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                if isinstance(memory_context, dict):
-                    for key, value in memory_context.items():
-                        if str(value).lower() in context_lower:
-                            score += 0.5
-<<<<<<< HEAD
-                
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                # Boost recent memories
-                time_diff = (datetime.utcnow() - memory.timestamp).total_seconds()
-                recency_boost = 1.0 / (1.0 + time_diff / 86400.0)  # Decay over days
-                score += recency_boost
-<<<<<<< HEAD
-                
-                # Boost high-impact memories
-                if memory.memory_type == 'milestone':
-                    impact = memory.metadata.get('impact', 0.0)
-                    if isinstance(impact, (int, float)):
-                        score *= (1.0 + float(impact))
-                
-                if score > 0:
-                    scored_memories.append((score, memory))
-            
-=======
-
-                # Boost high-impact memories
-                if memory.memory_type == "milestone":
-                    impact = memory.metadata.get("impact", 0.0)
-                    if isinstance(impact, (int, float)):
-                        score *= 1.0 + float(impact)
-
-                if score > 0:
-                    scored_memories.append((score, memory))
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-            # Sort by relevance score and return top memories
-            scored_memories.sort(reverse=True, key=lambda x: x[0])
-            return [memory.to_dict() for _, memory in scored_memories[:limit]]
+            # Top memories by score; ties keep insertion order
+            rows = np.flatnonzero(scores > 0)
+            if limit < len(rows):
+                top = np.argpartition(-scores[rows], limit - 1)[:limit]
+                rows = rows[top]
+            rows = rows[np.lexsort((rows, -scores[rows]))]
+            return [self.memories[row].to_dict() for row in rows]
         except Exception as e:
             raise ValueError(f"Error getting relevant memories: {e}")
 
+    def _sync_index(self) -> None:
+        """Index memories added since the last query (rebuild if replaced)."""
+        index = self._index
+        if index.size > len(self.memories):
+            index = self._index = _RelevanceIndex()
+        for memory in self.memories[index.size :]:
+            index.add(memory)
+
     def update_context(self, new_context: Dict[str, Any]) -> None:
         """Update the current context for new memories."""
         if not isinstance(new_context, dict):
@@ -298,25 +337,33 @@ class SemanticMemoryManager:
         self.current_context.update(new_context)
 
     def _load_memories(self) -> None:
-        """Load memories from storage."""
+        """Load memories from storage, streaming the journal line by line."""
+        self.memories = []
+        self._index = _RelevanceIndex()
         if not os.path.exists(self.storage_path):
-            self.memories = []
             return
-<<<<<<< HEAD
-            
-        try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-=======
 
+        needs_compaction = False
         try:
             with open(self.storage_path, "r", encoding="utf-8") as f:
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                data = json.load(f)
-                if not isinstance(data, list):
-                    raise TypeError("Memory storage must contain a list")
+                first = f.read(1)
+                while first and first.isspace():
+                    first = f.read(1)
+                if first == "[":
+                    # Older stores are a single JSON list; convert them
+                    f.seek(0)
+                    data = json.load(f)
+                    if not isinstance(data, list):
+                        raise TypeError("Memory storage must contain a list")
+                    records = data
+                    needs_compaction = True
+                else:
+                    f.seek(0)
+                    records, torn = self._read_journal(f)
+                    needs_compaction = torn
                 self.memories = [
                     MemoryEntry.from_dict(memory_data)
-                    for memory_data in data
+                    for memory_data in records
                     if isinstance(memory_data, dict)
                 ]
         except (json.JSONDecodeError, TypeError) as e:
@@ -325,19 +372,91 @@ class SemanticMemoryManager:
             self.memories = []
             raise ValueError(f"Unexpected error loading memories: {e}")
 
+        if needs_compaction:
+            self.compact()
+
+    def _read_journal(self, f) -> Tuple[List[Any], bool]:
+        """Parse journal lines; a torn last line (crash mid-append) is dropped."""
+        records = []
+        pending_error = None
+        torn = False
+        for line_number, line in enumerate(f, start=1):
+            if pending_error is not None:
+                # Only the last line can be partially written
+                raise pending_error
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                pending_error = json.JSONDecodeError(
+                    f"Line {line_number}: {e.msg}", e.doc, e.pos
+                )
+        if pending_error is not None:
+            logger.warning(
+                "Dropping incomplete last record of memory journal %s",
+                self.storage_path,
+            )
+            torn = True
+        return records, torn
+
+    def _open_journal(self):
+        if self._journal is None:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.storage_path)), exist_ok=True
+            )
+            self._journal = open(self.storage_path, "a", encoding="utf-8")
+        return self._journal
+
+    def _append_memory(self, memory: MemoryEntry) -> None:
+        """Append one memory to the journal."""
+        journal = self._open_journal()
+        journal.write(json.dumps(memory.to_dict(), ensure_ascii=False) + "\n")
+        journal.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.fsync_batch_size
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Fsync journal appends not yet on disk."""
+        if self._journal is not None and self._unsynced:
+            os.fsync(self._journal.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Fsync and close the journal."""
+        if self._journal is not None:
+            self.flush()
+            self._journal.close()
+            self._journal = None
+
+    def compact(self) -> None:
+        """Rewrite the journal with the current memories, atomically."""
+        directory = os.path.dirname(os.path.abspath(self.storage_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.storage_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for memory in self.memories:
+                f.write(json.dumps(memory.to_dict(), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()  # The open handle would point at the replaced file
+        os.replace(temp_path, self.storage_path)
+        if hasattr(os, "O_DIRECTORY"):
+            # Persist the rename itself
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
     def _save_memories(self) -> None:
-        """Save memories to storage."""
+        """Save all memories to storage (compacts the journal)."""
         try:
-            data = [memory.to_dict() for memory in self.memories]
-            os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-<<<<<<< HEAD
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            raise ValueError(f"Error saving memories: {e}") 
-=======
-            with open(self.storage_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.compact()
         except Exception as e:
             raise ValueError(f"Error saving memories: {e}")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
@@ -1,48 +1,124 @@
 """Semantic Memory Service for Forest App."""
-<<<<<<< HEAD
-import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone, timedelta
-import numpy as np
-=======
 
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
+from uuid import uuid4
 
 import numpy as np
 
+from forest_app.core.services.embedding_cache import EmbeddingCache
+from forest_app.core.services.embedding_index import EmbeddingIndex
+from forest_app.core.services.embedding_store import EmbeddingStore
 from forest_app.core.services.semantic_base import SemanticMemoryManagerBase
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 from forest_app.integrations.llm import LLMClient
 
 logger = logging.getLogger(__name__)
 
-<<<<<<< HEAD
-from forest_app.core.services.semantic_base import SemanticMemoryManagerBase
 
 class SemanticMemoryManager(SemanticMemoryManagerBase):
     """Manages semantic episodic memory for the Forest application."""
-    
-    def __init__(self, llm_client: LLMClient):
-        self.llm_client = llm_client
-        self.memories: List[Dict[str, Any]] = []
-        
-    async def store_memory(self, 
-                          event_type: str,
-                          content: str,
-                          metadata: Optional[Dict[str, Any]] = None,
-                          importance: float = 0.5) -> Dict[str, Any]:
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        approximate_search: bool = False,
+        approximate_threshold: int = 10000,
+        embedding_store: Optional[EmbeddingStore] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+    ):
         """
-        Store a new memory with semantic embedding.
-        
-=======
-class SemanticMemoryManager(SemanticMemoryManagerBase):
-    """Manages semantic episodic memory for the Forest application."""
+        Initialize the memory manager.
 
-    def __init__(self, llm_client: LLMClient):
+        Args:
+            llm_client: Client used to embed memories and queries
+            approximate_search: Use approximate (IVF) search for large stores
+            approximate_threshold: Memories needed before approximate search
+                is used
+            embedding_store: Optional store for embedding vectors; when set,
+                memories (and so snapshots) hold only ids and metadata, and
+                vectors are loaded when a query first needs them
+            embedding_cache: Cache of embeddings by content (default: the
+                process-wide cache of llm_client's embedding model)
+        """
         self.llm_client = llm_client
+        self.embedding_store = embedding_store
+        self.embedding_cache = embedding_cache or EmbeddingCache.for_client(llm_client)
         self.memories: List[Dict[str, Any]] = []
+        self.memories_by_id: Dict[str, Dict[str, Any]] = {}
+        # Memory stored in each index row
+        self.index_rows: List[Dict[str, Any]] = []
+        self.index = EmbeddingIndex(
+            approximate=approximate_search,
+            approximate_threshold=approximate_threshold,
+        )
+        # Ids of stored memories whose vectors are not loaded into the index
+        self.unloaded_ids: set = set()
+
+    def _register_memories(self, memories: List[Dict[str, Any]]) -> None:
+        """Give memories an id and make them findable by it."""
+        for memory in memories:
+            memory.setdefault("id", str(uuid4()))
+            self.memories_by_id[memory["id"]] = memory
+
+    def _index_memories(
+        self, memories: List[Dict[str, Any]], embeddings: List[Any]
+    ) -> None:
+        """Add the embeddings of memories to the index."""
+        embedded = [m for m, e in zip(memories, embeddings) if len(e)]
+        embeddings = [e for e in embeddings if len(e)]
+        try:
+            rows = self.index.add_many([m["id"] for m in embedded], embeddings)
+        except ValueError:
+            # Mixed embedding sizes (e.g. after a model change): index those
+            # matching the index dimension and skip the rest
+            rows, indexed = [], []
+            for memory, embedding in zip(embedded, embeddings):
+                try:
+                    rows.append(self.index.add(memory["id"], embedding))
+                    indexed.append(memory)
+                except ValueError:
+                    logger.warning(f"Skipping embedding of memory {memory['id']}")
+            embedded = indexed
+        for row, memory in zip(rows, embedded):
+            if row == len(self.index_rows):
+                self.index_rows.append(memory)
+            else:
+                self.index_rows[row] = memory
+
+    async def _embed(self, texts: List[str]) -> List[Any]:
+        """Embed texts through the cache, fetching misses in one batch."""
+        return await self.embedding_cache.get_embeddings(self.llm_client, texts)
+
+    async def _reembed(self, memories: List[Dict[str, Any]]) -> List[Any]:
+        """Embed the content of memories that have lost their vectors."""
+        if not memories:
+            return []
+        logger.info(f"Re-embedding {len(memories)} memories without a vector")
+        embeddings = await self._embed([m["content"] for m in memories])
+        if self.embedding_store is not None:
+            await self.embedding_store.put_many(
+                {m["id"]: e for m, e in zip(memories, embeddings) if e}
+            )
+        else:
+            for memory, embedding in zip(memories, embeddings):
+                memory["embedding"] = embedding
+        return embeddings
+
+    async def _load_embeddings(self) -> None:
+        """Load vectors of stored memories not yet in the index."""
+        if not self.unloaded_ids:
+            return
+        vectors = await self.embedding_store.get_many(self.unloaded_ids)
+        memories = [self.memories_by_id[memory_id] for memory_id in vectors]
+        missing = [
+            self.memories_by_id[memory_id]
+            for memory_id in self.unloaded_ids
+            if memory_id not in vectors
+        ]
+        embeddings = list(vectors.values()) + await self._reembed(missing)
+        self._index_memories(memories + missing, embeddings)
+        self.unloaded_ids = set()
 
     async def store_memory(
         self,
@@ -54,51 +130,68 @@ class SemanticMemoryManager(SemanticMemoryManagerBase):
         """
         Store a new memory with semantic embedding.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             event_type: Type of event (e.g., 'task_completion', 'reflection', 'milestone')
             content: The actual content/description of the memory
             metadata: Additional structured data about the memory
             importance: Float between 0-1 indicating memory importance
         """
-        # Generate embedding for the content using LLM
-        embedding = await self.llm_client.get_embedding(content)
-<<<<<<< HEAD
-        
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        memory = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "event_type": event_type,
-            "content": content,
-            "metadata": metadata or {},
-            "importance": importance,
-            "embedding": embedding,
-            "access_count": 0,
-<<<<<<< HEAD
-            "last_accessed": None
-        }
-        
-        self.memories.append(memory)
-        logger.info(f"Stored new memory of type {event_type}")
-        return memory
-    
-    async def query_memories(self, 
-                           query: str, 
-                           k: int = 5,
-                           event_types: Optional[List[str]] = None,
-                           time_window_days: Optional[int] = None) -> List[Dict[str, Any]]:
+        memories = await self.store_memories(
+            [
+                {
+                    "event_type": event_type,
+                    "content": content,
+                    "metadata": metadata,
+                    "importance": importance,
+                }
+            ]
+        )
+        return memories[0]
+
+    async def store_memories(
+        self, entries: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """
-        Query memories semantically similar to the input query.
-        
-=======
-            "last_accessed": None,
-        }
+        Store several memories, embedding their content in one batch.
+
+        Args:
+            entries: Dicts with event_type and content, and optionally
+                metadata and importance (as taken by store_memory)
 
-        self.memories.append(memory)
-        logger.info(f"Stored new memory of type {event_type}")
-        return memory
+        Returns:
+            The stored memories
+        """
+        # Generate embeddings for the content using LLM
+        embeddings = await self._embed([entry["content"] for entry in entries])
+
+        memories = []
+        for entry in entries:
+            memories.append(
+                {
+                    "id": str(uuid4()),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "event_type": entry["event_type"],
+                    "content": entry["content"],
+                    "metadata": entry.get("metadata") or {},
+                    "importance": entry.get("importance", 0.5),
+                    "access_count": 0,
+                    "last_accessed": None,
+                }
+            )
+        if self.embedding_store is not None:
+            await self.embedding_store.put_many(
+                {m["id"]: e for m, e in zip(memories, embeddings) if e}
+            )
+        else:
+            for memory, embedding in zip(memories, embeddings):
+                memory["embedding"] = embedding
+
+        self.memories.extend(memories)
+        self._register_memories(memories)
+        self._index_memories(memories, [e or [] for e in embeddings])
+        for memory in memories:
+            logger.info(f"Stored new memory of type {memory['event_type']}")
+        return memories
 
     async def query_memories(
         self,
@@ -110,91 +203,67 @@ class SemanticMemoryManager(SemanticMemoryManagerBase):
         """
         Query memories semantically similar to the input query.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             query: The search query
             k: Number of memories to return
             event_types: Optional filter for specific event types
             time_window_days: Optional time window to search within
         """
-        if not self.memories:
+        await self._load_embeddings()
+        if not self.memories or not len(self.index):
             return []
-<<<<<<< HEAD
-            
-        # Get query embedding
-        query_embedding = await self.llm_client.get_embedding(query)
-        
-        # Filter memories by event type and time window if specified
-        filtered_memories = self.memories
-        if event_types:
-            filtered_memories = [m for m in filtered_memories if m["event_type"] in event_types]
-            
-        if time_window_days:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=time_window_days)
-            filtered_memories = [
-                m for m in filtered_memories 
-                if datetime.fromisoformat(m["timestamp"]) >= cutoff
-            ]
-            
-=======
 
         # Get query embedding
-        query_embedding = await self.llm_client.get_embedding(query)
-
-        # Filter memories by event type and time window if specified
-        filtered_memories = self.memories
-        if event_types:
-            filtered_memories = [
-                m for m in filtered_memories if m["event_type"] in event_types
-            ]
+        (query_embedding,) = await self._embed([query])
+
+        # Restrict the search to the index rows of matching memories if
+        # filtering by event type or time window
+        rows = None
+        if event_types or time_window_days:
+            cutoff = None
+            if time_window_days:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=time_window_days)
+            rows = np.fromiter(
+                (
+                    row
+                    for row, memory in enumerate(self.index_rows)
+                    if self._matches(memory, event_types, cutoff)
+                ),
+                dtype=np.intp,
+            )
+            if not len(rows):
+                return []
+
+        # One matrix-vector product over the normalized embeddings
+        top_memories = [
+            self.index_rows[row]
+            for row, _ in self.index.search(query_embedding, k, rows=rows)
+        ]
 
-        if time_window_days:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=time_window_days)
-            filtered_memories = [
-                m
-                for m in filtered_memories
-                if datetime.fromisoformat(m["timestamp"]) >= cutoff
-            ]
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        # Calculate cosine similarities
-        similarities = []
-        for memory in filtered_memories:
-            similarity = self._cosine_similarity(query_embedding, memory["embedding"])
-            similarities.append((similarity, memory))
-<<<<<<< HEAD
-            
-        # Sort by similarity and return top k
-        similarities.sort(reverse=True, key=lambda x: x[0])
-        top_memories = [memory for _, memory in similarities[:k]]
-        
         # Update access stats
         for memory in top_memories:
             await self.update_memory_stats(memory["id"], 1)
-            
-=======
-
-        # Sort by similarity and return top k
-        similarities.sort(reverse=True, key=lambda x: x[0])
-        top_memories = [memory for _, memory in similarities[:k]]
 
-        # Update access stats
-        for memory in top_memories:
-            await self.update_memory_stats(memory["id"], 1)
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         return top_memories
 
+    def _matches(
+        self,
+        memory: Dict[str, Any],
+        event_types: Optional[List[str]],
+        cutoff: Optional[datetime],
+    ) -> bool:
+        if event_types and memory["event_type"] not in event_types:
+            return False
+        if cutoff and datetime.fromisoformat(memory["timestamp"]) < cutoff:
+            return False
+        return True
+
     async def get_recent_memories(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get the most recent memories."""
         sorted_memories = sorted(
             self.memories,
             key=lambda x: datetime.fromisoformat(x["timestamp"]),
-<<<<<<< HEAD
-            reverse=True
-=======
             reverse=True,
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         )
         return sorted_memories[:limit]
 
@@ -205,42 +274,30 @@ class SemanticMemoryManager(SemanticMemoryManagerBase):
 
         # Combine all memory content for theme extraction
         combined_content = " ".join([m["content"] for m in memories])
-<<<<<<< HEAD
-        
-        # Use LLM to extract themes
-        themes = await self.llm_client.extract_themes(combined_content)
-        return themes
-    
-=======
 
         # Use LLM to extract themes
         themes = await self.llm_client.extract_themes(combined_content)
         return themes
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def update_memory_stats(self, memory_id: str, access_count: int = 1) -> bool:
         """Update access statistics for a memory."""
-        for memory in self.memories:
-            if memory.get("id") == memory_id:
-                memory["access_count"] += access_count
-                memory["last_accessed"] = datetime.now(timezone.utc).isoformat()
-                return True
-        return False
-<<<<<<< HEAD
-    
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+        memory = self.memories_by_id.get(memory_id)
+        if memory is None or memory.get("id") != memory_id:
+            # Ids changed in place by a caller: rebuild the id map
+            self.memories_by_id = {m["id"]: m for m in self.memories if "id" in m}
+            memory = self.memories_by_id.get(memory_id)
+            if memory is None:
+                return False
+        memory["access_count"] += access_count
+        memory["last_accessed"] = datetime.now(timezone.utc).isoformat()
+        return True
+
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         vec1 = np.array(vec1)
         vec2 = np.array(vec2)
         return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def get_memory_stats(self) -> Dict[str, Any]:
         """Get statistics about stored memories."""
         if not self.memories:
@@ -248,15 +305,6 @@ class SemanticMemoryManager(SemanticMemoryManagerBase):
                 "total_memories": 0,
                 "memory_types": {},
                 "avg_importance": 0,
-<<<<<<< HEAD
-                "avg_access_count": 0
-            }
-            
-        memory_types = {}
-        total_importance = 0
-        total_access_count = 0
-        
-=======
                 "avg_access_count": 0,
             }
 
@@ -264,33 +312,16 @@ class SemanticMemoryManager(SemanticMemoryManagerBase):
         total_importance = 0
         total_access_count = 0
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         for memory in self.memories:
             event_type = memory["event_type"]
             memory_types[event_type] = memory_types.get(event_type, 0) + 1
             total_importance += memory["importance"]
             total_access_count += memory["access_count"]
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         return {
             "total_memories": len(self.memories),
             "memory_types": memory_types,
             "avg_importance": total_importance / len(self.memories),
-<<<<<<< HEAD
-            "avg_access_count": total_access_count / len(self.memories)
-        }
-        
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert memory store to serializable dictionary."""
-        return {
-            "memories": self.memories,
-            "stats": self.get_memory_stats()
-        }
-        
-=======
             "avg_access_count": total_access_count / len(self.memories),
         }
 
@@ -298,13 +329,37 @@ class SemanticMemoryManager(SemanticMemoryManagerBase):
         """Convert memory store to serializable dictionary."""
         return {"memories": self.memories, "stats": self.get_memory_stats()}
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def from_dict(self, data: Dict[str, Any]) -> None:
         """Load memories from dictionary."""
         if "memories" in data and isinstance(data["memories"], list):
             self.memories = data["memories"]
-<<<<<<< HEAD
-            logger.info(f"Loaded {len(self.memories)} memories from dictionary") 
-=======
+            self.memories_by_id = {}
+            self.index_rows = []
+            self.index.clear()
+            self._register_memories(self.memories)
+
+            inline = [m for m in self.memories if m.get("embedding")]
+            embeddings = [m["embedding"] for m in inline]
+            if self.embedding_store is not None:
+                # Move vectors still stored inline (older data) to the store
+                if inline:
+                    await self.embedding_store.put_many(
+                        {m["id"]: e for m, e in zip(inline, embeddings)}
+                    )
+                    for memory in inline:
+                        del memory["embedding"]
+                inline_ids = {m["id"] for m in inline}
+                self.unloaded_ids = {
+                    m["id"] for m in self.memories if m["id"] not in inline_ids
+                }
+            else:
+                # Re-embed memories whose vectors were dropped, in one batch
+                missing = [
+                    m
+                    for m in self.memories
+                    if not m.get("embedding") and "content" in m
+                ]
+                embeddings += await self._reembed(missing)
+                inline += missing
+            self._index_memories(inline, embeddings)
             logger.info(f"Loaded {len(self.memories)} memories from dictionary")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
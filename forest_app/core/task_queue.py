@@ -7,145 +7,359 @@ journey remains responsive even during complex analysis or processing.
 """
 
 import asyncio
-<<<<<<< HEAD
-import logging
 import functools
+import heapq
+import importlib
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import random
+import socket
+import time
 import traceback
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, Awaitable
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timezone
 import uuid
-import json
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from forest_app.core.task_scheduler import FairScheduler
+from forest_app.core.task_store import StoredTask, TaskArchive, TaskBackend
 
 logger = logging.getLogger(__name__)
 
-class TaskQueue:
-    """
-    An asynchronous task queue for processing intensive background operations.
-    
-=======
-import functools
-import logging
-import traceback
-import uuid
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional, Set
 
-logger = logging.getLogger(__name__)
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class TaskRecord:
+    """Compact per-task metadata; timestamps are epoch seconds."""
+
+    __slots__ = (
+        "task_id",
+        "function",
+        "arg_count",
+        "kwarg_count",
+        "priority",
+        "status",
+        "queued_at",
+        "started_at",
+        "finished_at",
+        "error",
+        "user_metadata",
+        "attempts",
+        "dedup_key",
+        "dedup_window",
+        "concurrency_key",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        function: str,
+        arg_count: int,
+        kwarg_count: int,
+        priority: int,
+        user_metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.task_id = task_id
+        self.function = function
+        self.arg_count = arg_count
+        self.kwarg_count = kwarg_count
+        self.priority = priority
+        self.status = "queued"
+        self.queued_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[Dict[str, str]] = None
+        self.user_metadata = user_metadata or {}
+        self.attempts = 0
+        self.dedup_key: Optional[str] = None
+        self.dedup_window = 0.0
+        self.concurrency_key: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metadata in the dict shape returned by get_task_metadata."""
+        metadata = {
+            "id": self.task_id,
+            "function": self.function,
+            "args_summary": (
+                f"{self.arg_count} positional, {self.kwarg_count} keyword args"
+            ),
+            "priority": self.priority,
+            "status": self.status,
+            "queued_at": _isoformat(self.queued_at),
+            "user_metadata": self.user_metadata,
+            "attempts": self.attempts,
+        }
+        if self.started_at is not None:
+            metadata["started_at"] = _isoformat(self.started_at)
+        if self.finished_at is not None:
+            finished_key = "failed_at" if self.status == "failed" else "completed_at"
+            metadata[finished_key] = _isoformat(self.finished_at)
+        if self.error is not None:
+            metadata["error"] = self.error
+        return metadata
+
+
+class RecurringSchedule:
+    """A function enqueued as a new task at a fixed interval."""
+
+    __slots__ = (
+        "schedule_id",
+        "func",
+        "args",
+        "kwargs",
+        "interval",
+        "priority",
+        "metadata",
+        "next_run",
+        "runs",
+    )
+
+    def __init__(
+        self,
+        schedule_id: str,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        interval: float,
+        priority: int,
+        metadata: Dict[str, Any],
+    ):
+        self.schedule_id = schedule_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.priority = priority
+        self.metadata = metadata
+        self.next_run = 0.0  # Event loop time of the next run
+        self.runs = 0
+
+
+def _seconds(value: Union[float, timedelta]) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
 
 
 class TaskQueue:
     """
     An asynchronous task queue for processing intensive background operations.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     This implementation uses asyncio and provides:
     - Task prioritization
     - Scheduled task execution
     - Result caching
     - Failure handling with exponential backoff
+    - Optional durable backend, so queued work survives restarts and crashes
+
+    With a backend, tasks whose function can be found again after a restart
+    (registered with register_task, or importable module-level functions)
+    and whose arguments can be pickled are stored durably and leased while
+    they run. Other tasks run in memory only.
+
+    Sync functions run in a thread pool. CPU-bound ones can be enqueued with
+    cpu_bound=True to run in a process pool instead, where they neither hold
+    the GIL against the event loop nor compete with each other for it.
+
+    Enqueueing with a dedup_key attaches duplicates to the task already
+    queued or running under that key. Tasks sharing a concurrency_key run at
+    most max_concurrent_per_key at a time; the others wait without occupying
+    a worker.
+
+    Tasks are scheduled fairly between users (user_metadata["user_id"]):
+    within a priority level each user gets a turn in proportion to their
+    weight, optionally capped in concurrent tasks and rate limited.
+
+    Tasks can be enqueued to run later (run_at/delay) or on a recurring
+    schedule. Both wait on one timer heap, armed with a single event loop
+    timer for the earliest due task.
     """
-<<<<<<< HEAD
-    
-    def __init__(self, max_workers: int = 10, result_ttl: int = 300):
-        """
-        Initialize the task queue.
-        
-=======
 
-    def __init__(self, max_workers: int = 10, result_ttl: int = 300):
+    def __init__(
+        self,
+        max_workers: int = 10,
+        result_ttl: int = 300,
+        metadata_ttl: int = 3600,
+        max_retained_tasks: int = 10000,
+        archive: Optional[TaskArchive] = None,
+        max_traceback_length: int = 4000,
+        backend: Optional[TaskBackend] = None,
+        max_attempts: int = 1,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 300.0,
+        lease_timeout: float = 60.0,
+        process_workers: int = 0,
+        process_initializer: Optional[Callable[..., Any]] = None,
+        process_initargs: tuple = (),
+        process_start_method: str = "spawn",
+        dedup_window: float = 0.0,
+        max_concurrent_per_key: int = 1,
+        tenant_max_concurrency: Optional[int] = None,
+        tenant_rate_limit: Optional[float] = None,
+        tenant_burst: int = 10,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ):
         """
         Initialize the task queue.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             max_workers: Maximum number of worker tasks to run simultaneously
             result_ttl: Time (in seconds) to keep task results in cache
+            metadata_ttl: Time (in seconds) to keep metadata of finished tasks
+            max_retained_tasks: Maximum number of finished tasks whose results
+                and metadata are kept in memory (oldest are pruned first)
+            archive: Optional archive receiving metadata of pruned tasks
+            max_traceback_length: Characters of traceback kept for failed
+                tasks (the innermost frames are kept)
+            backend: Optional durable backend for queued tasks
+            max_attempts: Runs per task before it is failed (and dead-lettered
+                with a backend); 1 disables retries. Runs whose lease expired
+                (the worker was lost) count too
+            retry_base_delay: Delay (in seconds) before the first retry,
+                doubled for each further attempt
+            retry_max_delay: Upper bound (in seconds) on the retry delay
+            lease_timeout: Visibility timeout (in seconds) of a backend lease;
+                running tasks renew it, crashed workers let it expire
+            process_workers: Worker processes for cpu_bound tasks (0 disables
+                the process lane)
+            process_initializer: Optional picklable function run once in each
+                worker process (e.g. to load models)
+            process_initargs: Arguments for process_initializer
+            process_start_method: multiprocessing start method for worker
+                processes; spawn is safe with the threads an app already runs
+            dedup_window: Default time (in seconds) a dedup key keeps
+                attaching duplicates after its task completed successfully
+                (0 only while it is queued or running)
+            max_concurrent_per_key: Tasks sharing a concurrency key that may
+                run at the same time
+            tenant_max_concurrency: Maximum tasks of one user running at once
+                (None for no cap)
+            tenant_rate_limit: Tasks per second one user may start (None for
+                no limit)
+            tenant_burst: Tasks a user may start at once after being idle
+                when rate limited
+            tenant_weights: Optional scheduling share per user ID (default 1)
         """
-        self.queue = asyncio.PriorityQueue()
+        self.queue = FairScheduler(
+            max_running_per_tenant=tenant_max_concurrency,
+            rate_limit=tenant_rate_limit,
+            burst=tenant_burst,
+            weights=tenant_weights,
+        )
+        self.queued: Set[str] = set()  # Task IDs waiting in the queue
         self.processing: Set[str] = set()  # Currently processing task IDs
+        # Set when a task's result is stored; created on demand by waiters
+        self.completion_events: Dict[str, asyncio.Event] = {}
         self.results: Dict[str, Any] = {}  # Task results
-        self.result_timestamps: Dict[str, float] = {}  # When results were stored
+        # When results were stored, oldest first
+        self.result_timestamps: "OrderedDict[str, float]" = OrderedDict()
         self.max_workers = max_workers
         self.result_ttl = result_ttl
+        self.metadata_ttl = metadata_ttl
+        self.max_retained_tasks = max_retained_tasks
+        self.max_traceback_length = max_traceback_length
         self.running = False
         self.worker_tasks: List[asyncio.Task] = []
+        self.cleanup_task: Optional[asyncio.Task] = None
         self.thread_pool = ThreadPoolExecutor(max_workers=max_workers)
-<<<<<<< HEAD
-        
-        # Task metadata for better monitoring
-        self.task_metadata: Dict[str, Dict[str, Any]] = {}
-        
-        logger.info(f"TaskQueue initialized with {max_workers} workers and {result_ttl}s result TTL")
-    
-=======
+
+        # Process lane for CPU-bound tasks, created on start
+        self.process_workers = process_workers
+        self.process_initializer = process_initializer
+        self.process_initargs = process_initargs
+        self.process_start_method = process_start_method
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.cpu_bound: Set[str] = set()  # Task IDs routed to the process pool
 
         # Task metadata for better monitoring
-        self.task_metadata: Dict[str, Dict[str, Any]] = {}
+        self.task_metadata: Dict[str, TaskRecord] = {}
+        # When tasks finished, oldest first (drives metadata retention)
+        self.finished_timestamps: "OrderedDict[str, float]" = OrderedDict()
+
+        # Metadata of pruned tasks waiting to be written to the archive
+        self.archive = archive
+        self.archive_batch_size = 100
+        self.archive_buffer: List[Dict[str, Any]] = []
+        self.archive_task: Optional[asyncio.Task] = None
+
+        # Retries
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retry_timers: Dict[str, asyncio.TimerHandle] = {}
+
+        # Durable backend
+        self.backend = backend
+        self.lease_timeout = lease_timeout
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.durable: Set[str] = set()  # Task IDs stored in the backend
+        self.recovery_task: Optional[asyncio.Task] = None
+
+        # De-duplication: key -> task ID that duplicates attach to, and the
+        # expiry (time.monotonic) of keys whose task has completed
+        self.dedup_window = dedup_window
+        self.dedup_keys: Dict[str, str] = {}
+        self.dedup_expiry: Dict[str, float] = {}
+
+        # Per-key concurrency: running count, and tasks parked until a slot
+        # frees up
+        self.max_concurrent_per_key = max(1, max_concurrent_per_key)
+        self.key_running: Dict[str, int] = {}
+        self.key_waiting: Dict[str, Deque[tuple]] = {}
+
+        # Delayed tasks and recurring schedules: heap of (loop time, seq, kind,
+        # item), with one loop timer armed for the earliest
+        self.timer_heap: List[Tuple[float, int, str, Any]] = []
+        self.timer_seq = itertools.count()
+        self.timer_handle: Optional[asyncio.TimerHandle] = None
+        self.schedules: Dict[str, RecurringSchedule] = {}
+        self.schedule_tasks: Set[asyncio.Task] = set()
+
+        # Functions that can be found by name after a restart
+        self.task_registry: Dict[str, Callable[..., Any]] = {}
+        self.task_names: Dict[Callable[..., Any], str] = {}
 
         logger.info(
             f"TaskQueue initialized with {max_workers} workers and {result_ttl}s result TTL"
         )
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def start(self):
         """Start the task queue workers."""
         if self.running:
             return
-<<<<<<< HEAD
-            
-        self.running = True
-        
-=======
 
         self.running = True
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+        if self.process_workers > 0:
+            await self._start_process_pool()
+
         # Create worker tasks
         for i in range(self.max_workers):
             worker = asyncio.create_task(self._worker(i))
             self.worker_tasks.append(worker)
-<<<<<<< HEAD
-            
-        # Create task for cache cleanup
-        asyncio.create_task(self._cleanup_results())
-        
-        logger.info("TaskQueue workers started")
-        
-=======
 
         # Create task for cache cleanup
-        asyncio.create_task(self._cleanup_results())
+        self.cleanup_task = asyncio.create_task(self._cleanup_results())
+
+        # Pick up durable tasks left by previous runs and expired leases
+        if self.backend is not None:
+            self.recovery_task = asyncio.create_task(self._recover_tasks())
+
+        self._arm_timer()
 
         logger.info("TaskQueue workers started")
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def stop(self):
         """Gracefully stop the task queue."""
         if not self.running:
             return
-<<<<<<< HEAD
-            
-        self.running = False
-        
-        # Wait for all worker tasks to complete
-        for worker in self.worker_tasks:
-            worker.cancel()
-            
-        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
-        self.worker_tasks = []
-        
-        # Close thread pool
-        self.thread_pool.shutdown(wait=True)
-        
-        logger.info("TaskQueue workers stopped")
-        
-    async def _worker(self, worker_id: int):
-        """
-        Background worker to process tasks from the queue.
-        
-=======
 
         self.running = False
 
@@ -153,11 +367,35 @@ class TaskQueue:
         for worker in self.worker_tasks:
             worker.cancel()
 
+        for task in (self.cleanup_task, self.recovery_task):
+            if task is not None:
+                task.cancel()
+                self.worker_tasks.append(task)
+        self.cleanup_task = self.recovery_task = None
+
+        # Durable retries are picked up again from the backend after restart
+        for timer in self.retry_timers.values():
+            timer.cancel()
+        self.retry_timers.clear()
+
+        # Delayed tasks and schedules stay on the heap until the next start
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+
         await asyncio.gather(*self.worker_tasks, return_exceptions=True)
         self.worker_tasks = []
 
+        self.queue.close()
+
+        # Write out metadata pruned since the last archive flush
+        await self._flush_archive()
+
         # Close thread pool
         self.thread_pool.shutdown(wait=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True, cancel_futures=True)
+            self.process_pool = None
 
         logger.info("TaskQueue workers stopped")
 
@@ -165,236 +403,595 @@ class TaskQueue:
         """
         Background worker to process tasks from the queue.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             worker_id: Identifier for this worker
         """
         logger.debug(f"Worker {worker_id} started")
-<<<<<<< HEAD
-        
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         while self.running:
             try:
                 # Get task from queue with timeout
                 try:
-                    priority, task_id, func, args, kwargs = await asyncio.wait_for(
+                    tenant, entry = await asyncio.wait_for(
                         self.queue.get(), timeout=1.0
                     )
                 except asyncio.TimeoutError:
                     continue
-<<<<<<< HEAD
-                    
-                # Mark task as processing
-                self.processing.add(task_id)
-                
-                # Update task metadata
-                self.task_metadata[task_id]["status"] = "processing"
-                self.task_metadata[task_id]["started_at"] = datetime.now(timezone.utc).isoformat()
-                
-                logger.debug(f"Worker {worker_id} processing task {task_id} (priority: {priority})")
-                
-=======
-
-                # Mark task as processing
-                self.processing.add(task_id)
-
-                # Update task metadata
-                self.task_metadata[task_id]["status"] = "processing"
-                self.task_metadata[task_id]["started_at"] = datetime.now(
-                    timezone.utc
-                ).isoformat()
+                priority, task_id, func, args, kwargs = entry
 
-                logger.debug(
-                    f"Worker {worker_id} processing task {task_id} (priority: {priority})"
-                )
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                # Execute the task
+                self.queued.discard(task_id)
                 try:
-                    if asyncio.iscoroutinefunction(func):
-                        result = await func(*args, **kwargs)
-                    else:
-                        # Run sync functions in thread pool
-                        loop = asyncio.get_running_loop()
-                        result = await loop.run_in_executor(
-<<<<<<< HEAD
-                            self.thread_pool, 
-                            functools.partial(func, *args, **kwargs)
-                        )
-                        
-                    # Store the result
-                    self.results[task_id] = {
-                        "status": "completed",
-                        "result": result
-                    }
-                    
-                    # Update task metadata
-                    self.task_metadata[task_id]["status"] = "completed"
-                    self.task_metadata[task_id]["completed_at"] = datetime.now(timezone.utc).isoformat()
-                    
-                    logger.info(f"Task {task_id} completed successfully")
-                    
-                except Exception as e:
-                    error_details = {
-                        "error": str(e),
-                        "traceback": traceback.format_exc()
-                    }
-                    
-                    # Store the error
-                    self.results[task_id] = {
-                        "status": "failed",
-                        "error": error_details
-                    }
-                    
-                    # Update task metadata
-                    self.task_metadata[task_id]["status"] = "failed"
-                    self.task_metadata[task_id]["error"] = error_details
-                    self.task_metadata[task_id]["failed_at"] = datetime.now(timezone.utc).isoformat()
-                    
-                    logger.error(f"Task {task_id} failed: {e}")
-                
-                # Record timestamp for cache expiration
-                self.result_timestamps[task_id] = asyncio.get_event_loop().time()
-                
-                # Remove from processing set
-                self.processing.remove(task_id)
-                
-                # Mark queue task as done
-                self.queue.task_done()
-                
+                    await self._run_task(
+                        worker_id, priority, task_id, func, args, kwargs
+                    )
+                finally:
+                    # Mark queue task as done, freeing the user's slot
+                    self.queue.task_done(tenant)
+
             except asyncio.CancelledError:
                 logger.info(f"Worker {worker_id} cancelled")
                 break
-                
+
             except Exception as e:
                 logger.error(f"Error in worker {worker_id}: {e}")
-                
+
         logger.debug(f"Worker {worker_id} stopped")
-        
-=======
-                            self.thread_pool, functools.partial(func, *args, **kwargs)
-                        )
 
-                    # Store the result
-                    self.results[task_id] = {"status": "completed", "result": result}
+    async def _run_task(
+        self,
+        worker_id: int,
+        priority: int,
+        task_id: str,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+    ) -> None:
+        """Run one task taken from the queue, once its concurrency key allows."""
+        record = self.task_metadata.get(task_id)
+        if record is None or task_id in self.processing:
+            # Pruned, or a duplicate entry of a task already running here
+            return
 
-                    # Update task metadata
-                    self.task_metadata[task_id]["status"] = "completed"
-                    self.task_metadata[task_id]["completed_at"] = datetime.now(
-                        timezone.utc
-                    ).isoformat()
+        key = record.concurrency_key
+        if key is None:
+            await self._execute_task(worker_id, record, priority, func, args, kwargs)
+            return
 
-                    logger.info(f"Task {task_id} completed successfully")
+        if self.key_running.get(key, 0) >= self.max_concurrent_per_key:
+            # Parked until a task with the same key finishes
+            self.queued.add(task_id)
+            self.key_waiting.setdefault(key, deque()).append(
+                (priority, task_id, func, args, kwargs)
+            )
+            return
 
-                except Exception as e:
-                    error_details = {
-                        "error": str(e),
-                        "traceback": traceback.format_exc(),
-                    }
+        self.key_running[key] = self.key_running.get(key, 0) + 1
+        try:
+            await self._execute_task(worker_id, record, priority, func, args, kwargs)
+        finally:
+            self._release_key(key)
+
+    def _release_key(self, key: str) -> None:
+        """Free a concurrency slot and queue the next task waiting for it."""
+        running = self.key_running.get(key, 0) - 1
+        if running > 0:
+            self.key_running[key] = running
+        else:
+            self.key_running.pop(key, None)
+
+        waiting = self.key_waiting.get(key)
+        if waiting:
+            self._schedule(waiting.popleft())
+            if not waiting:
+                del self.key_waiting[key]
+
+    async def _execute_task(
+        self,
+        worker_id: int,
+        record: TaskRecord,
+        priority: int,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+    ) -> None:
+        """Execute a task and record its outcome."""
+        task_id = record.task_id
+
+        # Mark task as processing
+        self.processing.add(task_id)
+
+        heartbeat = None
+        lease_exhausted = False
+        if task_id in self.durable:
+            try:
+                attempt = await self.backend.lease(
+                    task_id, self.worker_id, self.lease_timeout
+                )
+            except Exception:
+                # Still queued in the backend; recovery picks it up again
+                self.processing.discard(task_id)
+                raise
+            if attempt is None:
+                # Finished, or leased by a worker in another process
+                self.processing.discard(task_id)
+                self._forget_durable(task_id)
+                return
+            record.attempts = attempt
+            # Every allowed attempt was leased and never finished (e.g. the
+            # task keeps crashing its worker): dead-letter it instead of
+            # running it again
+            lease_exhausted = attempt > self.max_attempts
+            heartbeat = asyncio.create_task(self._renew_lease(task_id))
+        else:
+            record.attempts += 1
+
+        record.status = "processing"
+        record.started_at = time.time()
+
+        logger.debug(
+            f"Worker {worker_id} processing task {task_id} (priority: {priority}, "
+            f"attempt {record.attempts})"
+        )
 
-                    # Store the error
-                    self.results[task_id] = {"status": "failed", "error": error_details}
+        # Execute the task
+        try:
+            if lease_exhausted:
+                raise RuntimeError(
+                    f"Lease expired on all {self.max_attempts} attempt(s) "
+                    "without an outcome; the worker running the task was lost"
+                )
+            if task_id in self.cpu_bound:
+                result = await self._run_in_process(func, args, kwargs)
+            elif asyncio.iscoroutinefunction(func):
+                result = await func(*args, **kwargs)
+            else:
+                # Run sync functions in thread pool
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self.thread_pool, functools.partial(func, *args, **kwargs)
+                )
+            outcome = {"status": "completed", "result": result}
+            error_details = None
+        except Exception as e:
+            error_details = {
+                "error": str(e),
+                "traceback": traceback.format_exc()[-self.max_traceback_length :],
+            }
+            outcome = {"status": "failed", "error": error_details}
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            self.processing.discard(task_id)
+
+        if error_details is not None and record.attempts < self.max_attempts:
+            record.error = error_details
+            await self._schedule_retry(record, (priority, task_id, func, args, kwargs))
+            return
+
+        self.cpu_bound.discard(task_id)
+        if task_id in self.durable:
+            self.durable.discard(task_id)
+            try:
+                encoded = self._encode_result(task_id, outcome)
+                if error_details is None:
+                    await self.backend.complete(task_id, self.worker_id, encoded)
+                else:
+                    await self.backend.dead_letter(
+                        task_id, self.worker_id, encoded, error_details["error"]
+                    )
+            except Exception as e:
+                logger.error(f"Error storing outcome of task {task_id}: {e}")
+
+        # Store the result and update task metadata
+        self.results[task_id] = outcome
+        record.status = outcome["status"]
+        if error_details is None:
+            logger.info(f"Task {task_id} completed successfully")
+        else:
+            record.error = error_details
+            logger.error(
+                f"Task {task_id} failed after {record.attempts} attempt(s): "
+                f"{error_details['error']}"
+            )
+
+        # Record timestamps for cache expiration
+        record.finished_at = time.time()
+        now = time.monotonic()
+        self.result_timestamps[task_id] = now
+        self.finished_timestamps[task_id] = now
+
+        # Successful results keep absorbing duplicates for their window;
+        # failures can be enqueued again straight away
+        if record.dedup_key is not None:
+            if error_details is None and record.dedup_window > 0:
+                self.dedup_expiry[record.dedup_key] = now + record.dedup_window
+            else:
+                self._release_dedup_key(record)
+
+        # Wake anyone waiting
+        self._notify_completion(task_id)
+
+        # Keep retained results and metadata within their bounds
+        self._prune(now)
+
+    async def _start_process_pool(self) -> None:
+        """Create the process pool and start every worker process up front."""
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=self.process_workers,
+            mp_context=multiprocessing.get_context(self.process_start_method),
+            initializer=self.process_initializer,
+            initargs=self.process_initargs,
+        )
+        # Worker processes start on demand; warm them all so the first
+        # CPU-bound tasks don't pay for interpreter start-up and initializer
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.process_pool, os.getpid)
+                for _ in range(self.process_workers)
+            )
+        )
+
+    async def _run_in_process(
+        self, func: Callable[..., Any], args: tuple, kwargs: dict
+    ) -> Any:
+        """Run a task in the process pool, replacing the pool if it broke."""
+        pool = self.process_pool
+        if pool is None:
+            raise RuntimeError("Process lane is not running")
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                pool, functools.partial(func, *args, **kwargs)
+            )
+        except BrokenProcessPool:
+            # A worker process died (e.g. killed for memory); the pool is
+            # unusable, so later tasks get a fresh one
+            if self.process_pool is pool and self.running:
+                logger.error("Process pool broke, starting a new one")
+                pool.shutdown(wait=False, cancel_futures=True)
+                await self._start_process_pool()
+            raise
+
+    async def _schedule_retry(self, record: TaskRecord, entry: tuple) -> None:
+        """Queue a failed task again after an exponential backoff delay."""
+        task_id = record.task_id
+        delay = min(
+            self.retry_max_delay, self.retry_base_delay * 2 ** (record.attempts - 1)
+        )
+        # Jitter keeps tasks that failed together from retrying together
+        delay *= random.uniform(0.5, 1.0)
 
-                    # Update task metadata
-                    self.task_metadata[task_id]["status"] = "failed"
-                    self.task_metadata[task_id]["error"] = error_details
-                    self.task_metadata[task_id]["failed_at"] = datetime.now(
-                        timezone.utc
-                    ).isoformat()
+        record.status = "retrying"
+        self.queued.add(task_id)
 
-                    logger.error(f"Task {task_id} failed: {e}")
+        if task_id in self.durable:
+            try:
+                await self.backend.retry(
+                    task_id, self.worker_id, time.time() + delay, record.error["error"]
+                )
+            except Exception as e:
+                logger.error(f"Error releasing task {task_id} for retry: {e}")
 
-                # Record timestamp for cache expiration
-                self.result_timestamps[task_id] = asyncio.get_event_loop().time()
+        logger.warning(
+            f"Task {task_id} failed (attempt {record.attempts}/{self.max_attempts}), "
+            f"retrying in {delay:.1f}s"
+        )
+        loop = asyncio.get_running_loop()
+        self.retry_timers[task_id] = loop.call_later(delay, self._requeue, entry)
+
+    def _requeue(self, entry: tuple) -> None:
+        task_id = entry[1]
+        self.retry_timers.pop(task_id, None)
+        record = self.task_metadata.get(task_id)
+        if record is not None:
+            record.status = "queued"
+        self._schedule(entry)
+
+    async def _renew_lease(self, task_id: str) -> None:
+        """Keep a running task's lease from expiring."""
+        while True:
+            await asyncio.sleep(self.lease_timeout / 3)
+            try:
+                if not await self.backend.extend_lease(
+                    task_id, self.worker_id, self.lease_timeout
+                ):
+                    logger.warning(f"Lease on running task {task_id} was lost")
+                    return
+            except Exception as e:
+                logger.error(f"Error renewing lease on task {task_id}: {e}")
+
+    def _encode_result(self, task_id: str, outcome: Dict[str, Any]) -> bytes:
+        try:
+            return pickle.dumps(outcome, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Result of task {task_id} is not picklable: {e}")
+            return pickle.dumps({"status": outcome["status"], "result": None})
+
+    def _find_duplicate(self, dedup_key: str) -> Optional[str]:
+        """Task ID a new task with this dedup key should attach to, if any."""
+        task_id = self.dedup_keys.get(dedup_key)
+        if task_id is None:
+            return None
+        expiry = self.dedup_expiry.get(dedup_key)
+        if (expiry is not None and expiry <= time.monotonic()) or (
+            task_id not in self.task_metadata and task_id not in self.results
+        ):
+            self.dedup_keys.pop(dedup_key, None)
+            self.dedup_expiry.pop(dedup_key, None)
+            return None
+        return task_id
 
-                # Remove from processing set
-                self.processing.remove(task_id)
+    def _release_dedup_key(self, record: TaskRecord) -> None:
+        if self.dedup_keys.get(record.dedup_key) == record.task_id:
+            del self.dedup_keys[record.dedup_key]
+            self.dedup_expiry.pop(record.dedup_key, None)
+
+    def _forget_durable(self, task_id: str) -> None:
+        """Drop local state of a durable task handled elsewhere."""
+        self.durable.discard(task_id)
+        record = self.task_metadata.pop(task_id, None)
+        if record is not None and record.dedup_key is not None:
+            self._release_dedup_key(record)
+        # Waiters then read the outcome from the backend
+        self._notify_completion(task_id)
+
+    async def _recover_tasks(self) -> None:
+        """
+        Periodically queue durable tasks that are available in the backend
+        but not queued here: tasks left by a previous run, retries whose
+        worker went away, and tasks whose lease expired.
+        """
+        interval = max(0.05, self.lease_timeout / 2)
+        while self.running:
+            try:
+                for stored in await self.backend.ready(limit=100):
+                    task_id = stored.task_id
+                    if (
+                        task_id in self.queued
+                        or task_id in self.processing
+                        or task_id in self.retry_timers
+                    ):
+                        continue
+                    try:
+                        func = self._resolve_task(stored.task_ref)
+                        args, kwargs = pickle.loads(stored.payload)
+                    except Exception as e:
+                        logger.error(
+                            f"Cannot restore durable task {task_id} "
+                            f"({stored.task_ref}): {e}"
+                        )
+                        continue
+
+                    record = TaskRecord(
+                        task_id,
+                        getattr(func, "__name__", stored.task_ref),
+                        len(args),
+                        len(kwargs),
+                        stored.priority,
+                        stored.metadata,
+                    )
+                    record.attempts = stored.attempts
+                    self.task_metadata[task_id] = record
+                    self.durable.add(task_id)
+                    self.queued.add(task_id)
+                    self._schedule((stored.priority, task_id, func, args, kwargs))
+                    logger.info(f"Recovered durable task {task_id}")
 
-                # Mark queue task as done
-                self.queue.task_done()
+                await asyncio.sleep(interval)
 
             except asyncio.CancelledError:
-                logger.info(f"Worker {worker_id} cancelled")
                 break
 
             except Exception as e:
-                logger.error(f"Error in worker {worker_id}: {e}")
+                logger.error(f"Error recovering durable tasks: {e}")
+                await asyncio.sleep(interval)
 
-        logger.debug(f"Worker {worker_id} stopped")
+    def register_task(
+        self, func: Callable[..., Any], name: Optional[str] = None
+    ) -> Callable[..., Any]:
+        """
+        Register a function so durable tasks can find it after a restart.
+
+        Needed for functions that are not importable by module and name,
+        such as methods of service instances. Usable as a decorator.
+
+        Args:
+            func: The function (or bound method) tasks will run
+            name: Stable name to store (default: module:qualname)
+
+        Returns:
+            The function, unchanged
+        """
+        name = name or f"{func.__module__}:{func.__qualname__}"
+        self.task_registry[name] = func
+        self.task_names[func] = name
+        return func
+
+    def _task_ref(self, func: Callable[..., Any]) -> Optional[str]:
+        """Name under which a function can be found again, if any."""
+        try:
+            name = self.task_names.get(func)
+        except TypeError:  # Unhashable callable
+            return None
+        if name is not None:
+            return name
+        module = getattr(func, "__module__", None)
+        qualname = getattr(func, "__qualname__", "")
+        if not module or "<" in qualname:  # Lambdas and nested functions
+            return None
+        try:
+            target = importlib.import_module(module)
+            for part in qualname.split("."):
+                target = getattr(target, part)
+        except (ImportError, AttributeError):
+            return None
+        return f"{module}:{qualname}" if target is func else None
+
+    def _resolve_task(self, task_ref: str) -> Callable[..., Any]:
+        func = self.task_registry.get(task_ref)
+        if func is not None:
+            return func
+        module, _, qualname = task_ref.partition(":")
+        target = importlib.import_module(module)
+        for part in qualname.split("."):
+            target = getattr(target, part)
+        return target
+
+    def _add_timer(self, due: float, kind: str, item: Any) -> None:
+        """Put a delayed task entry or a schedule on the timer heap."""
+        heapq.heappush(self.timer_heap, (due, next(self.timer_seq), kind, item))
+        if self.timer_heap[0][3] is item or self.timer_handle is None:
+            self._arm_timer()
+
+    def _arm_timer(self) -> None:
+        """Point the loop timer at the earliest entry of the timer heap."""
+        if self.timer_handle is not None:
+            if self.timer_heap and self.timer_handle.when() == self.timer_heap[0][0]:
+                return
+            self.timer_handle.cancel()
+            self.timer_handle = None
+        if self.timer_heap:
+            self.timer_handle = asyncio.get_running_loop().call_at(
+                self.timer_heap[0][0], self._fire_timers
+            )
+
+    def _fire_timers(self) -> None:
+        """Release every delayed task and schedule run that is due."""
+        self.timer_handle = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        while self.timer_heap and self.timer_heap[0][0] <= now:
+            due, _, kind, item = heapq.heappop(self.timer_heap)
+            if kind == "task":
+                record = self.task_metadata.get(item[1])
+                if record is not None:
+                    record.status = "queued"
+                    self._schedule(item)
+            else:
+                schedule = self.schedules.get(item)
+                # Entries of cancelled (or replaced) schedules are dropped
+                if schedule is not None and schedule.next_run == due:
+                    self._run_schedule(schedule, due, now)
+        self._arm_timer()
+
+    def _run_schedule(
+        self, schedule: RecurringSchedule, due: float, now: float
+    ) -> None:
+        """Enqueue one run of a recurring schedule and plan the next."""
+        schedule.runs += 1
+        task = asyncio.create_task(self._enqueue_schedule_run(schedule))
+        self.schedule_tasks.add(task)
+        task.add_done_callback(self.schedule_tasks.discard)
+
+        # Fixed rate; runs missed while the loop was busy are skipped
+        schedule.next_run = due + schedule.interval
+        if schedule.next_run <= now:
+            skipped = int((now - schedule.next_run) // schedule.interval) + 1
+            schedule.next_run += skipped * schedule.interval
+        self._add_timer(schedule.next_run, "schedule", schedule.schedule_id)
+
+    async def _enqueue_schedule_run(self, schedule: RecurringSchedule) -> None:
+        try:
+            await self.enqueue(
+                schedule.func,
+                *schedule.args,
+                priority=schedule.priority,
+                metadata={**schedule.metadata, "schedule_id": schedule.schedule_id},
+                # A run still pending absorbs the next one instead of piling up
+                dedup_key=f"schedule:{schedule.schedule_id}",
+                **schedule.kwargs,
+            )
+        except Exception as e:
+            logger.error(
+                f"Error enqueueing run of schedule {schedule.schedule_id}: {e}"
+            )
+
+    def _schedule(self, entry: tuple) -> None:
+        """Hand a task entry to the scheduler under its user."""
+        record = self.task_metadata.get(entry[1])
+        user_id = record.user_metadata.get("user_id") if record is not None else None
+        self.queue.put_nowait(entry, str(user_id) if user_id else None)
+
+    def _notify_completion(self, task_id: str) -> None:
+        """Wake every waiter of a task whose result has been stored."""
+        event = self.completion_events.pop(task_id, None)
+        if event is not None:
+            event.set()
+
+    def _prune(self, now: float) -> None:
+        """
+        Drop results and metadata of finished tasks beyond the retention
+        limits. Both are ordered oldest first, so this only touches the
+        entries being removed.
+
+        Args:
+            now: Current time.monotonic() value
+        """
+        results = self.result_timestamps
+        while results and (
+            len(results) > self.max_retained_tasks
+            or now - next(iter(results.values())) > self.result_ttl
+        ):
+            task_id, _ = results.popitem(last=False)
+            self.results.pop(task_id, None)
+
+        finished = self.finished_timestamps
+        while finished and (
+            len(finished) > self.max_retained_tasks
+            or now - next(iter(finished.values())) > self.metadata_ttl
+        ):
+            task_id, _ = finished.popitem(last=False)
+            record = self.task_metadata.pop(task_id, None)
+            if record is not None and self.archive is not None:
+                self.archive_buffer.append(record.to_dict())
+
+        if len(self.archive_buffer) >= self.archive_batch_size and (
+            self.archive_task is None or self.archive_task.done()
+        ):
+            self.archive_task = asyncio.create_task(self._flush_archive())
+
+    async def _flush_archive(self) -> None:
+        """Write buffered metadata of pruned tasks to the archive."""
+        while self.archive is not None and self.archive_buffer:
+            records, self.archive_buffer = self.archive_buffer, []
+            try:
+                await self.archive.archive(records)
+            except Exception as e:
+                logger.error(f"Error archiving metadata of {len(records)} tasks: {e}")
+                return
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     async def _cleanup_results(self):
-        """Periodically clean up expired results."""
+        """Periodically clean up expired results and metadata."""
         while self.running:
             try:
-                current_time = asyncio.get_event_loop().time()
-                expired_tasks = []
-<<<<<<< HEAD
-                
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                # Find expired results
-                for task_id, timestamp in self.result_timestamps.items():
-                    if current_time - timestamp > self.result_ttl:
-                        expired_tasks.append(task_id)
-<<<<<<< HEAD
-                
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-                # Remove expired results
-                for task_id in expired_tasks:
-                    if task_id in self.results:
-                        del self.results[task_id]
-                    if task_id in self.result_timestamps:
-                        del self.result_timestamps[task_id]
-                    if task_id in self.task_metadata:
-                        # Archive metadata if needed instead of deleting
-                        self.task_metadata[task_id]["archived"] = True
-<<<<<<< HEAD
-                
-                if expired_tasks:
-                    logger.debug(f"Cleaned up {len(expired_tasks)} expired task results")
-                
                 # Sleep for a while
                 await asyncio.sleep(60)  # Check every minute
-                
-            except asyncio.CancelledError:
-                break
-                
-            except Exception as e:
-                logger.error(f"Error in result cleanup: {e}")
-                await asyncio.sleep(60)  # Still sleep on error
-    
-    async def enqueue(self, 
-                     func: Callable[..., Any], 
-                     *args, 
-                     priority: int = 5,
-                     task_id: Optional[str] = None,
-                     metadata: Optional[Dict[str, Any]] = None,
-                     **kwargs) -> str:
-        """
-        Add a task to the queue.
-        
-=======
 
-                if expired_tasks:
+                results_before = len(self.results)
+                records_before = len(self.task_metadata)
+                now = time.monotonic()
+                self._prune(now)
+                await self._flush_archive()
+                for dedup_key, expiry in list(self.dedup_expiry.items()):
+                    if expiry <= now:
+                        self.dedup_keys.pop(dedup_key, None)
+                        del self.dedup_expiry[dedup_key]
+                if self.backend is not None:
+                    await self.backend.prune(time.time() - self.metadata_ttl)
+
+                if results_before != len(self.results):
                     logger.debug(
-                        f"Cleaned up {len(expired_tasks)} expired task results"
+                        f"Cleaned up {results_before - len(self.results)} expired "
+                        f"task results and {records_before - len(self.task_metadata)} "
+                        f"task records"
                     )
 
-                # Sleep for a while
-                await asyncio.sleep(60)  # Check every minute
-
             except asyncio.CancelledError:
                 break
 
             except Exception as e:
                 logger.error(f"Error in result cleanup: {e}")
-                await asyncio.sleep(60)  # Still sleep on error
 
     async def enqueue(
         self,
@@ -403,73 +1000,218 @@ class TaskQueue:
         priority: int = 5,
         task_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        cpu_bound: bool = False,
+        dedup_key: Optional[str] = None,
+        dedup_window: Optional[float] = None,
+        concurrency_key: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+        delay: Optional[Union[float, timedelta]] = None,
         **kwargs,
     ) -> str:
         """
         Add a task to the queue.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Args:
             func: The function to execute
             *args: Positional arguments for the function
             priority: Priority level (lower numbers = higher priority)
             task_id: Optional custom task ID (generates UUID if not provided)
             metadata: Optional task metadata
+            cpu_bound: Run the task in the process pool; the function and its
+                arguments must be picklable and the function must be sync
+            dedup_key: Optional key identifying the work; while a task with
+                the same key is queued or running (or within its dedup
+                window after completing), its task ID is returned instead of
+                queueing a new task
+            dedup_window: Seconds the key keeps deduplicating after the task
+                completed (default: the queue's dedup_window)
+            concurrency_key: Optional key limiting how many tasks sharing it
+                run at once (see max_concurrent_per_key)
+            run_at: Optional time to run the task at (naive datetimes are
+                taken as UTC)
+            delay: Optional delay (seconds or timedelta) before running the
+                task; mutually exclusive with run_at
             **kwargs: Keyword arguments for the function
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
-            Task ID that can be used to get the result
+            Task ID that can be used to get the result (the existing task's ID
+            for a duplicate)
+
+        Raises:
+            ValueError: If a cpu_bound task cannot run in the process pool, or
+                both run_at and delay are given
         """
+        if run_at is not None and delay is not None:
+            raise ValueError("Pass either run_at or delay, not both")
+        if run_at is not None:
+            if run_at.tzinfo is None:
+                run_at = run_at.replace(tzinfo=timezone.utc)
+            delay = (run_at - datetime.now(timezone.utc)).total_seconds()
+        delay = _seconds(delay) if delay is not None else 0.0
+
+        if dedup_key is not None:
+            existing = self._find_duplicate(dedup_key)
+            if existing is not None:
+                logger.debug(
+                    f"Task with dedup key {dedup_key} already queued: {existing}"
+                )
+                return existing
+
         # Generate task ID if not provided
         if task_id is None:
             task_id = str(uuid.uuid4())
-<<<<<<< HEAD
-            
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+        if cpu_bound:
+            self._check_process_task(func, args, kwargs)
+
         # Store task metadata
-        self.task_metadata[task_id] = {
-            "id": task_id,
-            "function": func.__name__,
-            "args_summary": f"{len(args)} positional, {len(kwargs)} keyword args",
-            "priority": priority,
-            "status": "queued",
-            "queued_at": datetime.now(timezone.utc).isoformat(),
-<<<<<<< HEAD
-            "user_metadata": metadata or {}
-        }
-        
+        record = TaskRecord(
+            task_id,
+            getattr(func, "__name__", type(func).__name__),
+            len(args),
+            len(kwargs),
+            priority,
+            metadata,
+        )
+        self.task_metadata[task_id] = record
+        record.concurrency_key = concurrency_key
+        if dedup_key is not None:
+            record.dedup_key = dedup_key
+            record.dedup_window = (
+                self.dedup_window if dedup_window is None else dedup_window
+            )
+            self.dedup_keys[dedup_key] = task_id
+
+        # Store durably when the task can be restored after a restart
+        if self.backend is not None:
+            task_ref = self._task_ref(func)
+            payload = None
+            if task_ref is not None:
+                try:
+                    payload = pickle.dumps((args, kwargs), pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    logger.debug(f"Arguments of task {task_id} are not picklable: {e}")
+            if payload is not None:
+                await self.backend.put(
+                    StoredTask(task_id, task_ref, payload, priority, 0, metadata or {}),
+                    available_at=time.time() + delay if delay > 0 else None,
+                )
+                self.durable.add(task_id)
+            else:
+                logger.debug(f"Task {task_id} ({func!r}) will not be stored durably")
+
         # Add task to queue
-        await self.queue.put((priority, task_id, func, args, kwargs))
-        
+        if cpu_bound:
+            self.cpu_bound.add(task_id)
+        self.queued.add(task_id)
+        entry = (priority, task_id, func, args, kwargs)
+        if delay > 0:
+            record.status = "scheduled"
+            self._add_timer(asyncio.get_running_loop().time() + delay, "task", entry)
+            logger.info(f"Task {task_id} scheduled to run in {delay:.1f}s")
+            return task_id
+
+        self._schedule(entry)
+
         logger.info(f"Task {task_id} added to queue with priority {priority}")
         return task_id
-        
-    async def get_result(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+
+    async def schedule_recurring(
+        self,
+        func: Callable[..., Any],
+        *args,
+        interval: Union[float, timedelta],
+        priority: int = 5,
+        metadata: Optional[Dict[str, Any]] = None,
+        start_delay: Optional[Union[float, timedelta]] = None,
+        schedule_id: Optional[str] = None,
+        **kwargs,
+    ) -> str:
         """
-        Get the result of a task.
-        
+        Enqueue a function as a new task at a fixed interval.
+
+        A run is skipped while the previous one is still queued or running.
+
         Args:
-            task_id: ID of the task
-            timeout: Optional timeout in seconds to wait for result
-            
+            func: The function to execute
+            *args: Positional arguments for the function
+            interval: Time between runs (seconds or timedelta)
+            priority: Priority level of each run's task
+            metadata: Optional metadata for each run's task (schedule_id is
+                added)
+            start_delay: Delay before the first run (default: one interval)
+            schedule_id: Optional custom schedule ID (replaces an existing
+                schedule with that ID)
+            **kwargs: Keyword arguments for the function
+
         Returns:
-            Dictionary with task status and result/error
-            
-=======
-            "user_metadata": metadata or {},
-        }
+            Schedule ID that can be used to cancel the schedule
+        """
+        interval = _seconds(interval)
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        schedule_id = schedule_id or str(uuid.uuid4())
 
-        # Add task to queue
-        await self.queue.put((priority, task_id, func, args, kwargs))
+        schedule = RecurringSchedule(
+            schedule_id, func, args, kwargs, interval, priority, metadata or {}
+        )
+        first_delay = interval if start_delay is None else _seconds(start_delay)
+        schedule.next_run = asyncio.get_running_loop().time() + first_delay
+        self.schedules[schedule_id] = schedule
+        self._add_timer(schedule.next_run, "schedule", schedule_id)
 
-        logger.info(f"Task {task_id} added to queue with priority {priority}")
-        return task_id
+        logger.info(f"Schedule {schedule_id} added: {func.__name__} every {interval}s")
+        return schedule_id
+
+    def cancel_schedule(self, schedule_id: str) -> bool:
+        """
+        Stop a recurring schedule (a run already enqueued still completes).
+
+        Args:
+            schedule_id: ID of the schedule
+
+        Returns:
+            True if the schedule existed
+        """
+        # Its timer entry is dropped when it comes due
+        return self.schedules.pop(schedule_id, None) is not None
+
+    def get_schedules(self) -> List[Dict[str, Any]]:
+        """
+        Get the recurring schedules.
+
+        Returns:
+            List of schedule summaries with their next run time
+        """
+        loop_now = asyncio.get_running_loop().time()
+        return [
+            {
+                "id": schedule.schedule_id,
+                "function": getattr(schedule.func, "__name__", repr(schedule.func)),
+                "interval": schedule.interval,
+                "runs": schedule.runs,
+                "next_run_at": _isoformat(time.time() + schedule.next_run - loop_now),
+            }
+            for schedule in self.schedules.values()
+        ]
+
+    def _check_process_task(
+        self, func: Callable[..., Any], args: tuple, kwargs: dict
+    ) -> None:
+        """Fail fast on tasks the process pool could not run."""
+        if self.process_workers <= 0:
+            raise ValueError("TaskQueue has no process lane (process_workers=0)")
+        if asyncio.iscoroutinefunction(func):
+            raise ValueError(
+                f"Coroutine function {func.__qualname__} cannot run in a process pool"
+            )
+        try:
+            pickle.dumps(functools.partial(func, *args, **kwargs))
+        except Exception as e:
+            raise ValueError(
+                f"Task {getattr(func, '__qualname__', func)!r} cannot run in a "
+                f"process pool, it is not picklable: {e}"
+            ) from e
 
     async def get_result(
         self, task_id: str, timeout: Optional[float] = None
@@ -484,71 +1226,92 @@ class TaskQueue:
         Returns:
             Dictionary with task status and result/error
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Raises:
             asyncio.TimeoutError: If timeout is reached and task is not complete
             KeyError: If task ID is not found
         """
-        start_time = asyncio.get_event_loop().time()
-<<<<<<< HEAD
-        
-=======
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
-        while timeout is None or asyncio.get_event_loop().time() - start_time < timeout:
-            # Check if task has a result
+        # Check if task has a result
+        if task_id in self.results:
+            return self.results[task_id]
+
+        # Check if task exists but is still queued or processing
+        if task_id in self.processing or task_id in self.queued:
+            # Wait for the worker to signal completion
+            event = self.completion_events.get(task_id)
+            if event is None:
+                event = self.completion_events[task_id] = asyncio.Event()
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(f"Timeout waiting for task {task_id}")
             if task_id in self.results:
                 return self.results[task_id]
-<<<<<<< HEAD
-                
-            # Check if task exists but is still processing
-            if task_id in self.processing or any(task_id == item[1] for item in self.queue._queue):
-                # Task exists but not done yet, wait a bit
-                await asyncio.sleep(0.1)
-                continue
-                
-            # Task not found in queue or processing
-            if task_id not in self.task_metadata:
-                raise KeyError(f"Task {task_id} not found")
-                
-            # Task exists in metadata but not in queue or processing, something went wrong
-            return {
-                "status": "unknown",
-                "error": "Task exists in metadata but not in queue or processing"
-            }
-            
-        # Timeout reached
-        raise asyncio.TimeoutError(f"Timeout waiting for task {task_id}")
-        
-    def get_task_metadata(self, task_id: str) -> Optional[Dict[str, Any]]:
+
+        # Task run by another process, or before a restart
+        if self.backend is not None and task_id not in self.task_metadata:
+            stored = await self._get_stored_result(task_id, timeout)
+            if stored is not None:
+                return stored
+
+        # Task not found in queue or processing
+        if task_id not in self.task_metadata:
+            raise KeyError(f"Task {task_id} not found")
+
+        # Task exists in metadata but not in queue or processing, something went wrong
+        return {
+            "status": "unknown",
+            "error": "Task exists in metadata but not in queue or processing",
+        }
+
+    async def _get_stored_result(
+        self, task_id: str, timeout: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """Read a task's outcome from the backend, waiting while it runs."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stored = await self.backend.get_result(task_id)
+            if stored is None:
+                return None
+            status, encoded = stored
+            if encoded is not None:
+                return pickle.loads(encoded)
+            # Queued or leased by another process; no local signal to wait on
+            if deadline is not None and time.monotonic() >= deadline:
+                raise asyncio.TimeoutError(f"Timeout waiting for task {task_id}")
+            await asyncio.sleep(0.5)
+
+    async def get_dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
-        Get metadata for a task.
-        
+        Get tasks that failed on every attempt (requires a backend).
+
+        Args:
+            limit: Maximum number of tasks to return
+
+        Returns:
+            List of dead-lettered task summaries, most recent first
+        """
+        if self.backend is None:
+            return []
+        return await self.backend.dead_letters(limit)
+
+    async def requeue_dead_letter(self, task_id: str) -> bool:
+        """
+        Run a dead-lettered task again with a fresh set of attempts.
+
         Args:
             task_id: ID of the task
-            
-=======
-
-            # Check if task exists but is still processing
-            if task_id in self.processing or any(
-                task_id == item[1] for item in self.queue._queue
-            ):
-                # Task exists but not done yet, wait a bit
-                await asyncio.sleep(0.1)
-                continue
-
-            # Task not found in queue or processing
-            if task_id not in self.task_metadata:
-                raise KeyError(f"Task {task_id} not found")
-
-            # Task exists in metadata but not in queue or processing, something went wrong
-            return {
-                "status": "unknown",
-                "error": "Task exists in metadata but not in queue or processing",
-            }
 
-        # Timeout reached
-        raise asyncio.TimeoutError(f"Timeout waiting for task {task_id}")
+        Returns:
+            True if the task was dead-lettered and has been requeued
+        """
+        if self.backend is None or not await self.backend.requeue(task_id):
+            return False
+        # Forget the old outcome; recovery queues the task again
+        self.results.pop(task_id, None)
+        self.result_timestamps.pop(task_id, None)
+        self.finished_timestamps.pop(task_id, None)
+        self.task_metadata.pop(task_id, None)
+        return True
 
     def get_task_metadata(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -557,24 +1320,37 @@ class TaskQueue:
         Args:
             task_id: ID of the task
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
-            Dictionary with task metadata or None if not found
+            Dictionary with task metadata or None if not found (or pruned)
         """
-        return self.task_metadata.get(task_id)
-<<<<<<< HEAD
-        
-    async def get_queue_status(self) -> Dict[str, Any]:
+        record = self.task_metadata.get(task_id)
+        return record.to_dict() if record is not None else None
+
+    async def get_archived_task_metadata(
+        self, task_id: str
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get the current status of the task queue.
-        
-=======
+        Get metadata for a task, falling back to the archive for tasks that
+        have been pruned from memory.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Dictionary with task metadata or None if not found
+        """
+        metadata = self.get_task_metadata(task_id)
+        if metadata is not None or self.archive is None:
+            return metadata
+        for buffered in self.archive_buffer:
+            if buffered["id"] == task_id:
+                return buffered
+        return await self.archive.get(task_id)
 
     async def get_queue_status(self) -> Dict[str, Any]:
         """
         Get the current status of the task queue.
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Returns:
             Dictionary with queue statistics
         """
@@ -583,24 +1359,28 @@ class TaskQueue:
             "workers": len(self.worker_tasks),
             "queue_size": self.queue.qsize(),
             "processing": len(self.processing),
-<<<<<<< HEAD
-            "completed_results": len(self.results)
+            "completed_results": len(self.results),
+            "retained_tasks": len(self.task_metadata),
+            "retrying": len(self.retry_timers),
+            "durable": len(self.durable),
+            "process_workers": self.process_workers if self.process_pool else 0,
+            "cpu_bound": len(self.cpu_bound),
+            "waiting_on_keys": sum(len(w) for w in self.key_waiting.values()),
+            "tenants": len(self.queue.tenants),
+            "scheduled": sum(1 for item in self.timer_heap if item[2] == "task"),
+            "recurring_schedules": len(self.schedules),
         }
-        
-    async def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+
+    def get_tenant_stats(self) -> Dict[str, Dict[str, Any]]:
         """
-        Wait for a task to complete and return its result.
-        
-        Args:
-            task_id: ID of the task
-            timeout: Optional timeout in seconds
-            
+        Get scheduling statistics per user with queued or running tasks.
+
         Returns:
-            Task result
-            
-=======
-            "completed_results": len(self.results),
-        }
+            Dictionary of user ID to queued/running counts, whether the user
+            is currently throttled, and wait times (in seconds) from enqueue
+            to start: average, maximum and that of the oldest queued task
+        """
+        return self.queue.get_tenant_stats()
 
     async def wait_for_task(
         self, task_id: str, timeout: Optional[float] = None
@@ -615,7 +1395,6 @@ class TaskQueue:
         Returns:
             Task result
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         Raises:
             asyncio.TimeoutError: If timeout is reached
             KeyError: If task is not found
@@ -626,13 +1405,8 @@ class TaskQueue:
     def get_instance(cls):
         """Return the global singleton instance of TaskQueue."""
         from forest_app.core.task_queue import task_queue
-<<<<<<< HEAD
-        return task_queue
-
-=======
 
         return task_queue
 
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 task_queue = TaskQueue()
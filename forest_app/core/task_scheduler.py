@@ -0,0 +1,282 @@
+"""
+Fair Task Scheduling for Forest App
+
+This module provides the scheduler the TaskQueue dispatches from. Tasks are
+grouped by tenant (the user a task runs for), so one user queueing many
+background jobs cannot starve everyone else's work at the same priority.
+
+Scheduling is start-time fair queuing: each task gets a virtual start tag
+when queued, advancing by 1/weight per task of its tenant, and workers take
+the task with the lowest (priority, tag). Priority stays strict; within a
+priority level tenants are served in proportion to their weights. Tenants
+can also be capped in concurrent tasks and rate limited with a token bucket;
+a tenant over either limit is parked until a task finishes or a token
+arrives, without holding up other tenants.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Tenant of tasks not tagged with a user
+DEFAULT_TENANT = "__default__"
+
+
+class _Tenant:
+    """Scheduling state for one tenant."""
+
+    __slots__ = (
+        "name",
+        "weight",
+        "entries",
+        "last_tag",
+        "running",
+        "parked",
+        "tokens",
+        "refilled_at",
+        "refill_timer",
+        "dispatched",
+        "wait_total",
+        "wait_max",
+    )
+
+    def __init__(self, name: str, weight: float, burst: float):
+        self.name = name
+        self.weight = weight
+        # Heap of (priority, tag, seq, queued_at, entry)
+        self.entries: List[tuple] = []
+        self.last_tag = 0.0
+        self.running = 0
+        self.parked = False
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+        self.refill_timer: Optional[asyncio.TimerHandle] = None
+        self.dispatched = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class FairScheduler:
+    """
+    Priority- and tenant-aware queue of task entries.
+
+    Used like an asyncio.Queue: put() entries with their tenant, get() the
+    next (tenant, entry) to run, and call task_done(tenant) when it has run.
+    """
+
+    def __init__(
+        self,
+        max_running_per_tenant: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        burst: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_running_per_tenant: Maximum tasks of one tenant running at
+                once (None for no cap)
+            rate_limit: Tasks per second each tenant may start (None for no
+                limit)
+            burst: Token bucket size, i.e. tasks a tenant may start at once
+                after being idle
+            weights: Optional share per tenant (default 1.0)
+        """
+        self.max_running_per_tenant = max_running_per_tenant
+        self.rate_limit = rate_limit
+        self.burst = max(1, burst)
+        self.weights = weights or {}
+
+        self.tenants: Dict[str, _Tenant] = {}
+        # Heap of (priority, tag, seq, tenant name): head of each tenant
+        # that can run now; entries whose head has changed are skipped
+        self.ready: List[Tuple[int, float, int, str]] = []
+        self.virtual_time = 0.0
+        self.counter = itertools.count()
+        self.size = 0
+        self.getters: Deque[asyncio.Future] = deque()
+
+    def qsize(self) -> int:
+        """Number of entries waiting, across all tenants."""
+        return self.size
+
+    def put_nowait(self, entry: tuple, tenant: Optional[str] = None) -> None:
+        """
+        Queue a task entry.
+
+        Args:
+            entry: Task entry; entry[0] must be its numeric priority
+            tenant: Tenant the task runs for (default tenant if None)
+        """
+        name = tenant or DEFAULT_TENANT
+        state = self.tenants.get(name)
+        if state is None:
+            state = self.tenants[name] = _Tenant(
+                name, self.weights.get(name, 1.0), self.burst
+            )
+
+        tag = max(self.virtual_time, state.last_tag) + 1.0 / state.weight
+        state.last_tag = tag
+        item = (entry[0], tag, next(self.counter), time.monotonic(), entry)
+        heapq.heappush(state.entries, item)
+        self.size += 1
+
+        if not state.parked and state.entries[0] is item:
+            heapq.heappush(self.ready, item[:3] + (name,))
+            self._wakeup_next()
+
+    async def put(self, entry: tuple, tenant: Optional[str] = None) -> None:
+        """Queue a task entry (never blocks; async for Queue compatibility)."""
+        self.put_nowait(entry, tenant)
+
+    def _refill(self, state: _Tenant, now: float) -> None:
+        state.tokens = min(
+            self.burst, state.tokens + (now - state.refilled_at) * self.rate_limit
+        )
+        state.refilled_at = now
+
+    def _park_until_token(self, state: _Tenant) -> None:
+        state.parked = True
+        if state.refill_timer is None:
+            delay = (1.0 - state.tokens) / self.rate_limit
+            state.refill_timer = asyncio.get_running_loop().call_later(
+                delay, self._token_arrived, state
+            )
+
+    def _token_arrived(self, state: _Tenant) -> None:
+        state.refill_timer = None
+        self._unpark(state)
+
+    def _unpark(self, state: _Tenant) -> None:
+        if not state.parked:
+            return
+        state.parked = False
+        if state.entries:
+            heapq.heappush(self.ready, state.entries[0][:3] + (state.name,))
+            self._wakeup_next()
+
+    def get_nowait(self) -> Optional[Tuple[str, tuple]]:
+        """Take the next entry that may run now, or None if there is none."""
+        now = time.monotonic()
+        while self.ready:
+            priority, tag, seq, name = heapq.heappop(self.ready)
+            state = self.tenants.get(name)
+            if (
+                state is None
+                or state.parked
+                or not state.entries
+                or state.entries[0][2] != seq
+            ):
+                continue  # Stale: the tenant's head has changed
+
+            if (
+                self.max_running_per_tenant is not None
+                and state.running >= self.max_running_per_tenant
+            ):
+                state.parked = True  # Until one of its tasks finishes
+                continue
+            if self.rate_limit is not None:
+                self._refill(state, now)
+                if state.tokens < 1.0:
+                    self._park_until_token(state)
+                    continue
+                state.tokens -= 1.0
+
+            _, tag, _, queued_at, entry = heapq.heappop(state.entries)
+            self.size -= 1
+            self.virtual_time = max(self.virtual_time, tag)
+            state.running += 1
+            state.dispatched += 1
+            wait = now - queued_at
+            state.wait_total += wait
+            state.wait_max = max(state.wait_max, wait)
+
+            if state.entries:
+                heapq.heappush(self.ready, state.entries[0][:3] + (name,))
+            return name, entry
+        return None
+
+    async def get(self) -> Tuple[str, tuple]:
+        """Wait for the next entry that may run and take it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = self.get_nowait()
+            if item is not None:
+                if self.ready:
+                    self._wakeup_next()  # More work for another worker
+                return item
+
+            getter = loop.create_future()
+            self.getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                try:
+                    self.getters.remove(getter)
+                except ValueError:
+                    pass
+                # Pass on a wakeup this getter received but won't use
+                if self.ready:
+                    self._wakeup_next()
+                raise
+
+    def _wakeup_next(self) -> None:
+        while self.getters:
+            getter = self.getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                return
+
+    def task_done(self, tenant: str) -> None:
+        """Record that a task taken with get() has finished running."""
+        state = self.tenants.get(tenant)
+        if state is None:
+            return
+        state.running -= 1
+        if state.parked and state.refill_timer is None:
+            self._unpark(state)
+        self._forget_if_idle(state)
+
+    def _forget_if_idle(self, state: _Tenant) -> None:
+        if state.entries or state.running or state.refill_timer is not None:
+            return
+        if self.rate_limit is not None:
+            self._refill(state, time.monotonic())
+            if state.tokens < self.burst:
+                return  # Keep its bucket until it has fully refilled
+        del self.tenants[state.name]
+
+    def get_tenant_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth, running count and wait times per active tenant."""
+        now = time.monotonic()
+        stats = {}
+        for name, state in list(self.tenants.items()):
+            self._forget_if_idle(state)
+            if name not in self.tenants:
+                continue
+            oldest = min((item[3] for item in state.entries), default=None)
+            stats[name] = {
+                "queued": len(state.entries),
+                "running": state.running,
+                "throttled": state.parked,
+                "dispatched": state.dispatched,
+                "avg_wait": (
+                    state.wait_total / state.dispatched if state.dispatched else 0.0
+                ),
+                "max_wait": state.wait_max,
+                "oldest_wait": now - oldest if oldest is not None else 0.0,
+            }
+        return stats
+
+    def close(self) -> None:
+        """Cancel pending refill timers (their tenants become runnable)."""
+        for state in self.tenants.values():
+            if state.refill_timer is not None:
+                state.refill_timer.cancel()
+                state.refill_timer = None
+                self._unpark(state)
@@ -0,0 +1,504 @@
+"""
+Task Storage for Forest App
+
+This module provides storage used by the TaskQueue outside of process
+memory:
+
+- Archives receive the metadata of tasks pruned from memory, so a
+  long-running worker keeps a flat memory profile without losing the task
+  history.
+- Backends make queued work durable. Tasks are written to the backend when
+  enqueued and are leased by a worker for a visibility timeout while they
+  run. A task whose lease expires (because its worker crashed or was
+  redeployed) becomes available again. Failed tasks are retried with
+  backoff and dead-lettered once their attempts are exhausted.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TaskArchive(ABC):
+    """Interface for task metadata archives."""
+
+    @abstractmethod
+    async def archive(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Store metadata of tasks pruned from memory.
+
+        Args:
+            records: Task metadata dicts (as returned by get_task_metadata)
+        """
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get archived metadata for a task, or None if not archived."""
+
+    async def close(self) -> None:
+        """Release resources."""
+
+
+class SQLiteTaskArchive(TaskArchive):
+    """Task archive stored in a SQLite database file."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the SQLite task archive.
+
+        Args:
+            path: Database file path
+        """
+        self.path = path
+        self.connection: Optional[sqlite3.Connection] = None
+        # sqlite3 connections must not be used from two threads at once
+        self.lock = asyncio.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS task_archive (
+                    task_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            self.connection = connection
+        return self.connection
+
+    def _archive(self, records: List[Dict[str, Any]]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO task_archive (task_id, status, data) "
+                "VALUES (?, ?, ?)",
+                [
+                    (record["id"], record["status"], json.dumps(record, default=str))
+                    for record in records
+                ],
+            )
+
+    def _get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self._connect()
+            .execute("SELECT data FROM task_archive WHERE task_id = ?", (task_id,))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def archive(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        async with self.lock:
+            await asyncio.to_thread(self._archive, records)
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        async with self.lock:
+            return await asyncio.to_thread(self._get, task_id)
+
+    async def close(self) -> None:
+        async with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+class StoredTask(NamedTuple):
+    """A task as stored in a durable backend."""
+
+    task_id: str
+    task_ref: str  # Registered name or "module:qualname" of the function
+    payload: bytes  # Pickled (args, kwargs)
+    priority: int
+    attempts: int
+    metadata: Dict[str, Any]
+
+
+class TaskBackend(ABC):
+    """Interface for durable task queue backends."""
+
+    @abstractmethod
+    async def put(self, task: StoredTask, available_at: Optional[float] = None) -> None:
+        """
+        Durably store a task (replaces a task with the same id).
+
+        Args:
+            task: The task
+            available_at: Epoch time the task becomes available to lease
+                (default: now)
+        """
+
+    @abstractmethod
+    async def lease(
+        self, task_id: str, owner: str, lease_seconds: float
+    ) -> Optional[int]:
+        """
+        Lease a task for execution if it is available.
+
+        A task is available when it is queued and due, or when its previous
+        lease has expired.
+
+        Args:
+            task_id: ID of the task
+            owner: Identifier of the leasing worker
+            lease_seconds: Visibility timeout
+
+        Returns:
+            The attempt number this lease starts (1 for the first run), or
+            None if the task is not available
+        """
+
+    @abstractmethod
+    async def extend_lease(
+        self, task_id: str, owner: str, lease_seconds: float
+    ) -> bool:
+        """Extend a held lease; returns False if the lease was lost."""
+
+    @abstractmethod
+    async def complete(self, task_id: str, owner: str, result: bytes) -> None:
+        """Mark a leased task completed and store its encoded result."""
+
+    @abstractmethod
+    async def retry(
+        self, task_id: str, owner: str, available_at: float, error: str
+    ) -> None:
+        """Release a failed task so it becomes available again at available_at."""
+
+    @abstractmethod
+    async def dead_letter(
+        self, task_id: str, owner: str, result: bytes, error: str
+    ) -> None:
+        """Mark a task as failed for good and store its encoded result."""
+
+    @abstractmethod
+    async def get_result(self, task_id: str) -> Optional[Tuple[str, Optional[bytes]]]:
+        """
+        Get the status and encoded result of a task.
+
+        Returns:
+            (status, result) with status one of queued, leased, completed or
+            dead (result is None until the task finishes), or None if the
+            task is unknown
+        """
+
+    @abstractmethod
+    async def ready(self, limit: int = 100) -> List[StoredTask]:
+        """Get tasks that are available to lease now, in priority order."""
+
+    @abstractmethod
+    async def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get dead-lettered tasks, most recent first."""
+
+    @abstractmethod
+    async def requeue(self, task_id: str) -> bool:
+        """Make a dead-lettered task available again with fresh attempts."""
+
+    @abstractmethod
+    async def prune(self, finished_before: float) -> int:
+        """
+        Delete completed tasks that finished before a time.
+
+        Returns:
+            Number of tasks deleted
+        """
+
+    async def close(self) -> None:
+        """Release resources."""
+
+
+class SQLTaskBackend(TaskBackend):
+    """
+    Task backend stored in a SQL database through SQLAlchemy Core.
+
+    Works with SQLite (a file next to the app is enough for a single host)
+    and PostgreSQL. Leases are taken with a conditional UPDATE, so workers
+    in several processes can share one database without running a task
+    twice. Database calls run on a dedicated thread to keep the event loop
+    free.
+    """
+
+    def __init__(
+        self, url: str = "sqlite:///forest_tasks.db", engine: Optional[Any] = None
+    ):
+        """
+        Initialize the SQL task backend.
+
+        Args:
+            url: SQLAlchemy database URL
+            engine: Pre-built SQLAlchemy engine, used instead of url
+        """
+        import sqlalchemy as sa
+
+        self.sa = sa
+        self.engine = engine or sa.create_engine(url, pool_pre_ping=True)
+        if self.engine.dialect.name == "sqlite":
+            sa.event.listen(self.engine, "connect", self._configure_sqlite)
+
+        metadata = sa.MetaData()
+        self.tasks = sa.Table(
+            "task_queue_tasks",
+            metadata,
+            sa.Column("task_id", sa.String(64), primary_key=True),
+            sa.Column("task_ref", sa.String(255), nullable=False),
+            sa.Column("payload", sa.LargeBinary, nullable=False),
+            sa.Column("priority", sa.Integer, nullable=False),
+            sa.Column("status", sa.String(16), nullable=False),
+            sa.Column("attempts", sa.Integer, nullable=False, default=0),
+            sa.Column("available_at", sa.Float, nullable=False),
+            sa.Column("lease_owner", sa.String(128)),
+            sa.Column("lease_expires_at", sa.Float),
+            sa.Column("enqueued_at", sa.Float, nullable=False),
+            sa.Column("finished_at", sa.Float),
+            sa.Column("task_metadata", sa.Text, nullable=False),
+            sa.Column("result", sa.LargeBinary),
+            sa.Column("last_error", sa.Text),
+            sa.Index("ix_task_queue_tasks_status_available", "status", "available_at"),
+        )
+        metadata.create_all(self.engine)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="task-backend"
+        )
+
+    @staticmethod
+    def _configure_sqlite(connection, _record) -> None:
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=FULL")
+        cursor.close()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _execute(self, statement) -> int:
+        with self.engine.begin() as connection:
+            return connection.execute(statement).rowcount
+
+    def _leased_by(self, task_id: str, owner: str):
+        tasks = self.tasks
+        return self.sa.and_(
+            tasks.c.task_id == task_id,
+            tasks.c.status == "leased",
+            tasks.c.lease_owner == owner,
+        )
+
+    def _available(self, now: float):
+        tasks = self.tasks
+        return self.sa.or_(
+            self.sa.and_(tasks.c.status == "queued", tasks.c.available_at <= now),
+            self.sa.and_(tasks.c.status == "leased", tasks.c.lease_expires_at < now),
+        )
+
+    # --- Executor-thread helpers ---
+
+    def _put(self, task: StoredTask, available_at: Optional[float]) -> None:
+        tasks = self.tasks
+        now = time.time()
+        with self.engine.begin() as connection:
+            connection.execute(tasks.delete().where(tasks.c.task_id == task.task_id))
+            connection.execute(
+                tasks.insert().values(
+                    task_id=task.task_id,
+                    task_ref=task.task_ref,
+                    payload=task.payload,
+                    priority=task.priority,
+                    status="queued",
+                    attempts=task.attempts,
+                    available_at=available_at or now,
+                    enqueued_at=now,
+                    task_metadata=json.dumps(task.metadata, default=str),
+                )
+            )
+
+    def _lease(self, task_id: str, owner: str, lease_seconds: float) -> Optional[int]:
+        tasks = self.tasks
+        now = time.time()
+        with self.engine.begin() as connection:
+            leased = connection.execute(
+                tasks.update()
+                .where(tasks.c.task_id == task_id, self._available(now))
+                .values(
+                    status="leased",
+                    lease_owner=owner,
+                    lease_expires_at=now + lease_seconds,
+                    attempts=tasks.c.attempts + 1,
+                )
+            ).rowcount
+            if not leased:
+                return None
+            return connection.execute(
+                self.sa.select(tasks.c.attempts).where(tasks.c.task_id == task_id)
+            ).scalar()
+
+    def _ready(self, limit: int) -> List[StoredTask]:
+        tasks = self.tasks
+        query = (
+            self.sa.select(
+                tasks.c.task_id,
+                tasks.c.task_ref,
+                tasks.c.payload,
+                tasks.c.priority,
+                tasks.c.attempts,
+                tasks.c.task_metadata,
+            )
+            .where(self._available(time.time()))
+            .order_by(tasks.c.priority, tasks.c.enqueued_at)
+            .limit(limit)
+        )
+        with self.engine.connect() as connection:
+            return [
+                StoredTask(*row[:5], json.loads(row[5]))
+                for row in connection.execute(query)
+            ]
+
+    def _get_result(self, task_id: str) -> Optional[Tuple[str, Optional[bytes]]]:
+        tasks = self.tasks
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                self.sa.select(tasks.c.status, tasks.c.result).where(
+                    tasks.c.task_id == task_id
+                )
+            ).first()
+        return (row[0], row[1]) if row else None
+
+    def _dead_letters(self, limit: int) -> List[Dict[str, Any]]:
+        tasks = self.tasks
+        query = (
+            self.sa.select(
+                tasks.c.task_id,
+                tasks.c.task_ref,
+                tasks.c.attempts,
+                tasks.c.finished_at,
+                tasks.c.last_error,
+                tasks.c.task_metadata,
+            )
+            .where(tasks.c.status == "dead")
+            .order_by(tasks.c.finished_at.desc())
+            .limit(limit)
+        )
+        with self.engine.connect() as connection:
+            return [
+                {
+                    "id": row[0],
+                    "function": row[1],
+                    "attempts": row[2],
+                    "failed_at": row[3],
+                    "error": row[4],
+                    "user_metadata": json.loads(row[5]),
+                }
+                for row in connection.execute(query)
+            ]
+
+    # --- TaskBackend ---
+
+    async def put(self, task: StoredTask, available_at: Optional[float] = None) -> None:
+        await self._run(self._put, task, available_at)
+
+    async def lease(
+        self, task_id: str, owner: str, lease_seconds: float
+    ) -> Optional[int]:
+        return await self._run(self._lease, task_id, owner, lease_seconds)
+
+    async def extend_lease(
+        self, task_id: str, owner: str, lease_seconds: float
+    ) -> bool:
+        statement = (
+            self.tasks.update()
+            .where(self._leased_by(task_id, owner))
+            .values(lease_expires_at=time.time() + lease_seconds)
+        )
+        return bool(await self._run(self._execute, statement))
+
+    async def complete(self, task_id: str, owner: str, result: bytes) -> None:
+        statement = (
+            self.tasks.update()
+            .where(self._leased_by(task_id, owner))
+            .values(
+                status="completed",
+                result=result,
+                finished_at=time.time(),
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        if not await self._run(self._execute, statement):
+            logger.warning(f"Lease on task {task_id} was lost before it completed")
+
+    async def retry(
+        self, task_id: str, owner: str, available_at: float, error: str
+    ) -> None:
+        statement = (
+            self.tasks.update()
+            .where(self._leased_by(task_id, owner))
+            .values(
+                status="queued",
+                available_at=available_at,
+                last_error=error,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        await self._run(self._execute, statement)
+
+    async def dead_letter(
+        self, task_id: str, owner: str, result: bytes, error: str
+    ) -> None:
+        statement = (
+            self.tasks.update()
+            .where(self._leased_by(task_id, owner))
+            .values(
+                status="dead",
+                result=result,
+                last_error=error,
+                finished_at=time.time(),
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        await self._run(self._execute, statement)
+
+    async def get_result(self, task_id: str) -> Optional[Tuple[str, Optional[bytes]]]:
+        return await self._run(self._get_result, task_id)
+
+    async def ready(self, limit: int = 100) -> List[StoredTask]:
+        return await self._run(self._ready, limit)
+
+    async def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return await self._run(self._dead_letters, limit)
+
+    async def requeue(self, task_id: str) -> bool:
+        tasks = self.tasks
+        statement = (
+            tasks.update()
+            .where(tasks.c.task_id == task_id, tasks.c.status == "dead")
+            .values(
+                status="queued",
+                attempts=0,
+                available_at=time.time(),
+                result=None,
+                finished_at=None,
+            )
+        )
+        return bool(await self._run(self._execute, statement))
+
+    async def prune(self, finished_before: float) -> int:
+        tasks = self.tasks
+        statement = tasks.delete().where(
+            tasks.c.status == "completed", tasks.c.finished_at < finished_before
+        )
+        return await self._run(self._execute, statement)
+
+    async def close(self) -> None:
+        await self._run(self.engine.dispose)
+        self.executor.shutdown(wait=True)
@@ -1,84 +1,39 @@
 # forest_app/main.py (MODIFIED: DI Wiring moved before router inclusion)
 
 import logging
-<<<<<<< HEAD
-import sys
-import os
-from typing import Callable, Any # Added Any
-=======
 import os
 import sys
 from typing import Any  # Added Any
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --- Explicitly add /app to sys.path ---
 # This helps resolve module imports in some deployment environments
 APP_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if APP_ROOT_DIR not in sys.path:
     sys.path.insert(0, APP_ROOT_DIR)
-<<<<<<< HEAD
-    sys.path.insert(0, os.path.join(APP_ROOT_DIR, 'forest_app'))
-=======
     sys.path.insert(0, os.path.join(APP_ROOT_DIR, "forest_app"))
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # --- End sys.path modification ---
 
 
 # --- Sentry Integration Imports ---
 import sentry_sdk
-<<<<<<< HEAD
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
-
 # --- FastAPI Imports ---
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from forest_app.middleware.logging import LoggingMiddleware
-=======
-# --- FastAPI Imports ---
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from sentry_sdk.integrations.logging import LoggingIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --- Core, Persistence & Feature Flag Imports ---
 # Keep necessary imports for init_db, security, models etc.
 # from forest_app.modules.trigger_phrase import TriggerPhraseHandler # Likely not needed globally now
 from forest_app.core.security import initialize_security_dependencies
-<<<<<<< HEAD
-from forest_app.persistence.database import init_db
-from forest_app.persistence.repository import get_user_by_email
-from forest_app.persistence.models import UserModel # Keep model import
-=======
 from forest_app.middleware.logging import LoggingMiddleware
-from forest_app.persistence.database import init_db
+from forest_app.persistence.database import dispose_async_engine, init_db
 from forest_app.persistence.models import UserModel  # Keep model import
-from forest_app.persistence.repository import get_user_by_email
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+from forest_app.persistence.repository import get_user_by_email_async
 
 # --- Import Feature Flags and Checker ---
 try:
     from forest_app.core.feature_flags import Feature, is_enabled
-<<<<<<< HEAD
-    feature_flags_available = True
-except ImportError as ff_import_err:
-    # Log this potential error early after basic logging is configured
-    logging.getLogger("main_init").error("Failed to import Feature Flags components: %s", ff_import_err)
-    feature_flags_available = False
-    # Define dummies if needed for code structure, though checks later should handle it
-    class Feature: pass
-    def is_enabled(feature: Any) -> bool: return False
-
-
-# --- Use Absolute Import for Container CLASS and INSTANCE --- ### MODIFIED ###
-from forest_app.containers import Container, init_container
-
-# --- Enhanced Architecture Components ---
-from forest_app.core.initialize_architecture import inject_enhanced_architecture
-from forest_app.core.integrations.discovery_integration import setup_discovery_journey
-=======
 
     feature_flags_available = True
 except ImportError as ff_import_err:
@@ -103,28 +58,16 @@ from forest_app.core.initialize_architecture import \
     inject_enhanced_architecture
 from forest_app.core.integrations.discovery_integration import \
     setup_discovery_journey
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # Initialize container
 container = init_container()
 
-<<<<<<< HEAD
-# --- Router Imports ---
-# Keep these here as they might rely on container/models
-from forest_app.routers import auth, users, onboarding, hta, snapshots, core, goals, trees
-# Import the new discovery journey router from api/routers
-from forest_app.api.routers import discovery_journey
-
-=======
 # Import the new discovery journey router from api/routers
 from forest_app.api.routers import discovery_journey
 # --- Router Imports ---
 # Keep these here as they might rely on container/models
 from forest_app.routers import (auth, core, goals, hta, onboarding, snapshots,
                                 trees, users)
-# --- Error Logging Imports ---
-from forest_app.utils.error_logging import get_error_logger
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --------------------------------------------------------------------------
 # Logging Setup
@@ -132,25 +75,6 @@ from forest_app.utils.error_logging import get_error_logger
 log_handler = logging.StreamHandler(sys.stdout)
 log_format_string = '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "name": "%(name)s", "message": "%(message)s"}'
 # Use datefmt for ISO8601 format in logs
-<<<<<<< HEAD
-date_format = '%Y-%m-%dT%H:%M:%S%z' # Example ISO 8601 format
-
-# Configure root logger
-logging.basicConfig(
-    level=logging.DEBUG, # Keep DEBUG to capture all levels for now
-    format=log_format_string,
-    datefmt=date_format,
-    handlers=[log_handler],
-    force=True # Force override if already configured elsewhere
-)
-logger = logging.getLogger(__name__) # Get logger for this module
-
-# Log path modification confirmation now that logging is configured
-if APP_ROOT_DIR not in sys.path: # Check condition again (should be false now)
-     pass # Already added
-else:
-     logger.warning(f"--- Path {APP_ROOT_DIR} was already in sys.path or added. ---")
-=======
 date_format = "%Y-%m-%dT%H:%M:%S%z"  # Example ISO 8601 format
 
 # Configure root logger
@@ -168,7 +92,6 @@ if APP_ROOT_DIR not in sys.path:  # Check condition again (should be false now)
     pass  # Already added
 else:
     logger.warning(f"--- Path {APP_ROOT_DIR} was already in sys.path or added. ---")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 logger.info("----- Forest OS API Starting Up (DI Enabled) -----")
 
@@ -188,22 +111,6 @@ SENTRY_DSN = os.getenv("SENTRY_DSN")
 if SENTRY_DSN:
     try:
         sentry_logging = LoggingIntegration(
-<<<<<<< HEAD
-            level=logging.INFO,      # Capture info and above as breadcrumbs
-            event_level=logging.ERROR  # Send errors as events (or WARNING)
-        )
-        sentry_sdk.init(
-            dsn=SENTRY_DSN,
-            traces_sample_rate=float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.1")), # Sample fewer traces usually
-            profiles_sample_rate=float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.1")),
-            integrations=[SqlalchemyIntegration(), sentry_logging], # Use configured logging integration
-            environment=os.getenv("APP_ENV", "development"),
-            release=os.getenv("APP_RELEASE_VERSION", "unknown"), # Provide a default release
-        )
-        logger.info("Sentry SDK initialized successfully.")
-    except Exception as sentry_init_e: logger.exception("Failed to initialize Sentry SDK: %s", sentry_init_e)
-else: logger.warning("SENTRY_DSN environment variable not found. Sentry integration skipped.")
-=======
             level=logging.INFO,  # Capture info and above as breadcrumbs
             event_level=logging.ERROR,  # Send errors as events (or WARNING)
         )
@@ -229,7 +136,6 @@ else:
     logger.warning(
         "SENTRY_DSN environment variable not found. Sentry integration skipped."
     )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --------------------------------------------------------------------------
 # Database Initialization
@@ -248,18 +154,6 @@ except Exception as db_init_e:
 logger.info("Initializing security dependencies...")
 try:
     # Basic check if UserModel seems valid (has an email annotation)
-<<<<<<< HEAD
-    if not hasattr(UserModel, '__annotations__') or 'email' not in UserModel.__annotations__:
-         logger.critical("UserModel may be incomplete or a dummy class. Security init might fail.")
-    initialize_security_dependencies(get_user_by_email, UserModel)
-    logger.info("Security dependencies initialized successfully.")
-except TypeError as sec_init_err:
-     logger.exception(f"CRITICAL: Failed security init - check function signature in core.security: {sec_init_err}")
-     sys.exit(f"CRITICAL: Security dependency initialization failed (TypeError): {sec_init_err}")
-except Exception as sec_init_gen_err:
-     logger.exception(f"CRITICAL: Unexpected error during security init: {sec_init_gen_err}")
-     sys.exit(f"CRITICAL: Security dependency initialization failed unexpectedly: {sec_init_gen_err}")
-=======
     if (
         not hasattr(UserModel, "__annotations__")
         or "email" not in UserModel.__annotations__
@@ -267,7 +161,7 @@ except Exception as sec_init_gen_err:
         logger.critical(
             "UserModel may be incomplete or a dummy class. Security init might fail."
         )
-    initialize_security_dependencies(get_user_by_email, UserModel)
+    initialize_security_dependencies(get_user_by_email_async, UserModel)
     logger.info("Security dependencies initialized successfully.")
 except TypeError as sec_init_err:
     logger.exception(
@@ -283,26 +177,17 @@ except Exception as sec_init_gen_err:
     sys.exit(
         f"CRITICAL: Security dependency initialization failed unexpectedly: {sec_init_gen_err}"
     )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 
 # --------------------------------------------------------------------------
 # --- DI Container Setup (Instance created on import) --- ### COMMENT UPDATED ###
 # --------------------------------------------------------------------------
 # Container instance is created when 'from forest_app.containers import container' runs
-<<<<<<< HEAD
-if not container: # Basic check
-     logger.critical("CRITICAL: DI Container instance is None after import.")
-     sys.exit("CRITICAL: Failed to get DI Container instance.")
-else:
-     logger.info("DI Container instance imported successfully.")
-=======
 if not container:  # Basic check
     logger.critical("CRITICAL: DI Container instance is None after import.")
     sys.exit("CRITICAL: Failed to get DI Container instance.")
 else:
     logger.info("DI Container instance imported successfully.")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 
 # --------------------------------------------------------------------------
@@ -327,47 +212,12 @@ inject_enhanced_architecture(app)
 logger.info("Initializing Journey of Discovery module...")
 setup_discovery_journey(app)
 
-<<<<<<< HEAD
-=======
-# --- Error Logging Setup ---
-error_logger = get_error_logger()
-
-
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    error_logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(status_code=500, content={"detail": "Internal server error."})
-
-
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # --------------------------------------------------------------------------
 # **** DI Container Wiring (MOVED HERE - BEFORE ROUTERS) ****
 # --------------------------------------------------------------------------
 try:
     logger.info("Wiring Dependency Injection container...")
     # Use the imported container instance directly
-<<<<<<< HEAD
-    container.wire(modules=[
-        __name__, # Wire this main module if using @inject here
-        "forest_app.routers.auth",
-        "forest_app.routers.users",
-        "forest_app.routers.onboarding",
-        "forest_app.routers.hta",
-        "forest_app.routers.snapshots",
-        "forest_app.routers.core",
-        "forest_app.routers.goals",
-        "forest_app.core.orchestrator", # Add other modules using DI if needed
-        "forest_app.helpers",
-        # Enhanced architecture components
-        "forest_app.core.services.enhanced_hta_service",
-        "forest_app.core.initialize_architecture",
-        "forest_app.core.task_queue",
-        "forest_app.core.event_bus",
-        "forest_app.core.cache_service",
-        "forest_app.core.circuit_breaker"
-        # Add other modules/packages containing @inject decorators or Provide markers
-    ])
-=======
     container.wire(
         modules=[
             __name__,  # Wire this main module if using @inject here
@@ -390,7 +240,6 @@ try:
             # Add other modules/packages containing @inject decorators or Provide markers
         ]
     )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     logger.info("Dependency Injection container wired successfully.")
 except Exception as e:
     logger.critical(f"CRITICAL: Failed to wire DI Container: {e}", exc_info=True)
@@ -408,15 +257,6 @@ try:
     app.include_router(hta.router, prefix="/hta", tags=["HTA"])
     app.include_router(snapshots.router, prefix="/snapshots", tags=["Snapshots"])
     app.include_router(core.router, prefix="/core", tags=["Core"])
-<<<<<<< HEAD
-    app.include_router(goals.router, prefix="/goals", tags=["Goals"]) # Changed prefix /goal to /goals
-    app.include_router(trees.router, prefix="/trees", tags=["Trees"]) # Added trees router for HTA tree management
-    app.include_router(discovery_journey.router, tags=["Discovery Journey"])
-    logger.info("API routers included successfully.")
-except Exception as router_err:
-     logger.critical(f"CRITICAL: Failed to include routers: {router_err}")
-     sys.exit(f"CRITICAL: Router inclusion failed: {router_err}")
-=======
     app.include_router(
         goals.router, prefix="/goals", tags=["Goals"]
     )  # Changed prefix /goal to /goals
@@ -428,7 +268,6 @@ except Exception as router_err:
 except Exception as router_err:
     logger.critical(f"CRITICAL: Failed to include routers: {router_err}")
     sys.exit(f"CRITICAL: Router inclusion failed: {router_err}")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 
 # --------------------------------------------------------------------------
@@ -436,21 +275,6 @@ except Exception as router_err:
 # --------------------------------------------------------------------------
 logger.info("Configuring middleware (CORS)...")
 origins = [
-<<<<<<< HEAD
-    "http://localhost", "http://localhost:8000", "http://localhost:8501",
-    # Ensure FRONTEND_URL env var is set in your deployment environment
-    os.getenv("FRONTEND_URL", "*") # Use wildcard only if necessary and safe
-]
-# Remove potential duplicates and sort
-origins = sorted(list(set(o for o in origins if o))) # Filter out empty strings
-
-app.add_middleware(
-    LoggingMiddleware
-)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins, # Use the cleaned list
-=======
     "http://localhost",
     "http://localhost:8000",
     "http://localhost:8501",
@@ -464,7 +288,6 @@ app.add_middleware(LoggingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # Use the cleaned list
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -481,48 +304,19 @@ async def startup_event():
 
     # --- Feature Flag Logging (Kept in startup event) ---
     logger.info("--- Verifying Feature Flag Status (from settings) ---")
-<<<<<<< HEAD
-    if feature_flags_available and hasattr(Feature, '__members__'):
-=======
     if feature_flags_available and hasattr(Feature, "__members__"):
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         for feature in Feature:
             try:
                 # Use the imported is_enabled function
                 status = is_enabled(feature)
-<<<<<<< HEAD
-                logger.info(f"Feature: {feature.name:<35} Status: {'ENABLED' if status else 'DISABLED'}")
-=======
                 logger.info(
                     f"Feature: {feature.name:<35} Status: {'ENABLED' if status else 'DISABLED'}"
                 )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             except Exception as e:
                 logger.error(f"Error checking status for feature {feature.name}: {e}")
     elif not feature_flags_available:
         logger.error("Feature flags module failed import, cannot check status.")
     else:
-<<<<<<< HEAD
-         logger.warning("Feature enum has no members defined?")
-    logger.info("-----------------------------------------------------")
-    # --- END Feature Flag Logging ---
-    
-    # --- Log architecture status ---
-    if hasattr(app.state, 'architecture'):
-        logger.info("Enhanced architecture is active and initialized")
-        try:
-            # Get and log metrics from components
-            if hasattr(app.state.architecture, 'task_queue'):
-                task_queue = app.state.architecture.task_queue()
-                queue_status = await task_queue.get_queue_status()
-                logger.info(f"Task Queue Status: {queue_status}")
-                
-            if hasattr(app.state.architecture, 'cache_service'):
-                cache_service = app.state.architecture.cache_service()
-                logger.info(f"Cache Service Active: {cache_service.config.backend.value}")
-                
-            if hasattr(app.state.architecture, 'event_bus'):
-=======
         logger.warning("Feature enum has no members defined?")
     logger.info("-----------------------------------------------------")
     # --- END Feature Flag Logging ---
@@ -544,7 +338,6 @@ async def startup_event():
                 )
 
             if hasattr(app.state.architecture, "event_bus"):
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 event_bus = app.state.architecture.event_bus()
                 bus_metrics = event_bus.get_metrics()
                 logger.info(f"Event Bus Metrics: {bus_metrics}")
@@ -562,15 +355,6 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutdown event executing...")
-<<<<<<< HEAD
-    
-    # --- Graceful shutdown of enhanced architecture components ---
-    if hasattr(app.state, 'architecture'):
-        logger.info("Shutting down enhanced architecture components...")
-        try:
-            # Stop task queue
-            if hasattr(app.state.architecture, 'task_queue'):
-=======
 
     # --- Graceful shutdown of enhanced architecture components ---
     if hasattr(app.state, "architecture"):
@@ -578,20 +362,21 @@ async def shutdown_event():
         try:
             # Stop task queue
             if hasattr(app.state.architecture, "task_queue"):
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
                 task_queue = app.state.architecture.task_queue()
                 await task_queue.stop()
                 logger.info("Task Queue stopped successfully")
         except Exception as shutdown_err:
-<<<<<<< HEAD
-            logger.error(f"Error during architecture component shutdown: {shutdown_err}")
-    
-=======
             logger.error(
                 f"Error during architecture component shutdown: {shutdown_err}"
             )
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+    # --- Close pooled async database connections ---
+    try:
+        await dispose_async_engine()
+        logger.info("Async database engine disposed")
+    except Exception as dispose_err:
+        logger.error(f"Error disposing async database engine: {dispose_err}")
+
     logger.info("Shutdown event complete.")
 
 
@@ -600,42 +385,26 @@ async def shutdown_event():
 # --------------------------------------------------------------------------
 @app.get("/", tags=["Status"], include_in_schema=False)
 async def read_root():
-<<<<<<< HEAD
-    """ Basic status endpoint """
-    return {"message": f"Welcome to the Forest OS API (Version {app.version})"}
-
-=======
     """Basic status endpoint"""
     return {"message": f"Welcome to the Forest OS API (Version {app.version})"}
 
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # --------------------------------------------------------------------------
 # Local Development Run Hook
 # --------------------------------------------------------------------------
 if __name__ == "__main__":
     import uvicorn
-<<<<<<< HEAD
-    logger.info("Starting Uvicorn development server directly via __main__...")
-    reload_flag = os.getenv("APP_ENV", "development") == "development" and \
-                 os.getenv("UVICORN_RELOAD", "True").lower() in ("true", "1")
-=======
 
     logger.info("Starting Uvicorn development server directly via __main__...")
     reload_flag = os.getenv("APP_ENV", "development") == "development" and os.getenv(
         "UVICORN_RELOAD", "True"
     ).lower() in ("true", "1")
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
     # Make sure to pass the app object correctly
     # Use "forest_app.main:app" if running from outside the directory
     # Use "main:app" if running from within the forest_app directory
     uvicorn.run(
-<<<<<<< HEAD
-        "main:app", # Changed for direct run
-=======
         "main:app",  # Changed for direct run
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", "8000")),
         reload=reload_flag,
@@ -1,40 +1,21 @@
 # forest_app/persistence/database.py (Refactored with get_db and Pydantic settings)
 
 import logging
-<<<<<<< HEAD
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator # Import Generator for type hint
-=======
 from contextlib import asynccontextmanager
-from typing import Generator  # Import Generator for type hint
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
+                                    async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # --- Settings Import (Using Pydantic settings object) ---
 print(">>> DEBUG DB: Importing from Pydantic settings.py")
 try:
     # Import the central settings object
     from forest_app.config.settings import settings
-<<<<<<< HEAD
-    print(">>> DEBUG DB: Successfully imported settings object.")
-    # Access the connection string via the settings object attribute
-    db_connection_string = settings.DB_CONNECTION_STRING
-    print(f">>> DEBUG DB: DB Connection String Type via settings: {type(db_connection_string)}")
-except ImportError as e:
-    print(f"CRITICAL: Failed to import settings object: {e}")
-    logging.getLogger(__name__).critical(f"Failed to import settings object: {e}", exc_info=True)
-    raise
-except AttributeError as e:
-    print(f"CRITICAL: Failed to access attribute on settings object (DB_CONNECTION_STRING?): {e}")
-    logging.getLogger(__name__).critical(f"Failed to access attribute on settings object (DB_CONNECTION_STRING?): {e}", exc_info=True)
-    raise # Raise error if required setting is missing attribute
-except Exception as e:
-    print(f"CRITICAL: Error during import or access of settings: {e}")
-    logging.getLogger(__name__).critical(f"Error during import or access of settings: {e}", exc_info=True)
-=======
 
     print(">>> DEBUG DB: Successfully imported settings object.")
     # Access the connection string via the settings object attribute
@@ -62,22 +43,11 @@ except Exception as e:
     logging.getLogger(__name__).critical(
         f"Error during import or access of settings: {e}", exc_info=True
     )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     raise
 # --- End Settings Import ---
 
 logger = logging.getLogger(__name__)
 
-<<<<<<< HEAD
-# --- Define Dummy Session Factory (for early import safety) ---
-def _dummy_session_factory():
-    logger.error("Attempted to get DB session via dummy, but database is not connected or failed to initialize.")
-    raise RuntimeError("Database connection not initialized. Check configuration and logs.")
-
-# --- Initialize SessionLocal with the dummy function ---
-SessionLocal: sessionmaker[Session] = _dummy_session_factory
-logger.info("SessionLocal initialized with a dummy factory (will be replaced upon successful DB connection).")
-=======
 
 # --- Define Dummy Session Factory (for early import safety) ---
 def _dummy_session_factory():
@@ -94,7 +64,6 @@ SessionLocal: sessionmaker[Session] = _dummy_session_factory
 logger.info(
     "SessionLocal initialized with a dummy factory (will be replaced upon successful DB connection)."
 )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --- Initialize SQLAlchemy engine and Base ---
 engine = None
@@ -104,11 +73,6 @@ Base = declarative_base()
 # Check if the connection string was successfully retrieved from settings
 if db_connection_string:
     try:
-<<<<<<< HEAD
-        SQLALCHEMY_DATABASE_URL = db_connection_string # Use the retrieved string
-        engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_recycle=1800, pool_pre_ping=True)
-        logger.info("SQLAlchemy engine creation attempt successful using URL from settings.") # Log source
-=======
         SQLALCHEMY_DATABASE_URL = db_connection_string  # Use the retrieved string
         engine = create_engine(
             SQLALCHEMY_DATABASE_URL, pool_recycle=1800, pool_pre_ping=True
@@ -116,7 +80,6 @@ if db_connection_string:
         logger.info(
             "SQLAlchemy engine creation attempt successful using URL from settings."
         )  # Log source
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
         # Test connection immediately after creating engine
         try:
@@ -128,35 +91,20 @@ if db_connection_string:
             logger.info("SessionLocal redefined successfully with the database engine.")
 
         except Exception as conn_test_e:
-<<<<<<< HEAD
-            logger.critical(f"CRITICAL: Engine created but connection test failed: {conn_test_e}", exc_info=True)
-            engine = None # Reset engine
-=======
             logger.critical(
                 f"CRITICAL: Engine created but connection test failed: {conn_test_e}",
                 exc_info=True,
             )
             engine = None  # Reset engine
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
             # SessionLocal remains the dummy factory
 
     except Exception as e:
         logger.critical(f"CRITICAL: Failed during engine creation: {e}", exc_info=True)
-<<<<<<< HEAD
-        engine = None # Ensure engine is None
-=======
         engine = None  # Ensure engine is None
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
         # SessionLocal remains the dummy factory
 
 else:
     # This condition might be hit if DB_CONNECTION_STRING is set but empty in environment
-<<<<<<< HEAD
-    logger.critical("CRITICAL: DB_CONNECTION_STRING is missing or empty in settings. Database engine cannot be created.")
-    engine = None # Ensure engine is None
-    # SessionLocal remains the dummy factory
-
-=======
     logger.critical(
         "CRITICAL: DB_CONNECTION_STRING is missing or empty in settings. Database engine cannot be created."
     )
@@ -164,7 +112,6 @@ else:
     # SessionLocal remains the dummy factory
 
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # +++ NEW Standard FastAPI DB Dependency Function +++
 def get_db() -> Generator[Session, None, None]:
     """
@@ -172,17 +119,12 @@ def get_db() -> Generator[Session, None, None]:
     Uses the globally defined `SessionLocal`.
     """
     if SessionLocal is _dummy_session_factory:
-<<<<<<< HEAD
-         logger.error("Database not connected: Cannot create session using dummy factory.")
-         raise RuntimeError("Database connection failed or not established during startup.")
-=======
         logger.error(
             "Database not connected: Cannot create session using dummy factory."
         )
         raise RuntimeError(
             "Database connection failed or not established during startup."
         )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
     db = SessionLocal()
     try:
@@ -190,16 +132,11 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         logger.debug("Closing database session.")
         db.close()
-<<<<<<< HEAD
-# +++ END NEW Dependency Function +++
-
-=======
 
 
 # +++ END NEW Dependency Function +++
 
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 # --- Optional: Function to Create Tables (Keep as is) ---
 def create_database_tables():
     """Creates database tables if the engine was successfully created."""
@@ -211,38 +148,24 @@ def create_database_tables():
         except Exception as e:
             logger.exception(f"CRITICAL: Failed to create database tables: {e}")
     else:
-<<<<<<< HEAD
-        logger.error("Cannot create database tables: SQLAlchemy engine is not initialized.")
-=======
         logger.error(
             "Cannot create database tables: SQLAlchemy engine is not initialized."
         )
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
 # --- Define init_db for potential use during startup (e.g., in main.py) ---
 def init_db():
     """Initializes the database by attempting to create tables."""
     create_database_tables()
 
-<<<<<<< HEAD
-# --- Async Context Manager for Transaction-Protected Sessions ---
-from contextlib import asynccontextmanager
-
-=======
 
 # --- Async Context Manager for Transaction-Protected Sessions ---
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 @asynccontextmanager
 async def get_db_session() -> Generator[Session, None, None]:
     """
     Async context manager that yields a SQLAlchemy session and ensures it's closed.
     Used with transaction_protected decorator for async database operations.
-<<<<<<< HEAD
-    
-=======
 
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
     Example:
         async with get_db_session() as session:
             # Use session with transaction protection
@@ -250,17 +173,12 @@ async def get_db_session() -> Generator[Session, None, None]:
             await session.commit()
     """
     if SessionLocal is _dummy_session_factory:
-<<<<<<< HEAD
-        logger.error("Database not connected: Cannot create session using dummy factory.")
-        raise RuntimeError("Database connection failed or not established during startup.")
-=======
         logger.error(
             "Database not connected: Cannot create session using dummy factory."
         )
         raise RuntimeError(
             "Database connection failed or not established during startup."
         )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
 
     db = SessionLocal()
     try:
@@ -272,13 +190,178 @@ async def get_db_session() -> Generator[Session, None, None]:
     finally:
         logger.debug("Closing database session.")
         db.close()
-<<<<<<< HEAD
-        
-print(">>> DEBUG DB: END OF database.py execution (Refactored with get_db and Pydantic settings)")
-=======
+
+
+# --- Async Engine and Sessions ---
+# Routes that await database calls through these sessions no longer block the
+# event loop: one slow query only holds up the request that issued it.
+
+# Async driver used for each sync driver's database
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Convert a database URL to use the async driver for its database.
+
+    Args:
+        url: SQLAlchemy URL, e.g. postgresql://... or sqlite:///forest.db
+
+    Returns:
+        The URL with an async driver (postgresql+asyncpg, sqlite+aiosqlite);
+        URLs that already name an async driver are returned unchanged
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None or parsed.get_driver_name() in ("asyncpg", "aiosqlite"):
+        return url
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def create_async_db_engine(
+    url: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = 1800,
+) -> AsyncEngine:
+    """
+    Create an async engine with an explicit connection pool policy.
+
+    At most pool_size + max_overflow connections are open at once; a
+    request that finds none free waits up to pool_timeout seconds and then
+    fails with sqlalchemy.exc.TimeoutError instead of queueing forever.
+
+    Args:
+        url: Database URL (converted to its async driver)
+        pool_size: Connections kept open
+        max_overflow: Extra connections opened under load and closed after
+        pool_timeout: Seconds to wait for a free connection
+        pool_recycle: Seconds after which a connection is replaced
+
+    Returns:
+        The async engine
+    """
+    async_url = to_async_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": True, "pool_recycle": pool_recycle}
+    parsed = make_url(async_url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+    if not is_sqlite or parsed.database not in (None, "", ":memory:"):
+        # In-memory SQLite uses a single shared connection, not a sized pool
+        options.update(
+            pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout
+        )
+        if is_sqlite:
+            # aiosqlite defaults to NullPool for files, which has no limits
+            options["poolclass"] = AsyncAdaptedQueuePool
+    return create_async_engine(async_url, **options)
+
+
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+
+if db_connection_string:
+    try:
+        async_engine = create_async_db_engine(
+            getattr(settings, "DB_ASYNC_CONNECTION_STRING", None)
+            or db_connection_string,
+            pool_size=getattr(settings, "DB_POOL_SIZE", 5),
+            max_overflow=getattr(settings, "DB_MAX_OVERFLOW", 10),
+            pool_timeout=getattr(settings, "DB_POOL_TIMEOUT", 30.0),
+            pool_recycle=getattr(settings, "DB_POOL_RECYCLE", 1800),
+        )
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, expire_on_commit=False, autoflush=False
+        )
+        logger.info(
+            "Async SQLAlchemy engine created (%s).", async_engine.url.drivername
+        )
+    except Exception as e:  # Typically the async driver is not installed
+        logger.warning(
+            "Async database engine unavailable, async sessions disabled: %s", e
+        )
+        async_engine = None
+        AsyncSessionLocal = None
+
+
+def _require_async_sessions() -> async_sessionmaker[AsyncSession]:
+    if AsyncSessionLocal is None:
+        logger.error("Async database engine not initialized: cannot create session.")
+        raise RuntimeError(
+            "Async database engine not available. Check the async driver "
+            "(asyncpg/aiosqlite) and DB settings."
+        )
+    return AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that yields an AsyncSession and ensures it's closed.
+    Uses the globally defined `AsyncSessionLocal`.
+    """
+    async with _require_async_sessions()() as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async context manager that yields an AsyncSession, rolling back on error.
+
+    Example:
+        async with get_async_db_session() as session:
+            session.add(model)
+            await session.commit()
+    """
+    async with _require_async_sessions()() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Error in async database session context manager: {e}")
+            await db.rollback()
+            raise
+
+
+def _pool_stats(pool: Any) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    for name in ("_max_overflow", "_timeout"):
+        if hasattr(pool, name):
+            stats[name.lstrip("_")] = getattr(pool, name)
+    return stats
+
+
+def get_pool_stats() -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Get connection pool statistics of the sync and async engines.
+
+    Returns:
+        {"sync": ..., "async": ...}, each None if that engine is not
+        initialized, else the pool class and, where the pool supports them,
+        size, checkedin, checkedout, overflow, max_overflow and timeout
+    """
+    return {
+        "sync": _pool_stats(engine.pool) if engine is not None else None,
+        "async": (
+            _pool_stats(async_engine.sync_engine.pool)
+            if async_engine is not None
+            else None
+        ),
+    }
+
+
+async def dispose_async_engine() -> None:
+    """Close all pooled async connections (call on application shutdown)."""
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 print(
     ">>> DEBUG DB: END OF database.py execution (Refactored with get_db and Pydantic settings)"
 )
->>>>>>> cede20c (Fix Pylint critical errors: update BaseSettings import for Pydantic v1, ensure dependency_injector and uvicorn are installed)
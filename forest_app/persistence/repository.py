@@ -7,12 +7,13 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 # --- ADD THIS IMPORT ---
 from sqlalchemy.orm.attributes import flag_modified
 # --- END IMPORT ---
 # Cast/String might still be needed if other parts of your app use them,
 # but removed from user_id logic here. Keeping import for now.
-from sqlalchemy import cast, Integer, String
+from sqlalchemy import cast, Integer, String, select
 
 # --- Models ---
 try:
@@ -52,6 +53,24 @@ def get_user_by_email(db: Session, email: str) -> Optional[UserModel]:
         # Propagate the error
         raise
 
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[UserModel]:
+    """Retrieves a user by their email address without blocking the event loop."""
+    if not isinstance(db, AsyncSession):
+        logger.error("get_user_by_email_async called with invalid db session type: %s", type(db))
+        return None
+    try:
+        if not hasattr(UserModel, 'email'):
+            logger.error("UserModel (potentially dummy) does not have 'email' attribute for query.")
+            return None
+        result = await db.execute(select(UserModel).where(UserModel.email == email).limit(1))
+        return result.scalars().first()
+    except SQLAlchemyError as e:
+        logger.error("Database error retrieving user by email %s: %s", email, e, exc_info=True)
+        raise
+    except Exception as e:
+        logger.error("Unexpected error retrieving user by email %s: %s", email, e, exc_info=True)
+        raise
+
 def create_user(db: Session, user_data: Dict[str, Any]) -> Optional[UserModel]:
     """
     Creates a new user in the database.
@@ -358,6 +377,151 @@ class MemorySnapshotRepository:
             # Consider raising
             return False
 
+# === AsyncMemorySnapshotRepository ===
+
+class AsyncMemorySnapshotRepository:
+    """
+    Async counterpart of MemorySnapshotRepository, for use with an AsyncSession.
+    Queries are awaited, so a slow query does not stall other requests.
+    IDs may be integers or UUIDs (the models use UUID primary keys).
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initializes the repository with an async database session."""
+        if not isinstance(db, AsyncSession):
+            raise TypeError("db must be a SQLAlchemy AsyncSession")
+        if not hasattr(MemorySnapshotModel, 'user_id'): # Check an expected attribute
+            raise ImportError("MemorySnapshotModel appears to be incompletely imported.")
+        self.db = db
+
+    @staticmethod
+    def _order_by_column():
+        """Most recently updated (or created, if there is no updated_at) first."""
+        order_by_field = "updated_at" if hasattr(MemorySnapshotModel, "updated_at") else "created_at"
+        return getattr(MemorySnapshotModel, order_by_field).desc()
+
+    async def create_snapshot(
+        self, user_id: Union[int, UUID], snapshot_data: dict, codename: Optional[str] = None
+    ) -> Optional[MemorySnapshotModel]:
+        """
+        Creates a new MemorySnapshot model instance and adds it to the session.
+        **Does NOT commit the transaction.**
+        """
+        if not isinstance(user_id, (int, UUID)):
+            logger.error("User ID must be an integer or UUID to create a snapshot.")
+            raise TypeError("User ID must be an integer or UUID to create a snapshot.")
+
+        model = MemorySnapshotModel(
+            user_id=user_id,
+            snapshot_data=snapshot_data,
+            codename=codename,
+            created_at=datetime.utcnow(),
+        )
+        self.db.add(model)
+        flag_modified(model, "snapshot_data")
+        logger.info("Added new snapshot object for user ID %s (codename: '%s') to session.",
+                    user_id, codename)
+        return model
+
+    async def get_latest_snapshot(self, user_id: Union[int, UUID]) -> Optional[MemorySnapshotModel]:
+        """Retrieves the latest MemorySnapshot for the specified user."""
+        if not isinstance(user_id, (int, UUID)):
+            logger.error("User ID must be an integer or UUID to get latest snapshot.")
+            raise TypeError("User ID must be an integer or UUID.")
+        try:
+            result = await self.db.execute(
+                select(MemorySnapshotModel)
+                .where(MemorySnapshotModel.user_id == user_id)
+                .order_by(self._order_by_column())
+                .limit(1)
+            )
+            return result.scalars().first()
+        except SQLAlchemyError as e:
+            logger.error("Database error retrieving latest snapshot for user ID %s: %s", user_id, e, exc_info=True)
+            raise
+
+    async def update_snapshot(
+        self, snapshot_model: MemorySnapshotModel, new_data: dict, codename: Optional[str] = None
+    ) -> Optional[MemorySnapshotModel]:
+        """
+        Updates attributes of an existing MemorySnapshot model instance within the session.
+        **Does NOT commit the transaction.** Uses flag_modified for JSONB changes.
+        """
+        if not snapshot_model or not isinstance(snapshot_model, MemorySnapshotModel) or not hasattr(snapshot_model, 'id'):
+            logger.warning("Attempted to update a non-existent or invalid snapshot model.")
+            return None
+
+        snapshot_model.snapshot_data = new_data
+        flag_modified(snapshot_model, "snapshot_data")
+        if hasattr(snapshot_model, 'updated_at'):
+            snapshot_model.updated_at = datetime.utcnow()
+        if codename is not None:
+            snapshot_model.codename = codename
+        logger.info("Prepared update (flagged modified) for snapshot id %s for user ID %s (codename: '%s') in session.",
+                    snapshot_model.id, snapshot_model.user_id, snapshot_model.codename)
+        return snapshot_model
+
+    async def list_snapshots(self, user_id: Union[int, UUID], limit: int = 100) -> List[MemorySnapshotModel]:
+        """Lists snapshots for a specific user, ordered by most recently created/updated first."""
+        if not isinstance(user_id, (int, UUID)):
+            logger.error("User ID must be an integer or UUID to list snapshots.")
+            return []
+        query = (
+            select(MemorySnapshotModel)
+            .where(MemorySnapshotModel.user_id == user_id)
+            .order_by(self._order_by_column())
+        )
+        if limit > 0: # Apply limit if positive
+            query = query.limit(limit)
+        try:
+            result = await self.db.execute(query)
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            logger.error("Database error listing snapshots for user ID %s: %s", user_id, e, exc_info=True)
+            raise
+
+    async def get_snapshot_by_id(self, snapshot_id: Union[int, UUID], user_id: Union[int, UUID]) -> Optional[MemorySnapshotModel]:
+        """Retrieves a specific snapshot by its ID, ensuring it belongs to the user."""
+        if not isinstance(user_id, (int, UUID)):
+            logger.error("User ID must be an integer or UUID to get snapshot by ID.")
+            raise TypeError("User ID must be an integer or UUID.")
+        if not isinstance(snapshot_id, (int, UUID)):
+            logger.error("Snapshot ID must be an integer or UUID.")
+            raise TypeError("Snapshot ID must be an integer or UUID.")
+        try:
+            result = await self.db.execute(
+                select(MemorySnapshotModel).where(
+                    MemorySnapshotModel.id == snapshot_id,
+                    MemorySnapshotModel.user_id == user_id # Ensure correct user
+                )
+            )
+            return result.scalars().first()
+        except SQLAlchemyError as e:
+            logger.error("Database error getting snapshot id %s for user ID %s: %s", snapshot_id, user_id, e, exc_info=True)
+            raise
+
+    async def delete_snapshot_by_id(self, snapshot_id: Union[int, UUID], user_id: Union[int, UUID]) -> bool:
+        """
+        Deletes a specific snapshot by its ID, ensuring it belongs to the user.
+        !! Commits the transaction immediately. !!
+        """
+        if not isinstance(user_id, (int, UUID)) or not isinstance(snapshot_id, (int, UUID)):
+            logger.error("Snapshot ID and user ID must be integers or UUIDs to delete snapshot.")
+            return False
+        try:
+            snapshot_to_delete = await self.get_snapshot_by_id(snapshot_id, user_id)
+            if not snapshot_to_delete:
+                logger.warning("Snapshot id %s not found or not owned by user ID %s for deletion.", snapshot_id, user_id)
+                return False
+            await self.db.delete(snapshot_to_delete)
+            await self.db.commit() # Commit deletion
+            logger.info("Deleted snapshot id %s for user ID %s", snapshot_id, user_id)
+            return True
+        except Exception as e:
+            await self.db.rollback() # Rollback on error during deletion
+            logger.error("Error deleting snapshot id %s: %s", snapshot_id, e, exc_info=True)
+            return False
+
 # === Standalone Helper Function for Snapshot Retrieval ===
 
 def get_latest_snapshot_model(user_id: int, db: Session) -> Optional[MemorySnapshotModel]:
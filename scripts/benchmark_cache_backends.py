@@ -0,0 +1,89 @@
+"""
+Micro-benchmark for the in-process cache backends.
+
+Compares the pickling, single-lock MemoryCache with the lock-striped
+LocalMemoryCache under concurrent get/set traffic. Run from the repo root:
+
+    python scripts/benchmark_cache_backends.py --keys 1000 --ops 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from forest_app.core.cache_service import (CacheBackend, CacheConfig,  # noqa: E402
+                                           CacheService, LocalValueMode)
+
+
+def make_payload(i):
+    """Build a value shaped like a small HTA node dict."""
+    return {
+        "id": f"node-{i}",
+        "title": f"Task {i}",
+        "status": "pending",
+        "priority": 0.5,
+        "children": [f"node-{i}-{j}" for j in range(5)],
+        "metadata": {"depth": i % 7, "tags": ["a", "b", "c"]},
+    }
+
+
+async def run_backend(label, config, keys, ops, concurrency):
+    cache = CacheService(config)
+    for i in range(keys):
+        await cache.set(f"k{i}", make_payload(i))
+
+    async def worker(offset):
+        for n in range(ops // concurrency):
+            i = (offset + n) % keys
+            if n % 10 == 0:
+                await cache.set(f"k{i}", make_payload(i))
+            else:
+                await cache.get(f"k{i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(c * 97) for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    total_ops = (ops // concurrency) * concurrency
+    print(
+        f"{label:<28} {elapsed * 1000:9.1f} ms  "
+        f"{total_ops / elapsed:12,.0f} ops/s  "
+        f"{elapsed / total_ops * 1e6:7.2f} us/op"
+    )
+    await cache.flush()
+
+
+async def main(args):
+    print(f"{args.keys} keys, {args.ops} ops (10% writes), {args.concurrency} tasks\n")
+    await run_backend(
+        "memory (pickle, 1 lock)",
+        CacheConfig(backend=CacheBackend.MEMORY),
+        args.keys,
+        args.ops,
+        args.concurrency,
+    )
+    for mode in LocalValueMode:
+        await run_backend(
+            f"local ({mode.value})",
+            CacheConfig(
+                backend=CacheBackend.LOCAL,
+                lock_stripes=args.stripes,
+                local_value_mode=mode,
+            ),
+            args.keys,
+            args.ops,
+            args.concurrency,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--stripes", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+"""
+Benchmark for the cache serializer profiles.
+
+Reports bytes-on-wire and encode/decode time per profile for payloads shaped
+like the values we cache in Redis (HTA trees, snapshot fragments). Run from
+the repo root:
+
+    python scripts/benchmark_cache_serializers.py --nodes 500 --rounds 200
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from forest_app.core.cache_serializers import (  # noqa: E402
+    CacheSerializer, CompressionCodec, SerializerProfile, lz4_frame, zstandard)
+
+
+def make_hta_tree(node_count):
+    """JSON-native payload resembling a serialized HTA tree."""
+    return {
+        "tree_id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "goal": "Learn to play the cello well enough to join a community orchestra",
+        "nodes": [
+            {
+                "id": str(uuid.uuid4()),
+                "parent_id": None if i == 0 else f"node-{i // 4}",
+                "title": f"Practice scales in position {i % 7}",
+                "description": "Work slowly with a metronome, focusing on intonation.",
+                "status": ["pending", "completed", "in_progress"][i % 3],
+                "priority": round((i % 10) / 10, 2),
+                "magnitude": 5.0,
+                "is_major_phase": i % 25 == 0,
+                "tags": ["practice", "technique", f"week-{i % 12}"],
+                "metadata": {"depth": i % 6, "estimated_minutes": 15 + i % 45},
+            }
+            for i in range(node_count)
+        ],
+    }
+
+
+def make_snapshot_fragment(node_count):
+    """Payload with datetimes and UUIDs, which only pickle round-trips exactly."""
+    return {
+        "user_id": uuid.uuid4(),
+        "captured_at": datetime.now(timezone.utc),
+        "recent_tasks": [
+            {"id": uuid.uuid4(), "completed_at": datetime.now(timezone.utc)}
+            for _ in range(node_count // 5)
+        ],
+    }
+
+
+def measure(label, serializer, value, rounds):
+    encoded = serializer(value) if callable(serializer) else serializer.dumps(value)
+    dumps = serializer if callable(serializer) else serializer.dumps
+    loads = pickle.loads if callable(serializer) else serializer.loads
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        dumps(value)
+    encode_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        loads(encoded)
+    decode_us = (time.perf_counter() - start) / rounds * 1e6
+
+    print(
+        f"  {label:<26} {len(encoded):>10,} B  "
+        f"{encode_us:9.1f} us  {decode_us:9.1f} us"
+    )
+
+
+def main(args):
+    codecs = [CompressionCodec.NONE, CompressionCodec.ZLIB]
+    if zstandard is not None:
+        codecs.append(CompressionCodec.ZSTD)
+    if lz4_frame is not None:
+        codecs.append(CompressionCodec.LZ4)
+
+    payloads = {
+        f"HTA tree ({args.nodes} nodes)": make_hta_tree(args.nodes),
+        f"snapshot fragment ({args.nodes // 5} tasks)": make_snapshot_fragment(
+            args.nodes
+        ),
+    }
+
+    for name, value in payloads.items():
+        print(f"\n{name}")
+        print(f"  {'profile':<26} {'bytes':>12}  {'encode':>12}  {'decode':>12}")
+        measure("legacy pickle.dumps", pickle.dumps, value, args.rounds)
+        for profile in SerializerProfile:
+            for codec in codecs:
+                threshold = 0 if codec != CompressionCodec.NONE else 2**62
+                serializer = CacheSerializer(profile, codec, threshold)
+                try:
+                    measure(
+                        f"{profile.value}+{codec.value}", serializer, value, args.rounds
+                    )
+                except (TypeError, ValueError) as e:
+                    print(f"  {profile.value}+{codec.value:<20} unsupported: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    main(parser.parse_args())
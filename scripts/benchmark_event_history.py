@@ -0,0 +1,103 @@
+"""
+Benchmark for the EventBus recent-event history.
+
+Compares the previous list-based history (re-sliced on overflow, reversed
+and linearly filtered per query) with the indexed ring buffer now used by
+EventBus. Run from the repo root:
+
+    python scripts/benchmark_event_history.py --events 100000 --queries 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from forest_app.core.event_bus import (EventData, EventType,  # noqa: E402
+                                       _EventHistory)
+
+
+class ListHistory:
+    """The list-based history EventBus used before the ring buffer."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.events = []
+
+    def append(self, event):
+        self.events.append(event)
+        if len(self.events) > self.capacity:
+            self.events = self.events[-self.capacity :]
+
+    def recent(self, event_type=None, user_id=None, limit=50):
+        events = list(reversed(self.events))
+        if event_type:
+            events = [e for e in events if e.event_type.value == event_type]
+        if user_id:
+            events = [e for e in events if e.user_id == user_id]
+        return events[:limit]
+
+
+def make_events(count, users):
+    types = list(EventType)
+    return [
+        EventData(
+            event_type=random.choice(types),
+            user_id=f"user-{random.randrange(users)}",
+            payload={"n": i},
+        )
+        for i in range(count)
+    ]
+
+
+def run(label, history, events, queries, users):
+    start = time.perf_counter()
+    for event in events:
+        history.append(event)
+    append_s = time.perf_counter() - start
+
+    lookups = [
+        (random.choice(list(EventType)).value, f"user-{random.randrange(users)}")
+        for _ in range(queries)
+    ]
+    timings = {}
+    for name, make_args in (
+        ("unfiltered", lambda t, u: (None, None)),
+        ("by type", lambda t, u: (t, None)),
+        ("by user", lambda t, u: (None, u)),
+        ("type+user", lambda t, u: (t, u)),
+    ):
+        start = time.perf_counter()
+        for event_type, user_id in lookups:
+            history.recent(*make_args(event_type, user_id), limit=50)
+        timings[name] = (time.perf_counter() - start) / queries * 1e6
+
+    print(
+        f"{label:<14} append {append_s / len(events) * 1e6:6.2f} us/event  "
+        + "  ".join(f"{name} {us:9.1f} us" for name, us in timings.items())
+    )
+
+
+def main(args):
+    random.seed(args.seed)
+    events = make_events(args.events, args.users)
+    capacity = args.capacity or args.events
+    print(
+        f"{args.events:,} events, capacity {capacity:,}, {args.users} users, "
+        f"{args.queries} queries of limit 50\n"
+    )
+    run("list", ListHistory(capacity), events, args.queries, args.users)
+    run("ring+index", _EventHistory(capacity), events, args.queries, args.users)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--capacity", type=int, default=0, help="default: --events")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
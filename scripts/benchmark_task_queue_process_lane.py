@@ -0,0 +1,95 @@
+"""
+Benchmark for the TaskQueue process lane.
+
+Runs a batch of CPU-bound jobs (pure-Python cosine similarity of a query
+against a set of memory embeddings) through the thread pool and through the
+process lane at increasing worker counts, reporting wall time and speed-up
+over a single worker. Run from the repo root:
+
+    python scripts/benchmark_task_queue_process_lane.py --jobs 32 --vectors 4000
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def top_similarities(query, vectors, k=5):
+    """Score every vector against the query; CPU-bound and GIL-holding."""
+    query_norm = math.sqrt(sum(q * q for q in query))
+    scores = []
+    for vector in vectors:
+        dot = sum(q * v for q, v in zip(query, vector))
+        norm = math.sqrt(sum(v * v for v in vector))
+        scores.append(dot / (query_norm * norm))
+    return sorted(scores, reverse=True)[:k]
+
+
+async def run_batch(queue, jobs, cpu_bound):
+    start = time.perf_counter()
+    task_ids = [
+        await queue.enqueue(top_similarities, query, vectors, cpu_bound=cpu_bound)
+        for query, vectors in jobs
+    ]
+    for task_id in task_ids:
+        result = await queue.get_result(task_id, timeout=600)
+        assert result["status"] == "completed", result
+    return time.perf_counter() - start
+
+
+def report(lane, workers, elapsed, baseline):
+    print(f"  {lane:<18} {workers:>7} {elapsed:9.2f} {baseline / elapsed:8.2f}x")
+
+
+async def main(args):
+    # Imported here so worker processes (which re-import this module under
+    # spawn) only need the job function, not the app
+    from forest_app.core.task_queue import TaskQueue
+
+    rng = random.Random(7)
+    vectors = [
+        [rng.uniform(-1, 1) for _ in range(args.dimensions)]
+        for _ in range(args.vectors)
+    ]
+    jobs = [
+        ([rng.uniform(-1, 1) for _ in range(args.dimensions)], vectors)
+        for _ in range(args.jobs)
+    ]
+
+    print(
+        f"{args.jobs} jobs x {args.vectors} vectors x {args.dimensions} dims "
+        f"({os.cpu_count()} CPUs)"
+    )
+    print(f"  {'lane':<18} {'workers':>7} {'seconds':>9} {'speed-up':>9}")
+
+    worker_counts = [n for n in (1, 2, 4, 8, 16) if n <= args.max_workers]
+    baseline = None
+    for workers in worker_counts:
+        queue = TaskQueue(max_workers=workers)
+        await queue.start()
+        elapsed = await run_batch(queue, jobs, cpu_bound=False)
+        await queue.stop()
+        baseline = baseline or elapsed
+        report("thread pool", workers, elapsed, baseline)
+
+    for workers in worker_counts:
+        queue = TaskQueue(max_workers=workers, process_workers=workers)
+        await queue.start()  # Warms the worker processes
+        elapsed = await run_batch(queue, jobs, cpu_bound=True)
+        await queue.stop()
+        report("process lane", workers, elapsed, baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--vectors", type=int, default=4000)
+    parser.add_argument("--dimensions", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,67 @@
+"""Tests for the async snapshot repository and user lookup."""
+
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from forest_app.persistence.models import Base, UserModel
+from forest_app.persistence.repository import (AsyncMemorySnapshotRepository,
+                                               get_user_by_email_async)
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def user(sessions):
+    async with sessions() as db:
+        user = UserModel(email="ada@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        return user
+
+
+@pytest.mark.asyncio
+async def test_user_lookup(sessions, user):
+    async with sessions() as db:
+        found = await get_user_by_email_async(db, "ada@example.com")
+        assert found.id == user.id
+        assert await get_user_by_email_async(db, "nobody@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_repository_round_trip(sessions, user):
+    async with sessions() as db:
+        repo = AsyncMemorySnapshotRepository(db)
+        first = await repo.create_snapshot(user.id, {"n": 1}, codename="first")
+        first.updated_at = datetime(2024, 1, 1)
+        second = await repo.create_snapshot(user.id, {"n": 2})
+        await db.commit()
+
+        latest = await repo.get_latest_snapshot(user.id)
+        assert latest.id == second.id
+        await repo.update_snapshot(first, {"n": 3}, codename="renamed")
+        await db.commit()
+
+    async with sessions() as db:
+        repo = AsyncMemorySnapshotRepository(db)
+        snapshots = await repo.list_snapshots(user.id)
+        assert {s.id for s in snapshots} == {first.id, second.id}
+        fetched = await repo.get_snapshot_by_id(first.id, user.id)
+        assert fetched.snapshot_data == {"n": 3} and fetched.codename == "renamed"
+
+        assert not await repo.delete_snapshot_by_id(first.id, uuid.uuid4())
+        assert await repo.delete_snapshot_by_id(first.id, user.id)
+        assert await repo.get_snapshot_by_id(first.id, user.id) is None
+
+    with pytest.raises(TypeError):
+        AsyncMemorySnapshotRepository(object())
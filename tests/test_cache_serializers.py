@@ -0,0 +1,130 @@
+"""Tests for the cache serializer profiles."""
+
+import pickle
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+import forest_app.core.cache_serializers as cache_serializers
+from forest_app.core.cache_serializers import (MAGIC, CacheSerializer,
+                                               CompressionCodec,
+                                               SerializerProfile)
+from forest_app.core.cache_service import (CacheBackend, CacheConfig,
+                                           CacheService, cacheable)
+
+TREE = {
+    "tree_id": "t-1",
+    "nodes": [
+        {"id": f"n{i}", "priority": i / 10, "done": i % 2 == 0} for i in range(5)
+    ],
+    "parent": None,
+}
+
+
+@pytest.mark.parametrize("profile", list(SerializerProfile))
+def test_profiles_round_trip_json_native_values(profile):
+    serializer = CacheSerializer(profile)
+
+    encoded = serializer.dumps(TREE)
+
+    assert encoded.startswith(MAGIC)
+    assert serializer.loads(encoded) == TREE
+
+
+def test_auto_profile_is_lossless_for_non_json_types():
+    serializer = CacheSerializer(SerializerProfile.AUTO)
+    value = {
+        "id": uuid.uuid4(),
+        "at": datetime.now(timezone.utc),
+        "pair": (1, 2),
+        1: "int key",
+    }
+
+    assert serializer.loads(serializer.dumps(value)) == value
+    assert serializer.loads(serializer.dumps(b"raw")) == b"raw"
+
+
+def test_json_profile_falls_back_to_pickle_for_unsupported_values():
+    serializer = CacheSerializer(SerializerProfile.JSON)
+    value = {1, 2, 3}
+
+    assert serializer.loads(serializer.dumps(value)) == value
+
+
+@pytest.mark.parametrize(
+    "codec", [CompressionCodec.ZLIB, CompressionCodec.ZSTD, CompressionCodec.LZ4]
+)
+def test_compression_applies_only_above_threshold(codec):
+    serializer = CacheSerializer(
+        SerializerProfile.PICKLE, codec, compression_threshold=256
+    )
+    large = {"text": "forest " * 500}
+
+    small_encoded = serializer.dumps({"text": "tiny"})
+    large_encoded = serializer.dumps(large)
+
+    assert small_encoded[len(MAGIC) + 1] == 0  # stored uncompressed
+    assert large_encoded[len(MAGIC) + 1] != 0
+    assert len(large_encoded) < len(pickle.dumps(large))
+    assert serializer.loads(large_encoded) == large
+
+
+def test_legacy_pickled_entries_still_decode():
+    serializer = CacheSerializer(SerializerProfile.AUTO)
+
+    assert serializer.loads(pickle.dumps(TREE)) == TREE
+    assert serializer.loads(pickle.dumps(TREE, protocol=0)) == TREE
+
+
+@pytest.mark.asyncio
+async def test_cache_service_uses_serializer_profile():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis()
+    cache = CacheService(
+        CacheConfig(
+            backend=CacheBackend.REDIS,
+            redis_client=client,
+            serializer_profile=SerializerProfile.JSON,
+            compression=CompressionCodec.ZLIB,
+            compression_threshold=64,
+        )
+    )
+
+    await cache.set("tree:1", TREE)
+
+    raw = await client.get("forest:tree:1")
+    assert raw.startswith(MAGIC)
+    assert await cache.get("tree:1") == TREE
+    await cache.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("profile", [SerializerProfile.MSGPACK, SerializerProfile.JSON])
+async def test_cacheable_refresh_envelope_survives_lossy_profiles(
+    profile, monkeypatch
+):
+    fakeredis = pytest.importorskip("fakeredis")
+    if profile == SerializerProfile.JSON:
+        # Exercise the stdlib json fallback, which accepts tuples
+        monkeypatch.setattr(cache_serializers, "orjson", None)
+    cache = CacheService(
+        CacheConfig(
+            backend=CacheBackend.REDIS,
+            redis_client=fakeredis.aioredis.FakeRedis(),
+            serializer_profile=profile,
+        )
+    )
+    monkeypatch.setattr(CacheService, "_instance", cache)
+    calls = 0
+
+    @cacheable(key_pattern="profile:{0}", ttl=60, stale_ttl=60)
+    async def load(user_id):
+        nonlocal calls
+        calls += 1
+        return {"x": 1}
+
+    assert await load("u1") == {"x": 1}
+    assert await load("u1") == {"x": 1}
+    assert calls == 1
+    await cache.close()
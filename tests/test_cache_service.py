@@ -0,0 +1,560 @@
+"""Tests for the cache service backends."""
+
+import asyncio
+
+import pytest
+
+from forest_app.core.cache_service import (CacheBackend, CacheConfig,
+                                           CacheService, EvictionPolicy,
+                                           LocalValueMode, cacheable,
+                                           cacheable_batch)
+
+
+def _bounded_service(**kwargs) -> CacheService:
+    return CacheService(
+        CacheConfig(backend=CacheBackend.BOUNDED_MEMORY, **kwargs)
+    )
+
+
+@pytest.mark.asyncio
+async def test_bounded_lru_evicts_least_recently_used():
+    cache = _bounded_service(max_entries=2, eviction_policy=EvictionPolicy.LRU)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1  # "b" is now least recently used
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_lfu_evicts_least_frequently_used():
+    cache = _bounded_service(max_entries=2, eviction_policy=EvictionPolicy.LFU)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    for _ in range(3):
+        await cache.get("a")
+    await cache.get("b")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_tinylfu_rejects_cold_candidate():
+    cache = _bounded_service(max_entries=2, eviction_policy=EvictionPolicy.TINYLFU)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    for _ in range(5):
+        await cache.get("a")
+        await cache.get("b")
+
+    assert await cache.set("cold", 3) is False
+    assert await cache.get("a") == 1
+    assert await cache.get("b") == 2
+    assert cache.get_stats()["rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_respects_max_bytes():
+    cache = _bounded_service(max_bytes=200)
+
+    for i in range(10):
+        assert await cache.set(f"k{i}", "x" * 50)
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 200
+    assert stats["entries"] < 10
+    assert await cache.get("k9") == "x" * 50
+
+    # A single value larger than the whole budget is refused outright
+    assert await cache.set("huge", "x" * 500) is False
+
+
+@pytest.mark.asyncio
+async def test_bounded_rejected_overwrite_removes_previous_value():
+    cache = _bounded_service(max_bytes=200)
+
+    await cache.set("k", "small")
+    assert await cache.set("k", "x" * 1000) is False
+    assert await cache.get("k") is None
+
+    await cache.set_many({"a": "small", "b": "small"}, tags=["t"])
+    assert await cache.set_many({"a": "x" * 1000, "b": "fits"}) is False
+    assert await cache.get_many(["a", "b"]) == {"b": "fits"}
+    assert await cache.invalidate_tag("t") == 0
+    assert cache.get_stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_overwrite_evicts_others_to_stay_within_max_bytes():
+    cache = _bounded_service(max_bytes=300, eviction_policy=EvictionPolicy.LFU)
+
+    await cache.set("a", "x" * 100)
+    await cache.set("b", "x" * 100)
+    await cache.set("k", "x" * 50)
+    for _ in range(3):
+        await cache.get("a")
+        await cache.get("b")
+
+    assert await cache.set("k", "x" * 250)
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 300
+    assert await cache.get("k") == "x" * 250
+    assert await cache.get("a") is None and await cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_bounded_expires_entries_without_scan():
+    cache = _bounded_service()
+
+    await cache.set("short", "v", ttl=0)
+    await cache.set("long", "v", ttl=60)
+    await asyncio.sleep(0.01)
+
+    assert await cache.get("short") is None
+    assert await cache.get("long") == "v"
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def _local_service(mode: LocalValueMode) -> CacheService:
+    return CacheService(
+        CacheConfig(backend=CacheBackend.LOCAL, lock_stripes=4, local_value_mode=mode)
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_reference_mode_shares_stored_object():
+    cache = _local_service(LocalValueMode.REFERENCE)
+    value = {"nodes": [1, 2]}
+
+    await cache.set("tree", value)
+
+    assert await cache.get("tree") is value
+
+
+@pytest.mark.asyncio
+async def test_local_copy_on_read_isolates_mutable_values():
+    cache = _local_service(LocalValueMode.COPY_ON_READ)
+    await cache.set("tree", {"nodes": [1, 2]})
+    await cache.set("title", "immutable")
+
+    first = await cache.get("tree")
+    first["nodes"].append(3)
+
+    assert await cache.get("tree") == {"nodes": [1, 2]}
+    assert await cache.get("title") == "immutable"
+
+
+@pytest.mark.asyncio
+async def test_local_freeze_mode_returns_read_only_values():
+    cache = _local_service(LocalValueMode.FREEZE)
+    await cache.set("tree", {"nodes": [1, 2]})
+
+    frozen = await cache.get("tree")
+
+    assert frozen["nodes"] == (1, 2)
+    with pytest.raises(TypeError):
+        frozen["nodes"] = []
+
+
+@pytest.mark.asyncio
+async def test_local_expiry_and_delete():
+    cache = _local_service(LocalValueMode.REFERENCE)
+    await cache.set("short", 1, ttl=0)
+    await cache.set("long", 2)
+    await asyncio.sleep(0.01)
+
+    assert await cache.get("short") is None
+    assert await cache.delete("long") is True
+    assert await cache.get("long") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_local_bounds_each_stripe_and_evicts_least_recently_used():
+    cache = CacheService(
+        CacheConfig(backend=CacheBackend.LOCAL, lock_stripes=1, max_entries=2)
+    )
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get_many(["a", "c"]) == {"a": 1, "c": 3}
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_local_sweep_removes_expired_keys_that_are_never_read():
+    cache = _local_service(LocalValueMode.REFERENCE)
+    cache.backend.SWEEP_INTERVAL = 0.01
+    await cache.set_many({f"k{n}": n for n in range(20)}, ttl=0)
+
+    await _wait_for(lambda: cache.get_stats()["entries"] == 0)
+    await cache.close()
+    assert cache.backend.sweep_task is None
+
+
+@pytest.fixture
+def local_cache_instance():
+    """Install a fresh local cache as the CacheService singleton."""
+    previous = CacheService._instance
+    CacheService._instance = _local_service(LocalValueMode.REFERENCE)
+    yield CacheService._instance
+    CacheService._instance = previous
+
+
+@pytest.mark.asyncio
+async def test_cacheable_single_flight_deduplicates_concurrent_misses(
+    local_cache_instance,
+):
+    calls = 0
+
+    @cacheable(key_pattern="journey:{0}", ttl=60)
+    async def load(user_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"user": user_id}
+
+    results = await asyncio.gather(*(load("u1") for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"user": "u1"} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cacheable_single_flight_propagates_errors(local_cache_instance):
+    calls = 0
+
+    @cacheable(key_pattern="failing:{0}", ttl=60)
+    async def fail(user_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("llm unavailable")
+
+    results = await asyncio.gather(
+        *(fail("u1") for _ in range(3)), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cacheable_single_flight_survives_leader_cancellation(
+    local_cache_instance,
+):
+    calls = 0
+
+    @cacheable(key_pattern="plan:{0}", ttl=60)
+    async def load(user_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"user": user_id}
+
+    leader = asyncio.create_task(load("u1"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(load("u1"))
+    await asyncio.sleep(0.005)
+    leader.cancel()
+
+    assert await follower == {"user": "u1"}
+    assert leader.cancelled()
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cacheable_serves_stale_while_revalidating(local_cache_instance):
+    calls = 0
+
+    @cacheable(key_pattern="pattern:{0}", ttl=0, stale_ttl=60)
+    async def analyse(user_id):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    assert await analyse("u1") == 1
+
+    # Entry is stale immediately; callers get the old value and one refresh runs
+    stale_results = await asyncio.gather(*(analyse("u1") for _ in range(5)))
+    assert stale_results == [1] * 5
+    await asyncio.sleep(0.05)
+
+    assert calls == 2
+    assert await analyse("u1") == 2
+
+
+@pytest.mark.asyncio
+async def test_cacheable_method_key_skips_self(local_cache_instance):
+    class JourneyService:
+        def __init__(self):
+            self.calls = 0
+
+        @cacheable(key_pattern="user:{0}:journey_data", ttl=60)
+        async def get_journey(self, user_id):
+            self.calls += 1
+            return user_id
+
+    service = JourneyService()
+    assert await service.get_journey("u1") == "u1"
+    assert await service.get_journey("u1") == "u1"
+    assert await service.get_journey("u2") == "u2"
+
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cacheable_static_method_key_keeps_first_argument(local_cache_instance):
+    calls = []
+
+    class Repo:
+        @staticmethod
+        @cacheable(key_pattern="user:{0}", ttl=60)
+        async def lookup(user_id, field):
+            calls.append(user_id)
+            return f"{user_id}:{field}"
+
+        @staticmethod
+        @cacheable_batch(key_pattern="node:{id}:{0}", ttl=60)
+        async def nodes(node_ids, version):
+            calls.append(list(node_ids))
+            return {node_id: f"{node_id}@{version}" for node_id in node_ids}
+
+    assert await Repo.lookup("u1", "name") == "u1:name"
+    assert await Repo.lookup("u2", "name") == "u2:name"
+    assert await Repo().lookup("u1", "name") == "u1:name"
+    assert await Repo.nodes(["a"], 1) == {"a": "a@1"}
+    assert await Repo.nodes(["a"], 1) == {"a": "a@1"}
+    assert calls == ["u1", "u2", ["a"]]
+
+
+async def _wait_for(predicate, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_tiered_invalidates_other_workers_l1():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def worker():
+        return CacheService(
+            CacheConfig(
+                backend=CacheBackend.TIERED,
+                redis_client=fakeredis.aioredis.FakeRedis(server=server),
+                l1_max_entries=10,
+            )
+        )
+
+    worker_a, worker_b = worker(), worker()
+    try:
+        await worker_a.set("tree:1", {"version": 1})
+        assert await worker_b.get("tree:1") == {"version": 1}  # L2 hit fills L1
+        assert await worker_b.get("tree:1") == {"version": 1}  # L1 hit
+        assert worker_b.get_stats()["l1_hits"] == 1
+
+        await _wait_for(
+            lambda: worker_a.backend.listener_task is not None
+            and worker_b.backend.listener_task is not None
+        )
+        await asyncio.sleep(0.05)  # let both listeners subscribe
+
+        await worker_a.set("tree:1", {"version": 2})
+        await _wait_for(
+            lambda: worker_b.get_stats()["invalidations_received"] >= 1
+        )
+        assert await worker_b.get("tree:1") == {"version": 2}
+
+        await worker_a.delete("tree:1")
+        await _wait_for(
+            lambda: worker_b.get_stats()["invalidations_received"] >= 2
+        )
+        assert await worker_b.get("tree:1") is None
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_l1_copy_expires_with_the_redis_entry():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis()
+    cache = CacheService(
+        CacheConfig(backend=CacheBackend.TIERED, redis_client=client, l1_ttl=60)
+    )
+    try:
+        await client.set("forest:short", cache.config.serializer("v"), px=50)
+        await client.set("forest:batch", cache.config.serializer("w"), px=50)
+        assert await cache.get("short") == "v"  # L2 hit fills L1
+        assert await cache.get_many(["batch"]) == {"batch": "w"}
+
+        await asyncio.sleep(0.1)
+        assert await cache.get("short") is None
+        assert await cache.get_many(["batch"]) == {}
+    finally:
+        await cache.close()
+
+
+def _tagging_services():
+    fakeredis = pytest.importorskip("fakeredis")
+    return [
+        _bounded_service(),
+        _local_service(LocalValueMode.REFERENCE),
+        CacheService(
+            CacheConfig(
+                backend=CacheBackend.REDIS,
+                redis_client=fakeredis.aioredis.FakeRedis(),
+            )
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tag_evicts_only_tagged_entries():
+    for cache in _tagging_services():
+        await cache.set("tree:1:nodes", [1], tags=["user:1", "tree:1"])
+        await cache.set("snapshot:1", {"s": 1}, tags=["user:1"])
+        await cache.set("snapshot:2", {"s": 2}, tags=["user:2"])
+        await cache.set("untagged", "keep")
+
+        assert await cache.invalidate_tag("user:1") == 2
+
+        assert await cache.get("tree:1:nodes") is None
+        assert await cache.get("snapshot:1") is None
+        assert await cache.get("snapshot:2") == {"s": 2}
+        assert await cache.get("untagged") == "keep"
+        assert await cache.invalidate_tag("tree:1") == 0
+
+
+@pytest.mark.asyncio
+async def test_overwrite_replaces_tags():
+    cache = _bounded_service()
+    await cache.set("snapshot", 1, tags=["user:1"])
+    await cache.set("snapshot", 2, tags=["user:2"])
+
+    assert await cache.invalidate_tag("user:1") == 0
+    assert await cache.get("snapshot") == 2
+    assert await cache.invalidate_tag("user:2") == 1
+
+
+@pytest.mark.asyncio
+async def test_cacheable_tags_allow_precise_eviction(local_cache_instance):
+    calls = 0
+
+    @cacheable(key_pattern="memory:user:{0}:latest", ttl=3600, tags=["user:{0}"])
+    async def latest_snapshot(user_id):
+        nonlocal calls
+        calls += 1
+        return {"user": user_id, "version": calls}
+
+    assert (await latest_snapshot("u1"))["version"] == 1
+    assert (await latest_snapshot("u1"))["version"] == 1
+
+    await local_cache_instance.invalidate_tag("user:u1")
+
+    assert (await latest_snapshot("u1"))["version"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_round_trip_on_every_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    services = _tagging_services() + [
+        CacheService(
+            CacheConfig(
+                backend=CacheBackend.TIERED,
+                redis_client=fakeredis.aioredis.FakeRedis(),
+            )
+        )
+    ]
+
+    for cache in services:
+        assert await cache.set_many({"n1": {"id": 1}, "n2": {"id": 2}}, ttl=60)
+
+        found = await cache.get_many(["n1", "n2", "n3"])
+        assert found == {"n1": {"id": 1}, "n2": {"id": 2}}
+
+        assert await cache.delete_many(["n1", "n3"]) == 1
+        assert await cache.get_many(["n1", "n2"]) == {"n2": {"id": 2}}
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_tags_work_without_expire_options():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+    client = fakeredis.aioredis.FakeRedis(version=6)  # No EXPIRE NX/GT
+    cache = CacheService(
+        CacheConfig(backend=CacheBackend.REDIS, redis_client=client)
+    )
+
+    assert await cache.set("a", 1, ttl=100, tags=["t"])
+    assert await cache.set_many({"b": 2, "c": 3}, ttl=10, tags=["t"])
+    assert cache.backend.expire_options is False
+    assert 90 < await client.ttl("forest:tag:t") <= 100  # Never shortened
+
+    assert await cache.invalidate_tag("t") == 3
+    assert await cache.get_many(["a", "b", "c"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_get_many_uses_single_mget():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis()
+    cache = CacheService(
+        CacheConfig(backend=CacheBackend.REDIS, redis_client=client)
+    )
+    await cache.set_many({f"node:{i}": i for i in range(20)})
+
+    calls = []
+    original_mget = client.mget
+
+    async def counting_mget(*args, **kwargs):
+        calls.append(args)
+        return await original_mget(*args, **kwargs)
+
+    client.mget = counting_mget
+    found = await cache.get_many([f"node:{i}" for i in range(20)])
+
+    assert len(found) == 20
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cacheable_batch_fetches_only_missing_ids(local_cache_instance):
+    requested = []
+
+    class NodeService:
+        @cacheable_batch(key_pattern="node:{id}", ttl=60)
+        async def get_nodes(self, node_ids):
+            requested.append(list(node_ids))
+            return {node_id: {"id": node_id} for node_id in node_ids}
+
+    service = NodeService()
+    assert await service.get_nodes(["a", "b"]) == {
+        "a": {"id": "a"},
+        "b": {"id": "b"},
+    }
+    result = await service.get_nodes(["b", "c", "a"])
+
+    assert list(result) == ["b", "c", "a"]
+    assert requested == [["a", "b"], ["c"]]
@@ -0,0 +1,226 @@
+"""Tests for the embedding index and its use by SemanticMemoryManager."""
+
+import json
+
+import numpy as np
+import pytest
+
+from forest_app.core.services.embedding_cache import EmbeddingCache
+from forest_app.core.services.embedding_index import EmbeddingIndex
+from forest_app.core.services.semantic_memory import SemanticMemoryManager
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_embedding_caches():
+    EmbeddingCache.reset_shared()
+    yield
+    EmbeddingCache.reset_shared()
+
+
+def brute_force(vectors, query, k):
+    vectors = np.asarray(vectors, dtype=np.float64)
+    query = np.asarray(query, dtype=np.float64)
+    scores = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+def test_search_matches_brute_force_cosine_similarity():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(300, 16))
+    index = EmbeddingIndex(initial_capacity=4)
+    for n, vector in enumerate(vectors):
+        assert index.add(f"m{n}", vector.tolist()) == n
+
+    query = rng.normal(size=16)
+    results = index.search(query.tolist(), k=10)
+
+    assert [row for row, _ in results] == brute_force(vectors, query, 10)
+    assert all(a[1] >= b[1] for a, b in zip(results, results[1:]))
+    assert index.get_stats()["capacity"] == 512
+
+
+def test_add_replaces_vector_of_known_id_and_rows_restrict_search():
+    index = EmbeddingIndex()
+    index.add_many(["a", "b", "c"], [[1, 0], [0, 1], [1, 1]])
+    assert index.add("a", [0, -1]) == 0
+    assert len(index) == 3 and index.row("c") == 2
+
+    assert index.search([1, 0.5], k=1)[0][0] == 2
+    assert index.search([1, 0.5], k=2, rows=np.array([0, 1]))[0][0] == 1
+    with pytest.raises(ValueError):
+        index.add("d", [1, 0, 0])
+
+
+def test_approximate_mode_finds_nearest_neighbours():
+    rng = np.random.default_rng(2)
+    centers = rng.normal(size=(20, 32))
+    vectors = np.repeat(centers, 100, axis=0) + rng.normal(scale=0.05, size=(2000, 32))
+    index = EmbeddingIndex(approximate=True, approximate_threshold=1000, n_probe=4)
+    index.add_many(list(range(1000)), vectors[:1000].tolist())
+    assert index.get_stats()["mode"] == "ivf"
+    index.add_many(list(range(1000, 2000)), vectors[1000:].tolist())
+
+    query = centers[7] + rng.normal(scale=0.05, size=32)
+    approximate = {row for row, _ in index.search(query.tolist(), k=10)}
+    exact = {row for row, _ in index.search(query.tolist(), k=10, exact=True)}
+
+    assert len(approximate & exact) >= 8
+
+
+class FakeLLM:
+    embeddings = {
+        "walk": [1.0, 0.0, 0.0],
+        "run": [0.9, 0.1, 0.0],
+        "read": [0.0, 1.0, 0.0],
+        "exercise": [1.0, 0.05, 0.0],
+    }
+
+    async def get_embedding(self, text):
+        return self.embeddings[text]
+
+
+@pytest.mark.asyncio
+async def test_query_memories_uses_index_and_updates_stats():
+    manager = SemanticMemoryManager(FakeLLM())
+    await manager.store_memory("reflection", "walk")
+    await manager.store_memory("task_completion", "run")
+    await manager.store_memory("reflection", "read")
+
+    top = await manager.query_memories("exercise", k=2)
+    assert [m["content"] for m in top] == ["walk", "run"]
+    assert all(m["access_count"] == 1 for m in top)
+
+    filtered = await manager.query_memories(
+        "exercise", k=2, event_types=["reflection"]
+    )
+    assert [m["content"] for m in filtered] == ["walk", "read"]
+
+
+@pytest.mark.asyncio
+async def test_from_dict_rebuilds_index():
+    manager = SemanticMemoryManager(FakeLLM())
+    await manager.store_memory("reflection", "read")
+    await manager.store_memory("reflection", "walk")
+
+    restored = SemanticMemoryManager(FakeLLM())
+    await restored.from_dict({"memories": manager.memories})
+
+    assert len(restored.index) == 2
+    top = await restored.query_memories("exercise", k=1)
+    assert top[0]["content"] == "walk"
+    assert await restored.update_memory_stats(top[0]["id"])
+
+
+@pytest.mark.asyncio
+async def test_embedding_store_keeps_vectors_out_of_memories(tmp_path):
+    from forest_app.core.services.embedding_store import SQLEmbeddingStore
+
+    store = SQLEmbeddingStore(f"sqlite:///{tmp_path / 'embeddings.db'}")
+    manager = SemanticMemoryManager(FakeLLM(), embedding_store=store)
+    await manager.store_memory("reflection", "read")
+    walk = await manager.store_memory("reflection", "walk")
+    assert "embedding" not in walk
+
+    # Older data with inline vectors is moved to the store on load
+    legacy = {"id": "legacy", "event_type": "reflection", "content": "run"}
+    legacy.update(timestamp=walk["timestamp"], importance=0.5, access_count=0)
+    data = {"memories": [*manager.memories, {**legacy, "embedding": [0.9, 0.1, 0]}]}
+
+    restored = SemanticMemoryManager(FakeLLM(), embedding_store=store)
+    await restored.from_dict(data)
+    assert all("embedding" not in m for m in restored.memories)
+    assert len(restored.index) == 1  # Stored vectors are loaded on first query
+
+    top = await restored.query_memories("exercise", k=2)
+    assert [m["content"] for m in top] == ["walk", "run"]
+    assert len(restored.index) == 3
+
+    vectors = await store.get_many(["legacy", "missing"])
+    assert list(vectors) == ["legacy"] and vectors["legacy"].dtype == np.float32
+    await store.close()
+
+
+class CountingLLM(FakeLLM):
+    def __init__(self):
+        self.calls = []
+
+    async def get_embeddings(self, texts):
+        self.calls.append(list(texts))
+        return [self.embeddings[text] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_embedding_cache_shares_and_batches_embedding_calls():
+    llm = CountingLLM()
+    cache = EmbeddingCache(max_entries=3)
+    manager = SemanticMemoryManager(llm, embedding_cache=cache)
+    await manager.store_memory("reflection", "walk")
+    await manager.query_memories("walk")
+    assert llm.calls == [["walk"]]
+
+    await manager.store_memories(
+        [{"event_type": "reflection", "content": text} for text in ("run", "read")]
+    )
+    assert llm.calls[-1] == ["run", "read"]
+
+    # Dropped vectors are re-embedded in one batch, through the shared cache
+    other = SemanticMemoryManager(llm, embedding_cache=cache)
+    data = [{k: v for k, v in m.items() if k != "embedding"} for m in manager.memories]
+    await other.from_dict({"memories": data})
+    assert len(other.index) == 3 and len(llm.calls) == 2
+
+    await other.store_memory("reflection", "exercise")  # Evicts "walk"
+    assert cache.get_stats()["entries"] == 3
+    await other.query_memories("walk")
+    assert llm.calls[-1] == ["walk"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip_keeps_inline_vectors_without_store():
+    from forest_app.core.snapshot import MemorySnapshot
+
+    llm = CountingLLM()
+    manager = SemanticMemoryManager(llm, embedding_cache=EmbeddingCache())
+    await manager.store_memory("reflection", "walk")
+    snapshot = MemorySnapshot()
+    snapshot.update_semantic_memories(manager.memories)
+
+    restored = MemorySnapshot.from_dict(json.loads(json.dumps(snapshot.to_dict())))
+    other = SemanticMemoryManager(llm, embedding_cache=EmbeddingCache())
+    await other.from_dict(restored.semantic_memories)
+
+    assert restored.semantic_memories["memories"][0]["embedding"] == [1.0, 0.0, 0.0]
+    assert len(other.index) == 1 and llm.calls == [["walk"]]
+
+
+class ModelLLM(CountingLLM):
+    def __init__(self, embedding_model, scale):
+        super().__init__()
+        self.embedding_model = embedding_model
+        self.scale = scale
+
+    async def get_embeddings(self, texts):
+        vectors = await super().get_embeddings(texts)
+        return [[x * self.scale for x in v] for v in vectors]
+
+
+@pytest.mark.asyncio
+async def test_default_cache_is_not_shared_across_models_or_clients():
+    small, large = ModelLLM("small", 1.0), ModelLLM("large", 2.0)
+    await SemanticMemoryManager(small).store_memory("reflection", "walk")
+    manager = SemanticMemoryManager(large)
+    await manager.store_memory("reflection", "walk")
+    assert manager.memories[0]["embedding"] == [2.0, 0.0, 0.0]
+    assert large.calls == [["walk"]]
+
+    # Same model: the cache is shared, even across client instances
+    other = SemanticMemoryManager(ModelLLM("large", 2.0))
+    await other.store_memory("reflection", "walk")
+    assert other.llm_client.calls == []
+
+    # Clients that do not name a model only reuse their own vectors
+    first, second = CountingLLM(), CountingLLM()
+    await SemanticMemoryManager(first).store_memory("reflection", "walk")
+    await SemanticMemoryManager(first).store_memory("reflection", "walk")
+    await SemanticMemoryManager(second).store_memory("reflection", "walk")
+    assert first.calls == [["walk"]] and second.calls == [["walk"]]
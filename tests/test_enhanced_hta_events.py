@@ -0,0 +1,71 @@
+"""Tests for the Enhanced HTA event manager."""
+
+import pytest
+
+from forest_app.core.cache_service import (CacheBackend, CacheConfig,
+                                           CacheService)
+from forest_app.core.event_bus import EventBus, EventType
+from forest_app.core.services.enhanced_hta.events import EventManager
+
+
+@pytest.fixture
+def event_manager(monkeypatch):
+    monkeypatch.setattr(EventBus, "_instance", EventBus())
+    return EventManager(CacheService(CacheConfig(backend=CacheBackend.BOUNDED_MEMORY)))
+
+
+@pytest.mark.asyncio
+async def test_publish_batch_events_coalesces_tree_evolutions(event_manager):
+    received = []
+    event_manager.event_bus.subscribe(
+        [EventType.TREE_EVOLVED, EventType.TASK_UPDATED], received.append, batch=True
+    )
+
+    events = [
+        {
+            "event_type": EventType.TREE_EVOLVED,
+            "user_id": "user-1",
+            "payload": {"tree_id": "tree-a", "version": version},
+        }
+        for version in range(3)
+    ]
+    events += [
+        {
+            "event_type": EventType.TREE_EVOLVED,
+            "user_id": "user-1",
+            "payload": {"tree_id": "tree-b", "version": 0},
+        },
+        {
+            "event_type": EventType.TASK_UPDATED,
+            "user_id": "user-1",
+            "payload": {"task_id": "t1"},
+        },
+        {"user_id": "user-1", "payload": {}},  # missing event_type
+    ]
+
+    results = await event_manager.publish_batch_events(events)
+
+    assert results == {"success": 3, "failure": 1, "coalesced": 2}
+    [batch] = received
+    assert [(e.payload.get("tree_id"), e.payload.get("version")) for e in batch] == [
+        ("tree-a", 2),
+        ("tree-b", 0),
+        (None, None),
+    ]
+    assert batch[0].metadata["coalesced_count"] == 2
+    assert all("timestamp" in e.payload for e in batch)
+
+
+@pytest.mark.asyncio
+async def test_publish_batch_events_without_coalescing(event_manager):
+    events = [
+        {
+            "event_type": EventType.TREE_EVOLVED,
+            "user_id": "user-1",
+            "payload": {"tree_id": "tree-a"},
+        }
+    ] * 3
+
+    results = await event_manager.publish_batch_events(events, coalesce=False)
+
+    assert results == {"success": 3, "failure": 0, "coalesced": 0}
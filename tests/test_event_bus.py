@@ -0,0 +1,517 @@
+"""Tests for the event bus dispatch modes."""
+
+import asyncio
+
+import pytest
+
+from forest_app.core.event_bus import (DispatchMode, EventBus, EventBusConfig,
+                                       EventData, EventType, OverflowPolicy,
+                                       _decode_event_binary,
+                                       _encode_event_binary, _serialize_event)
+from forest_app.core.event_log import SQLiteEventLog
+from forest_app.core.event_transport import RedisStreamsTransport
+
+
+def _queued_bus(**kwargs) -> EventBus:
+    return EventBus(EventBusConfig(dispatch_mode=DispatchMode.QUEUED, **kwargs))
+
+
+def _event(n: int) -> dict:
+    return {
+        "event_type": EventType.TASK_COMPLETED,
+        "user_id": "user-1",
+        "payload": {"n": n},
+    }
+
+
+@pytest.mark.asyncio
+async def test_inline_publish_waits_for_subscribers():
+    bus = EventBus()
+    received = []
+
+    async def subscriber(event):
+        await asyncio.sleep(0.01)
+        received.append(event.payload["n"])
+
+    bus.subscribe(EventType.TASK_COMPLETED, subscriber)
+    await bus.publish(_event(1))
+
+    assert received == [1]
+
+
+@pytest.mark.asyncio
+async def test_queued_publish_does_not_wait_for_slow_subscriber():
+    bus = _queued_bus()
+    release = asyncio.Event()
+    received = []
+
+    async def slow_subscriber(event):
+        await release.wait()
+        received.append(event.payload["n"])
+
+    bus.subscribe(EventType.TASK_COMPLETED, slow_subscriber)
+    await asyncio.wait_for(bus.publish(_event(1)), timeout=0.5)
+    await asyncio.wait_for(bus.publish(_event(2)), timeout=0.5)
+    assert received == []
+
+    release.set()
+    assert await bus.drain(timeout=1)
+    assert received == [1, 2]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_newest_events():
+    bus = _queued_bus(max_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    release = asyncio.Event()
+    received = []
+
+    async def subscriber(event):
+        await release.wait()
+        received.append(event.payload["n"])
+
+    bus.subscribe(EventType.TASK_COMPLETED, subscriber)
+    await bus.publish(_event(0))
+    await asyncio.sleep(0)  # worker takes event 0 and blocks in the handler
+    for n in range(1, 6):
+        await bus.publish(_event(n))
+
+    release.set()
+    await bus.drain(timeout=1)
+
+    assert received == [0, 4, 5]
+    [metrics] = bus.get_subscriber_metrics()
+    assert metrics["dropped"] == 3
+    assert metrics["delivered"] == 3
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure():
+    bus = _queued_bus(max_queue_size=1, overflow_policy=OverflowPolicy.BLOCK)
+    release = asyncio.Event()
+    received = []
+
+    async def subscriber(event):
+        await release.wait()
+        received.append(event.payload["n"])
+
+    bus.subscribe(EventType.TASK_COMPLETED, subscriber)
+    await bus.publish(_event(0))
+    await asyncio.sleep(0)
+    await bus.publish(_event(1))  # fills the queue
+
+    blocked = asyncio.create_task(bus.publish(_event(2)))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await bus.drain(timeout=1)
+    assert received == [0, 1, 2]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_spill_policy_preserves_every_event_in_order(tmp_path):
+    bus = _queued_bus(
+        max_queue_size=2,
+        overflow_policy=OverflowPolicy.SPILL,
+        spill_dir=str(tmp_path),
+    )
+    release = asyncio.Event()
+    received = []
+
+    async def subscriber(event):
+        await release.wait()
+        received.append(event.payload["n"])
+
+    bus.subscribe(EventType.TASK_COMPLETED, subscriber)
+    for n in range(10):
+        await bus.publish(_event(n))
+
+    [metrics] = bus.get_subscriber_metrics()
+    assert metrics["spilled"] > 0
+    assert metrics["depth"] >= 8
+
+    release.set()
+    assert await bus.drain(timeout=1)
+    assert received == list(range(10))
+    assert bus.get_subscriber_metrics()[0]["depth"] == 0
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_metrics_report_lag_and_failures():
+    bus = EventBus()
+    received = []
+
+    async def flaky(event):
+        await asyncio.sleep(0.02)
+        if event.payload["n"] == 1:
+            raise RuntimeError("boom")
+        received.append(event.payload["n"])
+
+    bus.subscribe(
+        EventType.TASK_COMPLETED, flaky, dispatch_mode=DispatchMode.QUEUED
+    )
+    for n in range(3):
+        await bus.publish(_event(n))
+    await bus.drain(timeout=1)
+
+    assert received == [0, 2]
+    [metrics] = bus.get_metrics()["subscriber_queues"]
+    assert metrics["delivered"] == 2
+    assert metrics["failed"] == 1
+    assert metrics["max_lag_seconds"] >= 0.02
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded_and_indexed():
+    bus = EventBus(EventBusConfig(max_history_size=4))
+    for n in range(6):
+        await bus.publish(
+            {
+                "event_type": EventType.TASK_COMPLETED
+                if n % 2
+                else EventType.TREE_EVOLVED,
+                "user_id": f"user-{n // 2}",
+                "payload": {"n": n},
+            }
+        )
+
+    def ns(events):
+        return [e.payload["n"] for e in events]
+
+    assert len(bus.event_history) == 4
+    assert ns(bus.get_recent_events()) == [5, 4, 3, 2]
+    assert ns(bus.get_recent_events(limit=2)) == [5, 4]
+    assert ns(bus.get_recent_events(event_type=EventType.TASK_COMPLETED)) == [5, 3]
+    assert ns(bus.get_recent_events(event_type="tree.evolved")) == [4, 2]
+    assert ns(bus.get_recent_events(user_id="user-2")) == [5, 4]
+    assert ns(
+        bus.get_recent_events(event_type=EventType.TREE_EVOLVED, user_id="user-1")
+    ) == [2]
+    # Evicted events leave no empty index buckets behind
+    assert "user-0" not in bus.event_history.by_user
+    assert bus.get_recent_events(user_id="user-0") == []
+
+
+@pytest.mark.asyncio
+async def test_string_and_enum_subscriptions_match():
+    bus = EventBus()
+    received = []
+
+    bus.subscribe("task.completed", lambda event: received.append("str"))
+    bus.subscribe(EventType.TASK_COMPLETED, lambda event: received.append("enum"))
+    await bus.publish(_event(1))
+
+    assert sorted(received) == ["enum", "str"]
+
+
+def _durable_bus(log) -> EventBus:
+    return EventBus(EventBusConfig(event_log=log, retry_base_delay=0.001))
+
+
+@pytest.mark.asyncio
+async def test_durable_subscriber_replays_events_missed_while_down(tmp_path):
+    path = str(tmp_path / "events.db")
+    log = SQLiteEventLog(path)
+    bus = _durable_bus(log)
+    first_run = []
+    bus.subscribe(
+        EventType.TASK_COMPLETED,
+        lambda event: first_run.append(event.payload["n"]),
+        durable_id="memory-sync",
+    )
+    await bus.publish(_event(1))
+    await bus.drain(timeout=1)
+    await bus.close()
+
+    # Subscriber is down while more events are published
+    bus = _durable_bus(log)
+    for n in (2, 3):
+        await bus.publish(_event(n))
+    await log.close()
+
+    # Restart: the subscriber resumes from its committed offset
+    log = SQLiteEventLog(path)
+    bus = _durable_bus(log)
+    second_run = []
+    bus.subscribe(
+        EventType.TASK_COMPLETED,
+        lambda event: second_run.append(event.payload["n"]),
+        durable_id="memory-sync",
+    )
+    await bus.start()
+    assert await bus.drain(timeout=1)
+
+    assert first_run == [1]
+    assert second_run == [2, 3]
+    [metrics] = bus.get_metrics()["durable_consumers"]
+    assert metrics["position"] == 3
+    assert metrics["lag"] == 0
+    await bus.close()
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_durable_subscriber_retries_failed_deliveries(tmp_path):
+    log = SQLiteEventLog(str(tmp_path / "events.db"))
+    bus = _durable_bus(log)
+    attempts = []
+
+    async def flaky(event):
+        attempts.append(event.payload["n"])
+        if len(attempts) < 3:
+            raise RuntimeError("temporarily unavailable")
+
+    bus.subscribe(EventType.TASK_COMPLETED, flaky, durable_id="flaky")
+    await bus.publish(_event(7))
+    await bus.drain(timeout=1)
+
+    assert attempts == [7, 7, 7]
+    [metrics] = bus.get_metrics()["durable_consumers"]
+    assert metrics["retries"] == 2
+    assert metrics["delivered"] == 1
+    await bus.close()
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_event_log_group_commits_concurrent_appends(tmp_path):
+    log = SQLiteEventLog(str(tmp_path / "events.db"))
+
+    offsets = await asyncio.gather(
+        *(log.append(f"e{n}", "task.completed", None, "{}") for n in range(50))
+    )
+
+    assert sorted(offsets) == list(range(1, 51))
+    assert log.stats["commits"] < 50
+    assert [r.offset for r in await log.read(45)] == [46, 47, 48, 49, 50]
+
+    await log.commit_offset("a", 20)
+    await log.commit_offset("b", 30)
+    assert await log.prune() == 20
+    assert (await log.read(0, limit=1))[0].offset == 21
+
+    # Events more than max_lag behind the head go even if "a" and "b" lag
+    assert await log.prune(max_lag=10) == 20
+    assert (await log.read(0, limit=1))[0].offset == 41
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_prune_advances_filtered_consumers_past_unmatched_events(tmp_path):
+    log = SQLiteEventLog(str(tmp_path / "events.db"))
+    bus = _durable_bus(log)
+    received = []
+    bus.subscribe(
+        EventType.USER_ONBOARDED,
+        lambda event: received.append(event.event_type),
+        durable_id="onboarding",
+    )
+    await bus.start()
+    await bus.publish({"event_type": EventType.USER_ONBOARDED, "user_id": "u1"})
+    await bus.drain(timeout=1)
+    for n in range(5):
+        await bus.publish(_event(n))
+
+    # Nothing matched since event 1, yet the consumer no longer pins the log
+    assert await bus.prune_log() == 6
+    [metrics] = bus.get_metrics()["durable_consumers"]
+    assert metrics["position"] == 6 and metrics["lag"] == 0
+    assert received == [EventType.USER_ONBOARDED]
+    assert bus.prune_task is not None
+    await bus.close()
+    assert bus.prune_task is None
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_publish_batch_groups_events_per_subscriber():
+    bus = EventBus()
+    batches = []
+    singles = []
+
+    bus.subscribe(EventType.TASK_COMPLETED, batches.append, batch=True)
+    bus.subscribe("*", lambda event: singles.append(event.payload["n"]))
+
+    ids = await bus.publish_batch(
+        [_event(1), {**_event(2), "event_type": EventType.TREE_EVOLVED}, _event(3)]
+    )
+    await bus.publish(_event(4))
+
+    assert len(ids) == 3
+    assert [[e.payload["n"] for e in batch] for batch in batches] == [[1, 3], [4]]
+    assert singles == [1, 2, 3, 4]
+    metrics = bus.get_metrics()
+    assert metrics["events_published"] == 4
+    assert metrics["batches_published"] == 1
+    assert len(bus.event_history) == 4
+
+
+def test_binary_event_encoding_round_trips():
+    event = EventData(
+        event_type=EventType.TREE_EVOLVED,
+        user_id="user-1",
+        payload={"tree_id": "t1", "nodes": [1, 2]},
+        metadata={"source": "test"},
+        trace_id="abc",  # extra field
+    )
+
+    encoded = _encode_event_binary(event)
+    decoded = _decode_event_binary(encoded)
+
+    assert decoded == event
+    assert len(encoded) < len(_serialize_event(event))
+
+
+async def _wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_redis_streams_transport_delivers_once_per_group():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    received = {"memory": [], "discovery": [], "local": []}
+
+    def worker(name):
+        bus = EventBus(
+            EventBusConfig(
+                transport=RedisStreamsTransport(
+                    redis_client=fakeredis.aioredis.FakeRedis(server=server),
+                    block_ms=20,
+                    consumer_name=name,
+                )
+            )
+        )
+        bus.subscribe(
+            EventType.TASK_COMPLETED,
+            lambda e: received["memory"].append((name, e.payload["n"])),
+            durable_id="memory",
+        )
+        bus.subscribe(
+            "*",
+            lambda e: received["discovery"].append((name, e.payload["n"])),
+            durable_id="discovery",
+        )
+        bus.subscribe("*", lambda e: received["local"].append((name, e.payload["n"])))
+        return bus
+
+    worker_a, worker_b = worker("a"), worker("b")
+    try:
+        await worker_a.start()
+        await worker_b.start()
+        await asyncio.sleep(0.05)  # consumer groups created
+
+        for n in range(10):
+            await worker_a.publish(_event(n))
+        await worker_a.publish_batch([_event(n) for n in range(10, 20)])
+
+        await _wait_until(
+            lambda: len(received["memory"]) >= 20 and len(received["discovery"]) >= 20
+        )
+        await asyncio.sleep(0.05)
+
+        for group in ("memory", "discovery"):
+            assert sorted(n for _, n in received[group]) == list(range(20))
+        # Ungrouped subscribers stay local to the publishing worker
+        assert {name for name, _ in received["local"]} == {"a"}
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_streams_transport_redelivers_failed_events():
+    fakeredis = pytest.importorskip("fakeredis")
+    transport = RedisStreamsTransport(
+        redis_client=fakeredis.aioredis.FakeRedis(), block_ms=20, claim_idle_ms=0
+    )
+    bus = EventBus(EventBusConfig(transport=transport))
+    attempts = []
+
+    def flaky(event):
+        attempts.append(event.payload["n"])
+        if len(attempts) == 1:
+            raise RuntimeError("temporarily unavailable")
+
+    bus.subscribe(EventType.TASK_COMPLETED, flaky, durable_id="flaky")
+    try:
+        await bus.start()
+        await asyncio.sleep(0.05)
+        await bus.publish(_event(1))
+
+        await _wait_until(lambda: len(attempts) >= 2)
+        assert attempts == [1, 1]
+        await _wait_until(lambda: transport.get_stats()["flaky"]["delivered"] == 1)
+        assert transport.get_stats()["flaky"]["reclaimed"] == 1
+    finally:
+        await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_streams_transport_creates_groups_before_sending():
+    fakeredis = pytest.importorskip("fakeredis")
+    transport = RedisStreamsTransport(
+        redis_client=fakeredis.aioredis.FakeRedis(), block_ms=20
+    )
+    received = []
+
+    async def handler(message):
+        received.append(message)
+        return True
+
+    # Sent before any consumer of the group has run
+    transport.register("late", None, handler)
+    await transport.send("task.completed", b"first")
+    try:
+        await transport.start()
+        await _wait_until(lambda: received == [b"first"])
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_streams_transport_skips_handled_entries_on_redelivery():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis()
+    transport = RedisStreamsTransport(redis_client=client, block_ms=20, claim_idle_ms=0)
+    bus = EventBus(EventBusConfig(transport=transport))
+    handled = []
+    bus.subscribe(
+        EventType.TASK_COMPLETED,
+        lambda e: handled.append(e.payload["n"]),
+        durable_id="ack-lost",
+    )
+
+    xack = client.xack
+    failures = []
+
+    async def lose_first_ack(*args):
+        if not failures:
+            failures.append(args)
+            raise ConnectionError("connection reset")
+        return await xack(*args)
+
+    client.xack = lose_first_ack
+    try:
+        await bus.start()
+        await bus.publish(_event(1))
+
+        await _wait_until(lambda: transport.get_stats()["ack-lost"]["duplicates"])
+        assert failures and handled == [1]
+        assert await client.xpending("forest:events", "ack-lost") == {
+            "pending": 0,
+            "min": None,
+            "max": None,
+            "consumers": [],
+        }
+    finally:
+        await bus.close()
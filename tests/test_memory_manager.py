@@ -0,0 +1,109 @@
+"""Tests for the journal-backed SemanticMemoryManager."""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from forest_app.core.services.memory_manager import SemanticMemoryManager
+
+
+def test_store_appends_to_journal_and_reloads(tmp_path):
+    path = tmp_path / "memories.jsonl"
+    manager = SemanticMemoryManager(storage_path=str(path), fsync_batch_size=2)
+    manager.store_milestone(uuid.uuid4(), "finished the draft", 0.8)
+    manager.store_reflection("daily", "felt focused", emotion="calm")
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["memory_type"] for line in lines] == [
+        "milestone",
+        "reflection",
+    ]
+    assert manager._unsynced == 0  # Batch of two was fsynced
+    manager.close()
+
+    reloaded = SemanticMemoryManager(storage_path=str(path))
+    assert [m.content for m in reloaded.memories] == [
+        "finished the draft",
+        "felt focused",
+    ]
+
+
+def test_torn_last_line_is_dropped_and_compacted(tmp_path):
+    path = tmp_path / "memories.jsonl"
+    manager = SemanticMemoryManager(storage_path=str(path))
+    manager.store_reflection("daily", "first")
+    manager.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"memory_type": "reflection", "cont')  # Crash mid-append
+
+    reloaded = SemanticMemoryManager(storage_path=str(path))
+    assert [m.content for m in reloaded.memories] == ["first"]
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert not (tmp_path / "memories.jsonl.tmp").exists()
+
+
+def test_corruption_before_last_line_is_an_error(tmp_path):
+    path = tmp_path / "memories.jsonl"
+    path.write_text('not json\n{"memory_type": "a"}\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        SemanticMemoryManager(storage_path=str(path))
+
+
+def test_legacy_json_list_is_converted(tmp_path):
+    path = tmp_path / "memory_store.json"
+    record = {
+        "memory_type": "reflection",
+        "content": "old entry",
+        "timestamp": "2024-01-01T00:00:00",
+        "metadata": {},
+    }
+    path.write_text(json.dumps([record], indent=2), encoding="utf-8")
+
+    manager = SemanticMemoryManager(storage_path=str(path))
+    assert [m.content for m in manager.memories] == ["old entry"]
+    assert json.loads(path.read_text(encoding="utf-8").strip()) == record
+
+
+def reference_scores(manager, context):
+    """Relevance scoring as a plain loop over memories."""
+    now = datetime.utcnow()
+    scores = []
+    for memory in manager.memories:
+        score = 1.0 if context.lower() in memory.content.lower() else 0.0
+        for value in memory.metadata.get("context", {}).values():
+            if str(value).lower() in context.lower():
+                score += 0.5
+        age = (now - memory.timestamp).total_seconds()
+        score += 1.0 / (1.0 + age / 86400.0)
+        if memory.memory_type == "milestone":
+            score *= 1.0 + memory.metadata["impact"]
+        scores.append((score, memory.content))
+    scores.sort(key=lambda item: item[0], reverse=True)
+    return [content for _, content in scores]
+
+
+def test_relevant_memories_match_reference_scoring(tmp_path):
+    manager = SemanticMemoryManager(storage_path=str(tmp_path / "m.jsonl"))
+    manager.update_context({"goal": "marathon"})
+    manager.store_milestone(uuid.uuid4(), "Ran a half marathon!", 0.9)
+    manager.store_reflection("daily", "Long run felt easy today")
+    manager.update_context({"goal": "novel"})
+    manager.store_reflection("daily", "Outlined chapter two of the novel")
+    manager.store_milestone(uuid.uuid4(), "Finished the first draft", 0.3)
+    for n, memory in enumerate(manager.memories):
+        memory.timestamp -= timedelta(days=n)
+
+    for context in ("marathon", "run", "half marathon!", "l run f", "!", "draft"):
+        results = manager.get_relevant_memories(context, limit=3)
+        expected = reference_scores(manager, context)[:3]
+        assert [m["content"] for m in results] == expected, context
+
+    # Memories appended after a query are picked up by the next one
+    manager.store_reflection("daily", "Marathon training plan")
+    results = manager.get_relevant_memories("marathon training", limit=5)
+    assert [m["content"] for m in results] == reference_scores(
+        manager, "marathon training"
+    )
+    assert results[1]["content"] == "Marathon training plan"
@@ -0,0 +1,428 @@
+"""Tests for the background task queue."""
+
+import asyncio
+import os
+import pickle
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from forest_app.core.task_queue import TaskQueue
+from forest_app.core.task_store import SQLiteTaskArchive, SQLTaskBackend, StoredTask
+
+
+def double(value):
+    return value * 2
+
+
+def always_fails():
+    raise RuntimeError("downstream unavailable")
+
+
+@pytest_asyncio.fixture
+async def backend(tmp_path):
+    task_backend = SQLTaskBackend(f"sqlite:///{tmp_path / 'tasks.db'}")
+    yield task_backend
+    await task_backend.close()
+
+
+@pytest_asyncio.fixture
+async def queue():
+    task_queue = TaskQueue(max_workers=2)
+    await task_queue.start()
+    yield task_queue
+    await task_queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_get_result_wakes_as_soon_as_task_completes(queue):
+    release = asyncio.Event()
+
+    async def job():
+        await release.wait()
+        return 42
+
+    task_id = await queue.enqueue(job)
+    waiter = asyncio.create_task(queue.get_result(task_id, timeout=1))
+    await asyncio.sleep(0.01)
+
+    released_at = time.perf_counter()
+    release.set()
+    result = await waiter
+
+    assert result == {"status": "completed", "result": 42}
+    assert time.perf_counter() - released_at < 0.05
+    assert not queue.completion_events
+
+
+@pytest.mark.asyncio
+async def test_multiple_waiters_and_failures(queue):
+    def failing_job():
+        raise ValueError("bad input")
+
+    task_id = await queue.enqueue(failing_job)
+    first, second = await asyncio.gather(
+        queue.wait_for_task(task_id, timeout=1), queue.get_result(task_id, timeout=1)
+    )
+
+    assert first is second
+    assert first["status"] == "failed"
+    assert first["error"]["error"] == "bad input"
+
+
+@pytest.mark.asyncio
+async def test_get_result_timeout_and_unknown_task():
+    queue = TaskQueue(max_workers=1)  # not started, so tasks stay queued
+
+    task_id = await queue.enqueue(lambda: None)
+    assert task_id in queue.queued
+
+    with pytest.raises(asyncio.TimeoutError):
+        await queue.get_result(task_id, timeout=0.01)
+    with pytest.raises(KeyError):
+        await queue.get_result("missing")
+
+
+@pytest.mark.asyncio
+async def test_finished_tasks_are_pruned_by_count_and_archived(tmp_path):
+    archive = SQLiteTaskArchive(str(tmp_path / "tasks.db"))
+    queue = TaskQueue(max_workers=2, max_retained_tasks=10, archive=archive)
+    await queue.start()
+    try:
+        task_ids = [await queue.enqueue(lambda n=n: n) for n in range(50)]
+        while queue.processing or queue.queued:
+            await asyncio.sleep(0.01)
+    finally:
+        await queue.stop()
+
+    assert len(queue.results) == len(queue.task_metadata) == 10
+    retained = list(queue.finished_timestamps)
+    assert queue.get_task_metadata(retained[-1])["status"] == "completed"
+
+    pruned = next(task_id for task_id in task_ids if task_id not in retained)
+    assert queue.get_task_metadata(pruned) is None
+    archived = await queue.get_archived_task_metadata(pruned)
+    assert archived["id"] == pruned
+    assert archived["status"] == "completed"
+    assert "completed_at" in archived
+    await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_results_and_metadata_are_pruned():
+    queue = TaskQueue(max_workers=1, result_ttl=10, metadata_ttl=20)
+    await queue.start()
+    try:
+        task_id = await queue.enqueue(lambda: "done", metadata={"user_id": "u1"})
+        await queue.get_result(task_id, timeout=1)
+    finally:
+        await queue.stop()
+
+    finished = queue.finished_timestamps[task_id]
+    metadata = queue.get_task_metadata(task_id)
+    assert metadata["user_metadata"] == {"user_id": "u1"}
+    assert set(metadata) >= {"queued_at", "started_at", "completed_at"}
+
+    queue._prune(finished + 15)
+    assert task_id not in queue.results
+    assert queue.get_task_metadata(task_id) is not None
+
+    queue._prune(finished + 25)
+    assert queue.get_task_metadata(task_id) is None
+    with pytest.raises(KeyError):
+        await queue.get_result(task_id)
+
+
+@pytest.mark.asyncio
+async def test_failed_task_is_retried_with_backoff():
+    queue = TaskQueue(max_workers=1, max_attempts=3, retry_base_delay=0.01)
+    calls = []
+
+    def flaky():
+        calls.append(time.perf_counter())
+        if len(calls) < 3:
+            raise ConnectionError("timeout")
+        return "ok"
+
+    await queue.start()
+    try:
+        task_id = await queue.enqueue(flaky)
+        result = await queue.get_result(task_id, timeout=2)
+    finally:
+        await queue.stop()
+
+    assert result == {"status": "completed", "result": "ok"}
+    assert queue.get_task_metadata(task_id)["attempts"] == 3
+    # Second delay is about twice the first (with up to 50% jitter)
+    assert calls[1] - calls[0] >= 0.005
+    assert calls[2] - calls[1] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_durable_task_survives_restart(backend):
+    crashed = TaskQueue(max_workers=1, backend=backend)
+    task_id = await crashed.enqueue(double, 21)  # never started
+    assert task_id in crashed.durable
+
+    restarted = TaskQueue(max_workers=1, backend=backend, lease_timeout=0.2)
+    await restarted.start()
+    try:
+        result = await restarted.get_result(task_id, timeout=3)
+    finally:
+        await restarted.stop()
+
+    assert result == {"status": "completed", "result": 42}
+    assert await backend.ready() == []
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_recovered(backend):
+    queue = TaskQueue(max_workers=1, backend=backend, lease_timeout=0.1, max_attempts=2)
+    queue.register_task(double, name="double")
+    await backend.put(StoredTask("t1", "double", pickle.dumps(((4,), {})), 5, 0, {}))
+    # A worker leased the task and then crashed
+    assert await backend.lease("t1", "crashed-worker", 0.05) == 1
+
+    await queue.start()
+    try:
+        result = await queue.get_result("t1", timeout=3)
+        while queue.get_task_metadata("t1") is None:
+            await asyncio.sleep(0.01)
+    finally:
+        await queue.stop()
+
+    assert result == {"status": "completed", "result": 8}
+    assert queue.get_task_metadata("t1")["attempts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_task_whose_leases_keep_expiring_is_dead_lettered(backend):
+    runs = []
+
+    def crashes_worker():
+        runs.append(1)
+
+    queue = TaskQueue(max_workers=1, backend=backend, lease_timeout=0.1)
+    queue.register_task(crashes_worker, name="crashes_worker")
+    payload = pickle.dumps(((), {}))
+    await backend.put(StoredTask("t1", "crashes_worker", payload, 5, 0, {}))
+    # The only allowed attempt took down its worker before finishing
+    assert await backend.lease("t1", "crashed-worker", 0.05) == 1
+
+    await queue.start()
+    try:
+        result = await queue.get_result("t1", timeout=3)
+    finally:
+        await queue.stop()
+
+    assert result["status"] == "failed"
+    assert "Lease expired" in result["error"]["error"]
+    assert runs == []
+    assert [dead["id"] for dead in await queue.get_dead_letters()] == ["t1"]
+    assert await backend.ready() == []
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_are_dead_lettered(backend):
+    queue = TaskQueue(
+        max_workers=1, backend=backend, max_attempts=2, retry_base_delay=0.01
+    )
+    queue.register_task(always_fails, name="always_fails")
+    await queue.start()
+    try:
+        task_id = await queue.enqueue(always_fails, metadata={"user_id": "u1"})
+        result = await queue.get_result(task_id, timeout=2)
+    finally:
+        await queue.stop()
+
+    assert result["status"] == "failed"
+    assert result["error"]["error"] == "downstream unavailable"
+    [dead] = await queue.get_dead_letters()
+    assert dead["id"] == task_id
+    assert dead["attempts"] == 2
+    assert dead["user_metadata"] == {"user_id": "u1"}
+
+    assert await queue.requeue_dead_letter(task_id)
+    assert await queue.get_dead_letters() == []
+    assert [task.task_id for task in await backend.ready()] == [task_id]
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_tasks_run_in_worker_processes():
+    queue = TaskQueue(max_workers=2, process_workers=2)
+    await queue.start()
+    try:
+        pid_task = await queue.enqueue(os.getpid, cpu_bound=True)
+        sum_task = await queue.enqueue(sum, range(1000), cpu_bound=True)
+        pid_result = await queue.get_result(pid_task, timeout=10)
+        sum_result = await queue.get_result(sum_task, timeout=10)
+    finally:
+        await queue.stop()
+
+    assert pid_result["status"] == "completed"
+    assert pid_result["result"] != os.getpid()
+    assert sum_result == {"status": "completed", "result": 499500}
+    assert not queue.cpu_bound
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_enqueue_rejects_tasks_the_pool_cannot_run():
+    async def coroutine_job():
+        return None
+
+    no_lane = TaskQueue(max_workers=1)
+    with pytest.raises(ValueError, match="no process lane"):
+        await no_lane.enqueue(sum, [1], cpu_bound=True)
+
+    queue = TaskQueue(max_workers=1, process_workers=1)  # not started
+    with pytest.raises(ValueError, match="not picklable"):
+        await queue.enqueue(lambda: 1, cpu_bound=True)
+    with pytest.raises(ValueError, match="Coroutine function"):
+        await queue.enqueue(coroutine_job, cpu_bound=True)
+    assert not queue.task_metadata
+
+
+@pytest.mark.asyncio
+async def test_duplicate_enqueues_attach_to_pending_task(queue):
+    release = asyncio.Event()
+    runs = []
+
+    async def expand(node_id):
+        runs.append(node_id)
+        await release.wait()
+        return node_id
+
+    first = await queue.enqueue(expand, "n1", dedup_key="expand:n1")
+    duplicate = await queue.enqueue(expand, "n1", dedup_key="expand:n1")
+    other = await queue.enqueue(expand, "n2", dedup_key="expand:n2")
+    assert duplicate == first
+    assert other != first
+
+    release.set()
+    await queue.get_result(first, timeout=1)
+    await queue.get_result(other, timeout=1)
+    assert sorted(runs) == ["n1", "n2"]
+
+    # Without a window, the key is free again once the task has finished
+    again = await queue.enqueue(expand, "n1", dedup_key="expand:n1")
+    assert again != first
+    await queue.get_result(again, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_dedup_window_outlives_completion_but_not_failure(queue):
+    def boom():
+        raise ValueError("failed")
+
+    done = await queue.enqueue(lambda: 1, dedup_key="k", dedup_window=60)
+    await queue.get_result(done, timeout=1)
+    assert await queue.enqueue(lambda: 1, dedup_key="k") == done
+
+    queue.dedup_expiry["k"] = 0  # window elapsed
+    assert await queue.enqueue(lambda: 1, dedup_key="k") != done
+
+    failed = await queue.enqueue(boom, dedup_key="f", dedup_window=60)
+    await queue.get_result(failed, timeout=1)
+    assert await queue.enqueue(lambda: 1, dedup_key="f") != failed
+
+
+@pytest.mark.asyncio
+async def test_concurrency_key_runs_one_task_per_key_at_a_time():
+    queue = TaskQueue(max_workers=4)
+    running = {"tree-a": 0, "tree-b": 0}
+    peak = {"tree-a": 0, "tree-b": 0}
+
+    async def expand(tree_id):
+        running[tree_id] += 1
+        peak[tree_id] = max(peak[tree_id], running[tree_id])
+        await asyncio.sleep(0.02)
+        running[tree_id] -= 1
+
+    await queue.start()
+    try:
+        task_ids = [
+            await queue.enqueue(expand, tree_id, concurrency_key=tree_id)
+            for tree_id in ["tree-a"] * 3 + ["tree-b"] * 3
+        ]
+        for task_id in task_ids:
+            assert (await queue.get_result(task_id, timeout=2))["status"] == "completed"
+    finally:
+        await queue.stop()
+
+    assert peak == {"tree-a": 1, "tree-b": 1}
+    assert not queue.key_running and not queue.key_waiting
+
+
+@pytest.mark.asyncio
+async def test_heavy_user_does_not_starve_others():
+    queue = TaskQueue(max_workers=1)
+    finished = []
+
+    async def job(user_id):
+        finished.append(user_id)
+
+    for _ in range(20):
+        await queue.enqueue(job, "heavy", metadata={"user_id": "heavy"})
+    light_id = await queue.enqueue(job, "light", metadata={"user_id": "light"})
+
+    await queue.start()
+    try:
+        await queue.get_result(light_id, timeout=2)
+    finally:
+        await queue.stop()
+
+    assert finished.index("light") <= 1
+
+
+@pytest.mark.asyncio
+async def test_delayed_tasks_run_in_due_order(queue):
+    finished = []
+
+    async def job(name):
+        finished.append((name, time.perf_counter()))
+
+    started = time.perf_counter()
+    later = await queue.enqueue(job, "later", delay=0.1)
+    sooner = await queue.enqueue(job, "sooner", delay=timedelta(seconds=0.05))
+    at = await queue.enqueue(
+        job, "at", run_at=datetime.now(timezone.utc) + timedelta(seconds=0.02)
+    )
+    assert queue.get_task_metadata(later)["status"] == "scheduled"
+    assert (await queue.get_queue_status())["scheduled"] == 3
+
+    await queue.get_result(later, timeout=1)
+    assert [name for name, _ in finished] == ["at", "sooner", "later"]
+    assert finished[-1][1] - started >= 0.1
+    assert {sooner, at} <= set(queue.results)
+
+    with pytest.raises(ValueError):
+        await queue.enqueue(job, "x", delay=1, run_at=datetime.now(timezone.utc))
+
+
+@pytest.mark.asyncio
+async def test_recurring_schedule_runs_until_cancelled(queue):
+    runs = []
+
+    async def tick():
+        runs.append(time.perf_counter())
+
+    schedule_id = await queue.schedule_recurring(tick, interval=0.03, start_delay=0)
+    await asyncio.sleep(0.1)
+    assert queue.cancel_schedule(schedule_id)
+    count = len(runs)
+    await asyncio.sleep(0.08)
+
+    assert 3 <= count <= 5
+    assert len(runs) <= count + 1  # at most a run already enqueued
+    assert not queue.get_schedules()
+    assert not queue.cancel_schedule(schedule_id)
+
+
+@pytest.mark.asyncio
+async def test_delayed_durable_task_waits_in_backend(backend):
+    queue = TaskQueue(max_workers=1, backend=backend)
+    task_id = await queue.enqueue(double, 5, delay=60)
+    assert await backend.ready() == []  # not due, so not recoverable early
+    assert (await backend.get_result(task_id))[0] == "queued"
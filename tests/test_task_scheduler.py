@@ -0,0 +1,103 @@
+"""Tests for fair task scheduling."""
+
+import asyncio
+import time
+
+import pytest
+
+from forest_app.core.task_scheduler import DEFAULT_TENANT, FairScheduler
+
+
+def drain(scheduler):
+    order = []
+    while (item := scheduler.get_nowait()) is not None:
+        tenant, entry = item
+        order.append(entry[1])
+        scheduler.task_done(tenant)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_tenants_take_turns_within_a_priority_level():
+    scheduler = FairScheduler()
+    for n in range(6):
+        scheduler.put_nowait((5, f"heavy-{n}"), "heavy")
+    scheduler.put_nowait((5, "light-0"), "light")
+    scheduler.put_nowait((5, "light-1"), "light")
+
+    order = drain(scheduler)
+
+    assert order[:4] == ["heavy-0", "light-0", "heavy-1", "light-1"]
+    assert order[4:] == ["heavy-2", "heavy-3", "heavy-4", "heavy-5"]
+    assert scheduler.qsize() == 0
+    assert not scheduler.tenants
+
+
+@pytest.mark.asyncio
+async def test_priority_is_strict_and_weights_share_a_level():
+    scheduler = FairScheduler(weights={"gold": 2.0})
+    for n in range(4):
+        scheduler.put_nowait((5, f"gold-{n}"), "gold")
+        scheduler.put_nowait((5, f"basic-{n}"), "basic")
+    scheduler.put_nowait((1, "urgent"), None)
+
+    order = drain(scheduler)
+
+    assert order[0] == "urgent"
+    # gold is served twice as often while both have work
+    first_six = [task.split("-")[0] for task in order[1:7]]
+    assert first_six.count("gold") == 4 and first_six.count("basic") == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_parks_tenant_until_task_done():
+    scheduler = FairScheduler(max_running_per_tenant=1)
+    scheduler.put_nowait((5, "a-0"), "a")
+    scheduler.put_nowait((5, "a-1"), "a")
+    scheduler.put_nowait((5, "b-0"), "b")
+
+    assert scheduler.get_nowait() == ("a", (5, "a-0"))
+    assert scheduler.get_nowait() == ("b", (5, "b-0"))
+    assert scheduler.get_nowait() is None  # a is at its cap
+
+    waiter = asyncio.create_task(scheduler.get())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    scheduler.task_done("a")
+    assert await asyncio.wait_for(waiter, 1) == ("a", (5, "a-1"))
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_out_a_tenant_without_blocking_others():
+    scheduler = FairScheduler(rate_limit=20, burst=1)
+    scheduler.put_nowait((5, "a-0"), "a")
+    scheduler.put_nowait((5, "a-1"), "a")
+    scheduler.put_nowait((5, "b-0"), "b")
+
+    assert scheduler.get_nowait()[1] == (5, "a-0")
+    assert scheduler.get_nowait()[1] == (5, "b-0")  # a is out of tokens
+
+    started = time.perf_counter()
+    tenant, entry = await asyncio.wait_for(scheduler.get(), 1)
+    assert entry == (5, "a-1")
+    assert 0.03 <= time.perf_counter() - started < 0.5
+
+    stats = scheduler.get_tenant_stats()
+    assert stats["a"]["dispatched"] == 2
+    assert stats["a"]["max_wait"] >= 0.03
+    scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_tenant_stats_report_depth_and_default_tenant():
+    scheduler = FairScheduler()
+    scheduler.put_nowait((5, "x"), None)
+    scheduler.put_nowait((5, "y"), "user-1")
+    scheduler.put_nowait((5, "z"), "user-1")
+    scheduler.get_nowait()
+
+    stats = scheduler.get_tenant_stats()
+
+    assert stats[DEFAULT_TENANT]["running"] == 1
+    assert stats["user-1"]["queued"] == 2
+    assert stats["user-1"]["oldest_wait"] >= 0